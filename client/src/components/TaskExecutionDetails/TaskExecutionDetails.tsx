@@ -2,6 +2,7 @@ import {
   RunEnvironment,
   Task,
   TaskExecution,
+  TaskExecutionLogs,
   AnyEvent,
   AwsEcsExecutionMethodSettings,
   AwsLambdaExecutionMethodSettings,
@@ -28,7 +29,9 @@ import {
 } from '../../utils/constants';
 
 import EventTable from '../EventList/EventTable';
-import { ResultsPage, makeEmptyResultsPage, fetchEvents } from '../../utils/api';
+import {
+  ResultsPage, makeEmptyResultsPage, fetchEvents, fetchTaskExecutionLogs
+} from '../../utils/api';
 
 import styles from './TaskExecutionDetails.module.scss';
 
@@ -68,8 +71,8 @@ function PropertyTable({ rows }: { rows: NameValuePair[] }) {
   );
 }
 
-function LogSection({ te, isStdout }: { te: TaskExecution; isStdout: boolean }) {
-  const logLines = isStdout ? te.debug_log_tail : te.error_log_tail;
+function LogSection({ logs, isStdout }: { logs: TaskExecutionLogs | null; isStdout: boolean }) {
+  const logLines = logs ? (isStdout ? logs.debug_log_tail : logs.error_log_tail) : null;
   return (
     <Row className={styles.logSection}>
       <Col>
@@ -89,6 +92,7 @@ const TaskExecutionDetails = ({ taskExecution, task, runEnvironment }: Props) =>
   const [eventsPage, setEventsPage] = useState<ResultsPage<AnyEvent>>(makeEmptyResultsPage());
   const [isLoadingEvents, setIsLoadingEvents] = useState(false);
   const [activeTab, setActiveTab] = useState('general');
+  const [logs, setLogs] = useState<TaskExecutionLogs | null>(null);
   const [searchParams, setSearchParams] = useSearchParams();
 
   // Derive all event filter state from URL parameters - memoized to prevent infinite loops
@@ -173,6 +177,26 @@ const TaskExecutionDetails = ({ taskExecution, task, runEnvironment }: Props) =>
     loadTaskExecutionEvents();
   }, [loadTaskExecutionEvents]);
 
+  // Log tails aren't included in the Task Execution, so only fetch them
+  // when they are viewed
+  useEffect(() => {
+    if (activeTab !== 'logs') {
+      return;
+    }
+
+    const abortController = new AbortController();
+
+    fetchTaskExecutionLogs(taskExecution.uuid, abortController.signal)
+      .then(setLogs)
+      .catch(error => {
+        if (!abortController.signal.aborted) {
+          console.error('Failed to load task execution logs:', error);
+        }
+      });
+
+    return () => abortController.abort();
+  }, [activeTab, taskExecution.uuid, taskExecution.updated_at]);
+
   const handleEventPageChanged = useCallback((currentPage: number) => {
     updateEventFiltersInUrl({ event_page: currentPage });
   }, [updateEventFiltersInUrl]);
@@ -516,8 +540,8 @@ const TaskExecutionDetails = ({ taskExecution, task, runEnvironment }: Props) =>
           <PropertyTable rows={infrastructureRows} />
         </Tab.Pane>
         <Tab.Pane eventKey="logs">
-          <LogSection te={te} isStdout={true} />
-          <LogSection te={te} isStdout={false} />
+          <LogSection logs={logs} isStdout={true} />
+          <LogSection logs={logs} isStdout={false} />
         </Tab.Pane>
         <Tab.Pane eventKey="events">
           <EventTable
@@ -714,14 +714,12 @@ export interface TaskExecution extends Execution, ExecutionDetails, TaskExecutio
   commit_url: string;
   current_cpu_units: number | null;
   current_memory_mb: number | null;
-  debug_log_tail: string | null;
   deploy: DeployInfo | null;
   deployment: string | null;
   embedded_mode: boolean | null;
   environment_variables_overrides: any;
   error_count: number;
   error_details: any;
-  error_log_tail: string | null;
   execution_method_details: object | null;
   execution_method_type: string;
   exit_code: number | null;
@@ -753,6 +751,11 @@ export interface TaskExecution extends Execution, ExecutionDetails, TaskExecutio
   wrapper_version: string;
 }
 
+export interface TaskExecutionLogs {
+  debug_log_tail: string | null;
+  error_log_tail: string | null;
+}
+
 export interface WorkflowTaskInstance extends TrackedEntityReference, Described {
   allocated_cpu_units: number | null;
   allocated_memory_mb: number | null;
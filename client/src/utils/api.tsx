@@ -19,6 +19,7 @@ import {
   Task,
   TaskImpl,
   TaskExecution,
+  TaskExecutionLogs,
   RunEnvironment,
   Workflow,
   WorkflowExecution,
@@ -760,7 +761,7 @@ export async function fetchTaskExecutions(opts?: TaskExecutionPageFetchOptions):
     params['status__in'] = statuses.join(',');
   }
 
-  params['omit'] = 'debug_log_tail,environment_variables_overrides,execution_method_details,infrastructure_settings';
+  params['omit'] = 'environment_variables_overrides,execution_method_details,infrastructure_settings';
 
   const response = await makeAuthenticatedClient().get(
     'api/v1/task_executions/', {
@@ -780,6 +781,15 @@ export async function fetchTaskExecution(uuid: string,
   return response.data as TaskExecution;
 }
 
+export async function fetchTaskExecutionLogs(uuid: string,
+    abortSignal?: AbortSignal): Promise<TaskExecutionLogs> {
+  const response = await makeAuthenticatedClient().get(
+    'api/v1/task_executions/' + encodeURIComponent(uuid) + '/logs/', {
+      signal: abortSignal
+    });
+  return response.data as TaskExecutionLogs;
+}
+
 export async function startTaskExecution(taskUuid: string,
     executionProps?: any, abortSignal?: AbortSignal): Promise<TaskExecution> {
   const response = await makeAuthenticatedClient().post(
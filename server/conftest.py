@@ -130,6 +130,22 @@ def enable_db_debug_cursor():
         connection.force_debug_cursor = True
 
 
+@pytest.fixture(autouse=True)
+def reset_caches():
+    """
+    Prevents values cached in this process, such as usage limits, API keys,
+    estimated history row counts, and pooled connections and clients, from
+    leaking between tests. Rolling back the test transaction doesn't send
+    the signals that invalidate them, and clients may be mocks or use
+    overridden settings.
+    """
+    from processes.common.lru_ttl_cache import reset_all_caches
+
+    reset_all_caches()
+    yield
+    reset_all_caches()
+
+
 @pytest.fixture
 def api_client():
     return APIClient()
@@ -173,6 +189,40 @@ def make_api_client_from_options(api_client: APIClient,
             api_client=api_client, access_level=api_key_access_level,
             run_environment=api_key_run_environment)
 
+def fetch_cursor_pages(client: APIClient, url: str,
+        params: dict[str, Any]) -> list[list[str]]:
+    """
+    Returns the UUIDs of the results of each page of a keyset paginated
+    list, following the next links from the first page, after checking
+    that following the previous links from the last page returns the
+    same pages.
+    """
+    pages: list[list[str]] = []
+    next_url: str | None = url
+    page: dict[str, Any] = {}
+
+    while next_url:
+        response = client.get(next_url, params if not pages else None)
+        assert response.status_code == 200
+        page = response.data
+        assert (page['previous'] is not None) == bool(pages)
+        pages.append([r['uuid'] for r in page['results']])
+        next_url = page['next']
+
+    previous_pages: list[list[str]] = []
+    previous_url = page['previous']
+
+    while previous_url:
+        response = client.get(previous_url)
+        assert response.status_code == 200
+        page = response.data
+        previous_pages.insert(0, [r['uuid'] for r in page['results']])
+        previous_url = page['previous']
+
+    assert previous_pages == pages[:-1]
+
+    return pages
+
 def set_group_access_level(user: User, group: Group,
         access_level: int | None) -> None:
     if access_level is None:
@@ -385,7 +435,6 @@ COPIED_TASK_EXECUTION_ATTRIBUTES = [
     'api_final_update_timeout_seconds',
     'status_update_interval_seconds',
     'status_update_port', 'status_update_message_max_bytes',
-    'debug_log_tail', 'error_log_tail',
     'embedded_mode',
     'auto_created_task_properties',
     'input_value', 'output_value', 'error_details',
@@ -1,11 +1,17 @@
 from typing import cast, Tuple
 
+from django.utils.translation import gettext_lazy as _
+
 from django.contrib.auth.models import User
 
 from rest_framework.authentication import TokenAuthentication
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import AuthenticationFailed, PermissionDenied
+from rest_framework.request import Request
 
+from ..common.api_key_cache import ApiKeyPrincipal, get_api_key_cache
+from ..common.authorization_context import AuthorizationContext
 from ..models.saas_token import SaasToken
+from ..models.user_group_access_level import UserGroupAccessLevel
 
 
 class SaasTokenAuthentication(TokenAuthentication):
@@ -14,11 +20,49 @@ class SaasTokenAuthentication(TokenAuthentication):
 
     model = SaasToken
 
+    def __init__(self) -> None:
+        super().__init__()
+        self.principal: ApiKeyPrincipal | None = None
+
+    def authenticate(self, request: Request):
+        result = super().authenticate(request)
+
+        if result and self.principal:
+            (user, token) = cast(Tuple[User, SaasToken], result)
+
+            # Save permission checks in this request from looking up the
+            # access level again
+            context = AuthorizationContext.for_request(request, user=user,
+                    auth=token)
+
+            if context:
+                context.remember_access_level(user=user, group=token.group,
+                        access_level=self.principal.user_access_level)
+
+        return result
+
     def authenticate_credentials(self, key) -> Tuple[User, SaasToken]:
-        (user, token) = cast(Tuple[User, SaasToken],
-              super().authenticate_credentials(key))
+        self.principal = get_api_key_cache().get(key,
+                lambda: self.load_principal(key))
+
+        token = self.principal.token()
+        user = token.user
+
+        if not user.is_active:
+            raise AuthenticationFailed(_('User inactive or deleted.'))
 
-        if (not user.is_active) or (not token.enabled):
+        if not token.enabled:
             raise PermissionDenied(detail='Token is deactivated')
 
         return user, token
+
+    def load_principal(self, key) -> ApiKeyPrincipal:
+        try:
+            token = SaasToken.objects.select_related('user', 'group',
+                    'run_environment').get(key=key)
+        except SaasToken.DoesNotExist:
+            raise AuthenticationFailed(_('Invalid token.'))
+
+        return ApiKeyPrincipal(saas_token=token,
+                user_access_level=UserGroupAccessLevel.access_level_for_user_in_group(
+                        user=token.user, group=token.group))
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from typing import Callable, TYPE_CHECKING
+
+import copy
+import logging
+import threading
+
+from django.conf import settings
+
+from .lru_ttl_cache import LruTtlCache
+
+if TYPE_CHECKING:
+    from ..models import SaasToken
+
+
+logger = logging.getLogger(__name__)
+
+
+class ApiKeyPrincipal:
+    """
+    What an API key resolves to: its SaasToken, with its User, Group and
+    Run Environment loaded, and the access level of the User in the Group.
+    The instances are never handed out directly, since requests may modify
+    them; token() returns copies.
+    """
+
+    __slots__ = ('saas_token', 'user_access_level')
+
+    def __init__(self, saas_token: SaasToken,
+            user_access_level: int | None) -> None:
+        self.saas_token = saas_token
+        self.user_access_level = user_access_level
+
+    @property
+    def user_id(self) -> int:
+        return self.saas_token.user_id
+
+    @property
+    def group_id(self) -> int:
+        return self.saas_token.group_id
+
+    @property
+    def run_environment_id(self) -> int | None:
+        return self.saas_token.run_environment_id
+
+    def token(self) -> SaasToken:
+        """
+        Returns a copy of the SaasToken, with copies of its User, Group and
+        Run Environment cached so that accessing them runs no queries.
+        """
+        saas_token = copy.copy(self.saas_token)
+        saas_token.user = copy.copy(self.saas_token.user)
+        saas_token.group = copy.copy(self.saas_token.group)
+
+        if self.saas_token.run_environment_id is not None:
+            saas_token.run_environment = copy.copy(self.saas_token.run_environment)
+
+        return saas_token
+
+
+class ApiKeyCache:
+    """
+    Caches the principals of API keys for up to ttl_seconds in this
+    process, evicting the least recently used when there are more than
+    max_entries. Entries are invalidated when their SaasToken, User, Group
+    membership, access level, or Run Environment changes in this process;
+    the TTL bounds how long changes made by other processes take to apply.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.entries: LruTtlCache[str, ApiKeyPrincipal] = LruTtlCache(
+                max_entries, ttl_seconds=ttl_seconds)
+
+    def get(self, key: str,
+            loader: Callable[[], ApiKeyPrincipal]) -> ApiKeyPrincipal:
+        """
+        Returns the cached principal of the API key, or calls loader to
+        resolve it. Exceptions raised by loader are not cached.
+        """
+        if self.ttl_seconds <= 0:
+            return loader()
+
+        return self.entries.get_or_load(key, loader)
+
+    def invalidate(self, key: str | None = None) -> None:
+        """
+        Remove the cached principal of the API key, or of all API keys if
+        key is None.
+        """
+        if key is None:
+            self.entries.clear()
+        else:
+            self.entries.remove(key)
+
+    def invalidate_matching(self, predicate: Callable[[ApiKeyPrincipal], bool]) -> None:
+        self.entries.remove_matching(lambda _key, principal: predicate(principal))
+
+    def invalidate_user(self, user_id: int) -> None:
+        self.invalidate_matching(lambda principal: principal.user_id == user_id)
+
+    def invalidate_group(self, group_id: int) -> None:
+        self.invalidate_matching(lambda principal: principal.group_id == group_id)
+
+    def invalidate_run_environment(self, run_environment_id: int) -> None:
+        self.invalidate_matching(
+                lambda principal: principal.run_environment_id == run_environment_id)
+
+    def stats(self) -> dict[str, int]:
+        return self.entries.stats()
+
+
+_api_key_cache: ApiKeyCache | None = None
+_api_key_cache_lock = threading.Lock()
+
+
+def get_api_key_cache() -> ApiKeyCache:
+    global _api_key_cache
+
+    with _api_key_cache_lock:
+        if _api_key_cache is None:
+            cache_settings = settings.API_KEY_CACHE_SETTINGS
+            _api_key_cache = ApiKeyCache(
+                    ttl_seconds=cache_settings['TTL_SECONDS'],
+                    max_entries=cache_settings['MAX_ENTRIES'])
+
+        return _api_key_cache
+
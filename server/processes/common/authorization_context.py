@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Hashable, TYPE_CHECKING
+
+import logging
+
+from django.http import HttpRequest
+
+from django.contrib.auth.models import AbstractUser, Group, User
+
+from django_middleware_global_request.middleware import get_request
+
+if TYPE_CHECKING:
+    from ..models import RunEnvironment
+
+
+logger = logging.getLogger(__name__)
+
+
+class AuthorizationContext:
+    """
+    Authorization decisions made during a request, so that the views,
+    permissions, serializers and models that check the same access don't
+    repeat the lookups. It is attached to the underlying HttpRequest, which
+    is shared by all the DRF Requests that wrap it, and only used while the
+    request is authenticated as the same user and credentials.
+    """
+
+    REQUEST_ATTRIBUTE = '_authorization_context'
+
+    def __init__(self, identity: Hashable) -> None:
+        self.identity = identity
+        self.user_and_group: tuple[User | None, Group | None] | None = None
+        self.access_levels: dict[tuple[int, int], int | None] = {}
+        self.decisions: dict[Hashable, tuple[User, Group | None, int]] = {}
+
+    @staticmethod
+    def identity_of(user: Any, auth: Any) -> Hashable:
+        return (getattr(user, 'pk', None), type(auth).__name__,
+                getattr(auth, 'pk', None))
+
+    @classmethod
+    def for_request(cls, request: HttpRequest | None, user: Any = None,
+            auth: Any = None) -> AuthorizationContext | None:
+        """
+        Returns the context of the request, creating it if the request has
+        none or was authenticated differently. user and auth default to
+        those of the request.
+        """
+        if request is None:
+            return None
+
+        if user is None:
+            user = getattr(request, 'user', None)
+            auth = getattr(request, 'auth', None)
+
+        http_request = getattr(request, '_request', request)
+        identity = cls.identity_of(user, auth)
+        context = getattr(http_request, cls.REQUEST_ATTRIBUTE, None)
+
+        if (context is None) or (context.identity != identity):
+            context = AuthorizationContext(identity)
+            setattr(http_request, cls.REQUEST_ATTRIBUTE, context)
+
+        return context
+
+    def access_level_for_user_in_group(self, user: AbstractUser,
+            group: Group) -> int | None:
+        from ..models import UserGroupAccessLevel
+
+        if not user.is_authenticated:
+            return None
+
+        key = (user.pk, group.pk)
+
+        if key in self.access_levels:
+            return self.access_levels[key]
+
+        access_level = UserGroupAccessLevel.access_level_for_user_in_group(
+                user=user, group=group)
+
+        self.access_levels[key] = access_level
+        return access_level
+
+    def remember_access_level(self, user: User, group: Group,
+            access_level: int | None) -> None:
+        self.access_levels[(user.pk, group.pk)] = access_level
+
+    def ensure_access(self, group: Group, min_access_level: int,
+            run_environment: RunEnvironment | None, allow_api_key: bool,
+            check: Callable[[], tuple[User, Group | None, int]]) \
+            -> tuple[User, Group | None, int]:
+        """
+        Returns the result of check, which raises an exception if access is
+        denied, remembering it if access was granted. Denials aren't
+        remembered, since callers may recover from them.
+        """
+        if (group.pk is None) or \
+                ((run_environment is not None) and (run_environment.pk is None)):
+            return check()
+
+        key = (group.pk, None if run_environment is None else run_environment.pk,
+                min_access_level, allow_api_key)
+
+        decision = self.decisions.get(key)
+
+        if decision is None:
+            decision = check()
+            self.decisions[key] = decision
+
+        return decision
+
+    def forget(self) -> None:
+        self.user_and_group = None
+        self.access_levels.clear()
+        self.decisions.clear()
+
+
+def forget_authorizations() -> None:
+    """
+    Removes the authorization decisions made in the current request, after
+    access levels or group membership change.
+    """
+    request = get_request()
+
+    if request is not None:
+        context = getattr(request, AuthorizationContext.REQUEST_ATTRIBUTE, None)
+
+        if context is not None:
+            context.forget()
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from typing import Any, Callable
+
+from datetime import datetime, timedelta
+import hashlib
+import logging
+import threading
+
+from django.conf import settings
+from django.utils import timezone
+
+import boto3
+
+from .lru_ttl_cache import LruTtlCache
+
+
+logger = logging.getLogger(__name__)
+
+
+def hash_secret(secret: str | None) -> str | None:
+    """
+    Returns a digest of the secret to use in cache keys, so that keys can
+    be logged and don't hold secrets.
+    """
+    if secret is None:
+        return None
+
+    return hashlib.sha256(secret.encode('utf-8')).hexdigest()
+
+
+class AwsSessionCacheEntry:
+    """
+    A boto3 session and the clients made from it, which share the session's
+    credentials and expire with them.
+    """
+
+    def __init__(self, session: boto3.session.Session,
+            expires_at: datetime | None) -> None:
+        self.session = session
+        self.expires_at = expires_at
+        self.lock = threading.Lock()
+        self.clients: dict[str, Any] = {}
+
+    def client(self, service_name: str) -> Any:
+        # Sessions aren't thread safe, but the clients made from them are
+        with self.lock:
+            client = self.clients.get(service_name)
+
+            if client is None:
+                client = self.session.client(service_name)  # type: ignore
+                self.clients[service_name] = client
+
+            return client
+
+    def is_fresh(self, utc_now: datetime, refresh_margin: timedelta) -> bool:
+        return (self.expires_at is None) or (utc_now < self.expires_at - refresh_margin)
+
+
+class AwsSessionCache:
+    """
+    Caches boto3 sessions, such as those with the credentials of assumed
+    roles, and the clients made from them, for all threads in this process.
+    Sessions are keyed by the caller, typically by the role ARN, external
+    ID and region, and are replaced refresh_margin_seconds before their
+    credentials expire. Only one thread creates the session for a key at
+    once, so concurrent requests for the same role assume it once. The
+    least recently used sessions are evicted once there are more than
+    max_entries.
+    """
+
+    def __init__(self, refresh_margin_seconds: float, max_entries: int) -> None:
+        self.refresh_margin = timedelta(seconds=refresh_margin_seconds)
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.entries: LruTtlCache[tuple, AwsSessionCacheEntry] = LruTtlCache(
+                max_entries, on_remove=self.forget_key_lock)
+        self.key_locks: dict[tuple, threading.Lock] = {}
+
+    def get_session(self, key: tuple,
+            create: Callable[[], tuple[boto3.session.Session, datetime | None]]) -> AwsSessionCacheEntry:
+        """
+        Returns the cached session for key, or calls create to make it.
+        create returns the session and the time its credentials expire, if
+        they do.
+        """
+        entry = self.get_fresh_entry(key)
+
+        if entry is not None:
+            return entry
+
+        with self.lock:
+            key_lock = self.key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # Another thread may have created it while this one waited
+            entry = self.get_fresh_entry(key)
+
+            if entry is not None:
+                return entry
+
+            session, expires_at = create()
+            entry = AwsSessionCacheEntry(session=session, expires_at=expires_at)
+
+            self.entries.set(key, entry)
+            return entry
+
+    def get_client(self, key: tuple, service_name: str,
+            create: Callable[[], tuple[boto3.session.Session, datetime | None]]) -> Any:
+        """
+        Returns a client for service_name made from the cached session for
+        key, calling create to make the session if needed.
+        """
+        return self.get_session(key, create).client(service_name)
+
+    def get_fresh_entry(self, key: tuple) -> AwsSessionCacheEntry | None:
+        entry = self.entries.get(key)
+
+        if (entry is None) or entry.is_fresh(timezone.now(), self.refresh_margin):
+            return entry
+
+        logger.info(f"Cached AWS session for {key[0]} expires at {entry.expires_at}, refreshing")
+        return None
+
+    def forget_key_lock(self, key: tuple, _entry: AwsSessionCacheEntry) -> None:
+        # Entries replaced by a refreshed session keep their key lock
+        if key in self.entries:
+            return
+
+        with self.lock:
+            self.key_locks.pop(key, None)
+
+    def invalidate(self) -> None:
+        self.entries.clear()
+
+        with self.lock:
+            self.key_locks.clear()
+
+
+_aws_session_cache: AwsSessionCache | None = None
+_aws_session_cache_lock = threading.Lock()
+
+
+def get_aws_session_cache() -> AwsSessionCache:
+    global _aws_session_cache
+
+    with _aws_session_cache_lock:
+        if _aws_session_cache is None:
+            cache_settings = settings.AWS_SESSION_CACHE_SETTINGS
+            _aws_session_cache = AwsSessionCache(
+                    refresh_margin_seconds=cache_settings['REFRESH_MARGIN_SECONDS'],
+                    max_entries=cache_settings['MAX_ENTRIES'])
+
+        return _aws_session_cache
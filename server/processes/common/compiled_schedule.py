@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from functools import lru_cache
+import logging
+import re
+
+from crontab import CronTab
+
+from dateutil.relativedelta import relativedelta
+
+
+logger = logging.getLogger(__name__)
+
+
+SCHEDULE_TYPE_CRON = 'C'
+SCHEDULE_TYPE_RATE = 'R'
+
+CRON_REGEX = re.compile(r"cron\s*\(([^)]+)\)")
+RATE_REGEX = re.compile(r"rate\s*\((\d+)\s+([A-Za-z]+)\)")
+
+# The number of distinct schedules to keep compiled
+MAX_COMPILED_SCHEDULES = 4096
+
+ONE_SECOND = timedelta(seconds=1)
+HALF_SECOND = timedelta(microseconds=500000)
+
+
+def cron_time(now: datetime, seconds: float) -> datetime:
+    """
+    Returns the time seconds after now, rounded to the nearest second
+    since cron schedules fire on whole seconds, to remove floating point
+    error.
+    """
+    return (now + timedelta(seconds=seconds) + HALF_SECOND).replace(microsecond=0)
+
+
+def make_relative_delta(n: int, time_unit: str) -> relativedelta:
+    if time_unit == 'second':
+        return relativedelta(seconds=n)
+    if time_unit == 'minute':
+        return relativedelta(minutes=n)
+    if time_unit == 'hour':
+        return relativedelta(hours=n)
+    if time_unit == 'day':
+        return relativedelta(days=n)
+    if time_unit == 'month':
+        return relativedelta(months=n)
+    if time_unit == 'year':
+        return relativedelta(years=n)
+    raise Exception(f"Unknown time unit '{time_unit}'")
+
+
+class CompiledSchedule:
+    """
+    A parsed cron or rate schedule expression, which can be shared between
+    threads.
+
+    A cron schedule fires at fixed times. A rate schedule fires every rate
+    after an anchor time, usually the last execution or schedule update,
+    which is passed to the methods that need it.
+    """
+
+    def __init__(self, schedule: str) -> None:
+        self.schedule = schedule
+        self.schedule_type: str | None = None
+        self.cron_expression: str | None = None
+        self.cron: CronTab | None = None
+        self.rate: relativedelta | None = None
+
+        # The rate as a timedelta, if it has no months or years, so fire
+        # times can be computed without stepping through each rate
+        self.rate_timedelta: timedelta | None = None
+
+        m = CRON_REGEX.match(schedule)
+
+        if m:
+            self.schedule_type = SCHEDULE_TYPE_CRON
+            self.cron_expression = m.group(1)
+            self.cron = CronTab(self.cron_expression)
+            return
+
+        m = RATE_REGEX.match(schedule)
+
+        if m:
+            self.schedule_type = SCHEDULE_TYPE_RATE
+            self.rate = make_relative_delta(int(m.group(1)),
+                    m.group(2).lower().rstrip('s'))
+
+            if not (self.rate.months or self.rate.years):
+                self.rate_timedelta = timedelta(days=self.rate.days,
+                        hours=self.rate.hours, minutes=self.rate.minutes,
+                        seconds=self.rate.seconds)
+
+    def previous(self, now: datetime, anchor: datetime | None = None) \
+            -> datetime | None:
+        """
+        Returns the latest fire time at or before now, or None if there is
+        none. Rate schedules fire every rate after anchor.
+        """
+        if self.cron:
+            negative_seconds = self.cron.previous(now=now)
+
+            if negative_seconds is None:
+                return None
+
+            return cron_time(now, negative_seconds)
+
+        if self.rate and anchor and (anchor <= now):
+            index = self.first_rate_fire_index(now + timedelta(microseconds=1),
+                    anchor=anchor)
+            return self.rate_fire_time(anchor, index - 1)
+
+        return None
+
+    def next(self, now: datetime, anchor: datetime | None = None) \
+            -> datetime | None:
+        """
+        Returns the earliest fire time after now, or None if there is none.
+        Rate schedules fire every rate after anchor.
+        """
+        if self.cron:
+            seconds = self.cron.next(now=now)
+
+            if seconds is None:
+                return None
+
+            return cron_time(now, seconds)
+
+        if self.rate:
+            return self.first_rate_fire_time(now + timedelta(microseconds=1),
+                    anchor=anchor or now)
+
+        return None
+
+    def fire_times(self, start: datetime, end: datetime,
+            anchor: datetime | None = None, limit: int = 1000) -> list[datetime]:
+        """
+        Returns the fire times in [start, end), up to limit of them. Rate
+        schedules fire every rate after anchor, or start if anchor is
+        missing.
+        """
+        fire_times: list[datetime] = []
+
+        if self.cron:
+            # CronTab.next() only returns times after now
+            now = start - ONE_SECOND
+
+            while len(fire_times) < limit:
+                seconds = self.cron.next(now=now)
+
+                if seconds is None:
+                    break
+
+                fire_time = cron_time(now, seconds)
+
+                if fire_time >= end:
+                    break
+
+                if (fire_time >= start) and \
+                        ((not fire_times) or (fire_time > fire_times[-1])):
+                    fire_times.append(fire_time)
+
+                now = max(fire_time, now + ONE_SECOND)
+        elif self.rate:
+            anchor = anchor or start
+            index = self.first_rate_fire_index(start, anchor)
+
+            while len(fire_times) < limit:
+                fire_time = self.rate_fire_time(anchor, index)
+
+                if fire_time >= end:
+                    break
+
+                fire_times.append(fire_time)
+                index += 1
+
+        return fire_times
+
+    def first_rate_fire_time(self, start: datetime, anchor: datetime) -> datetime:
+        """
+        Returns the first time at or after start that is a whole number of
+        rates after anchor.
+        """
+        return self.rate_fire_time(anchor, self.first_rate_fire_index(start, anchor))
+
+    def first_rate_fire_index(self, start: datetime, anchor: datetime) -> int:
+        """
+        Returns the least number of rates after anchor that is at or after
+        start.
+        """
+        if anchor >= start:
+            return 0
+
+        if self.rate_timedelta:
+            return -((anchor - start) // self.rate_timedelta)
+
+        # Months and years have varying lengths
+        index = 1
+
+        while self.rate_fire_time(anchor, index) < start:
+            index += 1
+
+        return index
+
+    def rate_fire_time(self, anchor: datetime, index: int) -> datetime:
+        """
+        Returns the time index rates after anchor. Multiples of the rate are
+        added to anchor, rather than adding the rate repeatedly, so days of
+        the month clipped in short months aren't carried forward.
+        """
+        assert self.rate
+
+        if self.rate_timedelta:
+            return anchor + (index * self.rate_timedelta)
+
+        return anchor + (self.rate * index)
+
+    def __repr__(self) -> str:
+        return f"CompiledSchedule({self.schedule!r})"
+
+
+@lru_cache(maxsize=MAX_COMPILED_SCHEDULES)
+def compile_schedule(schedule: str) -> CompiledSchedule:
+    """
+    Returns the compiled form of a schedule expression, shared by all
+    callers with the same schedule. Raises an exception if the schedule
+    contains an invalid cron expression.
+    """
+    return CompiledSchedule(schedule.strip())
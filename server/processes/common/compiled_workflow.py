@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Iterable, TYPE_CHECKING
+
+import logging
+
+from django.db.models import Count
+
+from .lru_ttl_cache import LruTtlCache
+from .utils import json_digest
+
+if TYPE_CHECKING:
+    from ..models import WorkflowExecution
+
+
+logger = logging.getLogger(__name__)
+
+
+# The number of Workflow Executions to keep compiled Workflows for
+MAX_COMPILED_WORKFLOWS = 1024
+
+
+def snapshot_task_instances(snapshot: dict[str, Any]) -> list[dict[str, Any]]:
+    # For compatibility
+    return snapshot.get('workflow_process_type_instances') or \
+            snapshot['workflow_task_instances']
+
+
+def snapshot_transition_endpoint_uuid(wt: dict[str, Any], endpoint: str) -> str:
+    # For compatibility
+    return str((wt.get(f"{endpoint}_workflow_process_type_instance") or \
+            wt[f"{endpoint}_workflow_task_instance"])['uuid'])
+
+
+def snapshot_digest(snapshot: dict[str, Any]) -> str:
+    return json_digest(snapshot)
+
+
+class CompiledWorkflowTransition:
+    """
+    The parts of a Workflow Transition needed to decide if it activates.
+    """
+
+    __slots__ = ('uuid', 'id', 'from_index', 'to_index', 'rule_type',
+            'exit_codes')
+
+    def __init__(self, uuid: str, id: int | None, from_index: int,
+            to_index: int, rule_type: str, exit_codes: list[str] | None) -> None:
+        self.uuid = uuid
+        self.id = id
+        self.from_index = from_index
+        self.to_index = to_index
+        self.rule_type = rule_type
+        self.exit_codes = exit_codes
+
+    def __repr__(self) -> str:
+        return f"CompiledWorkflowTransition({self.uuid!r})"
+
+
+class CompiledWorkflow:
+    """
+    The graph of a Workflow Execution's snapshot of its Workflow, indexed so
+    that the transitions into and out of a Workflow Task Instance are found
+    without queries. Workflow Task Instances are numbered in snapshot order,
+    and transitions are stored in tuples indexed by those numbers. Since
+    it is immutable, it can be shared between threads.
+
+    task_instance_ids and transition_ids map UUIDs in the snapshot to the
+    primary keys of the rows, which are missing if the rows were deleted
+    before it was compiled. Since rows may be deleted after that, callers
+    check that the rows still exist before using their ids.
+    """
+
+    def __init__(self, snapshot: dict[str, Any],
+            task_instance_ids: dict[str, int],
+            transition_ids: dict[str, int]) -> None:
+        self.task_instance_uuids = tuple(str(wti['uuid'])
+                for wti in snapshot_task_instances(snapshot))
+        self.task_instance_indexes = {
+            wti_uuid: index for index, wti_uuid in enumerate(self.task_instance_uuids)
+        }
+        self.task_instance_ids = tuple(task_instance_ids.get(wti_uuid)
+                for wti_uuid in self.task_instance_uuids)
+
+        outbound: list[list[CompiledWorkflowTransition]] = [[] for _wti in self.task_instance_uuids]
+        inbound: list[list[CompiledWorkflowTransition]] = [[] for _wti in self.task_instance_uuids]
+        transitions: dict[str, CompiledWorkflowTransition] = {}
+
+        for wt in snapshot['workflow_transitions']:
+            wt_uuid = str(wt['uuid'])
+            transition = CompiledWorkflowTransition(uuid=wt_uuid,
+                    id=transition_ids.get(wt_uuid),
+                    from_index=self.task_instance_indexes[
+                            snapshot_transition_endpoint_uuid(wt, 'from')],
+                    to_index=self.task_instance_indexes[
+                            snapshot_transition_endpoint_uuid(wt, 'to')],
+                    rule_type=wt['rule_type'],
+                    exit_codes=wt.get('exit_codes'))
+
+            transitions[wt_uuid] = transition
+            outbound[transition.from_index].append(transition)
+            inbound[transition.to_index].append(transition)
+
+        self.transitions = transitions
+        self.outbound = tuple(tuple(wts) for wts in outbound)
+        self.inbound = tuple(tuple(wts) for wts in inbound)
+        self.inbound_counts = tuple(len(wts) for wts in inbound)
+
+    def outbound_transitions(self, wti_uuid: str) -> tuple[CompiledWorkflowTransition, ...]:
+        index = self.task_instance_indexes.get(str(wti_uuid))
+        return () if index is None else self.outbound[index]
+
+    def inbound_transitions(self, wti_uuid: str) -> tuple[CompiledWorkflowTransition, ...]:
+        index = self.task_instance_indexes.get(str(wti_uuid))
+        return () if index is None else self.inbound[index]
+
+    def reachable_task_instance_uuids(self, wti_uuids: Iterable[Any]) -> set[str]:
+        """
+        Returns the UUIDs of wti_uuids and all the Workflow Task Instances
+        reachable from them.
+        """
+        reachable_indexes: set[int] = set()
+        reachable_uuids: set[str] = set()
+        stack: list[int] = []
+
+        for wti_uuid in wti_uuids:
+            wti_uuid = str(wti_uuid)
+            reachable_uuids.add(wti_uuid)
+            index = self.task_instance_indexes.get(wti_uuid)
+
+            if (index is not None) and (index not in reachable_indexes):
+                reachable_indexes.add(index)
+                stack.append(index)
+
+        while stack:
+            for transition in self.outbound[stack.pop()]:
+                to_index = transition.to_index
+
+                if to_index not in reachable_indexes:
+                    reachable_indexes.add(to_index)
+                    stack.append(to_index)
+
+        reachable_uuids.update(self.task_instance_uuids[index]
+                for index in reachable_indexes)
+
+        return reachable_uuids
+
+
+class WorkflowProgress:
+    """
+    The state of a Workflow Execution used to decide if some of its Workflow
+    Task Instances should start, loaded for all of them at once: how many
+    latest executions each has, and which of their inbound transitions were
+    activated by latest executions.
+    """
+
+    def __init__(self, compiled_workflow: CompiledWorkflow,
+            latest_execution_counts: dict[int, int],
+            activated_transition_ids: set[int],
+            existing_transition_ids: set[int]) -> None:
+        self.compiled_workflow = compiled_workflow
+        self.latest_execution_counts = latest_execution_counts
+        self.activated_transition_ids = activated_transition_ids
+        self.existing_transition_ids = existing_transition_ids
+
+    @staticmethod
+    def load(workflow_execution: WorkflowExecution,
+            wti_uuids: Iterable[Any]) -> WorkflowProgress:
+        from ..models import (
+            WorkflowTaskInstanceExecution,
+            WorkflowTransition,
+            WorkflowTransitionEvaluation,
+        )
+
+        compiled_workflow = workflow_execution.compiled_workflow()
+        wti_ids: list[int] = []
+        transition_ids: list[int] = []
+
+        for wti_uuid in set(str(wti_uuid) for wti_uuid in wti_uuids):
+            index = compiled_workflow.task_instance_indexes.get(wti_uuid)
+
+            if index is None:
+                continue
+
+            wti_id = compiled_workflow.task_instance_ids[index]
+
+            if wti_id is not None:
+                wti_ids.append(wti_id)
+
+            transition_ids += [transition.id for transition in compiled_workflow.inbound[index]
+                    if transition.id is not None]
+
+        latest_execution_counts = dict(WorkflowTaskInstanceExecution.objects.filter(
+                workflow_execution=workflow_execution, is_latest=True,
+                workflow_task_instance_id__in=wti_ids).order_by() \
+                .values('workflow_task_instance_id') \
+                .annotate(count=Count('id')) \
+                .values_list('workflow_task_instance_id', 'count'))
+
+        activated_transition_ids = set(WorkflowTransitionEvaluation.objects.filter(
+                workflow_execution=workflow_execution, result=True,
+                from_workflow_task_instance_execution__is_latest=True,
+                workflow_transition_id__in=transition_ids) \
+                .values_list('workflow_transition_id', flat=True))
+
+        existing_transition_ids = set(WorkflowTransition.objects.filter(
+                id__in=transition_ids).values_list('id', flat=True))
+
+        return WorkflowProgress(compiled_workflow=compiled_workflow,
+                latest_execution_counts=latest_execution_counts,
+                activated_transition_ids=activated_transition_ids,
+                existing_transition_ids=existing_transition_ids)
+
+    def latest_execution_count(self, wti_id: int) -> int:
+        return self.latest_execution_counts.get(wti_id, 0)
+
+    def inbound_transition_counts(self, wti_uuid: Any) -> tuple[int, int]:
+        """
+        Returns the number of activated inbound transitions of a Workflow
+        Task Instance, and the number of inbound transitions that still
+        exist.
+        """
+        transitions = [transition for transition in
+                self.compiled_workflow.inbound_transitions(str(wti_uuid))
+                if transition.id in self.existing_transition_ids]
+
+        activated_count = len([transition for transition in transitions
+                if transition.id in self.activated_transition_ids])
+
+        return (activated_count, len(transitions))
+
+
+_compiled_workflows: LruTtlCache[tuple[str, str], CompiledWorkflow] = \
+        LruTtlCache(MAX_COMPILED_WORKFLOWS)
+
+
+def get_compiled_workflow(workflow_execution_uuid: str, digest: str,
+        create: Callable[[], CompiledWorkflow]) -> CompiledWorkflow:
+    """
+    Returns the compiled Workflow of a Workflow Execution, calling create
+    to compile it if it isn't cached. Compiled Workflows are cached by the
+    Workflow Execution and the digest of its snapshot, and the least
+    recently used are evicted.
+    """
+    return _compiled_workflows.get_or_load(
+            (str(workflow_execution_uuid), digest), create)
+
+
+def clear_compiled_workflows() -> None:
+    _compiled_workflows.clear()
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from typing import Any, Callable
+
+import logging
+import threading
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import QuerySet
+
+from .lru_ttl_cache import LruTtlCache
+
+
+logger = logging.getLogger(__name__)
+
+
+class HistoryRetention:
+    """
+    Keeps histories, such as the Events of a Group or the Task Executions
+    of a Task, near their size limits without counting their rows on every
+    insert.
+
+    Each history has an estimated row count, loaded with a COUNT when
+    missing or older than resync_seconds, and incremented on every insert
+    made through this process. Rows are only trimmed inline once the
+    estimate would pass the high-water mark, which is the limit plus
+    slack_fraction of the limit, so the cost of trimming is amortized over
+    the slack. Inserts made by other processes are not counted, so the
+    usage limit enforcer also trims histories in the background.
+    """
+
+    def __init__(self, slack_fraction: float, batch_size: int,
+            resync_seconds: int, max_entries: int) -> None:
+        self.slack_fraction = slack_fraction
+        self.batch_size = batch_size
+        self.resync_seconds = resync_seconds
+        self.max_entries = max_entries
+        self.entries: LruTtlCache[str, int] = LruTtlCache(
+                max_entries, ttl_seconds=resync_seconds)
+
+    def slack(self, max_count: int) -> int:
+        return max(int(max_count * self.slack_fraction), 0)
+
+    def before_insert(self, key: str, max_count: int | None,
+            count: Callable[[], int], trim: Callable[[], int]) -> int:
+        """
+        Account for a row about to be inserted into the history identified
+        by key. count returns the exact number of rows in the history, and
+        trim deletes the oldest rows, leaving room for the new row within
+        max_count. Returns the number of rows trimmed.
+        """
+        if max_count is None:
+            return 0
+
+        estimated_count = self.entries.get(key)
+        resync = estimated_count is None
+
+        if resync:
+            estimated_count = count()
+
+        trimmed_count = 0
+        high_water_mark = max_count + self.slack(max_count)
+
+        if estimated_count + 1 > high_water_mark:
+            logger.info(f"History {key} has about {estimated_count} rows, over {high_water_mark=}, trimming ...")
+            trimmed_count = trim()
+            estimated_count = count()
+            resync = True
+
+        # Keep the time of the last COUNT, so the estimate is resynced
+        # resync_seconds after it, not after the last insert
+        self.entries.set(key, estimated_count + 1, keep_expiry=not resync)
+
+        return trimmed_count
+
+    def delete_oldest(self, queryset: QuerySet, order_by: str,
+            max_to_delete: int) -> int:
+        """
+        Delete up to max_to_delete rows of queryset, earliest by order_by
+        first, using one DELETE per batch instead of one per row. If a
+        batch can't be deleted, its rows are deleted one at a time, and the
+        rows that still fail are skipped, so one row that can't be deleted
+        doesn't stop the history from being trimmed. Returns the number of
+        rows deleted.
+        """
+        deleted_count = 0
+        failed_pks: set[Any] = set()
+
+        while deleted_count < max_to_delete:
+            batch_size = min(self.batch_size, max_to_delete - deleted_count)
+            pks = list(queryset.exclude(pk__in=failed_pks).order_by(order_by) \
+                    .values_list('pk', flat=True)[:batch_size])
+
+            if not pks:
+                break
+
+            try:
+                # Use a savepoint so a failed batch doesn't abort the
+                # enclosing transaction
+                with transaction.atomic():
+                    queryset.model.objects.filter(pk__in=pks).delete()
+            except Exception:
+                logger.warning(f"Failed to delete {len(pks)} {queryset.model.__name__} rows, deleting them one at a time",
+                        exc_info=True)
+            else:
+                deleted_count += len(pks)
+                continue
+
+            for pk in pks:
+                try:
+                    with transaction.atomic():
+                        queryset.model.objects.filter(pk=pk).delete()
+                except Exception:
+                    logger.warning(f"Failed to delete {queryset.model.__name__} {pk}, skipping it",
+                            exc_info=True)
+                    failed_pks.add(pk)
+                else:
+                    deleted_count += 1
+
+        return deleted_count
+
+    def invalidate(self, key: str | None = None) -> None:
+        if key is None:
+            self.entries.clear()
+        else:
+            self.entries.remove(key)
+
+
+_history_retention: HistoryRetention | None = None
+_history_retention_lock = threading.Lock()
+
+
+def get_history_retention() -> HistoryRetention:
+    global _history_retention
+
+    with _history_retention_lock:
+        if _history_retention is None:
+            retention_settings = settings.HISTORY_RETENTION_SETTINGS
+            _history_retention = HistoryRetention(
+                    slack_fraction=retention_settings['SLACK_FRACTION'],
+                    batch_size=retention_settings['BATCH_SIZE'],
+                    resync_seconds=retention_settings['RESYNC_SECONDS'],
+                    max_entries=retention_settings['MAX_ENTRIES'])
+
+        return _history_retention
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from typing import Hashable
+
+import logging
+import threading
+
+from django.conf import settings
+
+from .lru_ttl_cache import LruTtlCache, register_cache
+
+
+logger = logging.getLogger(__name__)
+
+
+class LivenessThrottle:
+    """
+    Limits how often the liveness of an item, such as the last heartbeat
+    time of a Workflow Execution, is written by this process: at most once
+    per interval_seconds per key. The times of the last writes of up to
+    max_entries keys are kept, evicting the least recently written.
+    """
+
+    def __init__(self, interval_seconds: float, max_entries: int) -> None:
+        self.interval_seconds = interval_seconds
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.written_at: LruTtlCache[Hashable, bool] = LruTtlCache(
+                max_entries, ttl_seconds=interval_seconds)
+        self.write_count = 0
+        self.skip_count = 0
+        register_cache(self)
+
+    def should_write(self, key: Hashable, force: bool = False) -> bool:
+        """
+        Returns True, and records the write, if key was not written in the
+        last interval_seconds or force is True.
+        """
+        if force:
+            self.written_at.set(key, True)
+            should_write = True
+        else:
+            should_write = self.written_at.add(key, True)
+
+        with self.lock:
+            if should_write:
+                self.write_count += 1
+            else:
+                self.skip_count += 1
+
+        return should_write
+
+    def invalidate(self) -> None:
+        self.written_at.clear()
+
+        with self.lock:
+            self.write_count = 0
+            self.skip_count = 0
+
+    def reset(self) -> None:
+        self.invalidate()
+
+
+_workflow_liveness_throttle: LivenessThrottle | None = None
+_workflow_liveness_throttle_lock = threading.Lock()
+
+
+def get_workflow_liveness_throttle() -> LivenessThrottle:
+    global _workflow_liveness_throttle
+
+    with _workflow_liveness_throttle_lock:
+        if _workflow_liveness_throttle is None:
+            workflow_settings = settings.WORKFLOW_SETTINGS
+            _workflow_liveness_throttle = LivenessThrottle(
+                    interval_seconds=workflow_settings['LIVENESS_UPDATE_INTERVAL_SECONDS'],
+                    max_entries=workflow_settings['LIVENESS_MAX_ENTRIES'])
+
+        return _workflow_liveness_throttle
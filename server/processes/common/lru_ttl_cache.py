@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Generic, Hashable, TypeVar
+
+from collections import OrderedDict
+import logging
+import threading
+import time
+import weakref
+
+
+logger = logging.getLogger(__name__)
+
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+
+class LruTtlCache(Generic[K, V]):
+    """
+    A thread safe map of up to max_entries items, shared by the threads of
+    this process, that evicts the least recently used items when full.
+    Items expire ttl_seconds after they are set, or after the TTL they were
+    set with, or never if neither is given. If sliding is True, getting an
+    item also postpones its expiry, so items expire once they are idle.
+    on_remove is called with the key and value of each item that is
+    evicted, expires, or is removed, after the lock is released.
+
+    Every instance is registered, so tests can reset them all with
+    reset_all_caches().
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float | None = None,
+            sliding: bool = False,
+            on_remove: Callable[[K, V], None] | None = None) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.sliding = sliding
+        self.on_remove = on_remove
+        self.lock = threading.Lock()
+        self.entries: OrderedDict[K, tuple[V, float | None]] = OrderedDict()
+        self.hit_count = 0
+        self.miss_count = 0
+        register_cache(self)
+
+    def get(self, key: K) -> V | None:
+        """
+        Returns the value of key, or None if it is missing or expired.
+        """
+        now = time.monotonic()
+        removed: list[tuple[K, V]] = []
+
+        with self.lock:
+            entry = self.entries.get(key)
+
+            if (entry is not None) and (entry[1] is not None) and (entry[1] <= now):
+                del self.entries[key]
+                removed.append((key, entry[0]))
+                entry = None
+
+            if entry is None:
+                self.miss_count += 1
+            else:
+                self.entries.move_to_end(key)
+                self.hit_count += 1
+
+                if self.sliding:
+                    self.entries[key] = (entry[0], self.expires_at(now, None))
+
+        self.notify_removed(removed)
+        return None if entry is None else entry[0]
+
+    def get_or_load(self, key: K, loader: Callable[[], V],
+            ttl_seconds: float | None = None) -> V:
+        """
+        Returns the value of key, or calls loader to make it and caches the
+        result. loader is called outside the lock, so if two threads load
+        the same key at once, either value can be kept. Exceptions raised
+        by loader are not cached.
+        """
+        value = self.get(key)
+
+        if value is None:
+            value = loader()
+            self.set(key, value, ttl_seconds=ttl_seconds)
+
+        return value
+
+    def set(self, key: K, value: V, ttl_seconds: float | None = None,
+            keep_expiry: bool = False) -> None:
+        """
+        Cache value for key, expiring after ttl_seconds, or the default TTL
+        if None. If keep_expiry is True and key is cached, its current
+        expiry is kept.
+        """
+        now = time.monotonic()
+        removed: list[tuple[K, V]] = []
+
+        with self.lock:
+            old_entry = self.entries.get(key)
+
+            if keep_expiry and (old_entry is not None) and \
+                    ((old_entry[1] is None) or (old_entry[1] > now)):
+                expires_at = old_entry[1]
+            else:
+                expires_at = self.expires_at(now, ttl_seconds)
+
+            self.entries[key] = (value, expires_at)
+            self.entries.move_to_end(key)
+
+            if (old_entry is not None) and (old_entry[0] is not value):
+                removed.append((key, old_entry[0]))
+
+            while len(self.entries) > self.max_entries:
+                evicted_key, (evicted_value, _expires_at) = self.entries.popitem(last=False)
+                removed.append((evicted_key, evicted_value))
+
+        self.notify_removed(removed)
+
+    def add(self, key: K, value: V, ttl_seconds: float | None = None) -> bool:
+        """
+        Cache value for key only if key is missing or expired. Returns True
+        if it was added.
+        """
+        now = time.monotonic()
+
+        with self.lock:
+            entry = self.entries.get(key)
+
+            if (entry is not None) and ((entry[1] is None) or (entry[1] > now)):
+                return False
+
+        self.set(key, value, ttl_seconds=ttl_seconds)
+        return True
+
+    def remove(self, key: K) -> V | None:
+        """
+        Remove key, returning its value if it was cached.
+        """
+        with self.lock:
+            entry = self.entries.pop(key, None)
+
+        if entry is None:
+            return None
+
+        self.notify_removed([(key, entry[0])])
+        return entry[0]
+
+    def remove_matching(self, predicate: Callable[[K, V], bool]) -> int:
+        """
+        Remove the items for which predicate returns True. Returns the
+        number removed.
+        """
+        with self.lock:
+            removed = [(key, value) for key, (value, _expires_at) in self.entries.items()
+                    if predicate(key, value)]
+
+            for key, _value in removed:
+                del self.entries[key]
+
+        self.notify_removed(removed)
+        return len(removed)
+
+    def clear(self) -> None:
+        """
+        Remove every item.
+        """
+        with self.lock:
+            removed = [(key, value) for key, (value, _expires_at) in self.entries.items()]
+            self.entries.clear()
+
+        self.notify_removed(removed)
+
+    def reset(self) -> None:
+        """
+        Remove every item, and reset the statistics.
+        """
+        self.clear()
+        self.reset_stats()
+
+    def items(self) -> list[tuple[K, V]]:
+        """
+        Returns the cached items, including expired items that haven't been
+        removed yet, from least to most recently used.
+        """
+        with self.lock:
+            return [(key, value) for key, (value, _expires_at) in self.entries.items()]
+
+    def stats(self) -> dict[str, int]:
+        with self.lock:
+            return {
+                'hit_count': self.hit_count,
+                'miss_count': self.miss_count,
+                'entry_count': len(self.entries),
+            }
+
+    def reset_stats(self) -> None:
+        with self.lock:
+            self.hit_count = 0
+            self.miss_count = 0
+
+    def expires_at(self, now: float, ttl_seconds: float | None) -> float | None:
+        if ttl_seconds is None:
+            ttl_seconds = self.ttl_seconds
+
+        return None if ttl_seconds is None else now + ttl_seconds
+
+    def notify_removed(self, removed: list[tuple[K, V]]) -> None:
+        if self.on_remove is None:
+            return
+
+        for key, value in removed:
+            try:
+                self.on_remove(key, value)
+            except Exception:
+                logger.warning(f"Failed to handle removal of {key} from cache", exc_info=True)
+
+    def __len__(self) -> int:
+        with self.lock:
+            return len(self.entries)
+
+    def __contains__(self, key: Any) -> bool:
+        now = time.monotonic()
+
+        with self.lock:
+            entry = self.entries.get(key)
+            return (entry is not None) and ((entry[1] is None) or (entry[1] > now))
+
+
+# Objects with a reset() method holding state that lives as long as this
+# process, such as caches and connection pools
+_registered_caches: weakref.WeakSet[Any] = weakref.WeakSet()
+_registered_caches_lock = threading.Lock()
+
+
+def register_cache(cache: Any) -> None:
+    """
+    Register an object with a reset() method, so that reset_all_caches()
+    resets it. Only a weak reference is kept.
+    """
+    with _registered_caches_lock:
+        _registered_caches.add(cache)
+
+
+def reset_all_caches() -> None:
+    """
+    Reset every registered cache, so that tests don't see values cached, or
+    statistics counted, by other tests.
+    """
+    with _registered_caches_lock:
+        caches = list(_registered_caches)
+
+    for cache in caches:
+        cache.reset()
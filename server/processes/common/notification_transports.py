@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+from typing import Iterator, Sequence
+
+from contextlib import contextmanager
+import logging
+import smtplib
+import threading
+import time
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+
+import apprise
+import pagerduty
+
+from .lru_ttl_cache import LruTtlCache, register_cache
+
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationTransports:
+    """
+    Long-lived connections to the services Notifications are delivered to:
+    an email connection, a PagerDuty Events API client (an HTTP session)
+    per API key, and parsed Apprise objects keyed by URL, evicting the
+    least recently used when there are more than max_clients.
+
+    None of these are thread safe, so a set of transports is used by one
+    thread at a time; see NotificationTransportPool. Transports that have
+    been idle for more than max_idle_seconds are health checked (SMTP) or
+    replaced (HTTP clients, whose keep-alive connections have likely been
+    closed by the server) before they are used again.
+    """
+
+    def __init__(self, max_idle_seconds: float, max_clients: int) -> None:
+        self.max_idle_seconds = max_idle_seconds
+        self.max_clients = max_clients
+        self.email_connection: BaseEmailBackend | None = None
+        self.email_connection_used_at = 0.0
+        self.email_connection_count = 0
+        self.pagerduty_clients: LruTtlCache[str, pagerduty.EventsApiV2Client] = \
+                self.make_client_cache()
+        self.apprise_objects: LruTtlCache[str, apprise.Apprise] = \
+                self.make_client_cache()
+
+    def send_email_messages(self, messages: Sequence[EmailMessage]) -> int:
+        """
+        Send messages over the shared email connection, reconnecting once
+        if the server dropped it. Returns the number of messages sent.
+        """
+        # Like EmailMessage.send(), don't connect for messages without
+        # recipients
+        messages = [message for message in messages if message.recipients()]
+
+        if not messages:
+            return 0
+
+        connection = self.get_email_connection()
+
+        try:
+            return connection.send_messages(messages) or 0
+        except smtplib.SMTPServerDisconnected:
+            logger.info("Email server disconnected, reconnecting ...")
+            self.close_email_connection()
+            return self.get_email_connection().send_messages(messages) or 0
+        except OSError:
+            # The connection may be left in an unknown state
+            self.close_email_connection()
+            raise
+
+    def get_email_connection(self) -> BaseEmailBackend:
+        now = time.monotonic()
+        connection = self.email_connection
+
+        if (connection is not None) and \
+                (now - self.email_connection_used_at > self.max_idle_seconds) and \
+                not self.is_email_connection_healthy(connection):
+            logger.info("Idle email connection failed health check, reconnecting ...")
+            self.close_email_connection()
+            connection = None
+
+        if connection is None:
+            connection = get_connection(fail_silently=False)
+            connection.open()
+            self.email_connection = connection
+            self.email_connection_count += 1
+
+        self.email_connection_used_at = now
+        return connection
+
+    @staticmethod
+    def is_email_connection_healthy(connection: BaseEmailBackend) -> bool:
+        # Backends other than SMTP (console, locmem) have nothing to check
+        smtp_connection = getattr(connection, 'connection', None)
+
+        if smtp_connection is None:
+            return True
+
+        try:
+            return smtp_connection.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def close_email_connection(self) -> None:
+        connection = self.email_connection
+        self.email_connection = None
+
+        if connection is not None:
+            try:
+                connection.close()
+            except Exception:
+                logger.warning("Failed to close email connection", exc_info=True)
+
+    def make_client_cache(self) -> LruTtlCache:
+        # Clients expire once idle, and are closed when they are evicted,
+        # expire, or are discarded
+        return LruTtlCache(self.max_clients,
+                ttl_seconds=self.max_idle_seconds, sliding=True,
+                on_remove=lambda _key, client: self.close_client(client))
+
+    def get_pagerduty_client(self, api_key: str) -> pagerduty.EventsApiV2Client:
+        return self.pagerduty_clients.get_or_load(api_key,
+                lambda: pagerduty.EventsApiV2Client(api_key, debug=False))
+
+    def discard_pagerduty_client(self, api_key: str) -> None:
+        """
+        Close the client for api_key, so the next send reconnects.
+        """
+        self.pagerduty_clients.remove(api_key)
+
+    def get_apprise_object(self, apprise_url: str,
+            asset: apprise.AppriseAsset) -> apprise.Apprise:
+        def make_apprise_object() -> apprise.Apprise:
+            apobj = apprise.Apprise(asset=asset)
+
+            if not apobj.add(apprise_url):
+                raise ValueError(f"Invalid Apprise URL: {apprise_url}")
+
+            return apobj
+
+        return self.apprise_objects.get_or_load(apprise_url, make_apprise_object)
+
+    @staticmethod
+    def close_client(client) -> None:
+        close = getattr(client, 'close', None)
+
+        if close:
+            try:
+                close()
+            except Exception:
+                logger.warning(f"Failed to close {client}", exc_info=True)
+
+    def close(self) -> None:
+        self.close_email_connection()
+
+        self.pagerduty_clients.clear()
+        self.apprise_objects.clear()
+
+
+class NotificationTransportPool:
+    """
+    Lends sets of NotificationTransports to the threads delivering
+    Notifications, so that the workers of a dispatcher reuse the same
+    connections from one batch to the next, even though each batch runs
+    in new threads. At most max_idle_sets are kept while not in use; any
+    more are closed when they are returned.
+    """
+
+    def __init__(self, max_idle_sets: int, max_idle_seconds: float,
+            max_clients: int) -> None:
+        self.max_idle_sets = max_idle_sets
+        self.max_idle_seconds = max_idle_seconds
+        self.max_clients = max_clients
+        self.lock = threading.Lock()
+        self.idle_sets: list[NotificationTransports] = []
+        register_cache(self)
+
+    @contextmanager
+    def checkout(self) -> Iterator[NotificationTransports]:
+        transports: NotificationTransports | None = None
+
+        with self.lock:
+            if self.idle_sets:
+                transports = self.idle_sets.pop()
+
+        if transports is None:
+            transports = NotificationTransports(
+                    max_idle_seconds=self.max_idle_seconds,
+                    max_clients=self.max_clients)
+
+        try:
+            yield transports
+        finally:
+            with self.lock:
+                if len(self.idle_sets) < self.max_idle_sets:
+                    self.idle_sets.append(transports)
+                    transports = None
+
+            if transports is not None:
+                transports.close()
+
+    def close_all(self) -> None:
+        """
+        Close the connections of the transports that are not in use.
+        """
+        with self.lock:
+            idle_sets = self.idle_sets
+            self.idle_sets = []
+
+        for transports in idle_sets:
+            transports.close()
+
+    def reset(self) -> None:
+        self.close_all()
+
+
+_notification_transport_pool: NotificationTransportPool | None = None
+_notification_transport_pool_lock = threading.Lock()
+
+
+def get_notification_transport_pool() -> NotificationTransportPool:
+    global _notification_transport_pool
+
+    with _notification_transport_pool_lock:
+        if _notification_transport_pool is None:
+            transport_settings = settings.NOTIFICATION_TRANSPORT_SETTINGS
+            _notification_transport_pool = NotificationTransportPool(
+                    max_idle_sets=transport_settings['MAX_IDLE_SETS'],
+                    max_idle_seconds=transport_settings['MAX_IDLE_SECONDS'],
+                    max_clients=transport_settings['MAX_CLIENTS'])
+
+        return _notification_transport_pool
@@ -24,6 +24,7 @@ from rest_framework.request import (
 from rest_framework import serializers
 
 from ..exception import UnprocessableEntity
+from .authorization_context import AuthorizationContext
 
 if TYPE_CHECKING:
     from ..models import RunEnvironment, SaasToken
@@ -86,6 +87,10 @@ def context_with_request() -> dict[str, Any]:
 def user_and_group_from_request(request: Request | None = None) -> \
         tuple[User | None, Group | None]:
     r = request or request_for_context()
+    context = AuthorizationContext.for_request(r)
+
+    if context and (context.user_and_group is not None):
+        return context.user_and_group
 
     user: User | None = None
 
@@ -105,6 +110,9 @@ def user_and_group_from_request(request: Request | None = None) -> \
         if len(all_groups) == 1:
             group = all_groups[0]
 
+    if context:
+        context.user_and_group = (user, group)
+
     return (user, group)
 
 def required_user_and_group_from_request(request: Request | None = None) -> \
@@ -213,8 +221,28 @@ def ensure_group_access_level(group: Group | None = None,
     elif min_access_level is None:
         min_access_level = UserGroupAccessLevel.ACCESS_LEVEL_OBSERVER
 
-    access_level = UserGroupAccessLevel.access_level_for_user_in_group(
-            user=request_user, group=group)
+    # Decisions are remembered for the rest of the request
+    context = cast(AuthorizationContext,
+            AuthorizationContext.for_request(request))
+
+    return context.ensure_access(group=group,
+            min_access_level=min_access_level,
+            run_environment=run_environment, allow_api_key=allow_api_key,
+            check=lambda: check_group_access_level(request=request,
+                    context=context, user=request_user,
+                    request_group=request_group, group=group,
+                    min_access_level=min_access_level,
+                    run_environment=run_environment,
+                    allow_api_key=allow_api_key))
+
+def check_group_access_level(request: Request, context: AuthorizationContext,
+        user: User, request_group: Group | None, group: Group,
+        min_access_level: int, run_environment: RunEnvironment | None,
+        allow_api_key: bool) -> tuple[User, Group | None, int]:
+    from ..models import UserGroupAccessLevel
+
+    access_level = context.access_level_for_user_in_group(user=user,
+            group=group)
 
     if access_level is None:
         raise PermissionDenied('User has no access to Group')
@@ -244,7 +272,7 @@ def ensure_group_access_level(group: Group | None = None,
             # API Key is scoped to a specific, non-matching Run Environment
             raise PermissionDenied('Invalid Run Environment')
 
-    return (request_user, request_group, access_level)
+    return (user, request_group, access_level)
 
 def extract_authenticated_run_environment(
         request: Request | None = None) -> RunEnvironment | None:
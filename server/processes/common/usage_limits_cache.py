@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from typing import Callable
+
+from datetime import datetime
+import logging
+import threading
+
+from django.conf import settings
+from django.utils import timezone
+
+from django_middleware_global_request.middleware import get_request
+
+from .lru_ttl_cache import LruTtlCache, register_cache
+from .usage_limits import UsageLimits
+
+
+logger = logging.getLogger(__name__)
+
+
+class UsageLimitsCache:
+    """
+    Caches the UsageLimits of Groups in two layers: for the rest of the
+    current request, and for up to ttl_seconds in this process, evicting the
+    least recently used Groups when there are more than max_entries.
+    Entries also expire when the earliest subscription they were computed
+    from ends.
+    """
+
+    REQUEST_ATTRIBUTE = '_usage_limits_by_group_id'
+
+    def __init__(self, ttl_seconds: int, max_entries: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.entries: LruTtlCache[int, UsageLimits] = LruTtlCache(
+                max_entries, ttl_seconds=ttl_seconds)
+        self.request_hit_count = 0
+        register_cache(self)
+
+    def get(self, group_id: int,
+            loader: Callable[[], tuple[UsageLimits, datetime | None]]) -> UsageLimits:
+        """
+        Return the cached UsageLimits of the Group, or call loader to
+        compute them. loader returns the UsageLimits and the time they
+        stop being valid, if known.
+        """
+        request_cache = self.request_cache()
+
+        if request_cache is not None:
+            usage_limits = request_cache.get(group_id)
+            if usage_limits is not None:
+                with self.lock:
+                    self.request_hit_count += 1
+                return usage_limits
+
+        usage_limits = self.entries.get(group_id)
+
+        if usage_limits is None:
+            usage_limits, valid_until = loader()
+            ttl_seconds = self.ttl_seconds
+
+            if valid_until:
+                ttl_seconds = min(ttl_seconds,
+                        (valid_until - timezone.now()).total_seconds())
+
+            self.entries.set(group_id, usage_limits, ttl_seconds=ttl_seconds)
+
+        if request_cache is not None:
+            request_cache[group_id] = usage_limits
+
+        return usage_limits
+
+    def invalidate(self, group_id: int | None = None) -> None:
+        """
+        Remove the cached UsageLimits of the Group, or of all Groups if
+        group_id is None.
+        """
+        if group_id is None:
+            self.entries.clear()
+        else:
+            self.entries.remove(group_id)
+
+        request_cache = self.request_cache()
+
+        if request_cache is not None:
+            if group_id is None:
+                request_cache.clear()
+            else:
+                request_cache.pop(group_id, None)
+
+    def stats(self) -> dict[str, int]:
+        entry_stats = self.entries.stats()
+
+        with self.lock:
+            return {
+                'request_hit_count': self.request_hit_count,
+                'process_hit_count': entry_stats['hit_count'],
+                'miss_count': entry_stats['miss_count'],
+                'entry_count': entry_stats['entry_count'],
+            }
+
+    def reset_stats(self) -> None:
+        self.entries.reset_stats()
+
+        with self.lock:
+            self.request_hit_count = 0
+
+    def reset(self) -> None:
+        self.invalidate()
+        self.reset_stats()
+
+    def request_cache(self) -> dict[int, UsageLimits] | None:
+        request = get_request()
+
+        if request is None:
+            return None
+
+        request_cache = getattr(request, self.REQUEST_ATTRIBUTE, None)
+
+        if request_cache is None:
+            request_cache = {}
+            setattr(request, self.REQUEST_ATTRIBUTE, request_cache)
+
+        return request_cache
+
+
+_usage_limits_cache: UsageLimitsCache | None = None
+_usage_limits_cache_lock = threading.Lock()
+
+
+def get_usage_limits_cache() -> UsageLimitsCache:
+    global _usage_limits_cache
+
+    with _usage_limits_cache_lock:
+        if _usage_limits_cache is None:
+            cache_settings = settings.USAGE_LIMITS_CACHE_SETTINGS
+            _usage_limits_cache = UsageLimitsCache(
+                    ttl_seconds=cache_settings['TTL_SECONDS'],
+                    max_entries=cache_settings['MAX_ENTRIES'])
+
+        return _usage_limits_cache
@@ -1,8 +1,11 @@
-from typing import Any, Mapping
+from typing import Any, Callable, Mapping
 from collections import abc
+import hashlib
+import json
 import logging
 import re
 
+from django.db import transaction
 from django.utils.text import camel_case_to_spaces
 
 logger = logging.getLogger(__name__)
@@ -16,6 +19,25 @@ def model_class_to_type_string(model_class) -> str:
     return camel_case_to_spaces(model_class.__name__).replace(' ', '_').lower()
 
 
+def json_digest(x: Any) -> str:
+    """
+    Returns a hash of the JSON representation of x that doesn't depend on
+    the order of keys.
+    """
+    return hashlib.sha256(json.dumps(x, sort_keys=True,
+            default=str).encode('utf-8')).hexdigest()
+
+
+def invalidate_now_and_on_commit(invalidate: Callable[[], Any]) -> None:
+    """
+    Call invalidate now, so the current transaction doesn't read stale
+    cached values, and again after it commits, in case another request
+    cached the old values before the commit.
+    """
+    invalidate()
+    transaction.on_commit(invalidate)
+
+
 def val_to_str(x: Any | None, default: str = "-1") -> str:
     return default if (x is None) else str(x)
 
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from datetime import datetime
 import os
 from urllib.parse import quote
 import uuid
@@ -11,6 +12,7 @@ import boto3
 from pydantic import BaseModel
 
 from ..common.aws import *
+from ..common.aws_session_cache import get_aws_session_cache, hash_secret
 from ..exception import UnprocessableEntity
 from .infrastructure_settings import InfrastructureSettings
 
@@ -213,25 +215,14 @@ class AwsSettings(InfrastructureSettings):
     xray: AwsXraySettings | None = None
     tags: dict[str, str] | None = None
 
-    def assume_aws_role(self, b, service_name: str, role_arn: str,
+    @staticmethod
+    def assume_aws_role(sts_client, service_name: str, role_arn: str,
             region_name: str, session_uuid: str,
-            aws_access_key: str | None = None,
-            aws_secret_access_key: str | None = None,
-            external_id: str | None = None) -> boto3.session.Session:
-        kwargs = {
-            'region_name': region_name
-        }
-
-        if aws_access_key:
-            kwargs['aws_access_key_id'] = aws_access_key
-
-            if not aws_secret_access_key:
-                raise UnprocessableEntity(detail='AWS access key found but not secret access key')
-
-            kwargs['aws_secret_access_key'] = aws_secret_access_key
-
-        sts_client = b.client('sts', **kwargs)
-
+            external_id: str | None = None) -> tuple[boto3.session.Session, datetime | None]:
+        """
+        Assume the role using sts_client. Returns a session with the
+        assumed credentials, and the time they expire.
+        """
         logger.info(f"Assuming role {role_arn} ...")
 
         kwargs = {
@@ -248,52 +239,87 @@ class AwsSettings(InfrastructureSettings):
 
         assumed_credentials = assume_role_response['Credentials']
 
-        return boto3.session.Session(
+        return (boto3.session.Session(
             aws_access_key_id=assumed_credentials['AccessKeyId'],
             aws_secret_access_key=assumed_credentials['SecretAccessKey'],
             aws_session_token=assumed_credentials['SessionToken'],
-            region_name=region_name)
+            region_name=region_name), assumed_credentials.get('Expiration'))
 
 
     def make_boto3_client(self, service_name: str, session_uuid: str | None = None):
+        """
+        Returns a client for the service, using the access key if set, or
+        else by assuming the customer invoker role, then the events role.
+        Sessions with the assumed credentials and their clients are cached
+        for this process until shortly before the credentials expire, so
+        the roles are only assumed once per expiry window. session_uuid
+        names the role sessions when the roles are assumed.
+        """
         if not self.region:
             raise UnprocessableEntity(detail='Missing region to access AWS')
 
+        cache = get_aws_session_cache()
+
         if self.access_key and self.secret_key:
-            return boto3.client(
-                service_name,
-                aws_access_key_id=self.access_key,
-                aws_secret_access_key=self.secret_key,
-                region_name=self.region
-            )  # type: ignore
-        else:
-            if not self.events_role_arn:
-                raise UnprocessableEntity(detail='Missing IAM Role to access AWS')
-
-            if not session_uuid:
-                session_uuid = str(uuid.uuid4())
-
-            customer_invoker_role_arn = os.environ['CUSTOMER_INVOKER_ROLE_ARN']
-            aws_region = os.environ['HOME_AWS_DEFAULT_REGION']
-            aws_access_key = os.environ.get('HOME_AWS_ACCESS_KEY')
-            aws_secret_access_key = os.environ.get('HOME_AWS_SECRET_KEY')
-
-            boto3_session_1 = self.assume_aws_role(boto3,
-                service_name='sts',
-                role_arn=customer_invoker_role_arn,
-                region_name=aws_region,
-                session_uuid=session_uuid,
-                aws_access_key=aws_access_key,
-                aws_secret_access_key=aws_secret_access_key)
-
-            boto3_session_2 = self.assume_aws_role(boto3_session_1,
-                service_name=service_name,
-                role_arn=self.events_role_arn,
-                region_name=self.region,
-                session_uuid=session_uuid,
-                external_id=self.assumed_role_external_id)
-
-            return boto3_session_2.client(service_name)  # type: ignore
+            access_key = self.access_key
+            secret_key = self.secret_key
+            region = self.region
+
+            return cache.get_client(
+                    ('access_key', access_key, hash_secret(secret_key), region),
+                    service_name,
+                    lambda: (boto3.session.Session(
+                            aws_access_key_id=access_key,
+                            aws_secret_access_key=secret_key,
+                            region_name=region), None))
+
+        if not self.events_role_arn:
+            raise UnprocessableEntity(detail='Missing IAM Role to access AWS')
+
+        events_role_arn = self.events_role_arn
+        external_id = self.assumed_role_external_id
+        region = self.region
+        role_session_uuid = session_uuid or str(uuid.uuid4())
+
+        customer_invoker_role_arn = os.environ['CUSTOMER_INVOKER_ROLE_ARN']
+        aws_region = os.environ['HOME_AWS_DEFAULT_REGION']
+        aws_access_key = os.environ.get('HOME_AWS_ACCESS_KEY')
+        aws_secret_access_key = os.environ.get('HOME_AWS_SECRET_KEY')
+
+        if aws_access_key and not aws_secret_access_key:
+            raise UnprocessableEntity(detail='AWS access key found but not secret access key')
+
+        home_key = ('home', aws_access_key, hash_secret(aws_secret_access_key),
+                aws_region)
+
+        def make_home_session() -> tuple[boto3.session.Session, datetime | None]:
+            # Without an access key, the default credentials are used,
+            # which boto3 refreshes itself
+            return (boto3.session.Session(aws_access_key_id=aws_access_key,
+                    aws_secret_access_key=aws_secret_access_key,
+                    region_name=aws_region), None)
+
+        invoker_key = (customer_invoker_role_arn, None, aws_region, home_key)
+
+        def assume_invoker_role() -> tuple[boto3.session.Session, datetime | None]:
+            return self.assume_aws_role(
+                    cache.get_client(home_key, 'sts', make_home_session),
+                    service_name='sts',
+                    role_arn=customer_invoker_role_arn,
+                    region_name=aws_region,
+                    session_uuid=role_session_uuid)
+
+        def assume_events_role() -> tuple[boto3.session.Session, datetime | None]:
+            return self.assume_aws_role(
+                    cache.get_client(invoker_key, 'sts', assume_invoker_role),
+                    service_name=service_name,
+                    role_arn=events_role_arn,
+                    region_name=region,
+                    session_uuid=role_session_uuid,
+                    external_id=external_id)
+
+        return cache.get_client((events_role_arn, external_id, region, invoker_key),
+                service_name, assume_events_role)
 
 
     def make_events_client(self, session_uuid: str | None = None):
@@ -0,0 +1,56 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from proc_wrapper import StatusUpdater
+
+from ...services import *
+
+DEFAULT_POLL_INTERVAL_SECONDS = 5
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Send the Notifications waiting in the outbox'
+
+    def add_arguments(self, parser):
+        default_dispatcher = NotificationDispatcher.from_settings()
+        parser.add_argument('--max-workers', type=int,
+                default=default_dispatcher.pool.max_workers,
+                help='Maximum number of Notifications to send concurrently')
+        parser.add_argument('--batch-size', type=int,
+                default=default_dispatcher.batch_size,
+                help='Number of Notifications to claim at once')
+        parser.add_argument('--poll-interval-seconds', type=float,
+                default=DEFAULT_POLL_INTERVAL_SECONDS,
+                help='Seconds to wait after the outbox is empty before checking again')
+        parser.add_argument('--once', action='store_true',
+                help='Exit once the outbox is empty')
+
+    def handle(self, *args, **options):
+        with StatusUpdater(incremental_count_mode=True) as status_updater:
+            try:
+                dispatcher = NotificationDispatcher.from_settings(
+                        status_updater=status_updater,
+                        max_workers=options['max_workers'],
+                        batch_size=options['batch_size'])
+            except ValueError as ex:
+                raise CommandError(str(ex)) from ex
+
+            logger.info(f"Starting notification dispatcher with {options['max_workers']} workers ...")
+
+            while True:
+                try:
+                    sent_count = dispatcher.dispatch_all()
+                    logger.info(f"Sent {sent_count} Notifications")
+                except Exception:
+                    msg = 'Notification dispatch failed'
+                    logger.exception(msg)
+                    status_updater.send_update(last_status_message=msg)
+
+                if options['once']:
+                    break
+
+                time.sleep(options['poll_interval_seconds'])
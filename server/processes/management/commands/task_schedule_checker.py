@@ -2,6 +2,7 @@ import logging
 import sys
 import time
 
+from django.conf import settings
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 
@@ -18,11 +19,23 @@ class Command(BaseCommand):
     help = 'Ensure Tasks and Workflows are run on schedule'
 
     def add_arguments(self, parser):
-        #parser.add_argument('poll_ids', nargs='+', type=int)
-        pass
+        default_partition = CheckerPartition.from_settings()
+        parser.add_argument('--shard-index', type=int,
+                default=default_partition.shard_index,
+                help='Index of the shard of Tasks, Workflows, and Executions this process checks, starting from 0')
+        parser.add_argument('--shard-count', type=int,
+                default=default_partition.shard_count,
+                help='Number of checker processes, each with a distinct shard index')
+        parser.add_argument('--max-workers', type=int,
+                default=default_partition.max_workers,
+                help='Maximum number of items each checker checks concurrently')
 
     def handle(self, *args, **options):
-        logger.info("Starting check loop ...")
+        partition = CheckerPartition(shard_index=options['shard_index'],
+                shard_count=options['shard_count'],
+                max_workers=options['max_workers'])
+
+        logger.info(f"Starting check loop for {partition} ...")
 
         with StatusUpdater(incremental_count_mode=True) as status_updater:
             while True:
@@ -35,7 +48,7 @@ class Command(BaseCommand):
 
                 attempt_count += 1
                 try:
-                    ServiceConcurrencyChecker().check_all()
+                    ServiceConcurrencyChecker(partition=partition).check_all()
                     success_count += 1
                 except Exception:
                     failure_count += 1
@@ -53,7 +66,7 @@ class Command(BaseCommand):
 
                 attempt_count += 1
                 try:
-                    TaskScheduleChecker().check_all()
+                    TaskScheduleChecker(partition=partition).check_all()
                     success_count += 1
                 except Exception:
                     failure_count += 1
@@ -71,7 +84,7 @@ class Command(BaseCommand):
 
                 attempt_count += 1
                 try:
-                    WorkflowScheduleChecker().check_all()
+                    WorkflowScheduleChecker(partition=partition).check_all()
                     success_count += 1
                 except Exception:
                     failure_count += 1
@@ -89,7 +102,7 @@ class Command(BaseCommand):
 
                 attempt_count += 1
                 try:
-                    TaskExecutionChecker().check_all()
+                    TaskExecutionChecker(partition=partition).check_all()
                     success_count += 1
                 except Exception:
                     failure_count += 1
@@ -107,7 +120,7 @@ class Command(BaseCommand):
 
                 attempt_count += 1
                 try:
-                    WorkflowExecutionChecker().check_all()
+                    WorkflowExecutionChecker(partition=partition).check_all()
                     success_count += 1
                 except Exception:
                     failure_count += 1
@@ -124,7 +137,7 @@ class Command(BaseCommand):
                 logger.info(f"Checking all Workflow Executions took {run_duration} seconds")
 
                 try:
-                    PostponedEventChecker().check_all()
+                    PostponedEventChecker(partition=partition).check_all()
                     success_count += 1
                 except Exception:
                     failure_count += 1
@@ -140,6 +153,30 @@ class Command(BaseCommand):
 
                 logger.info(f"Checking postponed Events took {run_duration} seconds")
 
+                # Without the notification dispatcher, digests are only sent
+                # from here, once they close
+                if not settings.NOTIFICATION_DISPATCH_SETTINGS['ASYNCHRONOUS']:
+                    attempt_count += 1
+                    try:
+                        sent_count = NotificationDispatcher.from_settings(
+                                max_workers=partition.max_workers) \
+                                .dispatch_all(digests_only=True)
+                        success_count += 1
+                        logger.info(f"Sent {sent_count} digest Notifications")
+                    except Exception:
+                        failure_count += 1
+                        msg = 'Sending digest Notifications failed'
+                        logger.exception(msg)
+                        status_updater.send_update(last_status_message=msg,
+                                success_count=success_count,
+                                failure_count=failure_count)
+
+                    current_time = timezone.now()
+                    run_duration = int((current_time - last_start_time).total_seconds())
+                    total_run_duration += run_duration
+
+                    logger.info(f"Sending digest Notifications took {run_duration} seconds")
+
                 if failure_count == attempt_count:
                     msg = 'All checks failed to execute, exiting'
                     logger.error(msg)
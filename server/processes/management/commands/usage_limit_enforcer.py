@@ -4,13 +4,18 @@ import logging
 
 from django.core.management.base import BaseCommand
 
+from django.contrib.auth.models import Group
+
 from proc_wrapper import StatusUpdater
 
 from processes.models import (
+  Event,
+  Notification,
   Task,
   Workflow
 )
 from processes.services import *
+from processes.services.execution_history_purger import DEFAULT_CHUNK_SIZE
 
 MIN_CHECK_INTERVAL_SECONDS = 60
 
@@ -21,8 +26,13 @@ class Command(BaseCommand):
     help = 'Ensure usage limits are applied'
 
     def add_arguments(self, parser) -> None:
-        #parser.add_argument('poll_ids', nargs='+', type=int)
-        pass
+        parser.add_argument('--bulk', action='store_true',
+                help='Purge execution history with set-based deletes, a Group at a time')
+        parser.add_argument('--chunk-size', type=int,
+                default=DEFAULT_CHUNK_SIZE,
+                help='Number of executions to delete per statement in bulk mode')
+        parser.add_argument('--time-budget-seconds', type=float, default=None,
+                help='Stop purging in bulk mode after this many seconds. The next run resumes with the Groups that were not finished.')
 
     def handle(self, *args, **options) -> None:
         logger.info('Starting usage limit enforcer ...')
@@ -30,16 +40,37 @@ class Command(BaseCommand):
         exceptions: List[Exception] = []
 
         with StatusUpdater(incremental_count_mode=True) as status_updater:
+            if options['bulk']:
+                try:
+                    ExecutionHistoryPurger(chunk_size=options['chunk_size'],
+                            time_budget_seconds=options['time_budget_seconds'],
+                            status_updater=status_updater).purge_all()
+                except Exception as ex:
+                    logger.exception('Failed purging execution history')
+                    exceptions.append(ex)
+            else:
+                try:
+                    self.enforce_task_execution_limits(status_updater)
+                except Exception as ex:
+                    logger.exception('Failed enforcing Task Execution limits')
+                    exceptions.append(ex)
+
+                try:
+                    self.enforce_workflow_execution_limits(status_updater)
+                except Exception as ex:
+                    logger.exception('Failed enforcing Workflow Execution limits')
+                    exceptions.append(ex)
+
             try:
-                self.enforce_task_execution_limits(status_updater)
+                self.enforce_event_limits(status_updater)
             except Exception as ex:
-                logger.exception('Failed enforcing Task Execution limits')
+                logger.exception('Failed enforcing Event limits')
                 exceptions.append(ex)
 
             try:
-                self.enforce_workflow_execution_limits(status_updater)
+                self.enforce_notification_limits(status_updater)
             except Exception as ex:
-                logger.exception('Failed enforcing Workflow Execution limits')
+                logger.exception('Failed enforcing Notification limits')
                 exceptions.append(ex)
 
         if len(exceptions) > 0:
@@ -76,4 +107,35 @@ class Command(BaseCommand):
 
         logger.info(f'Purged a total of {total_purged_count} Workflow Executions')
 
-        return total_purged_count
\ No newline at end of file
+        return total_purged_count
+
+    def enforce_event_limits(self, status_updater: StatusUpdater) -> int:
+        total_purged_count = 0
+        for group in Group.objects.iterator():
+            try:
+                purged_count = Event.purge_history(group)
+                total_purged_count += purged_count
+                status_updater.send_update(success_count=purged_count)
+            except:
+                logger.exception(f'Failed enforcing Event limits on Group {group.pk}')
+                status_updater.send_update(error_count=1)
+
+        logger.info(f'Purged a total of {total_purged_count} Events')
+
+        return total_purged_count
+
+    def enforce_notification_limits(self,
+            status_updater: StatusUpdater) -> int:
+        total_purged_count = 0
+        for group in Group.objects.iterator():
+            try:
+                purged_count = Notification.purge_history(group)
+                total_purged_count += purged_count
+                status_updater.send_update(success_count=purged_count)
+            except:
+                logger.exception(f'Failed enforcing Notification limits on Group {group.pk}')
+                status_updater.send_update(error_count=1)
+
+        logger.info(f'Purged a total of {total_purged_count} Notifications')
+
+        return total_purged_count
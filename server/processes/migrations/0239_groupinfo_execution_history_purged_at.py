@@ -0,0 +1,17 @@
+# Generated by Django 5.2.13 on 2026-10-17 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("processes", "0238_apprise_notification_delivery_method"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="groupinfo",
+            name="execution_history_purged_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.13 on 2026-10-17 12:30
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+# RUNNING, STOPPING and MANUALLY_STARTED
+AWAITING_UPDATE_STATUSES = [0, 6, 9]
+
+
+def check_awaiting_task_executions(apps, schema_editor):
+    # Have TaskExecutionChecker compute the deadlines of existing Task
+    # Executions on its next run
+    TaskExecution = apps.get_model('processes', 'TaskExecution')
+    TaskExecution.objects.filter(status__in=AWAITING_UPDATE_STATUSES,
+            finished_at__isnull=True).update(check_deadline_at=timezone.now())
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("processes", "0239_groupinfo_execution_history_purged_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="taskexecution",
+            name="check_deadline_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="taskexecution",
+            index=models.Index(
+                condition=models.Q(("check_deadline_at__isnull", False)),
+                fields=["check_deadline_at"],
+                name="taskexec_check_deadline_idx",
+            ),
+        ),
+        migrations.RunPython(check_awaiting_task_executions,
+                reverse_code=migrations.RunPython.noop),
+    ]
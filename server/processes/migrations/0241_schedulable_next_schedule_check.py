@@ -0,0 +1,36 @@
+# Generated by Django 5.2.13 on 2026-10-17 13:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("processes", "0240_taskexecution_check_deadline_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="next_expected_execution_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="next_schedule_check_at",
+            field=models.DateTimeField(
+                blank=True, db_index=True, editable=False, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="workflow",
+            name="next_expected_execution_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="workflow",
+            name="next_schedule_check_at",
+            field=models.DateTimeField(
+                blank=True, db_index=True, editable=False, null=True
+            ),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.13 on 2026-10-17 13:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("processes", "0241_schedulable_next_schedule_check"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notification",
+            name="attempt_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="notification",
+            name="next_attempt_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                condition=models.Q(
+                    ("next_attempt_at__isnull", False), ("send_status", 0)
+                ),
+                fields=["next_attempt_at"],
+                name="notification_outbox_idx",
+            ),
+        ),
+    ]
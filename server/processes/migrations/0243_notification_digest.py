@@ -0,0 +1,54 @@
+# Generated by Django 5.2.13 on 2026-10-17 15:10
+
+from django.db import migrations, models
+
+import processes.models.notification
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("processes", "0242_notification_outbox"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notificationdeliverymethod",
+            name="digest_window_seconds",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="notification",
+            name="digest_closes_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="notification",
+            name="digested_events",
+            field=models.ManyToManyField(
+                blank=True,
+                related_name="digest_notifications",
+                to="processes.event",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="notification",
+            name="event",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=processes.models.notification.cascade_unless_digest,
+                to="processes.event",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="notification",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(
+                    ("send_status", 0),
+                    ("next_attempt_at", models.F("digest_closes_at")),
+                ),
+                fields=("notification_profile", "notification_delivery_method"),
+                name="notification_one_open_digest",
+            ),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.13 on 2026-10-17 18:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("processes", "0243_notification_digest"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="auto_created_task_properties_digest",
+            field=models.CharField(blank=True, default="", max_length=64),
+        ),
+    ]
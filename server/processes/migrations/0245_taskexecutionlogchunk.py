@@ -0,0 +1,121 @@
+# Generated by Django 5.2.13 on 2026-10-17 19:10
+
+import gzip
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+MAX_TAIL_LENGTH = 5000000
+
+# Each Task Execution may have two tails of up to MAX_TAIL_LENGTH
+# characters, so only a few are loaded at once
+BATCH_SIZE = 10
+
+
+def move_log_tails_to_chunks(apps, schema_editor):
+    TaskExecution = apps.get_model('processes', 'TaskExecution')
+    TaskExecutionLogChunk = apps.get_model('processes', 'TaskExecutionLogChunk')
+
+    # Read the ids first, then the tails of BATCH_SIZE Task Executions at
+    # a time, instead of holding a cursor over the tails
+    te_ids = list(TaskExecution.objects.exclude(debug_log_tail__isnull=True,
+            error_log_tail__isnull=True).order_by('id').values_list('id', flat=True))
+
+    for start in range(0, len(te_ids), BATCH_SIZE):
+        batch_ids = te_ids[start:start + BATCH_SIZE]
+
+        chunks = []
+        for te_id, debug_log_tail, error_log_tail in TaskExecution.objects \
+                .filter(id__in=batch_ids) \
+                .values_list('id', 'debug_log_tail', 'error_log_tail'):
+            for stream, text in (('debug', debug_log_tail), ('error', error_log_tail)):
+                if text:
+                    text = text[-MAX_TAIL_LENGTH:]
+                    chunks.append(TaskExecutionLogChunk(task_execution_id=te_id,
+                            stream=stream, data=gzip.compress(text.encode('utf-8')),
+                            length=len(text), end_offset=len(text)))
+
+        TaskExecutionLogChunk.objects.bulk_create(chunks)
+
+
+def move_log_chunks_to_tails(apps, schema_editor):
+    TaskExecution = apps.get_model('processes', 'TaskExecution')
+    TaskExecutionLogChunk = apps.get_model('processes', 'TaskExecutionLogChunk')
+
+    def save_tail(te_id: int, stream: str, texts: list[str]) -> None:
+        TaskExecution.objects.filter(id=te_id).update(**{
+            f"{stream}_log_tail": ''.join(texts)[-MAX_TAIL_LENGTH:]
+        })
+
+    # Only the chunks of one tail are kept in memory at once
+    key: tuple[int, str] | None = None
+    texts: list[str] = []
+    for te_id, stream, data in TaskExecutionLogChunk.objects \
+            .order_by('task_execution_id', 'stream', 'end_offset') \
+            .values_list('task_execution_id', 'stream', 'data') \
+            .iterator(chunk_size=BATCH_SIZE):
+        if (key is not None) and (key != (te_id, stream)):
+            save_tail(*key, texts)
+            texts = []
+
+        key = (te_id, stream)
+        texts.append(gzip.decompress(bytes(data)).decode('utf-8'))
+
+    if key is not None:
+        save_tail(*key, texts)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("processes", "0244_task_auto_created_task_properties_digest"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskExecutionLogChunk",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "stream",
+                    models.CharField(
+                        choices=[("debug", "Debug"), ("error", "Error")],
+                        max_length=10,
+                    ),
+                ),
+                ("data", models.BinaryField()),
+                ("length", models.PositiveIntegerField()),
+                ("end_offset", models.BigIntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "task_execution",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="log_chunks",
+                        to="processes.taskexecution",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["task_execution", "stream", "end_offset"],
+                        name="telogchunk_te_stream_end_idx",
+                    )
+                ],
+            },
+        ),
+        # The log tail columns are kept until
+        # 0247_remove_taskexecution_log_tails, so servers that still write
+        # them during a rolling deploy don't fail or lose their tails
+        migrations.RunPython(move_log_tails_to_chunks,
+                reverse_code=move_log_chunks_to_tails),
+    ]
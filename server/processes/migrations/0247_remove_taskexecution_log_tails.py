@@ -0,0 +1,65 @@
+# Generated by Django 5.2.13 on 2026-10-17 23:40
+
+import gzip
+
+from django.db import migrations
+
+
+MAX_TAIL_LENGTH = 5000000
+
+# Each Task Execution may have two tails of up to MAX_TAIL_LENGTH
+# characters, so only a few are loaded at once
+BATCH_SIZE = 10
+
+
+def move_remaining_log_tails_to_chunks(apps, schema_editor):
+    """
+    Move the log tails written to the columns by servers that were still
+    running before 0245_taskexecutionlogchunk was deployed, to streams that
+    have no chunks yet.
+    """
+    TaskExecution = apps.get_model('processes', 'TaskExecution')
+    TaskExecutionLogChunk = apps.get_model('processes', 'TaskExecutionLogChunk')
+
+    te_ids = list(TaskExecution.objects.exclude(debug_log_tail__isnull=True,
+            error_log_tail__isnull=True).order_by('id').values_list('id', flat=True))
+
+    for start in range(0, len(te_ids), BATCH_SIZE):
+        batch_ids = te_ids[start:start + BATCH_SIZE]
+
+        existing_streams = set(TaskExecutionLogChunk.objects \
+                .filter(task_execution_id__in=batch_ids) \
+                .values_list('task_execution_id', 'stream').distinct())
+
+        chunks = []
+        for te_id, debug_log_tail, error_log_tail in TaskExecution.objects \
+                .filter(id__in=batch_ids) \
+                .values_list('id', 'debug_log_tail', 'error_log_tail'):
+            for stream, text in (('debug', debug_log_tail), ('error', error_log_tail)):
+                if text and ((te_id, stream) not in existing_streams):
+                    text = text[-MAX_TAIL_LENGTH:]
+                    chunks.append(TaskExecutionLogChunk(task_execution_id=te_id,
+                            stream=stream, data=gzip.compress(text.encode('utf-8')),
+                            length=len(text), end_offset=len(text)))
+
+        TaskExecutionLogChunk.objects.bulk_create(chunks)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("processes", "0246_workflowexecution_workflow_snapshot_digest"),
+    ]
+
+    operations = [
+        # Reversing 0245_taskexecutionlogchunk moves the chunks back
+        migrations.RunPython(move_remaining_log_tails_to_chunks,
+                reverse_code=migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name="taskexecution",
+            name="debug_log_tail",
+        ),
+        migrations.RemoveField(
+            model_name="taskexecution",
+            name="error_log_tail",
+        ),
+    ]
@@ -14,6 +14,7 @@ from .execution import Execution
 from .task import Task
 from .task_link import TaskLink
 from .task_execution import TaskExecution
+from .task_execution_log_chunk import TaskExecutionLogChunk
 from .workflow import Workflow
 from .workflow_task_instance import WorkflowTaskInstance
 from .workflow_execution import WorkflowExecution
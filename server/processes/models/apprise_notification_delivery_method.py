@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, TYPE_CHECKING
 
 import logging
 
@@ -10,9 +10,13 @@ from django.db import models
 import apprise
 
 from ..common.notification import *
+from ..common.notification_transports import get_notification_transport_pool
 from .event import Event
 from .notification_delivery_method import NotificationDeliveryMethod
 
+if TYPE_CHECKING:
+    from ..services.notification_digest import NotificationDigest
+
 logger = logging.getLogger(__name__)
 
 
@@ -71,12 +75,6 @@ class AppriseNotificationDeliveryMethod(NotificationDeliveryMethod):
         if not self.apprise_url:
             raise ValueError("Apprise URL is required for Apprise notifications")
 
-        # Create Apprise instance with global asset configuration
-        apobj = apprise.Apprise(asset=self.get_apprise_asset())
-
-        if not apobj.add(self.apprise_url):
-            raise ValueError(f"Invalid Apprise URL: {self.apprise_url}")
-
         # Build notification body
         title = event.error_summary or "CloudReactor Notification"
         body = event.error_details_message or event.error_summary or "Event notification"
@@ -107,25 +105,60 @@ class AppriseNotificationDeliveryMethod(NotificationDeliveryMethod):
         # Apprise supports: info, success, warning, failure
         notify_type = self._compute_apprise_notification_type(event.severity)
 
-        logger.info(f"Sending Apprise notification to '{self.apprise_url}' ...")
+        # Apprise instances with the global asset configuration are cached
+        # by URL, so the URL is only parsed once
+        with get_notification_transport_pool().checkout() as transports:
+            apobj = transports.get_apprise_object(self.apprise_url,
+                    asset=self.get_apprise_asset())
+
+            logger.info(f"Sending Apprise notification to '{self.apprise_url}' ...")
+
+            try:
+                # Send notification
+                success = apobj.notify(
+                    body=body,
+                    title=title,
+                    notify_type=notify_type,
+                    body_format=apprise.NotifyFormat.HTML,
+                )
+
+                logger.info(f"Done sending Apprise notification, {success=}.")
+
+                return {
+                    'success': success,
+                }
+            except Exception as e:
+                logger.error(f"Error sending Apprise notification: {e}", exc_info=True)
+                raise
+
+    def send_digest(self, digest: NotificationDigest) -> dict[str, Any] | None:
+        """
+        Send the digest as a single Apprise notification, with the most
+        severe Event's notification type.
+        """
+        if not self.apprise_url:
+            raise ValueError("Apprise URL is required for Apprise notifications")
+
+        with get_notification_transport_pool().checkout() as transports:
+            apobj = transports.get_apprise_object(self.apprise_url,
+                    asset=self.get_apprise_asset())
+
+            logger.info(f"Sending Apprise digest of {digest.event_count} Events to '{self.apprise_url}' ...")
 
-        try:
-            # Send notification
             success = apobj.notify(
-                body=body,
-                title=title,
-                notify_type=notify_type,
-                body_format=apprise.NotifyFormat.HTML,
+                body=digest.make_text(),
+                title=f"[{digest.severity.upper()}] CloudReactor digest: {digest.summary}",
+                notify_type=self._compute_apprise_notification_type(
+                        digest.most_severe_event.severity),
+                body_format=apprise.NotifyFormat.TEXT,
             )
 
-            logger.info(f"Done sending Apprise notification, {success=}.")
+        logger.info(f"Done sending Apprise digest, {success=}.")
 
-            return {
-                'success': success,
-            }
-        except Exception as e:
-            logger.error(f"Error sending Apprise notification: {e}", exc_info=True)
-            raise
+        return {
+            'success': success,
+            'event_count': digest.event_count,
+        }
 
     def _compute_apprise_notification_type(self, severity: int) -> str:
         """
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from typing import Any, Collection, Type
+
+import copy
+
+from typing_extensions import Self
+
+from django.db import models
+
+
+class ChangeTrackedModel(models.Model):
+    """
+    Remembers the values of CHANGE_TRACKED_FIELDS when an instance is
+    loaded or saved, so that signal handlers can tell what changed. Only
+    those fields are kept, so instances with large columns, like metadata,
+    don't cost twice their size.
+    """
+
+    class Meta:
+        abstract = True
+
+    # Attribute names (like run_environment_id for foreign keys) of the
+    # fields that signal handlers compare
+    CHANGE_TRACKED_FIELDS: tuple[str, ...] = ()
+
+    # Transient properties
+    _loaded_values: dict[str, Any] | None = None
+
+    @classmethod
+    def from_db(cls: Type[Self], db: str | None, field_names: Collection[str], values: Collection[Any]) -> Self:
+        instance = super().from_db(db, field_names, values)
+        instance.remember_loaded_values()
+        return instance
+
+    def remember_loaded_values(self) -> None:
+        """
+        Remember the current values of the tracked fields, which are the
+        values in the database after loading or saving.
+        """
+        values = self.__dict__
+
+        # Deferred fields aren't tracked
+        self._loaded_values = {
+            attname: values[attname] for attname in self.CHANGE_TRACKED_FIELDS
+            if attname in values
+        }
+
+    @property
+    def _loaded_copy(self) -> Self | None:
+        """
+        Returns a copy of this instance with the tracked fields set to their
+        loaded values, or None if it was never loaded or saved. Fields that
+        aren't tracked have their current values.
+        """
+        if self._loaded_values is None:
+            return None
+
+        loaded_copy = copy.copy(self)
+        fields_cache = loaded_copy._state.fields_cache
+
+        for field in self._meta.concrete_fields:
+            attname = field.attname
+
+            if attname not in self._loaded_values:
+                continue
+
+            value = self._loaded_values[attname]
+
+            if field.is_relation and (value != getattr(self, attname)):
+                # Load the previously related instance when accessed
+                fields_cache.pop(field.name, None)
+
+            loaded_copy.__dict__[attname] = value
+
+        loaded_copy._loaded_values = self._loaded_values
+        return loaded_copy
@@ -14,12 +14,14 @@ from django.contrib.postgres.fields import ArrayField
 from templated_email import get_templated_mail
 
 from ..common.notification import *
+from ..common.notification_transports import get_notification_transport_pool
 from .event import Event
 from .task_execution import TaskExecution
 from .notification_delivery_method import NotificationDeliveryMethod
 
 
 if TYPE_CHECKING:
+    from ..services.notification_digest import NotificationDigest
     from .task_execution_status_change_event import TaskExecutionStatusChangeEvent
     from .workflow_execution_status_change_event import WorkflowExecutionStatusChangeEvent
 
@@ -54,17 +56,44 @@ class EmailNotificationDeliveryMethod(NotificationDeliveryMethod):
                           default='no-reply@cloudreactor.io')])
 
         logger.info(f"Sending email to {self.email_to_addresses} ...")
-        success_count = email.send()
+        with get_notification_transport_pool().checkout() as transports:
+            success_count = transports.send_email_messages([email])
+
         logger.info(f"Done sending email to {self.email_to_addresses}, {success_count=}.")
 
         return {
           'success_count': success_count
         }
 
+    def send_digest(self, digest: NotificationDigest) -> dict[str, Any] | None:
+        email = get_templated_mail(
+                template_name='notification_digest',
+                from_email=settings.DEFAULT_FROM_EMAIL,
+                to=self.email_to_addresses or [],
+                cc=self.email_cc_addresses or [],
+                bcc=self.email_bcc_addresses or [],
+                context=digest.make_template_params(),
+        )
+
+        email.reply_to = [settings.ENVIRON('DJANGO_EMAIL_REPLY_TO',
+                default=self.DEFAULT_REPLY_TO_EMAIL_ADDRESS)]
+
+        logger.info(f"Sending digest of {digest.event_count} Events by email to {self.email_to_addresses} ...")
+
+        with get_notification_transport_pool().checkout() as transports:
+            success_count = transports.send_email_messages([email])
+
+        logger.info(f"Done sending digest email to {self.email_to_addresses}, {success_count=}.")
+
+        return {
+          'success_count': success_count,
+          'event_count': digest.event_count,
+        }
+
     def make_task_execution_status_change_email(self, event: TaskExecutionStatusChangeEvent) -> Any:
-        from ..services.notification_generator import NotificationGenerator
+        from ..services.notification_generator import NotificationContext
 
-        notification_generator = NotificationGenerator()
+        notification_generator = NotificationContext.for_event(event)
 
         template_params = notification_generator.make_template_params(
             task_execution=event.task_execution,
@@ -98,9 +127,9 @@ class EmailNotificationDeliveryMethod(NotificationDeliveryMethod):
         return email
 
     def make_workflow_execution_status_change_email(self, event: WorkflowExecutionStatusChangeEvent) -> Any:
-        from ..services.notification_generator import NotificationGenerator
+        from ..services.notification_generator import NotificationContext
 
-        notification_generator = NotificationGenerator()
+        notification_generator = NotificationContext.for_event(event)
 
         template_params = notification_generator.make_template_params(
             workflow_execution=event.workflow_execution,
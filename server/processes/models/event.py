@@ -12,9 +12,12 @@ from django.contrib.auth.models import User, Group
 
 from typedmodels.models import TypedModel
 
+from ..common.history_retention import get_history_retention
+
 from .subscription import Subscription
 
 if TYPE_CHECKING:
+    from ..services.notification_generator import NotificationContext
     from .execution import Execution
     from .schedulable import Schedulable
 
@@ -113,6 +116,9 @@ class Event(TypedModel):
             models.Index(fields=['postponed_until']),
         ]
 
+    # Transient properties
+    _notification_context: NotificationContext | None = None
+
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
 
@@ -133,28 +139,39 @@ class Event(TypedModel):
             if group is None:
                 logger.warning(f"Event {self.uuid} has no group")
             else:
-                existing_event_count = Event.objects.filter(created_by_group=group).count()
-                usage_limits = Subscription.compute_usage_limits(group)
-                max_events = usage_limits.max_events
-
-                if (max_events is not None) and (existing_event_count >= max_events):
-                    diff = existing_event_count - max_events + 1
-                    for event in Event.objects.filter(created_by_group=group) \
-                            .order_by('event_at').all()[:diff].iterator():
-
-                        event_uuid = event.uuid
-                        logger.info(f"Deleting Event {event_uuid} because {group=} has reached the limit of {max_events}")
-
-                        try:
-                            event.delete()
-                            logger.info(f"Deleted Event {event_uuid} successfully")
-                        except Exception:
-                            logger.warning(f"Failed to delete Event {event_uuid}", exc_info=True)
+                max_events = Subscription.compute_usage_limits(group).max_events
+                get_history_retention().before_insert(f"events:{group.pk}",
+                        max_events,
+                        count=lambda: Event.objects.filter(created_by_group=group).count(),
+                        trim=lambda: Event.purge_history(group, reservation_count=1))
         else:
             logger.info('Updating an existing Event')
 
         super().save(*args, **kwargs)
 
+    @staticmethod
+    def purge_history(group: Group, reservation_count: int = 0) -> int:
+        """
+        Delete the earliest Events of the Group that exceed its limit,
+        leaving room for reservation_count more. Returns the number of
+        Events deleted.
+        """
+        max_events = Subscription.compute_usage_limits(group).max_events
+
+        if max_events is None:
+            return 0
+
+        qs = Event.objects.filter(created_by_group=group)
+        items_to_remove = qs.count() - (max_events - reservation_count)
+
+        if items_to_remove <= 0:
+            return 0
+
+        logger.info(f"Deleting {items_to_remove} Events because {group=} has reached the limit of {max_events}")
+
+        return get_history_retention().delete_oldest(qs, order_by='event_at',
+                max_to_delete=items_to_remove)
+
 
     @property
     def severity_label(self) -> str:
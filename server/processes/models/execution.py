@@ -1,21 +1,19 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Collection, Any, Final, Type
+from typing import TYPE_CHECKING, Final
 
-import copy
 import enum
 import logging
 
-from typing_extensions import Self
-
 from django.contrib.auth.models import Group, User
 from django.db import models, transaction
 from django.utils import timezone
 
+from .change_tracked_model import ChangeTrackedModel
 from .uuid_model import UuidModel
 from .execution_probabilities import ExecutionProbabilities
 from .event import Event
-from .schedulable import Schedulable
+from .schedulable import SCHEDULE_TYPE_RATE, Schedulable
 
 if TYPE_CHECKING:
     from .run_environment import RunEnvironment
@@ -25,7 +23,7 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
-class Execution(UuidModel, ExecutionProbabilities):
+class Execution(UuidModel, ExecutionProbabilities, ChangeTrackedModel):
     class Meta:
         abstract = True
 
@@ -87,16 +85,11 @@ class Execution(UuidModel, ExecutionProbabilities):
     other_instance_metadata = models.JSONField(null=True, blank=True)
     other_runtime_metadata = models.JSONField(null=True, blank=True)
 
+    # Used by signal handlers to detect changes
+    CHANGE_TRACKED_FIELDS = ('status', 'started_at',)
+
     # Transient properties
     skip_event_generation = False
-    _loaded_copy: Execution | None = None
-
-
-    @classmethod
-    def from_db(cls: Type[Self], db: str | None, field_names: Collection[str], values: Collection[Any]) -> Self:
-        instance = super().from_db(db, field_names, values)
-        instance._loaded_copy = copy.copy(instance)
-        return instance
 
     def get_schedulable(self) -> Schedulable | None:
         raise NotImplementedError()
@@ -262,6 +255,16 @@ class Execution(UuidModel, ExecutionProbabilities):
             logger.debug("resolve_missing_scheduled_execution_events(): not started or scheduled")
             return
 
+        if schedulable.schedule_type == SCHEDULE_TYPE_RATE:
+            # The next execution of a rate schedule is expected relative to
+            # the latest executions, so push back the next check
+            next_expected_execution_at, next_schedule_check_at = \
+                    ScheduleChecker.next_schedule_check(schedulable,
+                            utc_now=timezone.now())
+            type(schedulable).objects.filter(pk=schedulable.pk).update(
+                    next_expected_execution_at=next_expected_execution_at,
+                    next_schedule_check_at=next_schedule_check_at)
+
         for msee in schedulable.lookup_missing_scheduled_execution_events().filter() \
                 .order_by('-event_at', '-expected_execution_at').iterator():
             lateness_seconds = (self.started_at - msee.expected_execution_at).total_seconds()
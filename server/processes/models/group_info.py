@@ -1,7 +1,17 @@
+from datetime import datetime
+import logging
+
 from django.contrib.auth.models import Group
 from django.db import models
 
 
+logger = logging.getLogger(__name__)
+
+
+def _month_index(dt: datetime) -> int:
+    return dt.year * 12 + (dt.month - 1)
+
+
 class GroupInfo(models.Model):
     group = models.OneToOneField(
         Group, null=True, blank=True, related_name='group_info',
@@ -14,7 +24,62 @@ class GroupInfo(models.Model):
 
     api_last_used_at = models.DateTimeField(null=True)
 
+    # When the usage limit enforcer last finished deleting the executions
+    # of the Group that exceed its history limits
+    execution_history_purged_at = models.DateTimeField(null=True, blank=True)
+
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self) -> str:
         return self.group.name if self.group else str(self.pk)
+
+    def api_credits_used_in_month_of(self, utc_now: datetime) -> int:
+        """
+        Return the number of API credits used in the month of utc_now.
+        If the API was last used in an earlier month, first roll the counts
+        over so that the current month starts at 0, and the previous month
+        holds the old current month count if it was the immediately preceding
+        month.
+        """
+        if self.api_last_used_at is None:
+            return self.api_credits_used_current_month
+
+        months_since_last_use = _month_index(utc_now) - \
+                _month_index(self.api_last_used_at)
+
+        if months_since_last_use <= 0:
+            return self.api_credits_used_current_month
+
+        if months_since_last_use == 1:
+            self.api_credits_used_previous_month = \
+                    self.api_credits_used_current_month
+        else:
+            self.api_credits_used_previous_month = 0
+
+        self.api_credits_used_current_month = 0
+        self.api_last_used_at = utc_now
+        return 0
+
+    def add_api_credits(self, count: int, used_at: datetime) -> None:
+        """
+        Add count API credits used in the month of used_at, which may be
+        earlier than the month the API was last used in, if the credits were
+        counted before the month rolled over but added afterwards.
+        """
+        if self.api_last_used_at:
+            months_before_last_use = _month_index(self.api_last_used_at) - \
+                    _month_index(used_at)
+
+            if months_before_last_use == 1:
+                self.api_credits_used_previous_month += count
+                return
+
+            if months_before_last_use > 1:
+                logger.warning(f"Dropping {count} API credits used at {used_at} by {self}, since the API was last used at {self.api_last_used_at}")
+                return
+
+        self.api_credits_used_current_month = \
+                self.api_credits_used_in_month_of(used_at) + count
+
+        if (self.api_last_used_at is None) or (self.api_last_used_at < used_at):
+            self.api_last_used_at = used_at
@@ -21,7 +21,7 @@ Expected heartbeat at {{expected_heartbeat_at}} but last heartbeat was at {{last
 """Execution {{task_execution.uuid}} of the Task '{{task.name}}' has sent a late heartbeat at {{last_heartbeat_at}} after being marked as missing a heartbeat."""
 
     def __init__(self, *args, **kwargs):
-        from ..services.notification_generator import NotificationGenerator
+        from ..services.notification_generator import NotificationContext
 
         super().__init__(*args, **kwargs)
 
@@ -32,7 +32,7 @@ Expected heartbeat at {{expected_heartbeat_at}} but last heartbeat was at {{last
             summary_template = self.MISSING_HEARTBEAT_EVENT_SUMMARY_TEMPLATE
             details_template = self.MISSING_HEARTBEAT_EVENT_DETAILS_TEMPLATE
 
-        notification_generator = NotificationGenerator()
+        notification_generator = NotificationContext.for_event(self)
 
         template_params = notification_generator.make_template_params(
                 task_execution=self.task_execution,
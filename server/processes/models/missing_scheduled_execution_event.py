@@ -14,7 +14,7 @@ class MissingScheduledExecutionEvent:
         """{{type_label}} '{{instance.name}}' has started after being late according to its schedule"""
 
     def __init__(self, *args, **kwargs):
-        from ..services.notification_generator import NotificationGenerator
+        from ..services.notification_generator import NotificationContext
 
         # Note: Don't call super().__init__() here since this is a mixin class
         # and both parent classes are already initialized by the concrete class
@@ -37,7 +37,7 @@ class MissingScheduledExecutionEvent:
             summary_template = self.FOUND_SCHEDULED_EXECUTION_SUMMARY_TEMPLATE if \
                 self.resolved_event else self.MISSING_SCHEDULED_EXECUTION_SUMMARY_TEMPLATE
 
-            notification_generator = NotificationGenerator()
+            notification_generator = NotificationContext.for_event(self)
 
             template_params = notification_generator.make_template_params(
                 task=getattr(self, 'task'),
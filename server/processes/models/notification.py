@@ -1,25 +1,60 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from datetime import timedelta
+import json
 import logging
+import textwrap
 
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
 from django.utils import timezone
 
 from django.contrib.auth.models import Group
 
+from ..common.history_retention import get_history_retention
+from ..exception.notification_rate_limit_exceeded_exception import \
+    NotificationRateLimitExceededException
+
 from .event import Event
 
+from .notification_delivery_method import NotificationDeliveryMethod
 from .notification_send_status import NotificationSendStatus
 from .subscription import Subscription
 from .uuid_model import UuidModel
 
+if TYPE_CHECKING:
+    from .notification_profile import NotificationProfile
+
 
 logger = logging.getLogger(__name__)
 
 
+def cascade_unless_digest(collector, field, sub_objs, using):
+    """
+    on_delete handler for Notification.event: digests only record their
+    first Event there, so they outlive it, while other Notifications are
+    deleted with their Event.
+    """
+    digests = [obj for obj in sub_objs if obj.digest_closes_at is not None]
+    others = [obj for obj in sub_objs if obj.digest_closes_at is None]
+
+    if digests:
+        collector.add_field_update(field, None, digests)
+
+    if others:
+        models.CASCADE(collector, field, others, using)
+
+
 class Notification(UuidModel):
     MAX_SEND_RESULT_LENGTH = 50000
     MAX_EXCEPTION_MESSAGE_LENGTH = 50000
+    MAX_DIGEST_START_ATTEMPTS = 3
 
-    event = models.ForeignKey(Event, on_delete=models.CASCADE)
+    # Only null for digests whose first Event was deleted
+    event = models.ForeignKey(Event, on_delete=cascade_unless_digest,
+            null=True, blank=True)
     notification_profile = models.ForeignKey('NotificationProfile', on_delete=models.CASCADE)
     notification_delivery_method = models.ForeignKey('NotificationDeliveryMethod', on_delete=models.CASCADE)
     attempted_at = models.DateTimeField(default=timezone.now, null=True, blank=True)
@@ -35,6 +70,21 @@ class Notification(UuidModel):
     rate_limit_max_severity = models.PositiveIntegerField(null=True, blank=True)
     rate_limit_tier_index = models.PositiveIntegerField(null=True, blank=True)
 
+    # Set while the Notification is waiting in the outbox to be sent by
+    # the notification dispatcher, or claimed by a dispatcher until then
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+    attempt_count = models.PositiveIntegerField(default=0)
+
+    # Set if the Notification is a digest of the Events of its Notification
+    # Profile that the Notification Delivery Method received until then.
+    # event is the first of them, until it is deleted. The digest stays open
+    # while next_attempt_at equals digest_closes_at, until it closes and is
+    # claimed by a dispatcher or replaced by a new digest, which moves
+    # next_attempt_at.
+    digest_closes_at = models.DateTimeField(null=True, blank=True)
+    digested_events = models.ManyToManyField(Event, blank=True,
+            related_name='digest_notifications')
+
     # null=True until we can populate this field for existing notifications
     created_by_group = models.ForeignKey(Group, on_delete=models.CASCADE,
             null=True, editable=True)
@@ -42,6 +92,17 @@ class Notification(UuidModel):
     class Meta:
         indexes = [
             models.Index(fields=['created_by_group', 'attempted_at']),
+            models.Index(fields=['next_attempt_at'],
+                    condition=models.Q(send_status=NotificationSendStatus.SENDING,
+                            next_attempt_at__isnull=False),
+                    name='notification_outbox_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                    fields=['notification_profile', 'notification_delivery_method'],
+                    condition=models.Q(send_status=NotificationSendStatus.SENDING,
+                            next_attempt_at=F('digest_closes_at')),
+                    name='notification_one_open_digest'),
         ]
 
 
@@ -58,26 +119,236 @@ class Notification(UuidModel):
             if group is None:
                 logger.warning(f"Notification {self.uuid} has no group")
             else:
-                existing_notification_count = Notification.objects.filter(created_by_group=group).count()
-                usage_limits = Subscription.compute_usage_limits(group)
-                max_notification_count = usage_limits.max_notifications
-
-                if (max_notification_count is not None) and (existing_notification_count >= max_notification_count):
-                    diff = existing_notification_count - max_notification_count + 1
-                    for notification in Notification.objects.filter(created_by_group=group) \
-                            .order_by('attempted_at')[:diff].iterator():
-                        notification_uuid = notification.uuid
-                        logger.info(f"Deleting Notification {notification_uuid} because {group=} has reached the limit of {max_notification_count}")
-                        try:
-                            notification.delete()
-                            logger.info(f"Deleted Notification {notification_uuid} successfully")
-                        except Exception:
-                            logger.warning(f"Failed to delete Notification {notification_uuid}", exc_info=True)
+                max_notifications = Subscription.compute_usage_limits(group).max_notifications
+                get_history_retention().before_insert(f"notifications:{group.pk}",
+                        max_notifications,
+                        count=lambda: Notification.objects.filter(created_by_group=group).count(),
+                        trim=lambda: Notification.purge_history(group, reservation_count=1))
         else:
             logger.info('Updating an existing Notification')
 
         super().save(*args, **kwargs)
 
+    @staticmethod
+    def add_to_digest(event: Event, notification_profile: NotificationProfile,
+            notification_delivery_method: NotificationDeliveryMethod) -> Notification:
+        """
+        Add the Event to the open digest of the Notification Profile and
+        Notification Delivery Method, or start a digest that closes after
+        the delivery method's digest window. Digests are sent by the
+        notification dispatcher once they close. Events are not added to a
+        digest that has closed but hasn't been claimed yet.
+
+        Only the digest is locked, not the Notification Delivery Method, so
+        concurrent senders using the delivery method aren't blocked until
+        the current transaction commits. A unique constraint prevents two
+        digests from being started at once.
+        """
+        open_digests = Notification.objects.select_for_update() \
+                .filter(notification_profile=notification_profile,
+                        notification_delivery_method=notification_delivery_method,
+                        send_status=NotificationSendStatus.SENDING,
+                        digest_closes_at__isnull=False,
+                        next_attempt_at=F('digest_closes_at'))
+
+        failed_start_count = 0
+
+        with transaction.atomic():
+            while True:
+                # A digest that was claimed by a dispatcher has its
+                # next_attempt_at moved, so it no longer matches
+                notification = open_digests.first()
+                utc_now = timezone.now()
+
+                if (notification is not None) and (notification.digest_closes_at <= utc_now):
+                    # Leave the closed digest due for the dispatcher, but
+                    # move next_attempt_at so it is no longer the open one
+                    Notification.objects.filter(pk=notification.pk).update(
+                            next_attempt_at=notification.digest_closes_at - timedelta(microseconds=1))
+                    logger.info(f"Digest Notification {notification.uuid} closed at {notification.digest_closes_at}, starting another")
+                    notification = None
+
+                if notification is None:
+                    closes_at = utc_now + timedelta(
+                            seconds=notification_delivery_method.digest_window_seconds)
+                    notification = Notification(event=event,
+                            notification_profile=notification_profile,
+                            notification_delivery_method=notification_delivery_method,
+                            send_status=NotificationSendStatus.SENDING,
+                            digest_closes_at=closes_at, next_attempt_at=closes_at)
+
+                    try:
+                        with transaction.atomic():
+                            notification.save()
+                    except IntegrityError:
+                        failed_start_count += 1
+
+                        if failed_start_count >= Notification.MAX_DIGEST_START_ATTEMPTS:
+                            raise
+
+                        logger.info(f"Digest for Notification Delivery Method {notification_delivery_method.uuid} was started concurrently, retrying")
+                        continue
+
+                    logger.info(f"Started digest Notification {notification.uuid}, closing at {closes_at}")
+
+                notification.digested_events.add(event)
+                return notification
+
+    @staticmethod
+    def add_resolution_to_digest(resolution: Event,
+            notification_profile: NotificationProfile,
+            notification_delivery_method: NotificationDeliveryMethod) -> Notification | None:
+        """
+        Add the resolution to the latest digest of the Notification Profile
+        and Notification Delivery Method that has the Event it resolves.
+        If that digest was already sent and all of its Events are now
+        resolved, the digest is resolved once the current transaction
+        commits. A digest that hasn't been sent yet is resolved when it is
+        delivered. Returns None if no digest has the resolved Event, in
+        which case the resolution should be sent on its own.
+        """
+        with transaction.atomic():
+            notification = Notification.objects.select_for_update(of=('self',)) \
+                    .filter(notification_profile=notification_profile,
+                            notification_delivery_method=notification_delivery_method,
+                            digest_closes_at__isnull=False,
+                            digested_events=resolution.resolved_event_id) \
+                    .order_by('-id').first()
+
+            if notification is None:
+                return None
+
+            notification.digested_events.add(resolution)
+
+            if (notification.send_status == NotificationSendStatus.SUCCEEDED) and \
+                    notification.digest_dedup_key_was_sent and \
+                    notification.are_digested_events_resolved():
+                transaction.on_commit(lambda: notification_delivery_method.resolve_digest(notification),
+                        robust=True)
+
+            return notification
+
+    @property
+    def is_digest(self) -> bool:
+        return self.digest_closes_at is not None
+
+    @property
+    def digest_dedup_key(self) -> str:
+        """
+        The key that identifies the digest to delivery methods that can
+        later resolve it.
+        """
+        return f"cloudreactor-digest-{self.uuid}"
+
+    @property
+    def digest_dedup_key_was_sent(self) -> bool:
+        return bool(self.send_result and self.send_result.get('dedup_key'))
+
+    def are_digested_events_resolved(self) -> bool:
+        """
+        Returns True if every digested Event that isn't a resolution has
+        been resolved.
+        """
+        event_ids = self.digested_events.filter(resolved_event__isnull=True) \
+                .values_list('pk', flat=True)
+
+        return not event_ids.exclude(pk__in=Event.objects.filter(
+                resolved_event__isnull=False).values('resolved_event_id')).exists()
+
+    def deliver(self, max_attempts: int = 1, retry_delay_seconds: float = 0) -> None:
+        """
+        Send the Event using the Notification Delivery Method, then save
+        the outcome. If sending fails and fewer than max_attempts have been
+        made, the Notification stays SENDING, to be retried by the
+        notification dispatcher after retry_delay_seconds.
+        """
+        ndm = self.notification_delivery_method
+        event = self.event
+
+        self.attempt_count += 1
+        self.next_attempt_at = None
+
+        try:
+            if self.is_digest:
+                from ..services.notification_digest import NotificationDigest
+
+                send_result = ndm.send_digest_if_not_rate_limited(
+                        NotificationDigest.for_notification(self))
+            else:
+                send_result = ndm.send_if_not_rate_limited(event)
+
+            send_result_json = json.dumps(send_result)
+
+            if len(send_result_json) > Notification.MAX_SEND_RESULT_LENGTH:
+                logger.warning(f"send result too long for notification {self.uuid}: {send_result_json[0:Notification.MAX_SEND_RESULT_LENGTH]}")
+                # TODO: add some of the json
+                send_result = { 'success': True, 'warning': 'send result too long' }
+
+            self.send_result = send_result
+            self.send_status = NotificationSendStatus.SUCCEEDED
+            self.completed_at = timezone.now()
+        except NotificationRateLimitExceededException as nrkee:
+            event_uuid = event.uuid if event else None
+            logger.info(f"Notification rate limit exceeded for delivery method {ndm.uuid} for event {event_uuid}")
+            self.send_status = NotificationSendStatus.RATE_LIMITED
+
+            tier_index = nrkee.rate_limit_tier_index
+            self.rate_limit_max_requests_per_period = getattr(ndm,
+                    f'max_requests_per_period_{tier_index}')
+            self.rate_limit_request_period_seconds = getattr(ndm,
+                    f'request_period_seconds_{tier_index}')
+            self.rate_limit_max_severity = getattr(ndm, f'max_severity_{tier_index}')
+            self.rate_limit_tier_index = tier_index
+        except Exception as e:
+            logger.exception(f"Exception occurred sending notification using delivery method {ndm.uuid}, attempt {self.attempt_count} of {max_attempts}")
+
+            self.exception_type = type(e).__name__
+            self.exception_message = textwrap.shorten(str(e),
+                    width=Notification.MAX_EXCEPTION_MESSAGE_LENGTH)
+
+            if self.attempt_count < max_attempts:
+                self.next_attempt_at = timezone.now() + timedelta(seconds=retry_delay_seconds)
+            else:
+                self.send_status = NotificationSendStatus.FAILED
+
+        if not (self.is_digest and ndm.RESOLVES_DIGESTS):
+            self.save()
+            return
+
+        # Resolutions added to the digest lock it, so either they see that
+        # it was sent and resolve it, or it is resolved here
+        with transaction.atomic():
+            Notification.objects.select_for_update().filter(pk=self.pk).first()
+            self.save()
+
+            if (self.send_status == NotificationSendStatus.SUCCEEDED) and \
+                    self.digest_dedup_key_was_sent and \
+                    self.are_digested_events_resolved():
+                transaction.on_commit(lambda: ndm.resolve_digest(self), robust=True)
+
+    @staticmethod
+    def purge_history(group: Group, reservation_count: int = 0) -> int:
+        """
+        Delete the earliest Notifications of the Group that exceed its
+        limit, leaving room for reservation_count more. Returns the number
+        of Notifications deleted.
+        """
+        max_notifications = Subscription.compute_usage_limits(group).max_notifications
+
+        if max_notifications is None:
+            return 0
+
+        qs = Notification.objects.filter(created_by_group=group)
+        items_to_remove = qs.count() - (max_notifications - reservation_count)
+
+        if items_to_remove <= 0:
+            return 0
+
+        logger.info(f"Deleting {items_to_remove} Notifications because {group=} has reached the limit of {max_notifications}")
+
+        return get_history_retention().delete_oldest(qs,
+                order_by='attempted_at', max_to_delete=items_to_remove)
+
     def __str__(self) -> str:
         event_id = str(self.event.uuid) if self.event else '[REMOVED]'
         np_id = str(self.notification_profile.uuid) if self.notification_profile else '[REMOVED]'
@@ -2,11 +2,14 @@ from __future__ import annotations
 
 import logging
 
-from typing import Any
+from typing import Any, TYPE_CHECKING
 
 from abc import abstractmethod
+from datetime import timedelta
 
 from django.db import models
+from django.db.models import Case, F, Q, Value, When
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
 from typedmodels.models import TypedModel
@@ -17,14 +20,27 @@ from ..exception.notification_rate_limit_exceeded_exception import \
 from .event import Event
 from .named_with_uuid_and_run_environment_model import NamedWithUuidAndRunEnvironmentModel
 
+if TYPE_CHECKING:
+    from .notification import Notification
+    from ..services.notification_digest import NotificationDigest
+
+
 logger = logging.getLogger(__name__)
 
 
 class NotificationDeliveryMethod(TypedModel, NamedWithUuidAndRunEnvironmentModel):
     MAX_RATE_LIMIT_TIERS = 8
+    MAX_RATE_LIMIT_RESERVATION_ATTEMPTS = 3
+
+    # True if sent digests can later be resolved using their dedup key
+    RESOLVES_DIGESTS = False
 
     enabled = models.BooleanField(default=True)
 
+    # If set, Events are buffered for up to this many seconds, then sent
+    # together in one digest message by the notification dispatcher
+    digest_window_seconds = models.PositiveIntegerField(null=True, blank=True)
+
     max_requests_per_period_0 = models.PositiveIntegerField(null=True, blank=True, default=5)
     request_period_seconds_0 = models.PositiveIntegerField(null=True, blank=True, default=60)
     max_severity_0 = models.PositiveIntegerField(null=True, blank=True)
@@ -79,23 +95,45 @@ class NotificationDeliveryMethod(TypedModel, NamedWithUuidAndRunEnvironmentModel
             logger.info(f"Skipping Notification Delivery Method {self.uuid} / {self.name} because it is disabled")
             return None
 
-        tier_index = self.rate_limited_tier_index(event)
+        tier_index = self.reserve_request(event)
 
         if tier_index is not None:
             raise NotificationRateLimitExceededException(event=event, delivery_method=self,
                     rate_limit_tier_index=tier_index)
 
-        result = self.send(event)
+        return self.send(event)
+
+    def send_digest_if_not_rate_limited(self, digest: NotificationDigest) -> dict[str, Any] | None:
+        """
+        Send the digest, counting it as a single request for the rate
+        limits that apply to its most severe Event.
+        """
+        if self.enabled is False:
+            logger.info(f"Skipping Notification Delivery Method {self.uuid} / {self.name} because it is disabled")
+            return None
+
+        if self.RESOLVES_DIGESTS and digest.is_resolved:
+            logger.info(f"Skipping digest for Notification Delivery Method {self.uuid} / {self.name} because all of its Events were resolved")
+            return None
+
+        event = digest.most_severe_event
+        tier_index = self.reserve_request(event)
+
+        if tier_index is not None:
+            raise NotificationRateLimitExceededException(event=event, delivery_method=self,
+                    rate_limit_tier_index=tier_index)
 
-        self.increment_rate_limit_counters(event)
+        return self.send_digest(digest)
 
-        return result
+    @property
+    def digest_enabled(self) -> bool:
+        return bool(self.digest_window_seconds)
 
     def will_be_rate_limited(self, event: Event) -> bool:
         return self.rate_limited_tier_index(event) is not None
 
-    def rate_limited_tier_index(self, event: Event) -> int | None:
-        now = timezone.now()
+    def applicable_rate_limit_tier_indices(self, event: Event) -> list[int]:
+        tier_indices: list[int] = []
 
         for tier_index in range(self.MAX_RATE_LIMIT_TIERS):
             max_requests = getattr(self, f'max_requests_per_period_{tier_index}')
@@ -108,6 +146,17 @@ class NotificationDeliveryMethod(TypedModel, NamedWithUuidAndRunEnvironmentModel
             if max_severity is not None and event.severity > max_severity:
                 continue
 
+            tier_indices.append(tier_index)
+
+        return tier_indices
+
+    def rate_limited_tier_index(self, event: Event) -> int | None:
+        now = timezone.now()
+
+        for tier_index in self.applicable_rate_limit_tier_indices(event):
+            max_requests = getattr(self, f'max_requests_per_period_{tier_index}')
+            period_seconds = getattr(self, f'request_period_seconds_{tier_index}')
+
             request_count_in_period = getattr(self, f'request_count_in_period_{tier_index}') or 0
 
             period_started_at = getattr(self, f'request_period_started_at_{tier_index}')
@@ -122,42 +171,92 @@ class NotificationDeliveryMethod(TypedModel, NamedWithUuidAndRunEnvironmentModel
 
         return None
 
-    def increment_rate_limit_counters(self, event: Event) -> None:
-        now = timezone.now()
+    def reserve_request(self, event: Event) -> int | None:
+        """
+        Count a request to send the event in every applicable rate limit
+        tier, unless a tier is at its limit. Returns the index of the tier
+        that limits the request, or None if the request was counted.
+
+        The limits are checked and the counters incremented by a single
+        conditional UPDATE, so concurrent senders, even with stale
+        instances, can't exceed the limits. The limits themselves are read
+        from this instance. The UPDATE locks the row until the transaction
+        ends, so call this outside a transaction, as the notification
+        dispatcher and NotificationProfile.send() do, to avoid blocking
+        other senders while sending.
+        """
+        tier_indices = self.applicable_rate_limit_tier_indices(event)
+
+        if not tier_indices:
+            return None
 
-        update_fields: list[str] = []
+        counter_fields: list[str] = []
 
-        for tier_index in range(self.MAX_RATE_LIMIT_TIERS):
-            max_requests = getattr(self, f'max_requests_per_period_{tier_index}')
-            period_seconds = getattr(self, f'request_period_seconds_{tier_index}')
-            max_severity = getattr(self, f'max_severity_{tier_index}')
+        for tier_index in tier_indices:
+            if getattr(self, f'max_requests_per_period_{tier_index}') <= 0:
+                logger.info(f"Notification delivery method {self.uuid} rate limited on tier {tier_index}")
+                return tier_index
 
-            if max_requests is None or period_seconds is None:
-                continue
+            counter_fields += [f'request_count_in_period_{tier_index}',
+                    f'request_period_started_at_{tier_index}']
 
-            if max_severity is not None and event.severity > max_severity:
-                continue
+        for _attempt in range(self.MAX_RATE_LIMIT_RESERVATION_ATTEMPTS):
+            now = timezone.now()
+            within_limits = Q()
+            updates: dict[str, Any] = {}
 
-            request_count_attr = f'request_count_in_period_{tier_index}'
+            for tier_index in tier_indices:
+                max_requests = getattr(self, f'max_requests_per_period_{tier_index}')
+                period_seconds = getattr(self, f'request_period_seconds_{tier_index}')
+                request_count_field = f'request_count_in_period_{tier_index}'
+                period_started_at_field = f'request_period_started_at_{tier_index}'
 
-            update_fields.append(request_count_attr)
+                period_expired = Q(**{f'{period_started_at_field}__isnull': True}) | \
+                        Q(**{f'{period_started_at_field}__lt': now - timedelta(seconds=period_seconds)})
 
-            request_count_in_period = getattr(self, request_count_attr) or 0
+                within_limits &= period_expired | \
+                        Q(**{f'{request_count_field}__isnull': True}) | \
+                        Q(**{f'{request_count_field}__lt': max_requests})
 
-            period_started_at_attr = f'request_period_started_at_{tier_index}'
+                updates[request_count_field] = Case(
+                        When(period_expired, then=Value(1)),
+                        default=Coalesce(F(request_count_field), Value(0),
+                                output_field=models.PositiveIntegerField()) + Value(1),
+                        output_field=models.PositiveIntegerField())
+                updates[period_started_at_field] = Case(
+                        When(period_expired, then=Value(now)),
+                        default=F(period_started_at_field),
+                        output_field=models.DateTimeField())
 
-            period_started_at = getattr(self, period_started_at_attr)
+            updated_count = NotificationDeliveryMethod.objects.filter(
+                    within_limits, pk=self.pk).update(**updates)
 
-            if period_started_at is None or (now - period_started_at).total_seconds() > period_seconds:
-                logger.debug(f"Rate limit period reset for delivery method {self.uuid} tier {tier_index}")
-                request_count_in_period = 0
-                setattr(self, period_started_at_attr, now)
-                update_fields.append(period_started_at_attr)
+            self.refresh_from_db(fields=counter_fields)
+
+            if updated_count > 0:
+                return None
+
+            tier_index = self.rate_limited_tier_index(event)
+
+            if tier_index is not None:
+                return tier_index
 
-            setattr(self, request_count_attr, request_count_in_period + 1)
+            # A rate limit period expired after the UPDATE, try again
+            logger.info(f"Rate limit period of delivery method {self.uuid} expired while reserving, retrying")
 
-        self.save(update_fields=update_fields)
+        return tier_indices[0]
 
     @abstractmethod
     def send(self, event: Event) -> dict[str, Any] | None:
         raise NotImplementedError()
+
+    @abstractmethod
+    def send_digest(self, digest: NotificationDigest) -> dict[str, Any] | None:
+        raise NotImplementedError()
+
+    def resolve_digest(self, notification: Notification) -> None:
+        """
+        Resolve the sent digest Notification, once all of its Events were
+        resolved. Only called if RESOLVES_DIGESTS is True.
+        """
+        raise NotImplementedError()
@@ -1,13 +1,9 @@
-import json
 import logging
-import textwrap
 
-from django.db import models
+from django.conf import settings
+from django.db import models, transaction
 from django.utils import timezone
 
-from ..exception.notification_rate_limit_exceeded_exception import \
-    NotificationRateLimitExceededException
-
 from .notification_send_status import NotificationSendStatus
 from .named_with_uuid_and_run_environment_model import NamedWithUuidAndRunEnvironmentModel
 from .event import Event
@@ -32,55 +28,61 @@ class NotificationProfile(NamedWithUuidAndRunEnvironmentModel):
     notification_delivery_methods = models.ManyToManyField(NotificationDeliveryMethod, blank=True)
 
     def send(self, event: Event) -> None:
+        """
+        Create a Notification for each Notification Delivery Method. If
+        notifications are dispatched asynchronously, they are left in the
+        outbox, to be sent by the notification dispatcher once the current
+        transaction commits. Otherwise, they are sent as soon as the current
+        transaction commits, or immediately outside a transaction, so the
+        rate limit reservation is committed before sending and doesn't
+        block other senders during the send.
+
+        Delivery methods with a digest window add the Event to a digest
+        Notification instead, which the notification dispatcher sends when
+        the window closes, or the task schedule checker if notifications
+        are dispatched synchronously. Resolutions are not digested, so incidents are
+        resolved promptly. If the delivery method resolves digests, a
+        resolution of a digested Event is added to its digest instead, which
+        is resolved once all of its Events are.
+        """
         if not self.enabled:
             logger.info(f"Skipping Notification Profile {self.uuid} / {self.name} because it is disabled")
             return
 
+        asynchronous = settings.NOTIFICATION_DISPATCH_SETTINGS['ASYNCHRONOUS']
+
         for ndm in self.notification_delivery_methods.all():
+            if ndm.enabled and ndm.digest_enabled:
+                if not event.is_resolution:
+                    notification = Notification.add_to_digest(event=event,
+                            notification_profile=self, notification_delivery_method=ndm)
+                    logger.info(f"Added Event {event.uuid} to digest Notification {notification.uuid}")
+                    continue
+
+                if ndm.RESOLVES_DIGESTS:
+                    digest = Notification.add_resolution_to_digest(event,
+                            notification_profile=self, notification_delivery_method=ndm)
+
+                    if digest is not None:
+                        logger.info(f"Added resolution {event.uuid} to digest Notification {digest.uuid}")
+                        continue
+
             initial_send_status = NotificationSendStatus.SENDING if ndm.enabled else NotificationSendStatus.SKIPPED
 
             notification = Notification(event=event, notification_profile=self,
                     notification_delivery_method=ndm,
-                    send_status=initial_send_status)
+                    send_status=initial_send_status,
+                    next_attempt_at=timezone.now() if (asynchronous and ndm.enabled) else None)
             notification.save()
 
             if not ndm.enabled:
                 logger.info(f"Skipping Notification Delivery Method {ndm.uuid} / {ndm.name} because it is disabled")
                 continue
 
-            # TODO: Queue this, implement retry
-            try:
-                send_result = ndm.send_if_not_rate_limited(event)
-
-                send_result_json = json.dumps(send_result)
-
-                if len(send_result_json) > Notification.MAX_SEND_RESULT_LENGTH:
-                    logger.warning(f"send result too long for notification {notification.uuid}: {send_result_json[0:Notification.MAX_SEND_RESULT_LENGTH]}")
-                    # TODO: add some of the json
-                    send_result = { 'success': True, 'warning': 'send result too long' }
-
-                notification.send_result = send_result
-                notification.send_status = NotificationSendStatus.SUCCEEDED
-                notification.completed_at = timezone.now()
-            except NotificationRateLimitExceededException as nrkee:
-                logger.info(f"Notification rate limit exceeded for delivery method {ndm.uuid} for event {event.uuid}")
-                notification.send_status = NotificationSendStatus.RATE_LIMITED
-
-                tier_index = nrkee.rate_limit_tier_index
-                notification.rate_limit_max_requests_per_period = getattr(ndm,
-                        f'max_requests_per_period_{tier_index}')
-                notification.rate_limit_request_period_seconds = getattr(ndm,
-                        f'request_period_seconds_{tier_index}')
-                notification.rate_limit_max_severity = getattr(ndm, f'max_severity_{tier_index}')
-                notification.rate_limit_tier_index = tier_index
-            except Exception as e:
-                logger.exception(f"Exception occurred sending notification using delivery method {ndm.uuid}")
-                notification.send_status = NotificationSendStatus.FAILED
-
-                notification.exception_type = type(e).__name__
-                notification.exception_message = textwrap.shorten(str(e),
-                        width=Notification.MAX_EXCEPTION_MESSAGE_LENGTH)
+            if asynchronous:
+                logger.info(f"Queued Notification {notification.uuid} for dispatch")
+                continue
 
-            notification.save()
+            transaction.on_commit(notification.deliver, robust=True)
 
         logger.info(f"Finished sending notifications for event #{event.uuid}")
@@ -1,22 +1,27 @@
 from __future__ import annotations
 
-from typing import Any, cast
+from typing import Any, TYPE_CHECKING, cast
 
 import logging
 
 from django.conf import settings
 from django.db import models
 
-import pagerduty
-
 from ..common.notification import *
+from ..common.notification_transports import get_notification_transport_pool
 from .event import Event
 from .notification_delivery_method import NotificationDeliveryMethod
 
+if TYPE_CHECKING:
+    from .notification import Notification
+    from ..services.notification_digest import NotificationDigest
+
 logger = logging.getLogger(__name__)
 
 
 class PagerDutyNotificationDeliveryMethod(NotificationDeliveryMethod):
+    RESOLVES_DIGESTS = True
+
     pagerduty_api_key = models.CharField(max_length=1000, null=True)
     pagerduty_event_class_template = models.CharField(max_length=1000, null=True, blank=True)
     pagerduty_event_component_template = models.CharField(max_length=1000, null=True, blank=True)
@@ -45,7 +50,7 @@ class PagerDutyNotificationDeliveryMethod(NotificationDeliveryMethod):
         from .task_execution_status_change_event import TaskExecutionStatusChangeEvent
         from .workflow_execution_status_change_event import WorkflowExecutionStatusChangeEvent
 
-        from ..services.notification_generator import NotificationGenerator
+        from ..services.notification_generator import NotificationContext
 
         if not self.pagerduty_api_key:
             raise ValueError("PagerDuty API key is required for PagerDuty notifications")
@@ -62,7 +67,7 @@ class PagerDutyNotificationDeliveryMethod(NotificationDeliveryMethod):
         elif isinstance(event, WorkflowExecutionStatusChangeEvent):
             workflow_execution = cast(WorkflowExecutionStatusChangeEvent, event).workflow_execution
 
-        notification_generator = NotificationGenerator()
+        notification_generator = NotificationContext.for_event(event)
 
         template_params = notification_generator.make_template_params(
             task_execution=task_execution,
@@ -76,16 +81,9 @@ class PagerDutyNotificationDeliveryMethod(NotificationDeliveryMethod):
         if event.details:
             template_params.update(event.details)
 
-        with pagerduty.EventsApiV2Client(self.pagerduty_api_key,
-                debug=False) as events_client:
-
-            if event.is_resolution:
-                return {
-                    'resolve_return_value': events_client.resolve(dedup_key=event.grouping_key)
-                }
-
-            details: dict[str, Any] = {}
+        details: dict[str, Any] = {}
 
+        if not event.is_resolution:
             if self.pagerduty_event_class_template:
                 details['class'] = notification_generator.generate_text(
                     template_params=template_params,
@@ -107,18 +105,96 @@ class PagerDutyNotificationDeliveryMethod(NotificationDeliveryMethod):
                     task_execution=task_execution,
                     workflow_execution=workflow_execution).strip()
 
-            pd_severity = self.pagerduty_severity_from_event_severity(event.severity)
-            base_url = settings.EXTERNAL_BASE_URL.rstrip('/')
-            event_url = f"{base_url}/events/{event.uuid}"
-            dedup_key = events_client.trigger(summary=event.error_summary,
-                source=source,
-                severity=pd_severity,
-                dedup_key=event.grouping_key,
-                custom_details=details,
-                links=[{'href': event_url, 'text': 'View Event in CloudReactor'}])
-
-            logger.info(f"Done triggering PagerDuty event, {dedup_key=}")
-
-            return {
-                'dedup_key': dedup_key
-            }
+        # The client is a session kept open between sends, so bursts of
+        # Events don't each make a new HTTPS connection
+        with get_notification_transport_pool().checkout() as transports:
+            events_client = transports.get_pagerduty_client(self.pagerduty_api_key)
+
+            try:
+                if event.is_resolution:
+                    return {
+                        'resolve_return_value': events_client.resolve(dedup_key=event.grouping_key)
+                    }
+
+                pd_severity = self.pagerduty_severity_from_event_severity(event.severity)
+                base_url = settings.EXTERNAL_BASE_URL.rstrip('/')
+                event_url = f"{base_url}/events/{event.uuid}"
+                dedup_key = events_client.trigger(summary=event.error_summary,
+                    source=source,
+                    severity=pd_severity,
+                    dedup_key=event.grouping_key,
+                    custom_details=details,
+                    links=[{'href': event_url, 'text': 'View Event in CloudReactor'}])
+            except Exception:
+                # The session may be broken, so reconnect for the next send
+                transports.discard_pagerduty_client(self.pagerduty_api_key)
+                raise
+
+        logger.info(f"Done triggering PagerDuty event, {dedup_key=}")
+
+        return {
+            'dedup_key': dedup_key
+        }
+
+    def send_digest(self, digest: NotificationDigest) -> dict[str, Any] | None:
+        """
+        Trigger a single PagerDuty incident for the digest, with the counts
+        and most frequent Tasks and Workflows as custom details, and links
+        to the latest Events. The incident is deduplicated by the digest's
+        dedup key, so it can be resolved once all of its Events are.
+        """
+        if not self.pagerduty_api_key:
+            raise ValueError("PagerDuty API key is required for PagerDuty notifications")
+
+        event = digest.most_severe_event
+
+        details: dict[str, Any] = {
+            'event_count': digest.event_count,
+            'counts_by_severity': digest.counts_by_severity,
+            'most_frequent': [
+                f"{executable['name']}: {executable['event_count']}"
+                for executable in digest.top_executables
+            ],
+        }
+
+        links = [{'href': latest_event['dashboard_url'], 'text': latest_event['summary']}
+                for latest_event in digest.latest_events]
+
+        with get_notification_transport_pool().checkout() as transports:
+            events_client = transports.get_pagerduty_client(self.pagerduty_api_key)
+
+            try:
+                dedup_key = events_client.trigger(
+                    summary=f"CloudReactor digest: {digest.summary}",
+                    source=event.source or DEFAULT_NOTIFICATION_SOURCE,
+                    severity=self.pagerduty_severity_from_event_severity(event.severity),
+                    dedup_key=digest.dedup_key,
+                    custom_details=details,
+                    links=links)
+            except Exception:
+                transports.discard_pagerduty_client(self.pagerduty_api_key)
+                raise
+
+        logger.info(f"Done triggering PagerDuty digest event, {dedup_key=}")
+
+        return {
+            'dedup_key': dedup_key,
+            'event_count': digest.event_count,
+        }
+
+    def resolve_digest(self, notification: Notification) -> None:
+        if not self.pagerduty_api_key:
+            raise ValueError("PagerDuty API key is required for PagerDuty notifications")
+
+        dedup_key = notification.send_result['dedup_key']
+
+        with get_notification_transport_pool().checkout() as transports:
+            events_client = transports.get_pagerduty_client(self.pagerduty_api_key)
+
+            try:
+                events_client.resolve(dedup_key=dedup_key)
+            except Exception:
+                transports.discard_pagerduty_client(self.pagerduty_api_key)
+                raise
+
+        logger.info(f"Done resolving PagerDuty digest event, {dedup_key=}")
@@ -5,9 +5,11 @@ from typing import Type, override, TYPE_CHECKING
 import logging
 
 from django.db import models
-from django.db.models.signals import pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
+from ..common.api_key_cache import get_api_key_cache
+from ..common.utils import invalidate_now_and_on_commit
 from ..exception.unprocessable_entity import UnprocessableEntity
 from .named_with_uuid_model import NamedWithUuidModel
 from .infrastructure_configuration import InfrastructureConfiguration
@@ -118,3 +120,12 @@ def pre_save_run_environment(sender: Type[RunEnvironment], **kwargs):
         instance.enrich_settings()
     except Exception as ex:
         logger.warning(f"Failed to enrich Run Environment {instance.uuid} settings", exc_info=ex)
+
+
+@receiver([post_save, post_delete], sender=RunEnvironment)
+def invalidate_api_keys_of_run_environment(sender: Type[RunEnvironment],
+        instance: RunEnvironment, **kwargs) -> None:
+    # API keys cache their Run Environment
+    run_environment_id = instance.pk
+    invalidate_now_and_on_commit(
+            lambda: get_api_key_cache().invalidate_run_environment(run_environment_id))
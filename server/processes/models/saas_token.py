@@ -6,7 +6,7 @@ import os
 
 from django.conf import settings
 from django.db import models
-from django.db.models.signals import pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.utils.translation import gettext_lazy as _
 
@@ -14,6 +14,8 @@ from django.contrib.auth.models import Group
 
 from rest_framework.exceptions import PermissionDenied
 
+from ..common.api_key_cache import get_api_key_cache
+from ..common.utils import invalidate_now_and_on_commit
 from .uuid_model import UuidModel
 from .subscription import Subscription
 
@@ -99,3 +101,10 @@ def pre_save_saas_token(sender: Type[SaasToken], **kwargs) -> None:
     if (max_api_keys is not None) and (existing_token_count >= max_api_keys):
         raise PermissionDenied(code=SaasToken.ERROR_CODE_TOKEN_LIMIT_EXCEEDED,
                 detail=f"The group {group.name} already has {existing_token_count} API keys, exceeded its limit")
+
+
+@receiver([post_save, post_delete], sender=SaasToken)
+def invalidate_cached_saas_token(sender: Type[SaasToken],
+        instance: SaasToken, **kwargs) -> None:
+    key = instance.key
+    invalidate_now_and_on_commit(lambda: get_api_key_cache().invalidate(key))
@@ -1,18 +1,19 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Collection, Any, Type
+from typing import TYPE_CHECKING
 
-import copy
 from datetime import datetime
 import logging
-import re
-
-from typing_extensions import Self
 
 from django.db import models
 from django.db.models import QuerySet
 from django.utils import timezone
 
+from ..common.compiled_schedule import (
+    CRON_REGEX, RATE_REGEX, SCHEDULE_TYPE_CRON, SCHEDULE_TYPE_RATE,
+    CompiledSchedule, compile_schedule
+)
+from .change_tracked_model import ChangeTrackedModel
 from .event import Event
 from .execution_probabilities import ExecutionProbabilities
 from .named_with_uuid_model import NamedWithUuidModel
@@ -27,18 +28,14 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
-SCHEDULE_TYPE_CRON = 'C'
-SCHEDULE_TYPE_RATE = 'R'
-
-
-class Schedulable(NamedWithUuidModel, ExecutionProbabilities):
+class Schedulable(NamedWithUuidModel, ExecutionProbabilities, ChangeTrackedModel):
 
     DEFAULT_MAX_EARLY_STARTUP_SECONDS = 60
     DEFAULT_MAX_STARTUP_SECONDS = 10 * 60
     DEFAULT_MAX_SCHEDULED_LATENESS_SECONDS = 30 * 60
 
-    CRON_REGEX = re.compile(r"cron\s*\(([^)]+)\)")
-    RATE_REGEX = re.compile(r"rate\s*\((\d+)\s+([A-Za-z]+)\)")
+    CRON_REGEX = CRON_REGEX
+    RATE_REGEX = RATE_REGEX
 
     class Meta:
         abstract = True
@@ -54,6 +51,14 @@ class Schedulable(NamedWithUuidModel, ExecutionProbabilities):
     max_concurrency = models.IntegerField(null=True, blank=True)
     enabled = models.BooleanField(default=True)
 
+    # Maintained by ScheduleChecker, so it only loads the Schedulables whose
+    # next expected execution can be checked. Null means unknown, so the
+    # Schedulable is checked on the next run.
+    next_expected_execution_at = models.DateTimeField(null=True, blank=True,
+        editable=False)
+    next_schedule_check_at = models.DateTimeField(null=True, blank=True,
+        editable=False, db_index=True)
+
     max_age_seconds = models.PositiveIntegerField(null=True, blank=True)
     default_max_retries = models.PositiveIntegerField(default=0)
     postponed_failure_before_success_seconds = models.PositiveIntegerField(
@@ -92,15 +97,12 @@ class Schedulable(NamedWithUuidModel, ExecutionProbabilities):
     notification_event_severity_on_sufficient_instances_restored = models.PositiveIntegerField(
         null=True, blank=True, default=Event.Severity.INFO)
 
-    # Transient properties
-    _loaded_copy: Schedulable | None = None
+    SCHEDULE_CHECK_FIELDS = ('schedule', 'schedule_updated_at',
+            'scheduled_instance_count',)
 
-
-    @classmethod
-    def from_db(cls: Type[Self], db: str | None, field_names: Collection[str], values: Collection[Any]) -> Self:
-        instance = super().from_db(db, field_names, values)
-        instance._loaded_copy = copy.copy(instance)
-        return instance
+    # Used by signal handlers to detect changes
+    CHANGE_TRACKED_FIELDS = SCHEDULE_CHECK_FIELDS + ('enabled',
+            'run_environment_id',)
 
     @property
     def kind_label(self) -> str:
@@ -125,6 +127,40 @@ class Schedulable(NamedWithUuidModel, ExecutionProbabilities):
 
         return None
 
+    @property
+    def compiled_schedule(self) -> CompiledSchedule:
+        """
+        The parsed schedule, shared with other Schedulables with the same
+        schedule. Raises an exception if the cron expression is invalid.
+        """
+        return compile_schedule(self.schedule)
+
+    def update_next_schedule_check(self) -> None:
+        """
+        Compute the next expected execution and schedule check time, if the
+        Schedulable is new or its schedule changed. Called before saving.
+        """
+        from ..services.schedule_checker import ScheduleChecker
+
+        old_self = self._loaded_copy
+
+        if (self.pk is not None) and old_self and all(
+                getattr(old_self, field) == getattr(self, field)
+                for field in self.SCHEDULE_CHECK_FIELDS):
+            return
+
+        try:
+            # Executions before the schedule was updated don't count, so
+            # start checking from then
+            self.next_expected_execution_at, self.next_schedule_check_at = \
+                    ScheduleChecker.next_schedule_check(self,
+                            utc_now=self.schedule_updated_at)
+        except Exception:
+            logger.warning(f"Can't compute next schedule check for {self.kind_label} {self.uuid} with schedule '{self.schedule}'",
+                    exc_info=True)
+            self.next_expected_execution_at = None
+            self.next_schedule_check_at = None
+
     def lookup_all_missing_scheduled_execution_events(self) -> QuerySet[MissingScheduledExecutionEvent]:
         raise NotImplementedError()
 
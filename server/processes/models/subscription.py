@@ -1,14 +1,19 @@
 
 
+from datetime import datetime
 import logging
 
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.db.models import Q
 from django.utils import timezone
 
 from django.contrib.auth.models import Group
 
 from ..common import UsageLimits
+from ..common.usage_limits_cache import get_usage_limits_cache
+from ..common.utils import invalidate_now_and_on_commit
 from .subscription_plan import SubscriptionPlan
 
 
@@ -28,12 +33,25 @@ class Subscription(models.Model):
 
     @staticmethod
     def compute_usage_limits(group: Group) -> UsageLimits:
+        if group is None:
+            return Subscription.load_usage_limits(group)[0]
+
+        return get_usage_limits_cache().get(group.pk,
+                lambda: Subscription.load_usage_limits(group))
+
+    @staticmethod
+    def load_usage_limits(group: Group) -> tuple[UsageLimits, datetime | None]:
+        """
+        Compute the UsageLimits of the Group from its active subscriptions.
+        Also returns the time the first of these subscriptions ends, if any.
+        """
         utc_now = timezone.now()
         subscriptions = Subscription.objects.select_related('subscription_plan') \
                 .filter(Q(group=group), Q(active=True), Q(start_at__lte=utc_now),
                 Q(end_at__gte=utc_now) | Q(end_at__isnull=True)).all()
 
         usage_limits: UsageLimits | None = None
+        valid_until: datetime | None = None
 
         for subscription in subscriptions:
             plan = subscription.subscription_plan
@@ -44,14 +62,32 @@ class Subscription(models.Model):
                 else:
                     usage_limits = sul
 
+            if subscription.end_at and ((valid_until is None) or \
+                    (subscription.end_at < valid_until)):
+                valid_until = subscription.end_at
+
         if usage_limits:
-            return usage_limits
+            return (usage_limits, valid_until)
         else:
             logger.debug(f'No subscription found for {group=}, returning default limits')
-            return UsageLimits.default_limits()
+            return (UsageLimits.default_limits(), valid_until)
 
     def __str__(self) -> str:
         if self.group and self.subscription_plan:
             return self.group.name + '/' + self.subscription_plan.name + '/'+ str(self.pk)
 
         return str(self.pk)
+
+
+@receiver([post_save, post_delete], sender=Subscription)
+def invalidate_usage_limits_of_subscription(sender: type[Subscription],
+        instance: Subscription, **kwargs) -> None:
+    # The Group of the Subscription may have changed, so invalidate all
+    invalidate_now_and_on_commit(get_usage_limits_cache().invalidate)
+
+
+@receiver([post_save, post_delete], sender=SubscriptionPlan)
+def invalidate_usage_limits_of_subscription_plan(
+        sender: type[SubscriptionPlan], instance: SubscriptionPlan,
+        **kwargs) -> None:
+    invalidate_now_and_on_commit(get_usage_limits_cache().invalidate)
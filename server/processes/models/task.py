@@ -1,8 +1,7 @@
 from __future__ import annotations
 
-from typing import Any, Type, TYPE_CHECKING, cast, override
+from typing import Any, Collection, Iterable, Type, TYPE_CHECKING, cast, override
 
-import copy
 from datetime import datetime
 import logging
 
@@ -14,6 +13,7 @@ from django.dispatch import receiver
 from django.utils import timezone
 
 from ..common.aws import *
+from ..common.history_retention import get_history_retention
 from ..common.utils import coalesce
 from ..execution_methods import (
     ExecutionMethod,
@@ -102,8 +102,58 @@ class Task(TaskExecutionConfiguration, Schedulable):
 
     was_auto_created = models.BooleanField(default=False, null=True)
 
+    # Hash of the auto-created Task properties last applied by a Task
+    # Execution, cleared when the Task is changed another way
+    auto_created_task_properties_digest = models.CharField(max_length=64,
+            blank=True, default='')
+
+    # Includes TaskExecution.CHECK_DEADLINE_TASK_FIELDS, and the fields
+    # that determine the execution method and its scheduling and service
+    CHANGE_TRACKED_FIELDS = Schedulable.CHANGE_TRACKED_FIELDS + (
+        'passive',
+        'max_age_seconds',
+        'max_manual_start_delay_before_alert_seconds',
+        'max_manual_start_delay_before_abandonment_seconds',
+        'max_heartbeat_lateness_before_alert_seconds',
+        'max_heartbeat_lateness_before_abandonment_seconds',
+        'notification_event_severity_on_missing_heartbeat',
+        'aws_ecs_service_updated_at',
+        'execution_method_type',
+        'execution_method_capability_details',
+        'infrastructure_type',
+        'infrastructure_settings',
+        'allocated_cpu_units',
+        'allocated_memory_mb',
+        'is_scheduling_managed',
+        'scheduling_provider_type',
+        'scheduling_settings',
+        'is_service_managed',
+        'service_provider_type',
+        'service_settings',
+        'service_instance_count',
+        'min_service_instance_count',
+    )
+
+    # Fields this server updates itself, which don't make a Task differ
+    # from the auto-created properties last applied to it
+    AUTO_CREATED_TASK_PROPERTIES_IGNORED_FIELDS = frozenset((
+        'id',
+        'uuid',
+        'created_at',
+        'updated_at',
+        'latest_task_execution_id',
+        'schedule_updated_at',
+        'next_expected_execution_at',
+        'next_schedule_check_at',
+        'aws_ecs_service_updated_at',
+        'auto_created_task_properties_digest',
+    ))
+
     should_skip_synchronize_with_run_environment = False
 
+    # Transient properties
+    _loaded_auto_created_task_properties: tuple[str, dict[str, Any]] | None = None
+
     @override
     @property
     def kind_label(self) -> str:
@@ -225,21 +275,11 @@ class Task(TaskExecutionConfiguration, Schedulable):
 
         logger.info(f'Removing {items_to_remove=} Task Execution history items for Task {self.uuid} ...')
 
-        completed_qs = qs.exclude(
-                status__in=TaskExecution.IN_PROGRESS_STATUSES) \
-                .order_by('finished_at')[0:items_to_remove]
-
-        num_completed_deleted = 0
-        for te in completed_qs.iterator():
-            if num_completed_deleted >= items_to_remove:
-                break
+        completed_qs = qs.exclude(status__in=TaskExecution.IN_PROGRESS_STATUSES)
 
-            try:
-                te.delete()
-                num_completed_deleted += 1
-            except Exception:
-                logger.warning(f"Failed to delete completed Task Execution {te.uuid}",
-                        exc_info=True)
+        num_completed_deleted = get_history_retention().delete_oldest(
+                completed_qs, order_by='finished_at',
+                max_to_delete=items_to_remove)
 
         logger.info(f'Removed {num_completed_deleted=} completed Task Execution history items for Task {self.uuid}')
 
@@ -251,22 +291,9 @@ class Task(TaskExecutionConfiguration, Schedulable):
 
         logger.warning(f"Must remove {items_to_remove=} Task Executions for Task {self.uuid} that are still in-progress")
 
-        in_progress_qs = self.in_progress_executions_queryset() \
-                .order_by('started_at')[0:items_to_remove]
-
-        num_in_progress_deleted = 0
-        for te in in_progress_qs.iterator():
-            if num_in_progress_deleted >= items_to_remove:
-                break
-
-            logger.info(f'Deleting in-progress {te=} with {te.started_at=} for Task {self.uuid}')
-
-            try:
-                te.delete()
-                num_in_progress_deleted += 1
-            except Exception:
-                logger.warning(f'Failed to delete in-progress Task Execution {te.uuid} for Task {self.uuid}',
-                        exc_info=True)
+        num_in_progress_deleted = get_history_retention().delete_oldest(
+                self.in_progress_executions_queryset(), order_by='started_at',
+                max_to_delete=items_to_remove)
 
         logger.info(f'Removed {num_in_progress_deleted=} in-progress Task Execution history items for Task {self.uuid}')
         return num_completed_deleted + num_in_progress_deleted
@@ -274,6 +301,73 @@ class Task(TaskExecutionConfiguration, Schedulable):
     def execution_method(self) -> ExecutionMethod:
         return ExecutionMethod.make_execution_method(task=self)
 
+    def update_execution_check_deadlines(self) -> int:
+        """
+        Recompute the check deadlines of the Task Executions awaiting
+        updates, after settings they depend on changed. Returns the number
+        of Task Executions updated.
+        """
+        from .task_execution import TaskExecution
+
+        updated_count = 0
+
+        for te in self.taskexecution_set.filter(
+                status__in=TaskExecution.AWAITING_UPDATE_STATUSES,
+                finished_at__isnull=True):
+            te.task = self
+            check_deadline_at = te.compute_check_deadline_at()
+
+            if check_deadline_at != te.check_deadline_at:
+                TaskExecution.objects.filter(pk=te.pk).update(
+                        check_deadline_at=check_deadline_at)
+                updated_count += 1
+
+        return updated_count
+
+    @override
+    def remember_loaded_values(self) -> None:
+        super().remember_loaded_values()
+
+        values = self.__dict__
+        digest = values.get('auto_created_task_properties_digest')
+
+        # Only Tasks with auto-created properties applied remember all
+        # their fields, to tell if they are changed another way
+        if digest:
+            self._loaded_auto_created_task_properties = (digest, {
+                field.attname: values[field.attname]
+                for field in self._meta.concrete_fields
+                if (field.attname in values) and \
+                        (field.attname not in self.AUTO_CREATED_TASK_PROPERTIES_IGNORED_FIELDS)
+            })
+        else:
+            self._loaded_auto_created_task_properties = None
+
+    def is_changed_since_auto_created_properties_applied(self,
+            update_fields: Collection[str] | None = None) -> bool:
+        """
+        Returns True if this Task had auto-created properties applied when
+        it was loaded, and other fields (limited to update_fields, if
+        given) have changed since, without new properties being applied.
+        """
+        loaded = self._loaded_auto_created_task_properties
+
+        if (loaded is None) or \
+                (self.auto_created_task_properties_digest != loaded[0]):
+            return False
+
+        loaded_values = loaded[1]
+
+        if update_fields is None:
+            attnames: Iterable[str] = loaded_values.keys()
+        else:
+            attnames = [self._meta.get_field(name).attname for name in update_fields]
+
+        values = self.__dict__
+
+        return any((attname in loaded_values) and (attname in values) and \
+                (values[attname] != loaded_values[attname]) for attname in attnames)
+
     def save_without_sync(self, **kwargs) -> 'Task':
         old_sync = self.should_skip_synchronize_with_run_environment
         self.should_skip_synchronize_with_run_environment = True
@@ -462,6 +556,16 @@ def pre_save_task(sender: Type[Task], instance: Task, raw: bool, using: str, upd
         if (max_tasks is not None) and (existing_count >= max_tasks):
             raise UnprocessableEntity(detail='Task limit exceeded', code='limit_exceeded')
 
+    if instance.is_changed_since_auto_created_properties_applied(update_fields):
+        # The next auto-created properties must be applied again
+        logger.info(f"Task {instance.uuid} changed, clearing auto-created properties digest")
+        instance.auto_created_task_properties_digest = ''
+
+        if (update_fields is not None) and \
+                ('auto_created_task_properties_digest' not in update_fields):
+            Task.objects.filter(pk=instance.pk).update(
+                    auto_created_task_properties_digest='')
+
     if instance.should_skip_synchronize_with_run_environment:
         logger.info(f"skipping synchronize_with_run_environment with Task {instance}")
     else:
@@ -473,12 +577,35 @@ def pre_save_task(sender: Type[Task], instance: Task, raw: bool, using: str, upd
     except Exception as ex:
         logger.warning(f"Failed to enrich Task {instance.uuid} settings", exc_info=ex)
 
+    if update_fields is None:
+        instance.update_next_schedule_check()
+
     logger.info(f"Done with pre_save_task for Task {instance}, ss = {instance.scheduling_settings}")
 
 @receiver(post_save, sender=Task)
-def post_save_task(sender: Type[Task], instance: Task, **kwargs) -> None :
+def post_save_task(sender: Type[Task], instance: Task, created: bool, **kwargs) -> None :
+    from .task_execution import TaskExecution
+
     logger.info(f"post_save_task with Task {instance} ...")
-    instance._loaded_copy = copy.copy(instance)
+
+    old_instance = instance._loaded_copy
+    instance.remember_loaded_values()
+
+    if (not created) and ((old_instance is None) or any(
+            getattr(old_instance, field) != getattr(instance, field)
+            for field in TaskExecution.CHECK_DEADLINE_TASK_FIELDS)):
+        instance.update_execution_check_deadlines()
+
+@receiver(post_save, sender=RunEnvironment)
+def invalidate_auto_created_task_properties_of_run_environment(
+        sender: Type[RunEnvironment], instance: RunEnvironment,
+        created: bool, **kwargs) -> None:
+    # Tasks inherit settings from their Run Environment, so the next
+    # auto-created properties must be applied again
+    if not created:
+        Task.objects.filter(run_environment=instance).exclude(
+                auto_created_task_properties_digest='').update(
+                auto_created_task_properties_digest='')
 
 @receiver(pre_delete, sender=Task)
 def pre_delete_task(sender: Type[Task], instance: Task, **kwargs) -> None:
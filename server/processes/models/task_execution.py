@@ -1,13 +1,14 @@
 from __future__ import annotations
 
-from typing import Type, TYPE_CHECKING, cast, override
+from typing import Any, Type, TYPE_CHECKING, cast, override
 
-import copy
+from datetime import datetime, timedelta
 import enum
 import json
 import logging
 
 from django.db import models
+from django.db.models import Q
 from django.db.models.signals import pre_save, post_save
 from django.dispatch import receiver
 
@@ -19,6 +20,7 @@ from django_middleware_global_request.middleware import get_request
 from rest_framework.exceptions import ValidationError
 
 from ..common.aws import *
+from ..common.history_retention import get_history_retention
 from ..common.utils import coalesce, val_to_str
 from ..execution_methods.execution_method import ExecutionMethod
 
@@ -27,6 +29,7 @@ from .task import Task
 from .event import Event
 from .task_execution_configuration import TaskExecutionConfiguration
 from .schedulable import Schedulable
+from .subscription import Subscription
 
 
 if TYPE_CHECKING:
@@ -100,6 +103,21 @@ class TaskExecution(TaskExecutionConfiguration, Execution):
     # ago.
     MAX_STATUS_ALERT_AGE_SECONDS = 24 * 60 * 60
 
+    # Abandon Task Executions that have been stopping for longer than this
+    MAX_STOPPING_DURATION_SECONDS = 10 * 60
+
+    # The Task fields that determine check_deadline_at
+    CHECK_DEADLINE_TASK_FIELDS = [
+        'enabled',
+        'max_age_seconds',
+        'max_manual_start_delay_before_alert_seconds',
+        'max_manual_start_delay_before_abandonment_seconds',
+        'max_heartbeat_lateness_before_alert_seconds',
+        'max_heartbeat_lateness_before_abandonment_seconds',
+        'notification_event_severity_on_missing_heartbeat',
+        'aws_ecs_service_updated_at',
+    ]
+
     task = models.ForeignKey(Task, on_delete=models.CASCADE,
             db_column='process_type_id')
     auto_created_task_properties = models.JSONField(null=True, blank=True)
@@ -113,10 +131,14 @@ class TaskExecution(TaskExecutionConfiguration, Execution):
     hostname = models.CharField(max_length=1000, null=True, blank=True)
 
     last_app_heartbeat_at = models.DateTimeField(null=True, blank=True)
+
+    # The earliest time TaskExecutionChecker may need to act on this
+    # Task Execution, or NULL if it never needs to
+    check_deadline_at = models.DateTimeField(null=True, blank=True,
+            editable=False)
+
     exit_code = models.IntegerField(null=True, blank=True)
 
-    debug_log_tail = models.CharField(max_length=5000000, null=True, blank=True)
-    error_log_tail = models.CharField(max_length=5000000, null=True, blank=True)
     last_status_message = models.CharField(max_length=5000, null=True, blank=True)
     success_count = models.BigIntegerField(null=True, blank=True)
     error_count = models.BigIntegerField(null=True, blank=True)
@@ -177,6 +199,9 @@ class TaskExecution(TaskExecutionConfiguration, Execution):
         indexes = [
             models.Index(fields=['task', 'started_at'],
                     name='taskexec_task_started_at_idx'),
+            models.Index(fields=['check_deadline_at'],
+                    name='taskexec_check_deadline_idx',
+                    condition=Q(check_deadline_at__isnull=False)),
         ]
 
 
@@ -219,6 +244,120 @@ class TaskExecution(TaskExecutionConfiguration, Execution):
 
         exec_method.manually_start()
 
+    def compute_check_deadline_at(self,
+            skip_alerts_before: datetime | None = None) -> datetime | None:
+        """
+        Return the earliest time at which TaskExecutionChecker may need to
+        alert on, stop, or abandon this Task Execution, or None if it never
+        needs to. Alerts due at or before skip_alerts_before are ignored,
+        since the checker has already handled them.
+        """
+        if (self.status not in TaskExecution.AWAITING_UPDATE_STATUSES) or \
+                self.finished_at:
+            return None
+
+        task = self.task
+        started_at = self.started_at or self.created_at or timezone.now()
+        alert_deadlines: list[datetime] = []
+        action_deadlines: list[datetime] = []
+
+        if self.status == Execution.Status.MANUALLY_STARTED:
+            if task.max_manual_start_delay_before_alert_seconds is not None:
+                alert_deadlines.append(started_at + timedelta(
+                        seconds=task.max_manual_start_delay_before_alert_seconds))
+
+            if task.max_manual_start_delay_before_abandonment_seconds is not None:
+                action_deadlines.append(started_at + timedelta(
+                        seconds=task.max_manual_start_delay_before_abandonment_seconds))
+
+        if self.status == Execution.Status.STOPPING:
+            action_deadlines.append(started_at + timedelta(
+                    seconds=self.MAX_STOPPING_DURATION_SECONDS))
+        elif task.max_age_seconds is not None:
+            action_deadlines.append(started_at + timedelta(
+                    seconds=task.max_age_seconds))
+
+        if (self.status == Execution.Status.RUNNING) and self.started_at and \
+                task.notification_event_severity_on_missing_heartbeat and \
+                (self.heartbeat_interval_seconds is not None):
+            expected_heartbeat_at = self.last_heartbeat_at or self.started_at
+
+            if task.aws_ecs_service_updated_at and \
+                    (task.aws_ecs_service_updated_at > expected_heartbeat_at):
+                expected_heartbeat_at = task.aws_ecs_service_updated_at
+
+            expected_heartbeat_at += timedelta(
+                    seconds=self.heartbeat_interval_seconds)
+
+            if task.max_heartbeat_lateness_before_alert_seconds is not None:
+                alert_deadlines.append(expected_heartbeat_at + timedelta(
+                        seconds=task.max_heartbeat_lateness_before_alert_seconds))
+
+            if task.max_heartbeat_lateness_before_abandonment_seconds is not None:
+                action_deadlines.append(expected_heartbeat_at + timedelta(
+                        seconds=task.max_heartbeat_lateness_before_abandonment_seconds))
+
+        if skip_alerts_before:
+            alert_deadlines = [deadline for deadline in alert_deadlines
+                    if deadline > skip_alerts_before]
+
+        return min(alert_deadlines + action_deadlines, default=None)
+
+    def record_heartbeat(self, utc_now: datetime | None = None,
+            **attrs: Any) -> bool:
+        """
+        Record a heartbeat using a single conditional UPDATE that bypasses
+        the model signals. The UPDATE only matches if the Task Execution is
+        still RUNNING and its previous heartbeat was recent enough that no
+        missing heartbeat event can be awaiting resolution. Returns False,
+        leaving the row untouched, if the full save() path is required.
+        """
+        utc_now = utc_now or timezone.now()
+
+        qs = TaskExecution.objects.filter(pk=self.pk,
+                status=Execution.Status.RUNNING)
+
+        task = self.task
+        heartbeat_interval_seconds = self.heartbeat_interval_seconds or \
+                task.heartbeat_interval_seconds
+        max_lateness_seconds = task.max_heartbeat_lateness_before_alert_seconds
+
+        if heartbeat_interval_seconds and (max_lateness_seconds is not None):
+            if task.heartbeat_interval_seconds:
+                heartbeat_interval_seconds = min(heartbeat_interval_seconds,
+                        task.heartbeat_interval_seconds)
+
+            qs = qs.filter(last_heartbeat_at__gte=utc_now - timedelta(
+                    seconds=heartbeat_interval_seconds + max_lateness_seconds))
+
+        last_heartbeat_at = self.last_heartbeat_at
+        self.last_heartbeat_at = utc_now
+        check_deadline_at = self.compute_check_deadline_at()
+        self.last_heartbeat_at = last_heartbeat_at
+
+        updated_count = qs.update(last_heartbeat_at=utc_now,
+                check_deadline_at=check_deadline_at, updated_at=utc_now,
+                **attrs)
+
+        if updated_count == 0:
+            return False
+
+        self.last_heartbeat_at = utc_now
+        self.check_deadline_at = check_deadline_at
+        self.updated_at = utc_now
+        for attr, value in attrs.items():
+            setattr(self, attr, value)
+
+        # Workflow Executions are updated through their liveness throttle
+        from .workflow_execution import WorkflowExecution
+
+        for workflow_execution in WorkflowExecution.objects.filter(
+                workflowtaskinstanceexecution__task_execution=self) \
+                .only('id', 'started_at', 'last_heartbeat_at'):
+            workflow_execution.update_last_heartbeat_at(utc_now)
+
+        return True
+
     def enrich_settings(self) -> None:
         self.execution_method().enrich_task_execution_settings()
 
@@ -410,9 +549,16 @@ def pre_save_task_execution(sender: Type[TaskExecution], instance: TaskExecution
     old_instance: TaskExecution | None = None
 
     if instance.pk is None:
-        logger.info('Purging Task Execution history before saving new Execution ...')
-        num_removed = instance.task.purge_history(reservation_count=1, max_to_purge=50)
-        logger.info(f'Purged {num_removed} Task Executions')
+        task = instance.task
+        max_items = Subscription.compute_usage_limits(
+                task.created_by_group).max_task_execution_history_items
+        num_removed = get_history_retention().before_insert(
+                f"task_executions:{task.pk}", max_items,
+                count=lambda: task.taskexecution_set.count(),
+                trim=lambda: task.purge_history(reservation_count=1, max_to_purge=50))
+
+        if num_removed:
+            logger.info(f'Purged {num_removed} Task Executions')
     else:
         old_instance = cast(TaskExecution, instance._loaded_copy)
 
@@ -445,6 +591,8 @@ def pre_save_task_execution(sender: Type[TaskExecution], instance: TaskExecution
         logger.warning(f"Failed to enrich Task Execution {instance.uuid} settings",
                 exc_info=ex)
 
+    instance.check_deadline_at = instance.compute_check_deadline_at()
+
     logger.info(f"After Pre-Saved Task Execution {instance.uuid} settings, started_at = {instance.started_at}")
 
 
@@ -455,7 +603,7 @@ def post_save_task_execution(sender: Type[TaskExecution], instance: TaskExecutio
     logger.info(f"Before Post-Saved Task Execution {instance.uuid} settings, started_at = {instance.started_at}")
 
     old_instance = instance._loaded_copy
-    instance._loaded_copy = copy.copy(instance)
+    instance.remember_loaded_values()
 
     was_in_progress = (old_instance is None) or old_instance.is_in_progress()
     in_progress = instance.is_in_progress()
@@ -524,11 +672,9 @@ def post_save_task_execution(sender: Type[TaskExecution], instance: TaskExecutio
 
     if wtie:
         workflow_execution = wtie.workflow_execution
-        workflow_execution.last_heartbeat_at = max(
-            workflow_execution.last_heartbeat_at or workflow_execution.started_at,
-            instance.last_heartbeat_at or timezone.now()
-        )
-        workflow_execution.save()
+        workflow_execution.update_last_heartbeat_at(
+                instance.last_heartbeat_at or timezone.now(),
+                force=(old_instance is None) or (old_instance.status != instance.status))
 
         if not in_progress:
             if instance.stop_reason in [TaskExecution.StopReason.WORKFLOW_EXECUTION_STOPPED, TaskExecution.StopReason.WORKFLOW_EXECUTION_RETRIED]:
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import gzip
+import logging
+
+from django.db import models, transaction
+
+if TYPE_CHECKING:
+    from .task_execution import TaskExecution
+
+
+logger = logging.getLogger(__name__)
+
+
+class TaskExecutionLogChunk(models.Model):
+    """
+    A compressed piece of the debug or error log tail of a Task Execution.
+    Log tails are stored here instead of in the Task Execution row, so that
+    saving and loading Task Executions doesn't read or rewrite them. Chunks
+    are only appended, and the oldest are removed once the tail is longer
+    than MAX_TAIL_LENGTH characters.
+    """
+
+    STREAM_DEBUG = 'debug'
+    STREAM_ERROR = 'error'
+
+    STREAM_CHOICES = [
+        (STREAM_DEBUG, 'Debug'),
+        (STREAM_ERROR, 'Error'),
+    ]
+
+    MAX_TAIL_LENGTH = 5000000
+
+    COMPRESSION_LEVEL = 6
+
+    task_execution = models.ForeignKey('TaskExecution',
+            on_delete=models.CASCADE, related_name='log_chunks')
+    stream = models.CharField(max_length=10, choices=STREAM_CHOICES)
+
+    # gzip compressed UTF-8 text
+    data = models.BinaryField()
+
+    # Number of characters in the uncompressed text
+    length = models.PositiveIntegerField()
+
+    # Number of characters appended to the stream up to the end of this
+    # chunk, since the stream was last replaced. Increases with each chunk,
+    # so appending and trimming don't have to add up the lengths of all
+    # chunks.
+    end_offset = models.BigIntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['task_execution', 'stream', 'end_offset'],
+                    name='telogchunk_te_stream_end_idx'),
+        ]
+
+    @staticmethod
+    def compress(text: str) -> bytes:
+        return gzip.compress(text.encode('utf-8'),
+                compresslevel=TaskExecutionLogChunk.COMPRESSION_LEVEL)
+
+    @staticmethod
+    def decompress(data: bytes | memoryview) -> str:
+        return gzip.decompress(bytes(data)).decode('utf-8')
+
+    @staticmethod
+    def append(task_execution: TaskExecution, stream: str, text: str | None) -> None:
+        """
+        Append text to the log tail of the stream, then remove the oldest
+        chunks that are no longer part of the tail.
+        """
+        if not text:
+            return
+
+        text = text[-TaskExecutionLogChunk.MAX_TAIL_LENGTH:]
+
+        with transaction.atomic():
+            TaskExecutionLogChunk.lock(task_execution)
+
+            last_end_offset = TaskExecutionLogChunk.objects.filter(
+                    task_execution=task_execution, stream=stream) \
+                    .order_by('-end_offset') \
+                    .values_list('end_offset', flat=True).first() or 0
+
+            end_offset = last_end_offset + len(text)
+
+            TaskExecutionLogChunk.objects.create(task_execution=task_execution,
+                    stream=stream, data=TaskExecutionLogChunk.compress(text),
+                    length=len(text), end_offset=end_offset)
+
+            TaskExecutionLogChunk.trim(task_execution, stream, end_offset)
+
+    @staticmethod
+    def replace(task_execution: TaskExecution, stream: str, text: str | None) -> None:
+        """
+        Replace the log tail of the stream with text. None or an empty
+        string removes it.
+        """
+        with transaction.atomic():
+            TaskExecutionLogChunk.lock(task_execution)
+            TaskExecutionLogChunk.objects.filter(task_execution=task_execution,
+                    stream=stream).delete()
+            TaskExecutionLogChunk.append(task_execution, stream, text)
+
+    @staticmethod
+    def lock(task_execution: TaskExecution) -> None:
+        """
+        Lock the Task Execution row until the current transaction ends, so
+        that appends and replacements of its log tails are serialized, even
+        before a stream has any chunks to lock.
+        """
+        from .task_execution import TaskExecution
+
+        TaskExecution.objects.select_for_update().filter(pk=task_execution.pk) \
+                .values_list('pk', flat=True).first()
+
+    @staticmethod
+    def trim(task_execution: TaskExecution, stream: str, end_offset: int) -> None:
+        """
+        Delete the chunks of the stream that end before the last
+        MAX_TAIL_LENGTH characters, given the end_offset of its last chunk.
+        """
+        TaskExecutionLogChunk.objects.filter(task_execution=task_execution,
+                stream=stream,
+                end_offset__lte=end_offset - TaskExecutionLogChunk.MAX_TAIL_LENGTH) \
+                .delete()
+
+    @staticmethod
+    def read_tail(task_execution: TaskExecution, stream: str) -> str | None:
+        """
+        Returns the last MAX_TAIL_LENGTH characters logged to the stream, or
+        None if nothing was logged.
+        """
+        chunks = TaskExecutionLogChunk.objects.filter(
+                task_execution=task_execution, stream=stream).order_by('end_offset') \
+                .values_list('data', flat=True)
+
+        texts = [TaskExecutionLogChunk.decompress(data) for data in chunks]
+
+        if not texts:
+            return None
+
+        return ''.join(texts)[-TaskExecutionLogChunk.MAX_TAIL_LENGTH:]
@@ -24,13 +24,13 @@ class TaskExecutionStatusChangeEvent(ExecutionStatusChangeEvent, TaskExecutionEv
         """Execution {{task_execution.uuid}} of Task '{{task.name}}' finished with status {{task_execution.status}}"""
 
     def __init__(self, *args, **kwargs):
-        from ..services.notification_generator import NotificationGenerator
+        from ..services.notification_generator import NotificationContext
 
         super().__init__(*args, **kwargs)
 
         # Only generate error_summary if task_execution is set
         if self.task_execution:
-            notification_generator = NotificationGenerator()
+            notification_generator = NotificationContext.for_event(self)
 
             template_params = notification_generator.make_template_params(
                     task_execution=self.task_execution,
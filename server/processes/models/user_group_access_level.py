@@ -2,10 +2,16 @@ from typing import cast
 
 from django.conf import settings
 from django.db import models
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
 
 from django.contrib.auth.models import Group, AbstractUser, User
 from django.utils.translation import gettext_lazy as _
 
+from ..common.api_key_cache import get_api_key_cache
+from ..common.authorization_context import forget_authorizations
+from ..common.utils import invalidate_now_and_on_commit
+
 
 class UserGroupAccessLevel(models.Model):
     ACCESS_LEVEL_OBSERVER = 1
@@ -56,3 +62,52 @@ class UserGroupAccessLevel(models.Model):
     def admin_count(group: Group) -> int:
         return UserGroupAccessLevel.objects.filter(group=group,
                 access_level__gte=UserGroupAccessLevel.ACCESS_LEVEL_ADMIN).count()
+
+
+@receiver([post_save, post_delete], sender=UserGroupAccessLevel)
+def invalidate_access_levels_of_user(sender: type[UserGroupAccessLevel],
+        instance: UserGroupAccessLevel, **kwargs) -> None:
+    user_id = instance.user_id
+    invalidate_now_and_on_commit(lambda: get_api_key_cache().invalidate_user(user_id))
+    forget_authorizations()
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_api_keys_of_user(sender: type[User], instance: User,
+        **kwargs) -> None:
+    # API keys cache their User, including if it is active
+    user_id = instance.pk
+    invalidate_now_and_on_commit(lambda: get_api_key_cache().invalidate_user(user_id))
+
+
+@receiver([post_save, post_delete], sender=Group)
+def invalidate_api_keys_of_group(sender: type[Group], instance: Group,
+        **kwargs) -> None:
+    group_id = instance.pk
+    invalidate_now_and_on_commit(lambda: get_api_key_cache().invalidate_group(group_id))
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_access_levels_of_group_members(sender: type, instance: User | Group,
+        action: str, reverse: bool, pk_set: set[int] | None, **kwargs) -> None:
+    if not action.startswith('post_'):
+        return
+
+    instance_id = instance.pk
+    user_ids = None if pk_set is None else list(pk_set)
+
+    def invalidate() -> None:
+        api_key_cache = get_api_key_cache()
+
+        if reverse:
+            # instance is a Group; pk_set has User IDs, or is None when cleared
+            if user_ids is None:
+                api_key_cache.invalidate_group(instance_id)
+            else:
+                for user_id in user_ids:
+                    api_key_cache.invalidate_user(user_id)
+        else:
+            api_key_cache.invalidate_user(instance_id)
+
+    invalidate_now_and_on_commit(invalidate)
+    forget_authorizations()
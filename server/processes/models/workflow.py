@@ -2,7 +2,6 @@ from __future__ import annotations
 
 from typing import Any, Type, TYPE_CHECKING, cast, override
 
-import copy
 from datetime import datetime
 import json
 import logging
@@ -23,6 +22,7 @@ from rest_framework.exceptions import APIException
 
 from botocore.exceptions import ClientError
 
+from ..common.history_retention import get_history_retention
 from ..common.utils import generate_clone_name
 from ..common.aws import handle_aws_multiple_failure_response
 from ..exception import UnprocessableEntity
@@ -57,6 +57,9 @@ class Workflow(Schedulable):
         ordering = ['name']
         unique_together = (('name', 'created_by_group'),)
 
+    CHANGE_TRACKED_FIELDS = Schedulable.CHANGE_TRACKED_FIELDS + \
+            tuple(AWS_SCHEDULE_ATTRIBUTES) + ('scheduling_run_environment_id',)
+
     latest_workflow_execution = models.OneToOneField('WorkflowExecution',
         # Don't backreference, since WorkflowExecutions already point to Workflows
         related_name='+',
@@ -237,21 +240,11 @@ class Workflow(Schedulable):
 
         logger.info(f"Removing {items_to_remove=} Workflow Execution history items ...")
 
-        completed_qs = qs.exclude(
-                status__in=WorkflowExecution.IN_PROGRESS_STATUSES) \
-                .order_by('finished_at')[0:items_to_remove]
-
-        num_completed_deleted = 0
-        for we in completed_qs.iterator():
-            if num_completed_deleted >= items_to_remove:
-                break
+        completed_qs = qs.exclude(status__in=WorkflowExecution.IN_PROGRESS_STATUSES)
 
-            try:
-                we.delete()
-                num_completed_deleted += 1
-            except Exception:
-                logger.warning(f"Failed to delete completed Workflow Execution {we.uuid}",
-                        exc_info=True)
+        num_completed_deleted = get_history_retention().delete_oldest(
+                completed_qs, order_by='finished_at',
+                max_to_delete=items_to_remove)
 
         logger.info(f"Removed {num_completed_deleted=} completed Workflow Execution history items")
 
@@ -263,22 +256,9 @@ class Workflow(Schedulable):
 
         logger.warning(f"Must remove {items_to_remove=} Workflow Executions that are still in-progress")
 
-        in_progress_qs = self.in_progress_executions_queryset() \
-                .order_by('started_at')[0:items_to_remove]
-
-        num_in_progress_deleted = 0
-        for we in in_progress_qs.iterator():
-            if num_in_progress_deleted >= items_to_remove:
-                break
-
-            logger.info(f"Deleting in-progress {we=} with {we.started_at=}")
-
-            try:
-                we.delete()
-                num_in_progress_deleted += 1
-            except Exception:
-                logger.warning(f"Failed to delete in-progress Workflow Execution {we.uuid}",
-                        exc_info=True)
+        num_in_progress_deleted = get_history_retention().delete_oldest(
+                self.in_progress_executions_queryset(), order_by='started_at',
+                max_to_delete=items_to_remove)
 
         logger.info(f"Removed {num_in_progress_deleted=} in-progress Workflow Execution history items")
         return num_completed_deleted + num_in_progress_deleted
@@ -593,10 +573,13 @@ def pre_save_workflow(sender: Type[Workflow], instance: Workflow, **kwargs) -> N
     else:
         logger.info("Not updating schedule params")
 
+    if kwargs.get('update_fields') is None:
+        instance.update_next_schedule_check()
+
 @receiver(post_save, sender=Workflow)
 def post_save_workflow(sender: Type[Workflow], instance: Workflow, **kwargs) -> None :
     logger.info(f"post_save_workflow with Workflow {instance} ...")
-    instance._loaded_copy = copy.copy(instance)
+    instance.remember_loaded_values()
 
 
 @receiver(pre_delete, sender=Workflow)
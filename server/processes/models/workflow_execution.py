@@ -2,13 +2,13 @@ from __future__ import annotations
 
 from typing import Type, TYPE_CHECKING, cast, override
 
-import copy
+from datetime import datetime
 import enum
 import logging
 
-import networkx as nx
-
 from django.db import models
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce, Greatest
 from django.db.models.signals import pre_save, post_save
 from django.dispatch import receiver
 from django.utils import timezone
@@ -17,15 +17,26 @@ from django.contrib.auth.models import User
 from django_middleware_global_request.middleware import get_request
 
 from ..common.notification import *
+from ..common.compiled_workflow import (
+    CompiledWorkflow,
+    WorkflowProgress,
+    get_compiled_workflow,
+    snapshot_digest,
+    snapshot_task_instances,
+)
+from ..common.history_retention import get_history_retention
+from ..common.liveness_throttle import get_workflow_liveness_throttle
 from ..common.request_helpers import context_with_request
 from ..exception.unprocessable_entity import UnprocessableEntity
 
 from .execution import Execution
 from .schedulable import Schedulable
+from .subscription import Subscription
 from .task_execution import TaskExecution
 from .workflow import Workflow
 
 if TYPE_CHECKING:
+    from .workflow_task_instance import WorkflowTaskInstance
     from .workflow_task_instance_execution import WorkflowTaskInstanceExecution
     from .workflow_execution_status_change_event import WorkflowExecutionStatusChangeEvent
 
@@ -66,6 +77,11 @@ class WorkflowExecution(Execution):
     workflow = models.ForeignKey(Workflow, on_delete=models.CASCADE)
     workflow_snapshot = models.JSONField(null=True, blank=True)
 
+    # Identifies the contents of workflow_snapshot, so its compiled graph can
+    # be cached without hashing the snapshot on every lookup
+    workflow_snapshot_digest = models.CharField(max_length=64, null=True,
+            blank=True, editable=False)
+
     class Meta:
         ordering = ['started_at']
         indexes = [
@@ -123,7 +139,7 @@ class WorkflowExecution(Execution):
 
     @override
     def manually_start(self) -> None:
-        from ..serializers.workflow_serializer import WorkflowSerializer
+        from ..services.workflow_task_instance_starter import WorkflowTaskInstanceStarter
 
         logger.info(f"Manually starting workflow execution with UUID = {self.uuid} ...")
 
@@ -137,10 +153,7 @@ class WorkflowExecution(Execution):
 
             request = get_request()
 
-            self.workflow_snapshot = WorkflowSerializer(workflow,
-                context=context_with_request()).data
-
-            self.workflow_snapshot.pop('latest_workflow_execution')
+            self.take_workflow_snapshot()
 
             logger.info(f"Manually starting workflow with UUID = {workflow.uuid}, name = '{workflow.name}' ...")
 
@@ -151,11 +164,11 @@ class WorkflowExecution(Execution):
             self.started_by = request.user
             self.save()
 
-            roots = workflow.find_start_task_instances()
+            roots = list(workflow.find_start_task_instances())
 
-            for root in roots:
-                logger.info(f"Starting root wpti uuid = {root.uuid}, name = {root.name}")
-                root.start(workflow_execution=self)
+            logger.info(f"Starting root wptis {[str(root.uuid) for root in roots]}")
+            WorkflowTaskInstanceStarter.from_settings().start(roots,
+                    workflow_execution=self)
 
             # In case there are no root processes
             self.check_if_complete()
@@ -166,6 +179,7 @@ class WorkflowExecution(Execution):
             self.save()
 
     def retry(self) -> WorkflowExecution:
+        from ..services.workflow_task_instance_starter import WorkflowTaskInstanceStarter
         from .workflow_task_instance_execution import WorkflowTaskInstanceExecution
 
         logger.info(f"Retrying Workflow Execution with UUID = {self.uuid} ...")
@@ -200,10 +214,15 @@ class WorkflowExecution(Execution):
             self.started_by = current_user
 
             roots = self.workflow.find_start_task_instances()
+            pending_starts: list[WorkflowTaskInstance] = []
 
             for root in roots:
                 logger.info(f"Retrying if unsuccessful root wpti uuid = {root.uuid}, name = {root.name}")
-                root.retry_if_unsuccessful(workflow_execution=self)
+                root.retry_if_unsuccessful(workflow_execution=self,
+                        pending_starts=pending_starts)
+
+            WorkflowTaskInstanceStarter.from_settings().start(pending_starts,
+                    workflow_execution=self)
         except Exception:
             logger.exception(f"Failed to retry Workflow {self.workflow.uuid}")
             self.status = Execution.Status.FAILED
@@ -241,6 +260,9 @@ class WorkflowExecution(Execution):
 
     def handle_workflow_task_instance_execution_finished(self, wptie: 'WorkflowTaskInstanceExecution',
         skipped=False, retry_mode=False) -> None:
+        from ..services.workflow_task_instance_starter import WorkflowTaskInstanceStarter
+        from .workflow_task_instance import WorkflowTaskInstance
+        from .workflow_transition import WorkflowTransition
         from .workflow_transition_evaluation import WorkflowTransitionEvaluation
 
         if self.status in [Execution.Status.STOPPING, Execution.Status.STOPPED]:
@@ -248,48 +270,87 @@ class WorkflowExecution(Execution):
             return
 
         try:
-            # TODO: look this up differently if using the snapshot
-            transitions = self.workflow.workflow_transitions().filter(
-                from_workflow_task_instance=wptie.workflow_task_instance)
+            compiled_workflow = self.compiled_workflow()
+            wti_uuid = wptie.workflow_task_instance.uuid
+            transitions = compiled_workflow.outbound_transitions(wti_uuid)
 
-            logger.info(f"Found {len(transitions)} outbound transitions for wpti {wptie.workflow_task_instance.uuid}")
+            logger.info(f"Found {len(transitions)} outbound transitions for wpti {wti_uuid}")
+
+            if skipped:
+                # CHECKME: should we use the last Task Execution's properties?
+                task_execution_status = Execution.Status.SUCCEEDED
+                exit_code: int | None = 0
+            else:
+                task_execution_status = wptie.task_execution.status
+                exit_code = wptie.task_execution.exit_code
 
+            evaluations: list[WorkflowTransitionEvaluation] = []
             activated_transitions = []
 
+            # Transitions may have been deleted since the Workflow was compiled
+            existing_transition_ids = set(WorkflowTransition.objects.filter(
+                    id__in=[transition.id for transition in transitions
+                            if transition.id is not None]) \
+                    .values_list('id', flat=True))
+
             for transition in transitions:
-                if skipped:
-                    # CHECKME: should we use the last Task Execution's properties?
-                    should_activate = transition.should_activate(
-                        task_execution_status=Execution.Status.SUCCEEDED,
-                        exit_code=0)
-                else:
-                    should_activate = transition.should_activate_from(wptie)
+                if transition.id not in existing_transition_ids:
+                    logger.warning(f"For workflow execution {self.uuid}, skipping transition {transition.uuid} since it was deleted")
+                    continue
+
+                should_activate = WorkflowTransition.rule_matches(
+                        rule_type=transition.rule_type,
+                        exit_codes=transition.exit_codes,
+                        task_execution_status=task_execution_status,
+                        exit_code=exit_code)
 
                 logger.info(f"For workflow execution {self.uuid}, transition {transition.uuid}, should_activate = {should_activate}")
 
                 wte = WorkflowTransitionEvaluation(result=should_activate,
                     workflow_execution=self,
                     from_workflow_task_instance_execution=wptie,
-                    workflow_transition=transition)
-                wte.save()
+                    workflow_transition_id=transition.id)
+                evaluations.append(wte)
 
                 if should_activate:
                     activated_transitions.append([transition, wte])
 
+            WorkflowTransitionEvaluation.objects.bulk_create(evaluations)
+
             self.check_if_complete(is_pending_transition_activation=len(activated_transitions) > 0)
 
             if self.status == Execution.Status.RUNNING:
                 first_ex = None
-                for pair in activated_transitions:
+                pending_starts: list[WorkflowTaskInstance] = []
+                to_wti_ids = [compiled_workflow.task_instance_ids[pair[0].to_index]
+                        for pair in activated_transitions]
+                to_wtis = WorkflowTaskInstance.objects.select_related('task') \
+                        .in_bulk([wti_id for wti_id in to_wti_ids if wti_id is not None])
+                progress = WorkflowProgress.load(self,
+                        [to_wti.uuid for to_wti in to_wtis.values()])
+
+                for pair, to_wti_id in zip(activated_transitions, to_wti_ids):
                     transition = pair[0]
                     wte = pair[1]
+                    to_wti = to_wtis.get(to_wti_id) if to_wti_id else None
+
+                    if to_wti is None:
+                        logger.warning(f"For workflow execution {self.uuid}, not activating transition {transition.uuid} since its destination was deleted")
+                        continue
+
                     try:
-                        transition.to_workflow_task_instance.handle_inbound_transition_activated(
-                            wte, retry_mode=retry_mode)
+                        to_wti.handle_inbound_transition_activated(
+                            wte, retry_mode=retry_mode, pending_starts=pending_starts,
+                            progress=progress)
                     except Exception as ex:
-                        logger.exception(f"Failed to activate wpti {transition.to_workflow_task_instance.uuid}")
+                        logger.exception(f"Failed to activate wpti {to_wti.uuid}")
                         first_ex = first_ex or ex
 
+                # Branches that fail to start fail their Task Executions,
+                # which are handled like other failed Task Executions
+                WorkflowTaskInstanceStarter.from_settings().start(
+                        pending_starts, workflow_execution=self)
+
                 if first_ex:
                     raise first_ex
         except Exception:
@@ -305,6 +366,7 @@ class WorkflowExecution(Execution):
                 pass
 
     def start_task_instance_executions(self, wti_uuids):
+        from ..services.workflow_task_instance_starter import WorkflowTaskInstanceStarter
         from .workflow_task_instance import WorkflowTaskInstance
 
         wtis = WorkflowTaskInstance.objects.filter(uuid__in=wti_uuids,
@@ -320,9 +382,9 @@ class WorkflowExecution(Execution):
 
         self.invalidate_reachable_task_instance_executions(wti_uuids)
 
-        for wti in wtis:
-            logger.info(f"Manually starting wti uuid = {wti.uuid}, name = {wti.name}")
-            wti.start(workflow_execution=self)
+        logger.info(f"Manually starting wtis {[str(wti.uuid) for wti in wtis]}")
+        WorkflowTaskInstanceStarter.from_settings().start(wtis,
+                workflow_execution=self)
 
         self.refresh_from_db()
         self.check_if_complete()
@@ -333,15 +395,12 @@ class WorkflowExecution(Execution):
 
         logger.info(f"wti UUIDs = {wti_uuids}")
 
-        mdg, _uuid_to_wti, _uuid_to_wt = self.make_multidigraph_and_lookup_tables()
-
-        reachable_wti_uuids = set()
-        for wti_uuid in wti_uuids:
-            reachable_wti_uuids |= set(nx.dfs_preorder_nodes(mdg, str(wti_uuid)))
+        reachable_wti_uuids = self.compiled_workflow().reachable_task_instance_uuids(
+                wti_uuids)
 
         logger.info(f"Reachable wti UUIDs = {reachable_wti_uuids}")
 
-        WorkflowTaskInstanceExecution.objects.select_related('workflow_task_instance').filter(
+        WorkflowTaskInstanceExecution.objects.filter(workflow_execution=self,
                 workflow_task_instance__uuid__in=reachable_wti_uuids).update(is_latest=False)
 
     def check_if_complete(self, is_pending_transition_activation=False) -> bool:
@@ -377,9 +436,16 @@ class WorkflowExecution(Execution):
             return self.status
 
         current_executions = list(WorkflowTaskInstanceExecution.objects.filter(
-            workflow_execution=self, is_latest=True).prefetch_related('task_execution').
+            workflow_execution=self, is_latest=True).select_related('task_execution',
+            'workflow_task_instance').
             exclude(task_execution__status=Execution.Status.SUCCEEDED))
 
+        # Look at outbound transitions to see if any occurred
+        handled_wtie_ids = set(WorkflowTransitionEvaluation.objects.filter(
+                from_workflow_task_instance_execution__in=[wtie.pk for wtie in current_executions
+                    if wtie.task_execution.status not in TaskExecution.IN_PROGRESS_STATUSES],
+                result=True).values_list('from_workflow_task_instance_execution_id', flat=True))
+
         updated_status_if_not_running = Execution.Status.SUCCEEDED
         running_task_execution: TaskExecution | None = None
 
@@ -393,10 +459,7 @@ class WorkflowExecution(Execution):
             if tes in TaskExecution.IN_PROGRESS_STATUSES:
                 running_task_execution = task_execution
             else:
-                # Look at outbound transitions to see if any occurred
-                was_handled = WorkflowTransitionEvaluation.objects.filter(
-                        from_workflow_task_instance_execution=wtie,
-                        result=True).exists()
+                was_handled = wtie.pk in handled_wtie_ids
 
                 logger.info(f"wti {wti.uuid} status {tes} was_handled = {was_handled}")
 
@@ -451,35 +514,78 @@ class WorkflowExecution(Execution):
         logger.info(f"compute_updated_status(): returning {updated_status_if_not_running=}")
         return updated_status_if_not_running
 
-    def make_multidigraph_and_lookup_tables(self):
+    def update_last_heartbeat_at(self, heartbeat_at: datetime,
+            force: bool = False) -> bool:
+        """
+        Record that a Task Execution of this Workflow Execution was alive at
+        heartbeat_at. The row is updated without saving, so signals don't
+        fire, and never moves back in time. Unless force is True, it is
+        updated at most once per LIVENESS_UPDATE_INTERVAL_SECONDS in this
+        process. Returns True if the row was updated.
+        """
+        self.last_heartbeat_at = max(self.last_heartbeat_at or self.started_at,
+                heartbeat_at)
+
+        if not get_workflow_liveness_throttle().should_write(self.pk, force=force):
+            return False
+
+        WorkflowExecution.objects.filter(pk=self.pk).update(
+                last_heartbeat_at=Greatest(
+                    Coalesce(F('last_heartbeat_at'), F('started_at')),
+                    Value(heartbeat_at)),
+                updated_at=timezone.now())
+
+        return True
+
+    def compiled_workflow(self) -> CompiledWorkflow:
+        """
+        Returns the compiled graph of the snapshot of the Workflow taken
+        when this Workflow Execution started, shared with other callers in
+        this process.
+        """
+        from .workflow_task_instance import WorkflowTaskInstance
+        from .workflow_transition import WorkflowTransition
+
         # To handle legacy data, remove when all workflows have been converted
-        from ..serializers.workflow_serializer import WorkflowSerializer
         if not self.workflow_snapshot:
-            self.workflow_snapshot = WorkflowSerializer(self.workflow,
-                context=context_with_request()).data
-
-            self.workflow_snapshot.pop('latest_workflow_execution')
+            self.take_workflow_snapshot()
             self.save()
 
-        mdg = nx.MultiDiGraph()
-        uuid_to_wti = {}
-        uuid_to_wt = {}
+        snapshot = self.workflow_snapshot
+
+        # Snapshots taken before the digest was stored
+        if self.workflow_snapshot_digest is None:
+            self.workflow_snapshot_digest = snapshot_digest(snapshot)
+            WorkflowExecution.objects.filter(pk=self.pk).update(
+                    workflow_snapshot_digest=self.workflow_snapshot_digest)
+
+        def create() -> CompiledWorkflow:
+            wti_uuids = [wti['uuid'] for wti in snapshot_task_instances(snapshot)]
+            wt_uuids = [wt['uuid'] for wt in snapshot['workflow_transitions']]
+
+            return CompiledWorkflow(snapshot,
+                    task_instance_ids={str(wti_uuid): wti_id for wti_uuid, wti_id in
+                        WorkflowTaskInstance.objects.filter(uuid__in=wti_uuids) \
+                        .values_list('uuid', 'id')},
+                    transition_ids={str(wt_uuid): wt_id for wt_uuid, wt_id in
+                        WorkflowTransition.objects.filter(uuid__in=wt_uuids) \
+                        .values_list('uuid', 'id')})
 
-        # For compatibility
-        for wti in self.workflow_snapshot.get('workflow_process_type_instances') or self.workflow_snapshot['workflow_task_instances']:
-            wti_uuid = wti['uuid']
-            uuid_to_wti[wti_uuid] = wti
-            mdg.add_node(wti_uuid)
+        return get_compiled_workflow(self.uuid, self.workflow_snapshot_digest,
+                create)
+
+    def take_workflow_snapshot(self) -> None:
+        """
+        Copy the current definition of the Workflow into workflow_snapshot,
+        without saving.
+        """
+        from ..serializers.workflow_serializer import WorkflowSerializer
 
-        for wt in self.workflow_snapshot['workflow_transitions']:
-            wt_uuid = wt['uuid']
-            uuid_to_wt[wt_uuid] = wt
-            mdg.add_edge((wt.get('from_workflow_process_type_instance') or \
-                    wt['from_workflow_task_instance'])['uuid'],
-                    (wt.get('to_workflow_process_type_instance') or \
-                    wt['to_workflow_task_instance'])['uuid'])
+        self.workflow_snapshot = WorkflowSerializer(self.workflow,
+            context=context_with_request()).data
 
-        return [mdg, uuid_to_wti, uuid_to_wt]
+        self.workflow_snapshot.pop('latest_workflow_execution')
+        self.workflow_snapshot_digest = snapshot_digest(self.workflow_snapshot)
 
     def handle_stop_requested(self):
         now = timezone.now()
@@ -548,9 +654,16 @@ def pre_save_workflow_execution(sender: Type[WorkflowExecution], instance: Workf
     old_instance: WorkflowExecution | None = None
 
     if instance.pk is None:
-        logger.info('Purging Workflow Execution history before saving new Workflow Execution ...')
-        num_removed = instance.workflow.purge_history(reservation_count=1)
-        logger.info(f'Purged {num_removed} Workflow Executions')
+        workflow = instance.workflow
+        max_items = Subscription.compute_usage_limits(
+                workflow.created_by_group).max_workflow_execution_history_items
+        num_removed = get_history_retention().before_insert(
+                f"workflow_executions:{workflow.pk}", max_items,
+                count=lambda: workflow.workflowexecution_set.count(),
+                trim=lambda: workflow.purge_history(reservation_count=1))
+
+        if num_removed:
+            logger.info(f'Purged {num_removed} Workflow Executions')
     else:
         old_instance = cast(WorkflowExecution, instance._loaded_copy)
         if old_instance and (old_instance.status == Execution.Status.RUNNING) and \
@@ -561,7 +674,7 @@ def pre_save_workflow_execution(sender: Type[WorkflowExecution], instance: Workf
 @receiver(post_save, sender=WorkflowExecution)
 def post_save_workflow_execution(sender: Type[WorkflowExecution], instance: WorkflowExecution, **kwargs) -> None:
     old_instance = cast(WorkflowExecution, instance._loaded_copy)
-    instance._loaded_copy = copy.copy(instance)
+    instance.remember_loaded_values()
 
     in_progress = instance.is_in_progress()
 
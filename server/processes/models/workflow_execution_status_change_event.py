@@ -24,13 +24,13 @@ class WorkflowExecutionStatusChangeEvent(ExecutionStatusChangeEvent, WorkflowExe
         """Workflow '{{workflow.name}}' finished with status {{workflow_execution.status}}"""
 
     def __init__(self, *args, **kwargs):
-        from ..services.notification_generator import NotificationGenerator
+        from ..services.notification_generator import NotificationContext
 
         super().__init__(*args, **kwargs)
 
         # Only generate error_summary if workflow_execution is set
         if self.workflow_execution and (not self.resolved_at) and (not self.error_summary):
-            notification_generator = NotificationGenerator()
+            notification_generator = NotificationContext.for_event(self)
 
             template_params = notification_generator.make_template_params(
                     workflow_execution=self.workflow_execution,
@@ -158,47 +158,32 @@ class WorkflowTaskInstance(UuidModel):
         return (self.name or 'Unnamed') + ' / ' + str(self.uuid)
 
     def start(self, workflow_execution):
-        from .execution import Execution
-        from .task_execution import TaskExecution
-        from .workflow_task_instance_execution import WorkflowTaskInstanceExecution
-
-        logger.info(f"Starting Workflow Task Instance with UUID = {self.uuid}, name = {self.name} ...")
-
-        task_execution = TaskExecution(
-          task=self.task,
-          status=Execution.Status.MANUALLY_STARTED,
-        )
-
-        logger.info(f"wti: new task execution emt = {task_execution.execution_method_type}")
-
-        task_execution.save()
-
-        logger.info(f"wti: save task execution emt = {task_execution.execution_method_type}")
+        from ..services.workflow_task_instance_starter import WorkflowTaskInstanceStarter
 
-        WorkflowTaskInstanceExecution.objects.filter(
-            workflow_execution=workflow_execution,
-            workflow_task_instance=self).update(is_latest=False)
-
-        wtie = WorkflowTaskInstanceExecution(
-            workflow_execution=workflow_execution,
-            workflow_task_instance=self,
-            task_execution=task_execution,
-            is_latest=True
-        )
-        wtie.save()
-
-        task_execution.manually_start()
+        wtie = WorkflowTaskInstanceStarter.from_settings().start([self],
+                workflow_execution)[0]
 
         logger.info(f"Started Workflow Task Instance with UUID = {self.uuid}, name = {self.name}")
 
         return wtie
 
-    def retry_if_unsuccessful(self, workflow_execution):
+    def start_or_defer(self, workflow_execution, pending_starts=None) -> None:
+        """
+        Start this Workflow Task Instance, or if pending_starts is a list,
+        add it to the list, so the caller can start it along with its
+        siblings.
+        """
+        if pending_starts is None:
+            self.start(workflow_execution)
+        else:
+            pending_starts.append(self)
+
+    def retry_if_unsuccessful(self, workflow_execution, pending_starts=None):
         latest_execution = self.find_latest_execution(workflow_execution)
 
         if latest_execution is None:
             logger.info(f"retry_if_unsuccessful() on wti {self.uuid} : no existing latest execution, starting ...")
-            self.start(workflow_execution)
+            self.start_or_defer(workflow_execution, pending_starts)
         else:
             task_execution = latest_execution.task_execution
 
@@ -213,7 +198,7 @@ class WorkflowTaskInstance(UuidModel):
             else:
                 logger.info(
                     f"retry_if_unsuccessful() on wti {self.uuid} : existing Task Execution {task_execution.uuid} was unsuccessful, starting ...")
-                self.start(workflow_execution)
+                self.start_or_defer(workflow_execution, pending_starts)
 
     def find_executions(self, workflow_execution):
         from .workflow_task_instance_execution import WorkflowTaskInstanceExecution
@@ -227,26 +212,26 @@ class WorkflowTaskInstance(UuidModel):
     def find_latest_execution(self, workflow_execution):
         return self.find_latest_executions(workflow_execution).last()
 
-    def find_activated_inbound_transition_evaluations(self, workflow_execution):
-        from .workflow_transition import WorkflowTransition
-        from .workflow_transition_evaluation import WorkflowTransitionEvaluation
-
-        return WorkflowTransitionEvaluation.objects.filter(
-            workflow_execution=workflow_execution, workflow_transition__uuid__in=
-            WorkflowTransition.objects.filter(to_workflow_task_instance__uuid=self.uuid).
-                values_list('uuid', flat=True),
-            from_workflow_task_instance_execution__is_latest=True,
-            result=True)
-
     def find_inbound_transitions(self):
         from .workflow_transition import WorkflowTransition
         return WorkflowTransition.objects.filter(to_workflow_task_instance=self)
 
     def handle_inbound_transition_activated(self,
-        workflow_transition_evaluation, retry_mode=False):
+        workflow_transition_evaluation, retry_mode=False, pending_starts=None,
+        progress=None):
+        """
+        Start this Workflow Task Instance if its start condition is met.
+        progress is the WorkflowProgress of the Workflow Execution, which
+        callers activating several Workflow Task Instances load once.
+        """
+        from ..common.compiled_workflow import WorkflowProgress
+
         workflow_execution = workflow_transition_evaluation.workflow_execution
 
-        completed_execution_count = self.find_latest_executions(workflow_execution).count()
+        if progress is None:
+            progress = WorkflowProgress.load(workflow_execution, [self.uuid])
+
+        completed_execution_count = progress.latest_execution_count(self.pk)
 
         if (not self.should_eval_transitions_after_first_execution) and (not retry_mode) and \
                 (completed_execution_count >= 1):
@@ -259,27 +244,25 @@ class WorkflowTaskInstance(UuidModel):
         if self.start_transition_condition == self.START_TRANSITION_CONDITION_ANY:
             triggered = True
         else:
-            inbound_transition_evaluations = self.find_activated_inbound_transition_evaluations(workflow_execution)
-            activated_transition_uuids = inbound_transition_evaluations.values_list('workflow_transition__uuid', flat=True)
+            activated_transition_count, transition_count = \
+                    progress.inbound_transition_counts(self.uuid)
 
             if self.start_transition_condition == self.START_TRANSITION_CONDITION_COUNT_AT_LEAST:
                 if self.condition_count_threshold is None:
                     logger.warning(
                         "start_transition_condition == self.START_TRANSITION_CONDITION_COUNT_AT_LEAST but condition_count_threshold is not set, not activating")
                 else:
-                    triggered = len(activated_transition_uuids) >= self.condition_count_threshold
-            else:
-                all_transition_uuids = self.find_inbound_transitions().values_list('uuid', flat=True)
-                if self.start_transition_condition == self.START_TRANSITION_CONDITION_ALL:
-                    triggered = set(activated_transition_uuids) == set(all_transition_uuids)
-                elif self.start_transition_condition == self.START_TRANSITION_CONDITION_RATIO_AT_LEAST:
-                    if self.condition_ratio_threshold is None:
-                        logger.warning(
-                            "start_transition_condition == self.START_TRANSITION_CONDITION_RATIO_AT_LEAST but condition_ratio_threshold is not set, not activating")
-                    else:
-                        triggered = (len(activated_transition_uuids) / len(all_transition_uuids)) >= self.condition_ratio_threshold
+                    triggered = activated_transition_count >= self.condition_count_threshold
+            elif self.start_transition_condition == self.START_TRANSITION_CONDITION_ALL:
+                triggered = activated_transition_count == transition_count
+            elif self.start_transition_condition == self.START_TRANSITION_CONDITION_RATIO_AT_LEAST:
+                if self.condition_ratio_threshold is None:
+                    logger.warning(
+                        "start_transition_condition == self.START_TRANSITION_CONDITION_RATIO_AT_LEAST but condition_ratio_threshold is not set, not activating")
                 else:
-                    raise Exception(f"Unknown start_transition_condition {self.start_transition_condition}")
+                    triggered = (activated_transition_count / transition_count) >= self.condition_ratio_threshold
+            else:
+                raise Exception(f"Unknown start_transition_condition {self.start_transition_condition}")
 
         logger.info(f"For workflow execution {workflow_execution.uuid}, wti {self.uuid}, triggered = {triggered}")
 
@@ -288,13 +271,13 @@ class WorkflowTaskInstance(UuidModel):
 
         if retry_mode:
             logger.info(f"handle_inbound_transition_activated(): retrying wti {self.uuid} ...")
-            self.retry_if_unsuccessful(workflow_execution)
+            self.retry_if_unsuccessful(workflow_execution, pending_starts)
             return True
         elif (self.max_complete_executions is None) or (completed_execution_count < self.max_complete_executions):
             logger.info(
                 f"In workflow execution {workflow_execution.uuid}, starting wti {self.uuid}, completed_execution_count = {completed_execution_count}, max_complete_executions = {self.max_complete_executions}")
             logger.info(f"handle_inbound_transition_activated(): starting wti {self.uuid} ...")
-            self.start(workflow_execution)
+            self.start_or_defer(workflow_execution, pending_starts)
             return True
         else:
             logger.info(
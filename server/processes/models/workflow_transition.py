@@ -118,21 +118,29 @@ class WorkflowTransition(models.Model):
                 exit_code=task_execution.exit_code)
 
     def should_activate(self, task_execution_status, exit_code: int | None) -> bool:
+        return WorkflowTransition.rule_matches(rule_type=self.rule_type,
+                exit_codes=self.exit_codes,
+                task_execution_status=task_execution_status,
+                exit_code=exit_code)
+
+    @staticmethod
+    def rule_matches(rule_type: str, exit_codes: list[str] | None,
+            task_execution_status, exit_code: int | None) -> bool:
         from .execution import Execution
 
         pes = task_execution_status
-        rt = self.rule_type
+        rt = rule_type
 
-        if rt == self.RULE_TYPE_ALWAYS:
+        if rt == WorkflowTransition.RULE_TYPE_ALWAYS:
             return True
-        elif rt == self.RULE_TYPE_ON_SUCCESS:
+        elif rt == WorkflowTransition.RULE_TYPE_ON_SUCCESS:
             return pes == Execution.Status.SUCCEEDED
-        elif rt == self.RULE_TYPE_ON_FAILURE:
+        elif rt == WorkflowTransition.RULE_TYPE_ON_FAILURE:
             return pes == Execution.Status.FAILED
-        elif rt == self.RULE_TYPE_ON_TIMEOUT:
+        elif rt == WorkflowTransition.RULE_TYPE_ON_TIMEOUT:
             return pes == Execution.Status.TERMINATED_AFTER_TIME_OUT
-        elif rt == self.RULE_TYPE_ON_EXIT_CODE:
-            return (self.exit_codes is not None) and (exit_code in self.exit_codes)
+        elif rt == WorkflowTransition.RULE_TYPE_ON_EXIT_CODE:
+            return (exit_codes is not None) and (exit_code in exit_codes)
         else:
             # TODO handle other rule types
             raise APIException(detail=f"Unsupported rule type: {rt}")
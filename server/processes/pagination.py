@@ -0,0 +1,316 @@
+from __future__ import annotations
+
+from typing import Any
+
+from base64 import b64decode, b64encode
+from collections import OrderedDict
+import binascii
+import json
+import logging
+
+from django.db.models import BooleanField, DateTimeField, F, Func, QuerySet, Value
+from django.utils.dateparse import parse_datetime
+
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+logger = logging.getLogger(__name__)
+
+
+class RowComparison(Func):
+    """
+    Compares two rows of expressions, such as (started_at, id) > (%s, %s),
+    which PostgreSQL can answer with a range scan of an index on the
+    columns, unlike the equivalent combination of OR and AND.
+    """
+
+    output_field = BooleanField()
+
+    def __init__(self, lhs: list[Any], operator: str, rhs: list[Any]) -> None:
+        if len(lhs) != len(rhs):
+            raise ValueError('Compared rows must have the same length')
+
+        super().__init__(*lhs, *rhs)
+        self.operator = operator
+        self.width = len(lhs)
+
+    def as_sql(self, compiler: Any, connection: Any,
+            **extra_context: Any) -> tuple[str, list[Any]]:
+        sqls: list[str] = []
+        params: list[Any] = []
+
+        for expression in self.get_source_expressions():
+            sql, expression_params = compiler.compile(expression)
+            sqls.append(sql)
+            params.extend(expression_params)
+
+        lhs = ', '.join(sqls[:self.width])
+        rhs = ', '.join(sqls[self.width:])
+        return (f"({lhs}) {self.operator} ({rhs})", params)
+
+
+class KeysetPagination(LimitOffsetPagination):
+    """
+    Paginates with limit and offset, like the default pagination, unless
+    the request opts into keyset pagination by passing pagination=cursor or
+    a cursor. In keyset mode, a page is found by seeking past the sort key
+    of the last row of the previous page, instead of skipping offset rows,
+    so every page costs about the same.
+
+    Rows are ordered by one of the view's keyset_ordering_fields, which must
+    be indexed datetime fields, then by id to break ties. As in PostgreSQL
+    indexes, NULL values sort after all others, so they are last in
+    ascending order and first in descending order, and both directions can
+    be read from the same index. Rows with NULL values are fetched
+    separately from the others, so each seek is an index range scan. The
+    next and previous links contain opaque cursors. The total
+    count is only computed if requested with count=exact, or estimated by
+    the query planner with count=estimate.
+    """
+
+    pagination_query_param = 'pagination'
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+
+    PAGINATION_CURSOR = 'cursor'
+    COUNT_EXACT = 'exact'
+    COUNT_ESTIMATE = 'estimate'
+
+    invalid_cursor_message = 'Invalid cursor'
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.is_keyset = False
+        self.ordering_field = ''
+        self.descending = False
+        self.next_position: tuple[Any, int] | None = None
+        self.previous_position: tuple[Any, int] | None = None
+
+    def paginate_queryset(self, queryset: QuerySet, request: Request,
+            view: Any = None) -> list | None:
+        if not self.is_keyset_requested(request):
+            return super().paginate_queryset(queryset, request, view)
+
+        self.is_keyset = True
+        self.request = request
+        self.limit = self.get_limit(request)
+
+        if self.limit is None:
+            return None
+
+        self.ordering_field, self.descending = self.get_keyset_ordering(
+                request, view)
+
+        cursor = self.decode_cursor(request)
+        is_reversed = bool(cursor) and cursor['r']
+
+        self.count = self.compute_count(queryset,
+                request.query_params.get(self.count_query_param))
+
+        # Fetch pages before the cursor in the reverse order
+        descending = self.descending != is_reversed
+        results = self.fetch_after(queryset, cursor, descending,
+                count=self.limit + 1)
+        has_more = len(results) > self.limit
+        results = results[:self.limit]
+
+        if is_reversed:
+            results.reverse()
+
+        self.next_position = None
+        self.previous_position = None
+
+        if results:
+            if has_more or is_reversed:
+                self.next_position = self.get_position(results[-1])
+
+            if (has_more and is_reversed) or (cursor and not is_reversed):
+                self.previous_position = self.get_position(results[0])
+
+        return results
+
+    def get_paginated_response(self, data: Any) -> Response:
+        if not self.is_keyset:
+            return super().get_paginated_response(data)
+
+        return Response(OrderedDict([
+            ('count', self.count),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data)
+        ]))
+
+    def get_next_link(self) -> str | None:
+        if not self.is_keyset:
+            return super().get_next_link()
+
+        return self.make_cursor_link(self.next_position, is_reversed=False)
+
+    def get_previous_link(self) -> str | None:
+        if not self.is_keyset:
+            return super().get_previous_link()
+
+        return self.make_cursor_link(self.previous_position, is_reversed=True)
+
+    def get_schema_operation_parameters(self, view: Any) -> list[dict[str, Any]]:
+        parameters = super().get_schema_operation_parameters(view)
+
+        if not getattr(view, 'keyset_ordering_fields', None):
+            return parameters
+
+        return parameters + [{
+            'name': self.pagination_query_param,
+            'required': False,
+            'in': 'query',
+            'description': 'Set to "cursor" to use keyset pagination instead of offsets.',
+            'schema': {'type': 'string', 'enum': [self.PAGINATION_CURSOR]},
+        }, {
+            'name': self.cursor_query_param,
+            'required': False,
+            'in': 'query',
+            'description': 'The cursor from the next or previous link of a keyset paginated page.',
+            'schema': {'type': 'string'},
+        }, {
+            'name': self.count_query_param,
+            'required': False,
+            'in': 'query',
+            'description': 'With keyset pagination, "exact" to count the results, or "estimate" to estimate the count. By default, the count is null.',
+            'schema': {'type': 'string', 'enum': [self.COUNT_EXACT, self.COUNT_ESTIMATE]},
+        }]
+
+    def is_keyset_requested(self, request: Request) -> bool:
+        return (request.query_params.get(self.pagination_query_param) == self.PAGINATION_CURSOR) or \
+                (self.cursor_query_param in request.query_params)
+
+    def get_keyset_ordering(self, request: Request, view: Any) -> tuple[str, bool]:
+        keyset_ordering_fields = getattr(view, 'keyset_ordering_fields', None)
+
+        if not keyset_ordering_fields:
+            raise ValidationError({
+                self.pagination_query_param: ['Cursor pagination is not supported here']
+            })
+
+        ordering = request.query_params.get('ordering') or getattr(view, 'ordering', None)
+
+        if (not isinstance(ordering, str)) or (ordering.lstrip('-') not in keyset_ordering_fields):
+            if request.query_params.get('ordering'):
+                raise ValidationError({
+                    'ordering': [f"Cursor pagination supports ordering by {', '.join(keyset_ordering_fields)}"]
+                })
+
+            ordering = '-' + keyset_ordering_fields[0]
+
+        return (ordering.lstrip('-'), ordering.startswith('-'))
+
+    def fetch_after(self, queryset: QuerySet, cursor: dict[str, Any] | None,
+            descending: bool, count: int) -> list:
+        """
+        Returns up to count rows after the cursor, or from the start if
+        cursor is None, when ordered by the ordering field and id. Rows with
+        NULL values of the ordering field are only queried if the other
+        rows run out first, or vice versa in descending order.
+        """
+        field = self.ordering_field
+        direction = '-' if descending else ''
+        non_null = queryset.filter(**{f"{field}__isnull": False})
+        nulls = queryset.filter(**{f"{field}__isnull": True})
+
+        if cursor is None:
+            segments = [nulls, non_null] if descending else [non_null, nulls]
+        elif cursor['v'] is None:
+            nulls = nulls.filter(**{('id__lt' if descending else 'id__gt'): cursor['id']})
+            segments = [nulls, non_null] if descending else [nulls]
+        else:
+            non_null = non_null.filter(RowComparison([F(field), F('id')],
+                    '<' if descending else '>',
+                    [Value(cursor['v'], output_field=DateTimeField()), Value(cursor['id'])]))
+            segments = [non_null] if descending else [non_null, nulls]
+
+        results: list = []
+
+        for segment in segments:
+            results += list(segment.order_by(direction + field, direction + 'id')[
+                    :count - len(results)])
+
+            if len(results) >= count:
+                break
+
+        return results
+
+    def get_position(self, item: Any) -> tuple[Any, int]:
+        return (getattr(item, self.ordering_field), item.pk)
+
+    def make_cursor_link(self, position: tuple[Any, int] | None,
+            is_reversed: bool) -> str | None:
+        if position is None:
+            return None
+
+        value, pk = position
+        cursor = {
+            'o': ('-' if self.descending else '') + self.ordering_field,
+            'v': None if value is None else value.isoformat(),
+            'id': pk,
+            'r': is_reversed,
+        }
+
+        encoded = b64encode(json.dumps(cursor, separators=(',', ':')).encode('utf-8')).decode('ascii')
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.offset_query_param)
+        url = replace_query_param(url, self.pagination_query_param, self.PAGINATION_CURSOR)
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request: Request) -> dict[str, Any] | None:
+        encoded = request.query_params.get(self.cursor_query_param)
+
+        if not encoded:
+            return None
+
+        try:
+            cursor = json.loads(b64decode(encoded.encode('ascii'), validate=True).decode('utf-8'))
+            ordering = ('-' if self.descending else '') + self.ordering_field
+
+            if (not isinstance(cursor, dict)) or (cursor.get('o') != ordering) or \
+                    (not isinstance(cursor.get('id'), int)):
+                raise ValueError('Cursor does not match the ordering')
+
+            value = cursor.get('v')
+
+            if value is not None:
+                value = parse_datetime(value)
+
+                if value is None:
+                    raise ValueError('Invalid cursor value')
+
+            return {
+                'v': value,
+                'id': cursor['id'],
+                'r': bool(cursor.get('r')),
+            }
+        except (binascii.Error, UnicodeError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def compute_count(self, queryset: QuerySet, count_mode: str | None) -> int | None:
+        if count_mode == self.COUNT_EXACT:
+            return queryset.count()
+
+        if count_mode == self.COUNT_ESTIMATE:
+            return self.estimate_count(queryset)
+
+        return None
+
+    @staticmethod
+    def estimate_count(queryset: QuerySet) -> int | None:
+        """
+        Returns the query planner's estimate of the number of rows in
+        queryset, which is much cheaper than counting them.
+        """
+        try:
+            plan = json.loads(queryset.order_by().explain(format='json'))
+            return int(plan[0]['Plan']['Plan Rows'])
+        except Exception:
+            logger.warning('Failed to estimate count', exc_info=True)
+            return None
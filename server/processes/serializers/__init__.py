@@ -23,6 +23,8 @@ from .missing_scheduled_workflow_execution_event_serializer import MissingSchedu
 
 from .task_serializer import TaskSerializer
 from .task_execution_serializer import TaskExecutionSerializer
+from .task_execution_heartbeat_serializer import TaskExecutionHeartbeatSerializer
+from .task_execution_logs_serializer import TaskExecutionLogsSerializer
 from .workflow_serializer import WorkflowSummarySerializer
 from .workflow_serializer import WorkflowSerializer
 from .embedded_workflow_serializer import EmbeddedWorkflowSerializer
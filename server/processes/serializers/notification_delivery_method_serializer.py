@@ -54,6 +54,7 @@ class NotificationDeliveryMethodSerializer(GroupSettingSerializerMixin,
         fields = [
             'url', 'uuid', 'name', 'description', 'dashboard_url', 'enabled',
             'run_environment', 'delivery_method_type', 'rate_limit_tiers',
+            'digest_window_seconds',
             'created_by_user', 'created_by_group', 'created_at', 'updated_at'
         ]
 
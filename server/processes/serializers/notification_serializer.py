@@ -41,7 +41,8 @@ class NotificationSerializer(serializers.HyperlinkedModelSerializer):
 
     url = serializers.HyperlinkedIdentityField(view_name='notifications-detail', lookup_field='uuid')
 
-    event = NameAndUuidSerializer(view_name='events-detail', required=False)
+    event = NameAndUuidSerializer(view_name='events-detail', required=False,
+            allow_null=True)
     notification_profile = NameAndUuidSerializer(view_name='notification_profiles-detail', required=False)
     notification_delivery_method = NameAndUuidSerializer(view_name='notification_delivery_methods-detail', required=False)
     send_status = NotificationSendStatusSerializer(required=False, allow_null=True)
@@ -60,11 +61,12 @@ class NotificationSerializer(serializers.HyperlinkedModelSerializer):
             'rate_limit_request_period_seconds',
             'rate_limit_max_severity',
             'rate_limit_tier_index',
+            'digest_closes_at',
             'created_by_group',
             'created_at', 'updated_at', 'dashboard_url',
         ]
 
         read_only_fields = [
-            'url', 'uuid', 'created_by_group',
+            'url', 'uuid', 'digest_closes_at', 'created_by_group',
             'created_at', 'updated_at', 'dashboard_url',
         ]
@@ -10,8 +10,8 @@ from rest_framework.exceptions import (
 )
 from rest_framework import serializers
 
-from crontab import CronTab
 
+from ..common.compiled_schedule import compile_schedule
 from ..exception import UnprocessableEntity
 from ..models.run_environment import RunEnvironment
 from ..models.schedulable import Schedulable
@@ -106,7 +106,7 @@ class SerializerHelpers:
                 cron_expr = m.group(1)
 
                 try:
-                    CronTab(cron_expr)
+                    compile_schedule(schedule)
                     logger.debug(f"Schedule '{schedule}' contains a valid cron expression")
                 except Exception as ex:
                     raise serializers.ValidationError(
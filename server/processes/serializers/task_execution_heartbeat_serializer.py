@@ -0,0 +1,17 @@
+from rest_framework import serializers
+
+
+class TaskExecutionHeartbeatSerializer(serializers.Serializer): # pylint: disable=abstract-method
+    """
+    The optional properties a wrapper may send along with a heartbeat of a
+    running Task Execution.
+    """
+
+    last_app_heartbeat_at = serializers.DateTimeField(required=False,
+            allow_null=True)
+    last_status_message = serializers.CharField(required=False,
+            allow_null=True, allow_blank=True, max_length=5000)
+    success_count = serializers.IntegerField(required=False, allow_null=True)
+    error_count = serializers.IntegerField(required=False, allow_null=True)
+    skipped_count = serializers.IntegerField(required=False, allow_null=True)
+    expected_count = serializers.IntegerField(required=False, allow_null=True)
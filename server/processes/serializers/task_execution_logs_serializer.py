@@ -0,0 +1,11 @@
+from rest_framework import serializers
+
+
+class TaskExecutionLogsSerializer(serializers.Serializer): # pylint: disable=abstract-method
+    """
+    The debug and error log tails of a Task Execution, which are not
+    included in Task Execution responses.
+    """
+
+    debug_log_tail = serializers.CharField(read_only=True, allow_null=True)
+    error_log_tail = serializers.CharField(read_only=True, allow_null=True)
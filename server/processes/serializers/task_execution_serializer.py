@@ -16,6 +16,7 @@ from drf_spectacular.utils import extend_schema_field
 from ..models.execution import Execution
 from ..models.task import Task
 from ..models.task_execution import TaskExecution
+from ..models.task_execution_log_chunk import TaskExecutionLogChunk
 from ..models.user_group_access_level import UserGroupAccessLevel
 from ..models.workflow_task_instance_execution import WorkflowTaskInstanceExecution
 
@@ -23,7 +24,7 @@ from ..common import (
     extract_authenticated_run_environment
 )
 from ..common.request_helpers import ensure_group_access_level
-from ..common.utils import deepmerge
+from ..common.utils import deepmerge, json_digest
 from ..exception import UnprocessableEntity
 from ..execution_methods import *
 
@@ -109,6 +110,7 @@ class TaskExecutionSerializer(EmbeddedIdValidatingSerializerMixin,
             'workflow_task_instance_execution',
             'api_base_url', # Don't expose api_key
             'debug_log_tail', 'error_log_tail',
+            'debug_log_append', 'error_log_append',
             'embedded_mode',
             'input_value', 'output_value',
             'created_at', 'updated_at',
@@ -143,6 +145,27 @@ class TaskExecutionSerializer(EmbeddedIdValidatingSerializerMixin,
     build = serializers.SerializerMethodField()
     deploy = serializers.SerializerMethodField()
 
+    # Log tails are stored in TaskExecutionLogChunks and only returned by
+    # the logs endpoint. Sending a tail replaces it, for older wrappers;
+    # sending an append adds to it.
+    debug_log_tail = serializers.CharField(write_only=True, required=False,
+        allow_null=True, allow_blank=True, trim_whitespace=False,
+        max_length=TaskExecutionLogChunk.MAX_TAIL_LENGTH)
+    error_log_tail = serializers.CharField(write_only=True, required=False,
+        allow_null=True, allow_blank=True, trim_whitespace=False,
+        max_length=TaskExecutionLogChunk.MAX_TAIL_LENGTH)
+    debug_log_append = serializers.CharField(write_only=True, required=False,
+        allow_null=True, allow_blank=True, trim_whitespace=False,
+        max_length=TaskExecutionLogChunk.MAX_TAIL_LENGTH)
+    error_log_append = serializers.CharField(write_only=True, required=False,
+        allow_null=True, allow_blank=True, trim_whitespace=False,
+        max_length=TaskExecutionLogChunk.MAX_TAIL_LENGTH)
+
+    LOG_STREAM_FIELDS = {
+        TaskExecutionLogChunk.STREAM_DEBUG: ('debug_log_tail', 'debug_log_append'),
+        TaskExecutionLogChunk.STREAM_ERROR: ('error_log_tail', 'error_log_append'),
+    }
+
     def validate(self, attrs: Mapping[str, Any]) -> Mapping[str, Any]:
         attrs = super().validate(attrs)
 
@@ -209,19 +232,25 @@ class TaskExecutionSerializer(EmbeddedIdValidatingSerializerMixin,
                     task_serializer = TaskSerializer(task, data=task_dict,
                             context=self.context)
                     task_serializer.is_valid(raise_exception=True)
-                    task = task_serializer.save()
+                    task = task_serializer.save(
+                            auto_created_task_properties_digest=json_digest(task_dict))
                 else:
                     raise UnprocessableEntity({
                         'task': [ErrorDetail('Task does not exist', code='not_found')]
                     }) from e
             else:
                 if was_auto_created:
-                    should_update = True
-                    task_version_number = data.get('task_version_number')
-                    if (task_version_number is not None) and task.latest_task_execution:
-                        last_version_number = task.latest_task_execution.task_version_number
-                        if last_version_number is not None:
-                            should_update = (last_version_number <= task_version_number)
+                    digest = json_digest(task_dict)
+
+                    if task.auto_created_task_properties_digest == digest:
+                        should_update = False
+                    else:
+                        should_update = True
+                        task_version_number = data.get('task_version_number')
+                        if (task_version_number is not None) and task.latest_task_execution:
+                            last_version_number = task.latest_task_execution.task_version_number
+                            if last_version_number is not None:
+                                should_update = (last_version_number <= task_version_number)
 
                     if should_update:
                         logger.info(f"Updating Task details for {task.uuid=}")
@@ -229,7 +258,8 @@ class TaskExecutionSerializer(EmbeddedIdValidatingSerializerMixin,
                         task_serializer = TaskSerializer(task, data=task_dict,
                                 context=self.context)
                         task_serializer.is_valid(raise_exception=True)
-                        task = task_serializer.save()
+                        task = task_serializer.save(
+                                auto_created_task_properties_digest=digest)
                     else:
                         logger.info(f"Not updating Task details for {task.uuid=}")
 
@@ -322,7 +352,10 @@ class TaskExecutionSerializer(EmbeddedIdValidatingSerializerMixin,
 
         self.update_api_client_implicit_info(validated_data=validated_data)
 
-        return super().create(validated_data)
+        log_updates = self.pop_log_updates(validated_data)
+        task_execution = super().create(validated_data)
+        self.save_log_updates(task_execution, log_updates)
+        return task_execution
 
     def update(self, instance, validated_data: dict[str, Any]):
         now = timezone.now()
@@ -401,7 +434,37 @@ class TaskExecutionSerializer(EmbeddedIdValidatingSerializerMixin,
 
         self.update_api_client_implicit_info(validated_data=validated_data)
 
-        return super().update(instance, validated_data)
+        log_updates = self.pop_log_updates(validated_data)
+        task_execution = super().update(instance, validated_data)
+        self.save_log_updates(task_execution, log_updates)
+        return task_execution
+
+    def pop_log_updates(self, validated_data: dict[str, Any]) \
+            -> dict[str, tuple[bool, str | None, str | None]]:
+        """
+        Remove the log fields from validated_data, since they aren't
+        attributes of the Task Execution. Returns, for each stream, whether
+        the tail is replaced, the replacement, and the text to append.
+        """
+        log_updates: dict[str, tuple[bool, str | None, str | None]] = {}
+
+        for stream, (tail_field, append_field) in self.LOG_STREAM_FIELDS.items():
+            is_replaced = tail_field in validated_data
+            tail = validated_data.pop(tail_field, None)
+            appended = validated_data.pop(append_field, None)
+
+            if is_replaced or appended:
+                log_updates[stream] = (is_replaced, tail, appended)
+
+        return log_updates
+
+    def save_log_updates(self, task_execution: TaskExecution,
+            log_updates: dict[str, tuple[bool, str | None, str | None]]) -> None:
+        for stream, (is_replaced, tail, appended) in log_updates.items():
+            if is_replaced:
+                TaskExecutionLogChunk.replace(task_execution, stream, tail)
+
+            TaskExecutionLogChunk.append(task_execution, stream, appended)
 
 
     def get_build(self, obj: TaskExecution) -> dict[str, Any] | None:
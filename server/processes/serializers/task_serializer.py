@@ -495,6 +495,10 @@ class TaskSerializer(GroupSettingSerializerMixin,
 
         defaults.pop('uuid', None)
 
+        # Unless these are auto-created properties, the Task may now differ
+        # from the last auto-created properties applied to it
+        defaults.setdefault('auto_created_task_properties_digest', '')
+
         notification_profiles = defaults.pop('notification_profiles', None)
 
         task_links = validated_data.pop('task_links', None)
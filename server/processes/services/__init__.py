@@ -4,4 +4,10 @@ from .task_execution_checker import TaskExecutionChecker
 from .workflow_execution_checker import WorkflowExecutionChecker
 from .service_concurrency_checker import ServiceConcurrencyChecker
 from .postponed_event_checker import PostponedEventChecker
-from .notification_generator import NotificationGenerator
+from .checker_partition import CheckerPartition
+from .worker_pool import WorkerPool
+from .notification_generator import NotificationContext, NotificationGenerator
+from .execution_history_purger import ExecutionHistoryPurger
+from .notification_dispatcher import NotificationDispatcher
+from .notification_digest import NotificationDigest
+from .workflow_task_instance_starter import WorkflowTaskInstanceStarter
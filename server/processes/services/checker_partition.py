@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Iterable
+
+from django.conf import settings
+from django.db.models import F, Func, IntegerField, QuerySet, UUIDField
+from django.db.models.functions import Abs, Mod
+
+from .worker_pool import WorkerPool
+
+
+class CheckerPartition:
+    """
+    The subset of items a checker process is responsible for, when
+    shard_count checker processes run at once, and how many items it checks
+    concurrently.
+
+    Items are assigned to shards by their id modulo shard_count (or a hash
+    of their id, if it is a UUID), so as long as each process has a
+    distinct shard_index, every item is checked by exactly one process, and
+    alerts are not duplicated.
+    """
+
+    def __init__(self, shard_index: int = 0, shard_count: int = 1,
+            max_workers: int = 1) -> None:
+        if shard_count < 1:
+            raise ValueError(f"Shard count {shard_count} must be positive")
+
+        if (shard_index < 0) or (shard_index >= shard_count):
+            raise ValueError(f"Shard index {shard_index} must be between 0 and {shard_count - 1}")
+
+        if max_workers < 1:
+            raise ValueError(f"Max workers {max_workers} must be positive")
+
+        self.shard_index = shard_index
+        self.shard_count = shard_count
+        self.max_workers = max_workers
+
+    @staticmethod
+    def from_settings() -> CheckerPartition:
+        checker_settings = settings.CHECKER_SETTINGS
+        return CheckerPartition(shard_index=checker_settings['SHARD_INDEX'],
+                shard_count=checker_settings['SHARD_COUNT'],
+                max_workers=checker_settings['MAX_WORKERS'])
+
+    def filter(self, qs: QuerySet, field: str = 'pk') -> QuerySet:
+        """
+        Limit qs to the items in this shard, identified by field.
+        """
+        if self.shard_count == 1:
+            return qs
+
+        meta = qs.model._meta
+        model_field = meta.pk if field == 'pk' else meta.get_field(field)
+        key = F(field)
+
+        if isinstance(model_field, UUIDField):
+            key = Func(key, function='HASHTEXT',
+                    template='%(function)s(%(expressions)s::text)',
+                    output_field=IntegerField())
+
+        return qs.alias(shard=Abs(Mod(key, self.shard_count))) \
+                .filter(shard=self.shard_index)
+
+    def run(self, items: Iterable[Any], check: Callable[[Any], Any]) -> int:
+        """
+        Call check on each item, using up to max_workers threads. Returns
+        the number of items for which check returned a truthy value.
+        """
+        return WorkerPool(max_workers=self.max_workers).run(items, check)
+
+    def __str__(self) -> str:
+        return f"shard {self.shard_index + 1} of {self.shard_count} with {self.max_workers} workers"
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+from typing import Final, Type
+
+import logging
+import time
+
+from django.contrib.auth.models import Group
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, QuerySet, Value, When, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+
+from proc_wrapper import StatusUpdater
+
+from ..models import (
+    Event,
+    Execution,
+    GroupInfo,
+    Notification,
+    Subscription,
+    Task,
+    TaskExecution,
+    Workflow,
+    WorkflowExecution,
+    WorkflowTaskInstanceExecution,
+    WorkflowTransitionEvaluation,
+)
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_CHUNK_SIZE: Final[int] = 1000
+
+
+class ExecutionHistoryPurger:
+    """
+    Deletes the Task Executions and Workflow Executions that exceed the
+    history limits of their Tasks and Workflows, a Group at a time.
+
+    The executions to delete are found with one query per Group, which
+    ranks the executions of each Task or Workflow with ROW_NUMBER(),
+    keeping in-progress executions first, then the most recently finished.
+    They are deleted in chunks, deleting dependent rows first with one
+    statement each, instead of deleting and collecting cascades for each
+    execution.
+
+    Groups are processed in the order they were last purged, and a Group
+    is only marked as purged once all of its executions over the limits
+    are deleted. So if the time budget runs out, the next run resumes with
+    the Groups that were not finished.
+    """
+
+    def __init__(self, chunk_size: int = DEFAULT_CHUNK_SIZE,
+            time_budget_seconds: float | None = None,
+            status_updater: StatusUpdater | None = None) -> None:
+        self.chunk_size = chunk_size
+        self.time_budget_seconds = time_budget_seconds
+        self.status_updater = status_updater
+        self.deadline: float | None = None
+
+    def purge_all(self) -> int:
+        """
+        Purge the execution history of all Groups, until the time budget
+        runs out. Returns the number of executions deleted.
+        """
+        if self.time_budget_seconds is not None:
+            self.deadline = time.monotonic() + self.time_budget_seconds
+
+        total_purged_count = 0
+        group_count = 0
+
+        groups = Group.objects.order_by(
+                F('group_info__execution_history_purged_at').asc(nulls_first=True),
+                'pk')
+
+        for group in groups.iterator():
+            if self.is_out_of_time():
+                logger.info(f"Time budget exhausted after purging {group_count} Groups, stopping")
+                break
+
+            try:
+                purged_count, finished = self.purge_group(group)
+                total_purged_count += purged_count
+                group_count += 1
+            except Exception:
+                logger.exception(f"Failed purging execution history of Group {group.pk}")
+                self.send_update(error_count=1)
+                continue
+
+            if finished:
+                GroupInfo.objects.update_or_create(group=group,
+                        defaults={'execution_history_purged_at': timezone.now()})
+
+        logger.info(f"Purged a total of {total_purged_count} executions")
+
+        return total_purged_count
+
+    def purge_group(self, group: Group) -> tuple[int, bool]:
+        """
+        Purge the execution history of the Group. Returns the number of
+        executions deleted, and whether all executions over the limits were
+        deleted before the time budget ran out.
+        """
+        usage_limits = Subscription.compute_usage_limits(group)
+
+        task_execution_count, finished = self.purge_executions(
+                TaskExecution.objects.filter(task__created_by_group=group),
+                partition_by='task_id',
+                max_items=usage_limits.max_task_execution_history_items,
+                delete_chunk=self.delete_task_executions)
+
+        if not finished:
+            return task_execution_count, False
+
+        workflow_execution_count, finished = self.purge_executions(
+                WorkflowExecution.objects.filter(workflow__created_by_group=group),
+                partition_by='workflow_id',
+                max_items=usage_limits.max_workflow_execution_history_items,
+                delete_chunk=self.delete_workflow_executions)
+
+        return task_execution_count + workflow_execution_count, finished
+
+    def purge_executions(self, qs: QuerySet, partition_by: str,
+            max_items: int | None, delete_chunk) -> tuple[int, bool]:
+        if max_items is None:
+            return 0, True
+
+        pks = list(self.executions_over_limit(qs, partition_by=partition_by,
+                max_items=max_items))
+
+        purged_count = 0
+
+        for start in range(0, len(pks), self.chunk_size):
+            if self.is_out_of_time():
+                return purged_count, False
+
+            chunk = pks[start:start + self.chunk_size]
+
+            with transaction.atomic():
+                deleted_count = delete_chunk(chunk)
+
+            purged_count += deleted_count
+            self.send_update(success_count=deleted_count)
+
+        return purged_count, True
+
+    @staticmethod
+    def executions_over_limit(qs: QuerySet, partition_by: str,
+            max_items: int) -> QuerySet:
+        model: Type[Execution] = qs.model
+
+        return qs.annotate(
+            row_number=Window(
+                expression=RowNumber(),
+                partition_by=[F(partition_by)],
+                order_by=[
+                    Case(When(status__in=model.IN_PROGRESS_STATUSES, then=Value(0)),
+                            default=Value(1), output_field=IntegerField()).asc(),
+                    F('finished_at').desc(nulls_first=True),
+                    F('started_at').desc(nulls_first=True),
+                    F('pk').desc(),
+                ]
+            )
+        ).filter(row_number__gt=max_items).values_list('pk', flat=True)
+
+    @staticmethod
+    def delete_task_executions(pks: list[int]) -> int:
+        ExecutionHistoryPurger.delete_events(
+                Event.objects.filter(task_execution_id__in=pks))
+        WorkflowTaskInstanceExecution.objects.filter(
+                task_execution_id__in=pks).delete()
+        Task.objects.filter(latest_task_execution_id__in=pks) \
+                .update(latest_task_execution=None)
+
+        _, deleted_counts = TaskExecution.objects.filter(pk__in=pks) \
+                .only('pk').delete()
+        return deleted_counts.get(TaskExecution._meta.label, 0)
+
+    @staticmethod
+    def delete_workflow_executions(pks: list[int]) -> int:
+        ExecutionHistoryPurger.delete_events(
+                Event.objects.filter(workflow_execution_id__in=pks))
+        WorkflowTaskInstanceExecution.objects.filter(
+                workflow_execution_id__in=pks).delete()
+        WorkflowTransitionEvaluation.objects.filter(
+                workflow_execution_id__in=pks).delete()
+        Workflow.objects.filter(latest_workflow_execution_id__in=pks) \
+                .update(latest_workflow_execution=None)
+
+        _, deleted_counts = WorkflowExecution.objects.filter(pk__in=pks) \
+                .only('pk').delete()
+        return deleted_counts.get(WorkflowExecution._meta.label, 0)
+
+    @staticmethod
+    def delete_events(events: QuerySet) -> None:
+        Notification.objects.filter(event__in=events).delete()
+
+        # resolved_event doesn't cascade, so detach the Events that resolve
+        # the deleted ones
+        Event.objects.filter(resolved_event__in=events) \
+                .update(resolved_event=None)
+
+        events.only('pk', 'type').delete()
+
+    def is_out_of_time(self) -> bool:
+        return (self.deadline is not None) and (time.monotonic() >= self.deadline)
+
+    def send_update(self, **kwargs) -> None:
+        if self.status_updater:
+            self.status_updater.send_update(**kwargs)
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from typing import Any, TYPE_CHECKING
+
+from collections import Counter
+import logging
+
+from django.conf import settings
+
+if TYPE_CHECKING:
+    from ..models import Event, Notification
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationDigest:
+    """
+    The Events buffered by a digest Notification, summarized so they can be
+    sent as one message: the number of Events of each severity, the Tasks
+    and Workflows with the most Events, and links to the latest Events.
+    Resolutions of digested Events are not counted, but if every Event was
+    resolved, the digest is resolved.
+    """
+
+    MAX_TOP_EXECUTABLES = 10
+    MAX_LATEST_EVENTS = 20
+
+    def __init__(self, events: list[Event], dedup_key: str | None = None) -> None:
+        resolved_event_ids = {event.resolved_event_id for event in events
+                if event.resolved_event_id is not None}
+        events = [event for event in events if event.resolved_event_id is None]
+
+        if not events:
+            raise ValueError('A digest must have at least one Event')
+
+        self.dedup_key = dedup_key
+        self.is_resolved = all(event.pk in resolved_event_ids for event in events)
+        self.events = sorted(events, key=lambda event: event.event_at or event.created_at)
+        self.event_count = len(self.events)
+        self.most_severe_event = max(self.events, key=lambda event: event.severity)
+
+        severity_counts = Counter(event.severity for event in self.events)
+        self.counts_by_severity = {
+            self.severity_label(severity): count
+            for severity, count in sorted(severity_counts.items(), reverse=True)
+        }
+
+        executable_counts: Counter[tuple[str, str]] = Counter()
+        latest_summaries: dict[tuple[str, str], str] = {}
+        dashboard_urls: dict[tuple[str, str], str] = {}
+        names: dict[tuple[str, str], str] = {}
+
+        for event in self.events:
+            executable = event.get_executable()
+
+            if executable is None:
+                continue
+
+            key = (type(executable).__name__, str(executable.uuid))
+            executable_counts[key] += 1
+            latest_summaries[key] = self.event_summary(event)
+            dashboard_urls[key] = executable.dashboard_url
+            names[key] = executable.name
+
+        self.top_executables = [{
+            'type': key[0],
+            'name': names[key],
+            'dashboard_url': dashboard_urls[key],
+            'event_count': count,
+            'latest_summary': latest_summaries[key],
+        } for key, count in executable_counts.most_common(self.MAX_TOP_EXECUTABLES)]
+
+        base_url = settings.EXTERNAL_BASE_URL.rstrip('/')
+
+        self.latest_events = [{
+            'uuid': str(event.uuid),
+            'summary': self.event_summary(event),
+            'severity': event.severity_label,
+            'event_at': event.event_at,
+            'dashboard_url': f"{base_url}/events/{event.uuid}",
+        } for event in reversed(self.events[-self.MAX_LATEST_EVENTS:])]
+
+    @staticmethod
+    def for_notification(notification: Notification) -> NotificationDigest:
+        events = list(notification.digested_events.select_related(
+                'task', 'workflow', 'task_execution__task',
+                'workflow_execution__workflow'))
+
+        return NotificationDigest(events, dedup_key=notification.digest_dedup_key)
+
+    @property
+    def severity(self) -> str:
+        return self.most_severe_event.severity_label
+
+    @property
+    def summary(self) -> str:
+        counts = ', '.join(f"{count} {label}"
+                for label, count in self.counts_by_severity.items())
+        noun = 'Event' if self.event_count == 1 else 'Events'
+        return f"{self.event_count} {noun} ({counts})"
+
+    def make_template_params(self) -> dict[str, Any]:
+        return {
+            'severity': self.severity,
+            'summary': self.summary,
+            'event_count': self.event_count,
+            'counts_by_severity': self.counts_by_severity,
+            'top_executables': self.top_executables,
+            'latest_events': self.latest_events,
+            'first_event_at': self.events[0].event_at,
+            'last_event_at': self.events[-1].event_at,
+        }
+
+    def make_text(self) -> str:
+        """
+        Returns a plain text description of the digest, for delivery
+        methods without their own templates.
+        """
+        lines = [self.summary]
+
+        if self.top_executables:
+            lines.append('')
+            lines.append('Most frequent:')
+
+            for executable in self.top_executables:
+                lines.append(f"- {executable['name']}: {executable['event_count']} ({executable['latest_summary']}) {executable['dashboard_url']}")
+
+        lines.append('')
+        lines.append('Latest:')
+
+        for event in self.latest_events:
+            lines.append(f"- [{event['severity'].upper()}] {event['summary']} {event['dashboard_url']}")
+
+        return '\n'.join(lines)
+
+    @staticmethod
+    def event_summary(event: Event) -> str:
+        return event.error_summary or type(event).__name__
+
+    @staticmethod
+    def severity_label(severity: int) -> str:
+        from ..models import Event
+
+        try:
+            return Event.Severity(severity).name.lower()
+        except ValueError:
+            return 'unknown'
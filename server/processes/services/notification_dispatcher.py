@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from datetime import timedelta
+import logging
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from proc_wrapper import StatusUpdater
+
+from ..models import Notification, NotificationSendStatus
+
+from .worker_pool import WorkerPool
+
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationDispatcher:
+    """
+    Sends the Notifications waiting in the outbox, which are SENDING with
+    next_attempt_at in the past.
+
+    Batches of Notifications are claimed with SELECT ... FOR UPDATE SKIP
+    LOCKED, and leased for claim_timeout_seconds by moving next_attempt_at
+    forward, so several dispatchers can run at once without sending a
+    Notification twice. If a dispatcher dies while sending, the lease
+    expires and another dispatcher sends the Notification. Each batch is
+    sent by up to max_workers threads. Failed sends are retried with
+    exponential backoff, until max_attempts are made.
+    """
+
+    def __init__(self, max_workers: int = 1, batch_size: int = 100,
+            max_attempts: int = 1, retry_base_delay_seconds: int = 0,
+            max_retry_delay_seconds: int = 0, claim_timeout_seconds: int = 300,
+            status_updater: StatusUpdater | None = None) -> None:
+        if batch_size < 1:
+            raise ValueError(f"Batch size {batch_size} must be positive")
+
+        self.pool = WorkerPool(max_workers=max_workers)
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_base_delay_seconds = retry_base_delay_seconds
+        self.max_retry_delay_seconds = max_retry_delay_seconds
+        self.claim_timeout_seconds = claim_timeout_seconds
+        self.status_updater = status_updater
+
+    @staticmethod
+    def from_settings(status_updater: StatusUpdater | None = None,
+            max_workers: int | None = None,
+            batch_size: int | None = None) -> NotificationDispatcher:
+        """
+        Returns a dispatcher configured by NOTIFICATION_DISPATCH_SETTINGS,
+        except for max_workers and batch_size if given.
+        """
+        dispatch_settings = settings.NOTIFICATION_DISPATCH_SETTINGS
+        return NotificationDispatcher(
+                max_workers=dispatch_settings['MAX_WORKERS'] if max_workers is None else max_workers,
+                batch_size=dispatch_settings['BATCH_SIZE'] if batch_size is None else batch_size,
+                max_attempts=dispatch_settings['MAX_ATTEMPTS'],
+                retry_base_delay_seconds=dispatch_settings['RETRY_BASE_DELAY_SECONDS'],
+                max_retry_delay_seconds=dispatch_settings['MAX_RETRY_DELAY_SECONDS'],
+                claim_timeout_seconds=dispatch_settings['CLAIM_TIMEOUT_SECONDS'],
+                status_updater=status_updater)
+
+    def dispatch_all(self, digests_only: bool = False) -> int:
+        """
+        Send Notifications until none are due, or only digests if
+        digests_only is True. Returns the number sent successfully.
+        """
+        success_count = 0
+
+        while pks := self.claim_batch(digests_only=digests_only):
+            logger.info(f"Claimed {len(pks)} Notifications, sending ...")
+            success_count += self.pool.run(iter(pks), self.dispatch)
+
+        return success_count
+
+    def claim_batch(self, digests_only: bool = False) -> list[int]:
+        utc_now = timezone.now()
+
+        with transaction.atomic():
+            qs = Notification.objects.select_for_update(skip_locked=True) \
+                    .filter(send_status=NotificationSendStatus.SENDING,
+                            next_attempt_at__lte=utc_now)
+
+            if digests_only:
+                qs = qs.filter(digest_closes_at__isnull=False)
+
+            pks = list(qs.order_by('next_attempt_at') \
+                    .values_list('pk', flat=True)[:self.batch_size])
+
+            if pks:
+                Notification.objects.filter(pk__in=pks).update(
+                        next_attempt_at=utc_now + timedelta(seconds=self.claim_timeout_seconds))
+
+        return pks
+
+    def dispatch(self, pk: int) -> bool:
+        """
+        Send the claimed Notification. Returns True if it was sent
+        successfully.
+        """
+        notification = Notification.objects.select_related('event',
+                'notification_delivery_method').get(pk=pk)
+
+        if notification.send_status != NotificationSendStatus.SENDING:
+            logger.info(f"Notification {notification.uuid} was already sent, skipping")
+            return False
+
+        notification.deliver(max_attempts=self.max_attempts,
+                retry_delay_seconds=self.retry_delay_seconds(notification.attempt_count + 1))
+
+        if notification.send_status == NotificationSendStatus.SUCCEEDED:
+            self.send_update(success_count=1)
+            return True
+
+        if notification.send_status == NotificationSendStatus.FAILED:
+            self.send_update(failure_count=1)
+
+        return False
+
+    def retry_delay_seconds(self, attempt_number: int) -> int:
+        """
+        Returns how long to wait before retrying after attempt_number fails.
+        """
+        return min(self.retry_base_delay_seconds * (2 ** (attempt_number - 1)),
+                self.max_retry_delay_seconds)
+
+    def send_update(self, **kwargs) -> None:
+        if self.status_updater:
+            self.status_updater.send_update(**kwargs)
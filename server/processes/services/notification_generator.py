@@ -2,16 +2,20 @@ from __future__ import annotations
 
 from typing import Any, TYPE_CHECKING
 
+import hashlib
 import logging
 
+from jinja2 import Template
 from jinja2.sandbox import SandboxedEnvironment
 
+from ..common.lru_ttl_cache import LruTtlCache
 from ..common.notification import *
 from ..common.request_helpers import context_with_request
 from ..models.user_group_access_level import UserGroupAccessLevel
 
 if TYPE_CHECKING:
     from ..models import (
+        Event,
         RunEnvironment,
         Task, TaskExecution,
         Workflow, WorkflowExecution
@@ -20,9 +24,40 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+# The number of distinct compiled templates to keep
+MAX_COMPILED_TEMPLATES = 1000
+
+
+class TemplateCache:
+    """
+    Compiled Jinja templates, keyed by a hash of their source, shared by
+    all threads. The least recently used templates are evicted once there
+    are more than max_entries.
+    """
+
+    def __init__(self, max_entries: int = MAX_COMPILED_TEMPLATES) -> None:
+        self.max_entries = max_entries
+        self.sandbox = SandboxedEnvironment()
+        self.templates: LruTtlCache[str, Template] = LruTtlCache(max_entries)
+
+    def get(self, source: str) -> Template:
+        key = hashlib.sha256(source.encode('utf-8')).hexdigest()
+
+        # If another thread compiles the same template at once, either
+        # result can be kept
+        return self.templates.get_or_load(key,
+                lambda: self.sandbox.from_string(source))
+
+    def clear(self) -> None:
+        self.templates.clear()
+
+
+template_cache = TemplateCache()
+
+
 class NotificationGenerator:
     def __init__(self):
-        self.sandbox = SandboxedEnvironment()
+        self.sandbox = template_cache.sandbox
 
     def make_template_params(
           self,
@@ -100,4 +135,64 @@ class NotificationGenerator:
         elif not template:
             raise ValueError('No template found')
 
-        return self.sandbox.from_string(template).render(template_params)
+        return template_cache.get(template).render(template_params)
+
+
+class NotificationContext:
+    """
+    The template parameters used to describe an Event, computed once per
+    Event and shared by everything that renders it: the Event's summary,
+    and each Notification Profile and Notification Delivery Method it is
+    sent with. Serializing the Executions, Tasks, Workflows, and Run
+    Environment is the expensive part of rendering.
+    """
+
+    def __init__(self) -> None:
+        self.generator = NotificationGenerator()
+        self.template_params_by_key: dict[tuple, dict[str, Any]] = {}
+
+    @staticmethod
+    def for_event(event: Event) -> NotificationContext:
+        context = event._notification_context
+
+        if context is None:
+            context = NotificationContext()
+            event._notification_context = context
+
+        return context
+
+    def make_template_params(self, **kwargs) -> dict[str, Any]:
+        """
+        Returns the result of NotificationGenerator.make_template_params()
+        with the same arguments, computed on first use. The result is a
+        shallow copy, so callers can add parameters to it.
+        """
+        key = tuple(sorted((name, self.cache_key(value))
+                for name, value in kwargs.items()))
+
+        template_params = self.template_params_by_key.get(key)
+
+        if template_params is None:
+            template_params = self.generator.make_template_params(**kwargs)
+            self.template_params_by_key[key] = template_params
+
+        return dict(template_params)
+
+    def generate_text(self, template_params, template: str | None = None,
+            task_execution: TaskExecution | None = None,
+            workflow_execution: WorkflowExecution | None = None) -> str:
+        return self.generator.generate_text(template_params=template_params,
+                template=template, task_execution=task_execution,
+                workflow_execution=workflow_execution)
+
+    @staticmethod
+    def cache_key(value: Any) -> Any:
+        pk = getattr(value, 'pk', None)
+
+        if pk is not None:
+            return (type(value).__name__, pk)
+
+        if isinstance(value, (str, int, float, bool)) or (value is None):
+            return value
+
+        return id(value)
@@ -10,32 +10,45 @@ from django.utils import timezone
 
 from ..models import Event
 
+from .checker_partition import CheckerPartition
+
 logger = logging.getLogger(__name__)
 
 
 class PostponedEventChecker:
     MAX_POSTPONED_AGE_SECONDS: Final[int] = 7 * 24 * 60 * 60
 
+    def __init__(self, partition: CheckerPartition | None = None) -> None:
+        self.partition = partition or CheckerPartition()
+
     def check_all(self) -> int:
         logger.info("Checking for postponed events that should be triggered ...")
 
         utc_now = timezone.now()
 
-        event_count = 0
-        triggered_count = 0
-        for event in Event.objects.filter(
+        qs = Event.objects.filter(
                 postponed_until__gte=utc_now - timedelta(seconds=self.MAX_POSTPONED_AGE_SECONDS),
                 postponed_until__lte=utc_now,
                 triggered_at__isnull=True, resolved_event__isnull=True,
-                resolved_at__isnull=True).iterator():
-            event_count += 1
+                resolved_at__isnull=True)
 
+        event_count = 0
+
+        def counted_events():
+            nonlocal event_count
+            for event in self.partition.filter(qs).iterator():
+                event_count += 1
+                yield event
+
+        def check(event: Event) -> bool:
             with transaction.atomic():
                 try:
-                    if self.check_event(event):
-                        triggered_count += 1
+                    return self.check_event(event)
                 except Exception:
                     logger.exception(f"Exception checking event {event.uuid}")
+                    return False
+
+        triggered_count = self.partition.run(counted_events(), check)
 
         logger.info(f"Done checking for postponed events, triggered {triggered_count} out of {event_count} events")
 
@@ -1,24 +1,29 @@
 from __future__ import annotations
 
-from typing import Generic, TypeVar
+from typing import Generic, Iterable, Iterator, TypeVar
 
 from abc import ABCMeta, abstractmethod
 from datetime import datetime, timedelta
+from itertools import batched
 import logging
 
-from crontab import CronTab
+from dateutil.relativedelta import relativedelta
 
-from dateutil.relativedelta import *
-
-from django.db.models import Manager, Q
+from django.db.models import Count, Manager, Q
 from django.utils import timezone
 
+from ..common.compiled_schedule import compile_schedule, make_relative_delta
 from ..models import MissingScheduledExecutionEvent, Schedulable, Execution
 from ..models.schedulable import SCHEDULE_TYPE_CRON
 
+from .checker_partition import CheckerPartition
+
 
 MIN_DELAY_BETWEEN_EXPECTED_AND_ACTUAL_SECONDS = 300
 
+# The number of due Schedulables whose executions are counted in one query
+CHECK_BATCH_SIZE = 500
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,23 +32,86 @@ BoundExecution = TypeVar('BoundExecution', bound=Execution)
 
 
 class ScheduleChecker(Generic[BoundSchedulable, BoundExecution], metaclass=ABCMeta):
+    def __init__(self, partition: CheckerPartition | None = None) -> None:
+        self.partition = partition or CheckerPartition()
+
     def check_all(self) -> None:
         model_name = self.model_name()
 
-        logger.info(f"Checking all {model_name} schedules ...")
+        logger.info(f"Checking all {model_name} schedules in {self.partition} ...")
 
-        for schedulable in self.manager().filter(enabled=True,
+        utc_now = timezone.now()
+
+        qs = self.manager().filter(enabled=True,
                 notification_event_severity_on_missing_execution__isnull=False).filter(
                     Q(managed_probability__gte=1.0) |
-                    Q(managed_probability__isnull=True)).exclude(schedule='').iterator():
+                    Q(managed_probability__isnull=True)).filter(
+                    Q(next_schedule_check_at__lte=utc_now) |
+                    Q(next_schedule_check_at__isnull=True)).exclude(schedule='')
+
+        def check(item: tuple[BoundSchedulable, tuple[datetime, datetime, datetime] | None, int]) -> None:
+            schedulable, time_range, execution_count = item
             logger.info(f"Found {model_name} {schedulable.uuid} with schedule {schedulable.schedule}")
             try:
-                self.check_execution_on_time(schedulable)
+                self.check_time_range(schedulable, time_range=time_range,
+                        execution_count=execution_count, utc_now=utc_now)
             except Exception:
                 logger.exception(f"check_all() failed on {model_name} {schedulable.uuid}")
 
+        self.partition.run(self.due_items(
+                self.partition.filter(qs).iterator(chunk_size=CHECK_BATCH_SIZE),
+                utc_now=utc_now), check)
+
         logger.info(f"Done checking all {model_name} schedules")
 
+    def due_items(self, schedulables: Iterable[BoundSchedulable], utc_now: datetime) \
+            -> Iterator[tuple[BoundSchedulable, tuple[datetime, datetime, datetime] | None, int]]:
+        """
+        Yield each Schedulable with its expected execution time range and
+        the number of executions started in that range. The executions of a
+        batch of Schedulables are counted with one grouped query.
+        """
+        for batch in batched(schedulables, CHECK_BATCH_SIZE):
+            time_ranges: dict[int, tuple[datetime, datetime, datetime] | None] = {}
+
+            for schedulable in batch:
+                try:
+                    time_ranges[schedulable.pk] = self.execution_time_range(
+                            schedulable, utc_now=utc_now)
+                except Exception:
+                    logger.exception(f"Can't compute execution time range of {self.model_name()} {schedulable.uuid}")
+
+            execution_counts = self.count_executions(time_ranges)
+
+            for schedulable in batch:
+                if schedulable.pk in time_ranges:
+                    yield (schedulable, time_ranges[schedulable.pk],
+                            execution_counts.get(schedulable.pk, 0))
+
+    def count_executions(self,
+            time_ranges: dict[int, tuple[datetime, datetime, datetime] | None]) \
+            -> dict[int, int]:
+        """
+        Returns the number of executions started within the time range of
+        each Schedulable, keyed by Schedulable id.
+        """
+        field_name = self.execution_schedulable_field_name()
+        q: Q | None = None
+
+        for pk, time_range in time_ranges.items():
+            if time_range is None:
+                continue
+
+            range_q = Q(**{field_name: pk}, started_at__gte=time_range[1],
+                    started_at__lte=time_range[2])
+            q = range_q if q is None else (q | range_q)
+
+        if q is None:
+            return {}
+
+        return dict(self.execution_manager().filter(q).order_by() \
+                .values(field_name).annotate(count=Count('pk')) \
+                .values_list(field_name, 'count'))
 
     def check_execution_on_time(self, schedulable: BoundSchedulable) \
             -> MissingScheduledExecutionEvent | None:
@@ -53,22 +121,121 @@ class ScheduleChecker(Generic[BoundSchedulable, BoundExecution], metaclass=ABCMe
             logger.warning(f"For schedulable entity {schedulable.uuid}, schedule '{schedule}' is blank, skipping")
             return None
 
-        mse: MissingScheduledExecutionEvent | None = None
-
         utc_now = timezone.now()
         time_range = self.execution_time_range(schedulable, utc_now=utc_now)
 
-        if time_range is None:
-            return None
+        return self.check_time_range(schedulable, time_range=time_range,
+                execution_count=None, utc_now=utc_now)
 
-        mse = self.check_executions(schedulable, expected_datetime=time_range[0],
-                from_datetime=time_range[1], to_datetime=time_range[2], utc_now=utc_now)
+    def check_time_range(self, schedulable: BoundSchedulable,
+            time_range: tuple[datetime, datetime, datetime] | None,
+            execution_count: int | None, utc_now: datetime) \
+            -> MissingScheduledExecutionEvent | None:
+        """
+        Check that enough executions started in time_range, then save when
+        the Schedulable should be checked next. If execution_count is None,
+        the executions are counted.
+        """
+        mse: MissingScheduledExecutionEvent | None = None
+        missing_execution_count = 0
+
+        if time_range is not None:
+            if execution_count is None:
+                execution_count = schedulable.executions().filter(
+                        started_at__gte=time_range[1],
+                        started_at__lte=time_range[2]).count()
+
+            missing_execution_count = max(1, schedulable.scheduled_instance_count or 1) \
+                    - execution_count
+
+            mse = self.check_executions(schedulable, expected_datetime=time_range[0],
+                    from_datetime=time_range[1], to_datetime=time_range[2],
+                    utc_now=utc_now, execution_count=execution_count)
+
+        self.save_next_schedule_check(schedulable, *self.next_schedule_check(
+                schedulable, utc_now=utc_now, time_range=time_range,
+                missing_execution_count=missing_execution_count))
 
         if mse:
             schedulable.send_event_notifications(event=mse)
 
         return mse
 
+    def save_next_schedule_check(self, schedulable: BoundSchedulable,
+            next_expected_execution_at: datetime | None,
+            next_schedule_check_at: datetime | None) -> None:
+        schedulable.next_expected_execution_at = next_expected_execution_at
+        schedulable.next_schedule_check_at = next_schedule_check_at
+
+        # Avoid save() so the pre_save handlers don't resynchronize the
+        # schedule
+        self.manager().filter(pk=schedulable.pk).update(
+                next_expected_execution_at=next_expected_execution_at,
+                next_schedule_check_at=next_schedule_check_at)
+
+    @staticmethod
+    def next_schedule_check(schedulable: BoundSchedulable, utc_now: datetime,
+            time_range: tuple[datetime, datetime, datetime] | None = None,
+            missing_execution_count: int = 0) \
+            -> tuple[datetime | None, datetime | None]:
+        """
+        Returns when the next execution of schedulable that has not been
+        checked is expected to start, and when the checker can first decide
+        whether it is missing, given that the schedule was checked at utc_now
+        and missing_execution_count executions were missing in time_range.
+        While executions are missing, the schedule is checked on every run,
+        until the window of the expected execution closes.
+        """
+        schedule = schedulable.schedule.strip()
+        schedule_updated_at = schedulable.schedule_updated_at
+
+        if not schedule:
+            return None, None
+
+        compiled_schedule = compile_schedule(schedule)
+
+        if compiled_schedule.cron:
+            if (missing_execution_count > 0) and time_range and (utc_now < time_range[2]):
+                return time_range[0], utc_now
+
+            # Execution times within MIN_DELAY_BETWEEN_EXPECTED_AND_ACTUAL_SECONDS
+            # before utc_now have not been checked yet
+            after = max(utc_now - timedelta(seconds=MIN_DELAY_BETWEEN_EXPECTED_AND_ACTUAL_SECONDS),
+                    schedule_updated_at)
+
+            expected_datetime = compiled_schedule.next(now=after)
+
+            if expected_datetime is None:
+                return None, None
+
+            return expected_datetime, expected_datetime + \
+                    timedelta(seconds=MIN_DELAY_BETWEEN_EXPECTED_AND_ACTUAL_SECONDS)
+
+        rate_relative_delta = compiled_schedule.rate
+
+        if rate_relative_delta is None:
+            return None, None
+
+        if missing_execution_count > 0:
+            return (time_range[0] if time_range else utc_now), utc_now
+
+        # Executions are missing once the required number of executions
+        # haven't started within the rate, so the next execution is expected
+        # one rate after the Nth latest execution started.
+        required_instance_count = max(1, schedulable.scheduled_instance_count or 1)
+        last_started_at = schedule_updated_at
+
+        if schedulable.pk is not None:
+            started_ats = list(schedulable.executions().filter(started_at__isnull=False) \
+                    .order_by('-started_at').values_list('started_at', flat=True) \
+                    [required_instance_count - 1:required_instance_count])
+
+            if started_ats:
+                last_started_at = max(started_ats[0], schedule_updated_at)
+
+        expected_datetime = last_started_at + rate_relative_delta
+        return expected_datetime, expected_datetime + \
+                timedelta(seconds=Schedulable.DEFAULT_MAX_EARLY_STARTUP_SECONDS)
 
     @staticmethod
     def execution_time_range(schedulable: BoundSchedulable, utc_now: datetime) \
@@ -81,40 +248,36 @@ class ScheduleChecker(Generic[BoundSchedulable, BoundExecution], metaclass=ABCMe
         to_datetime = utc_now
         schedule_updated_at = schedulable.schedule_updated_at
 
-        m = Schedulable.CRON_REGEX.match(schedule)
+        try:
+            compiled_schedule = compile_schedule(schedule)
+        except Exception as ex:
+            logger.exception(f"Can't parse schedule '{schedule}'")
+            raise ex
 
-        if m:
-            cron_expr = m.group(1)
+        if compiled_schedule.cron:
             logger.info(
-                f"execution_time_range(): {model_name} {schedulable.name} with schedule {schedulable.schedule} has cron expression '{cron_expr}'")
+                f"execution_time_range(): {model_name} {schedulable.name} with schedule {schedulable.schedule} has cron expression '{compiled_schedule.cron_expression}'")
 
-            try:
-                entry = CronTab(cron_expr)
-            except Exception as ex:
-                logger.exception(f"Can't parse cron expression '{cron_expr}'")
-                raise ex
-
-            negative_previous_execution_seconds_ago = entry.previous(
-                    now=utc_now)
+            previous_execution_at = compiled_schedule.previous(now=utc_now)
 
-            if negative_previous_execution_seconds_ago is None:
+            if previous_execution_at is None:
                 logger.info('execution_time_range(): No expected previous execution, returning')
                 return None
 
-            previous_execution_seconds_ago = -(negative_previous_execution_seconds_ago or 0.0)
+            previous_execution_seconds_ago = (utc_now - previous_execution_at).total_seconds()
 
             if previous_execution_seconds_ago < MIN_DELAY_BETWEEN_EXPECTED_AND_ACTUAL_SECONDS:
                 logger.info('execution_time_range(): Expected previous execution too recent, returning')
                 return None
 
-            expected_datetime = utc_now - timedelta(seconds=previous_execution_seconds_ago)
+            expected_datetime = previous_execution_at
             from_datetime = expected_datetime - timedelta(seconds=Schedulable.DEFAULT_MAX_EARLY_STARTUP_SECONDS)
             to_datetime = expected_datetime + timedelta(seconds=Schedulable.DEFAULT_MAX_SCHEDULED_LATENESS_SECONDS)
 
             logger.info(
                 f"execution_time_range(): Previous execution was supposed to start {previous_execution_seconds_ago / 60} minutes ago at {expected_datetime}")
         else:
-            rate_relative_delta = ScheduleChecker.parse_rate_schedule(schedule)
+            rate_relative_delta = compiled_schedule.rate
 
             if rate_relative_delta:
                 if schedule_updated_at + rate_relative_delta > utc_now:
@@ -138,13 +301,17 @@ class ScheduleChecker(Generic[BoundSchedulable, BoundExecution], metaclass=ABCMe
 
 
     def check_executions(self, schedulable: BoundSchedulable, expected_datetime: datetime,
-            from_datetime: datetime, to_datetime: datetime, utc_now: datetime) -> \
+            from_datetime: datetime, to_datetime: datetime, utc_now: datetime,
+            execution_count: int | None = None) -> \
             MissingScheduledExecutionEvent | None:
 
         model_name = self.model_name()
         executions = schedulable.executions().filter(started_at__gte=from_datetime,
                 started_at__lte=to_datetime)
-        execution_count = executions.count()
+
+        if execution_count is None:
+            execution_count = executions.count()
+
         required_instance_count = max(1, schedulable.scheduled_instance_count or 1)
         missing_execution_count = required_instance_count - execution_count
 
@@ -218,30 +385,11 @@ class ScheduleChecker(Generic[BoundSchedulable, BoundExecution], metaclass=ABCMe
 
     @staticmethod
     def parse_rate_schedule(schedule: str) -> relativedelta | None:
-        m = Schedulable.RATE_REGEX.match(schedule)
-
-        if m:
-            n = int(m.group(1))
-            time_unit = m.group(2).lower().rstrip('s')
-            return ScheduleChecker.make_relative_delta(n, time_unit)
-
-        return None
+        return compile_schedule(schedule).rate
 
     @staticmethod
     def make_relative_delta(n: int, time_unit: str) -> relativedelta:
-        if time_unit == 'second':
-            return relativedelta(seconds=n)
-        if time_unit == 'minute':
-            return relativedelta(minutes=n)
-        if time_unit == 'hour':
-            return relativedelta(hours=n)
-        if time_unit == 'day':
-            return relativedelta(days=n)
-        if time_unit == 'month':
-            return relativedelta(months=n)
-        if time_unit == 'year':
-            return relativedelta(years=n)
-        raise Exception(f"Unknown time unit '{time_unit}'")
+        return make_relative_delta(n, time_unit)
 
     @abstractmethod
     def model_name(self) -> str:
@@ -251,6 +399,14 @@ class ScheduleChecker(Generic[BoundSchedulable, BoundExecution], metaclass=ABCMe
     def manager(self) -> Manager[BoundSchedulable]:
         raise NotImplementedError()
 
+    @abstractmethod
+    def execution_manager(self) -> Manager[BoundExecution]:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def execution_schedulable_field_name(self) -> str:
+        raise NotImplementedError()
+
     @abstractmethod
     def make_missing_scheduled_execution_event(self, schedulable: BoundSchedulable,
             expected_execution_at: datetime, missing_execution_count: int) \
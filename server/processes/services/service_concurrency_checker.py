@@ -10,6 +10,8 @@ import intervals as I
 from ..common.notification import *
 from ..models import *
 
+from .checker_partition import CheckerPartition
+
 LOOKBACK_DURATION_SECONDS = 5 * 60
 DEFAULT_MAX_STARTUP_DURATION_SECONDS = 5 * 60
 
@@ -24,17 +26,24 @@ class ServiceConcurrencyChecker:
     RESOLVED_EVENT_SUMMARY_TEMPLATE = \
         """Service '{{task.name}}' now has a sufficient instance count of at least {{required_concurrency}}"""
 
+    def __init__(self, partition: CheckerPartition | None = None) -> None:
+        self.partition = partition or CheckerPartition()
+
     def check_all(self):
         logger.info("Checking for services with insufficient concurrency ...")
 
-        for service in Task.objects.filter(enabled=True, min_service_instance_count__gt=0,
-                notification_event_severity_on_insufficient_instances__isnull=False).iterator():
+        qs = Task.objects.filter(enabled=True, min_service_instance_count__gt=0,
+                notification_event_severity_on_insufficient_instances__isnull=False)
+
+        def check(service: Task) -> None:
             with transaction.atomic():
                 try:
                     self.check_service(service)
                 except Exception:
                     logger.exception(f"Exception checking service {service.uuid}")
 
+        self.partition.run(self.partition.filter(qs).iterator(), check)
+
         logger.info("Done checking for services with insufficient concurrency")
 
     def check_service(self, service: Task):
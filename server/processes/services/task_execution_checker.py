@@ -10,54 +10,75 @@ from django.utils import timezone
 
 from ..models import *
 
+from .checker_partition import CheckerPartition
+
 
 logger = logging.getLogger(__name__)
 
 
 class TaskExecutionChecker:
     HEARTBEAT_DETECTION_INTERVAL_SECONDS: Final[int] = 60 * 60
-    MAX_STOPPING_DURATION_SECONDS: Final[int] = 10 * 60
+    MAX_STOPPING_DURATION_SECONDS: Final[int] = TaskExecution.MAX_STOPPING_DURATION_SECONDS
     MAX_DELAYED_START_DETECTION_TASK_AGE_SECONDS: Final[int] = 30 * 24 * 60 * 60
 
     MISSING_HEARTBEAT_EVENT_SUMMARY_TEMPLATE: Final[str] = \
         """Execution {{task_execution.task.uuid}} of Task '{{task_execution.task.name}}' has not sent a heartbeat for more than {{heartbeat_interval_seconds}} seconds after the previous heartbeat at {{last_heartbeat_at}}"""
 
+    def __init__(self, partition: CheckerPartition | None = None) -> None:
+        self.partition = partition or CheckerPartition()
+
     def check_all(self):
-        # TODO: optimize query to only fetch problematic executions
-        for te in TaskExecution.objects.select_related(
-                'task').filter(status__in=TaskExecution.AWAITING_UPDATE_STATUSES, 
-                finished_at__isnull=True, task__enabled=True).iterator():
+        # Only fetch executions with a deadline that has passed
+        qs = TaskExecution.objects.select_related(
+                'task').filter(status__in=TaskExecution.AWAITING_UPDATE_STATUSES,
+                finished_at__isnull=True, task__enabled=True,
+                check_deadline_at__lte=timezone.now())
+
+        def check(te: TaskExecution) -> None:
             try:
                 self.check_task_execution(te)
             except Exception:
                 logger.exception(f"Failed checking Task Execution {te.uuid} of Task {te.task}")
 
+        self.partition.run(self.partition.filter(qs).iterator(), check)
+
     def check_task_execution(self, te: TaskExecution):
+        utc_now = timezone.now()
+
         with transaction.atomic():
-            te.refresh_from_db()
+            self.check_task_execution_state(te)
+
+            # Alerts due by now have been handled, so don't fetch the
+            # Task Execution again until its next deadline
+            TaskExecution.objects.filter(pk=te.pk).update(
+                    check_deadline_at=te.compute_check_deadline_at(
+                            skip_alerts_before=utc_now))
+
+    def check_task_execution_state(self, te: TaskExecution):
+        te.refresh_from_db()
 
-            if te.task is None:
-                logger.error(f"Task Execution {te.uuid} has no Task associated with it")
-                return
+        if te.task is None:
+            logger.error(f"Task Execution {te.uuid} has no Task associated with it")
+            return
 
-            if not te.task.enabled:
-                logger.error(f"Task Execution {te.uuid} has a disabled Task associated with it")
-                return
+        if not te.task.enabled:
+            logger.error(f"Task Execution {te.uuid} has a disabled Task associated with it")
+            return
 
-            if te.finished_at:
-                logger.error(f"Task Execution {te.uuid} has an in progress status but finished_at is not NULL")
-                return
+        if te.finished_at:
+            logger.error(f"Task Execution {te.uuid} has an in progress status but finished_at is not NULL")
+            return
 
-            if te.status not in TaskExecution.AWAITING_UPDATE_STATUSES:
-                logger.error(f"Task Execution {te.uuid} has status {te.status} which is not in AWAITING_UPDATE_STATUSES")
+        if te.status not in TaskExecution.AWAITING_UPDATE_STATUSES:
+            logger.error(f"Task Execution {te.uuid} has status {te.status} which is not in AWAITING_UPDATE_STATUSES")
 
-            if not self.check_started_on_time(te):
-                return
+        if not self.check_started_on_time(te):
+            return
 
-            if self.check_timeout(te):
-                return
+        if self.check_timeout(te):
+            return
 
-            self.check_missing_heartbeat(te)
+        self.check_missing_heartbeat(te)
 
     def check_started_on_time(self, te: TaskExecution) -> bool:
         if te.status != Execution.Status.MANUALLY_STARTED:
@@ -21,6 +21,14 @@ class TaskScheduleChecker(ScheduleChecker[Task, TaskExecution]):
     def manager(self) -> Manager[Task]:
         return Task.objects
 
+    @override
+    def execution_manager(self) -> Manager[TaskExecution]:
+        return TaskExecution.objects
+
+    @override
+    def execution_schedulable_field_name(self) -> str:
+        return 'task_id'
+
     @override
     def make_missing_scheduled_execution_event(self, schedulable: Task,
             expected_execution_at: datetime, missing_execution_count: int) -> MissingScheduledTaskExecutionEvent:
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Iterable
+
+import logging
+import queue
+import threading
+
+from django.db import connections
+
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerPool:
+    """
+    Calls a function on a stream of items, using up to max_workers threads.
+
+    Items are read lazily, so only a few more than max_workers are in
+    memory at once. Each thread has its own database connection, which is
+    closed when the thread finishes, so it can only see committed rows.
+    """
+
+    def __init__(self, max_workers: int = 1) -> None:
+        if max_workers < 1:
+            raise ValueError(f"Max workers {max_workers} must be positive")
+
+        self.max_workers = max_workers
+
+    def run(self, items: Iterable[Any], work: Callable[[Any], Any]) -> int:
+        """
+        Call work on each item. Exceptions raised by work are logged.
+        Returns the number of items for which work returned a truthy value.
+        """
+        if self.max_workers == 1:
+            return len([item for item in items if self.call_safely(work, item)])
+
+        work_queue: queue.Queue = queue.Queue(maxsize=2 * self.max_workers)
+        done = object()
+        lock = threading.Lock()
+        truthy_count = 0
+
+        def consume() -> None:
+            nonlocal truthy_count
+
+            try:
+                while (item := work_queue.get()) is not done:
+                    if self.call_safely(work, item):
+                        with lock:
+                            truthy_count += 1
+            finally:
+                # Each thread has its own database connection
+                connections.close_all()
+
+        threads = [threading.Thread(target=consume, daemon=True)
+                for _i in range(self.max_workers)]
+
+        for thread in threads:
+            thread.start()
+
+        try:
+            for item in items:
+                work_queue.put(item)
+        finally:
+            for _thread in threads:
+                work_queue.put(done)
+
+            for thread in threads:
+                thread.join()
+
+        return truthy_count
+
+    @staticmethod
+    def call_safely(work: Callable[[Any], Any], item: Any) -> bool:
+        try:
+            return bool(work(item))
+        except Exception:
+            logger.exception(f"Failed processing {item}")
+            return False
+
+    def __str__(self) -> str:
+        return f"{self.max_workers} workers"
@@ -5,19 +5,28 @@ from django.utils import timezone
 
 from ..models import WorkflowExecution
 
+from .checker_partition import CheckerPartition
+
 logger = logging.getLogger(__name__)
 
 
 class WorkflowExecutionChecker:
+    def __init__(self, partition: CheckerPartition | None = None) -> None:
+        self.partition = partition or CheckerPartition()
+
     def check_all(self) -> None:
         # TODO: optimize query to only fetch problematic executions
-        for we in WorkflowExecution.objects.select_related(
-                'workflow').filter(status__in=WorkflowExecution.IN_PROGRESS_STATUSES):
+        qs = WorkflowExecution.objects.select_related(
+                'workflow').filter(status__in=WorkflowExecution.IN_PROGRESS_STATUSES)
+
+        def check(we: WorkflowExecution) -> None:
             try:
                 self.check_workflow_execution(we)
             except Exception:
                 logger.exception(f"Failed checking Workflow Execution {we.uuid} of Workflow {we.workflow}")
 
+        self.partition.run(self.partition.filter(qs).iterator(), check)
+
     def check_workflow_execution(self, we: WorkflowExecution) -> None:
         if we.finished_at:
             logger.error(f"Workflow Execution {we.uuid} has an in progress status but finished_at is not NULL")
@@ -21,6 +21,14 @@ class WorkflowScheduleChecker(ScheduleChecker[Workflow, WorkflowExecution]):
     def manager(self) -> Manager[Workflow]:
         return Workflow.objects
 
+    @override
+    def execution_manager(self) -> Manager[WorkflowExecution]:
+        return WorkflowExecution.objects
+
+    @override
+    def execution_schedulable_field_name(self) -> str:
+        return 'workflow_id'
+
     @override
     def make_missing_scheduled_execution_event(self, schedulable: Workflow,
             expected_execution_at: datetime, missing_execution_count: int) -> MissingScheduledWorkflowExecutionEvent:
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+from typing import Iterable, TYPE_CHECKING
+
+import logging
+import threading
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .worker_pool import WorkerPool
+
+if TYPE_CHECKING:
+    from ..models import (
+        TaskExecution,
+        WorkflowExecution,
+        WorkflowTaskInstance,
+        WorkflowTaskInstanceExecution,
+    )
+
+
+logger = logging.getLogger(__name__)
+
+
+class WorkflowTaskInstanceStarter:
+    """
+    Starts a set of Workflow Task Instances of a Workflow Execution at once,
+    such as the roots of a Workflow, or the Workflow Task Instances
+    activated when another one finishes.
+
+    The Task Executions and Workflow Task Instance Executions of all
+    branches are written first, in one transaction. Then the Task
+    Executions are started, which waits on AWS, using up to max_workers
+    threads. Each thread has its own database connection, so it can only
+    see committed rows. If the caller is inside a transaction, as API
+    requests are, the starts run once it commits.
+
+    If a Task Execution fails to start, it is marked as failed, so that the
+    Workflow Execution handles it like any other failed Task Execution,
+    and the other branches still start.
+    """
+
+    def __init__(self, max_workers: int = 1) -> None:
+        if max_workers < 1:
+            raise ValueError(f"Max workers {max_workers} must be positive")
+
+        self.max_workers = max_workers
+
+    @staticmethod
+    def from_settings() -> WorkflowTaskInstanceStarter:
+        return WorkflowTaskInstanceStarter(
+                max_workers=settings.WORKFLOW_SETTINGS['MAX_START_WORKERS'])
+
+    def start(self, workflow_task_instances: Iterable[WorkflowTaskInstance],
+            workflow_execution: WorkflowExecution) -> list[WorkflowTaskInstanceExecution]:
+        """
+        Start each of workflow_task_instances once, even if it is listed more
+        than once, and return the new Workflow Task Instance Executions.
+        Inside a transaction, the Task Executions are started after it
+        commits.
+        """
+        wtis: dict[int, WorkflowTaskInstance] = {}
+
+        for wti in workflow_task_instances:
+            wtis.setdefault(wti.pk, wti)
+
+        if not wtis:
+            return []
+
+        wties = self.create_executions(list(wtis.values()), workflow_execution)
+        task_executions = [wtie.task_execution for wtie in wties]
+
+        if transaction.get_connection().in_atomic_block:
+            transaction.on_commit(lambda: self.start_task_executions(
+                    task_executions, workflow_execution), robust=True)
+        else:
+            self.start_task_executions(task_executions, workflow_execution)
+
+        return wties
+
+    def start_task_executions(self, task_executions: list[TaskExecution],
+            workflow_execution: WorkflowExecution) -> int:
+        """
+        Start the Task Executions concurrently, and fail the ones that
+        couldn't be started. Returns the number started.
+        """
+        failures: list[tuple[TaskExecution, Exception]] = []
+        lock = threading.Lock()
+
+        def start_task_execution(task_execution: TaskExecution) -> bool:
+            try:
+                task_execution.manually_start()
+                return True
+            except Exception as ex:
+                logger.warning(f"Failed to start Task Execution {task_execution.uuid} in Workflow Execution {workflow_execution.uuid}",
+                        exc_info=True)
+
+                with lock:
+                    failures.append((task_execution, ex))
+
+                return False
+
+        max_workers = min(self.max_workers, len(task_executions))
+
+        # Only reached in a transaction if on_commit callbacks run early,
+        # as in tests, where other threads can't see the rows yet
+        if transaction.get_connection().in_atomic_block:
+            max_workers = 1
+
+        started_count = WorkerPool(max_workers=max_workers).run(
+                task_executions, start_task_execution)
+
+        logger.info(f"Started {started_count} of {len(task_executions)} Task Executions in Workflow Execution {workflow_execution.uuid} with {max_workers} workers")
+
+        # Report failures from this thread, so the Workflow Execution is
+        # updated by one thread at a time
+        for task_execution, ex in failures:
+            self.fail_task_execution(task_execution, ex)
+
+        return started_count
+
+    @staticmethod
+    def create_executions(wtis: list[WorkflowTaskInstance],
+            workflow_execution: WorkflowExecution) -> list[WorkflowTaskInstanceExecution]:
+        from ..models import Execution, TaskExecution, WorkflowTaskInstanceExecution
+
+        with transaction.atomic():
+            task_executions: list[TaskExecution] = []
+
+            # Each Task Execution is saved individually, since saving it
+            # purges history, and computes settings and check deadlines
+            for wti in wtis:
+                logger.info(f"Starting Workflow Task Instance with UUID = {wti.uuid}, name = {wti.name} ...")
+
+                task_execution = TaskExecution(
+                    task=wti.task,
+                    status=Execution.Status.MANUALLY_STARTED,
+                )
+                task_execution.save()
+                task_executions.append(task_execution)
+
+            WorkflowTaskInstanceExecution.objects.filter(
+                workflow_execution=workflow_execution,
+                workflow_task_instance__in=wtis).update(is_latest=False)
+
+            return WorkflowTaskInstanceExecution.objects.bulk_create([
+                WorkflowTaskInstanceExecution(
+                    workflow_execution=workflow_execution,
+                    workflow_task_instance=wti,
+                    task_execution=task_execution,
+                    is_latest=True
+                ) for wti, task_execution in zip(wtis, task_executions)
+            ])
+
+    @staticmethod
+    def fail_task_execution(task_execution: TaskExecution, ex: Exception) -> None:
+        from ..models import Execution, TaskExecution
+
+        task_execution.refresh_from_db()
+
+        if not task_execution.is_in_progress():
+            return
+
+        task_execution.status = Execution.Status.FAILED
+        task_execution.stop_reason = TaskExecution.StopReason.FAILED_TO_START
+        task_execution.finished_at = timezone.now()
+        task_execution.error_details = {
+            'exception': str(ex)
+        }
+        task_execution.save()
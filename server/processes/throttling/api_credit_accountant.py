@@ -0,0 +1,442 @@
+from __future__ import annotations
+
+from typing import Any, Final, override
+
+from datetime import datetime, timedelta, timezone as dt_timezone
+import atexit
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.utils import timezone
+
+from ..models.group_info import GroupInfo
+
+
+logger = logging.getLogger(__name__)
+
+
+class ApiCreditAccountant:
+    """
+    Counts the API credits used by Groups and decides if a Group may use
+    another one.
+    """
+
+    def consume_credit(self, group_id: int,
+            max_api_credits_per_month: int | None,
+            utc_now: datetime | None = None) -> bool:
+        """
+        Use a credit on behalf of the Group, unless the Group has already
+        used max_api_credits_per_month credits this month. Returns True if
+        the credit was used.
+        """
+        raise NotImplementedError()
+
+    def flush(self) -> int:
+        """
+        Write counted credits to GroupInfo. Returns the number of credits
+        written.
+        """
+        return 0
+
+
+class DatabaseApiCreditAccountant(ApiCreditAccountant):
+    """
+    Reads and writes the GroupInfo row of the Group on every credit used.
+    """
+
+    @override
+    def consume_credit(self, group_id: int,
+            max_api_credits_per_month: int | None,
+            utc_now: datetime | None = None) -> bool:
+        utc_now = utc_now or timezone.now()
+
+        group_info = GroupInfo.objects.filter(group_id=group_id).first()
+
+        if not group_info:
+            group_info = GroupInfo(group_id=group_id)
+
+        api_credits = group_info.api_credits_used_in_month_of(utc_now)
+
+        allowed = (max_api_credits_per_month is None) or \
+                (api_credits < max_api_credits_per_month)
+
+        if allowed:
+            group_info.api_credits_used_current_month = api_credits + 1
+            group_info.api_last_used_at = utc_now
+
+        group_info.save()
+
+        return allowed
+
+
+class BufferedApiCreditAccountant(ApiCreditAccountant):
+    """
+    Counts credits in a store, and periodically adds the aggregated counts
+    to GroupInfo.
+
+    For each Group and month, the store holds the credits already written
+    to GroupInfo (the committed count, loaded from the database when
+    missing) and the credits counted since then (the pending count). A
+    credit is used only if the sum is below the limit, so the limit is
+    exact as long as every server shares the store. Counts are keyed by
+    month, so credits counted just before the month rolls over are still
+    added to the correct month. Shared stores expire the counts of a month
+    KEY_EXPIRATION_GRACE_PERIOD after it ends.
+    """
+
+    KEY_PREFIX: Final[str] = 'api_credits'
+
+    # Long enough for the last flush of the month to complete
+    KEY_EXPIRATION_GRACE_PERIOD: Final[timedelta] = timedelta(days=2)
+
+    def __init__(self, flush_interval_seconds: int) -> None:
+        self.flush_interval_seconds = flush_interval_seconds
+        self.lock = threading.Lock()
+        self.last_used_at_by_period: dict[tuple[int, int, int], datetime] = {}
+        self.last_flushed_at = time.monotonic()
+
+    @override
+    def consume_credit(self, group_id: int,
+            max_api_credits_per_month: int | None,
+            utc_now: datetime | None = None) -> bool:
+        utc_now = utc_now or timezone.now()
+        period = (group_id, utc_now.year, utc_now.month)
+        pending_key = self.make_key(period, 'pending')
+
+        expires_at = self.period_expires_at(period)
+
+        committed = self.committed_credits(period)
+        used = committed + self.increment(pending_key, 1, expires_at)
+
+        if (max_api_credits_per_month is not None) and \
+                (used > max_api_credits_per_month):
+            self.increment(pending_key, -1, expires_at)
+            return False
+
+        with self.lock:
+            last_used_at = self.last_used_at_by_period.get(period)
+            if (last_used_at is None) or (last_used_at < utc_now):
+                self.last_used_at_by_period[period] = utc_now
+
+            should_flush = (time.monotonic() - self.last_flushed_at) >= \
+                    self.flush_interval_seconds
+
+        if should_flush:
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('Failed to flush API credits')
+
+        return True
+
+    @override
+    def flush(self) -> int:
+        with self.lock:
+            periods = self.last_used_at_by_period
+            self.last_used_at_by_period = {}
+            self.last_flushed_at = time.monotonic()
+
+        flushed_count = 0
+
+        # Flush earlier months first so month rollover happens in order
+        for period, last_used_at in sorted(periods.items(),
+                key=lambda item: item[1]):
+            flushed_count += self.flush_period(period, last_used_at)
+
+        return flushed_count
+
+    def flush_period(self, period: tuple[int, int, int],
+            last_used_at: datetime) -> int:
+        group_id = period[0]
+        pending_key = self.make_key(period, 'pending')
+        committed_key = self.make_key(period, 'committed')
+        expires_at = self.period_expires_at(period)
+
+        GroupInfo.objects.get_or_create(group_id=group_id)
+
+        # The row lock serializes flushes of the same Group across servers
+        with transaction.atomic():
+            group_info = GroupInfo.objects.select_for_update().get(
+                    group_id=group_id)
+
+            count = self.get_value(pending_key) or 0
+
+            if count <= 0:
+                return 0
+
+            # Move the count from pending to committed so that concurrent
+            # readers never see less than the true total.
+            has_committed = self.increment_if_present(committed_key, count)
+            self.increment(pending_key, -count, expires_at)
+
+            try:
+                group_info.add_api_credits(count, used_at=last_used_at)
+                group_info.save()
+            except Exception:
+                self.increment(pending_key, count, expires_at)
+
+                if has_committed:
+                    self.increment_if_present(committed_key, -count)
+
+                raise
+
+        logger.debug(f"Flushed {count} API credits for Group {group_id}")
+
+        return count
+
+    def committed_credits(self, period: tuple[int, int, int]) -> int:
+        committed_key = self.make_key(period, 'committed')
+        committed = self.get_value(committed_key)
+
+        if committed is not None:
+            return committed
+
+        group_id, year, month = period
+        committed = 0
+        group_info = GroupInfo.objects.filter(group_id=group_id).first()
+
+        if group_info and group_info.api_last_used_at:
+            last_used_at = group_info.api_last_used_at
+            if (last_used_at.year, last_used_at.month) == (year, month):
+                committed = group_info.api_credits_used_current_month
+
+        self.add_value(committed_key, committed, self.period_expires_at(period))
+
+        return self.get_value(committed_key) or committed
+
+    def make_key(self, period: tuple[int, int, int], kind: str) -> str:
+        group_id, year, month = period
+        return f"{self.KEY_PREFIX}:{group_id}:{year:04d}{month:02d}:{kind}"
+
+    def period_expires_at(self, period: tuple[int, int, int]) -> datetime:
+        """
+        Returns when the counts of the period are no longer needed.
+        """
+        _group_id, year, month = period
+
+        if month == 12:
+            next_month_start = datetime(year + 1, 1, 1, tzinfo=dt_timezone.utc)
+        else:
+            next_month_start = datetime(year, month + 1, 1, tzinfo=dt_timezone.utc)
+
+        return next_month_start + self.KEY_EXPIRATION_GRACE_PERIOD
+
+    @staticmethod
+    def seconds_until(expires_at: datetime) -> int:
+        return max(1, int((expires_at - timezone.now()).total_seconds()))
+
+    def get_value(self, key: str) -> int | None:
+        raise NotImplementedError()
+
+    def add_value(self, key: str, value: int, expires_at: datetime) -> None:
+        """
+        Set the value of the key, unless it already has one. Stores that
+        support expiration may remove the key after expires_at.
+        """
+        raise NotImplementedError()
+
+    def increment(self, key: str, amount: int, expires_at: datetime) -> int:
+        """
+        Atomically add amount to the value of the key, which is treated as
+        0 if missing. Returns the new value. Stores that support expiration
+        may remove the key after expires_at.
+        """
+        raise NotImplementedError()
+
+    def increment_if_present(self, key: str, amount: int) -> bool:
+        raise NotImplementedError()
+
+
+class LocalApiCreditAccountant(BufferedApiCreditAccountant):
+    """
+    Counts credits in the memory of this process. Since servers do not
+    share counts, a Group may exceed its limit by the credits counted on
+    other servers since their last flush.
+    """
+
+    def __init__(self, flush_interval_seconds: int) -> None:
+        super().__init__(flush_interval_seconds=flush_interval_seconds)
+        self.values: dict[str, int] = {}
+        self.values_lock = threading.Lock()
+
+    @override
+    def flush_period(self, period: tuple[int, int, int],
+            last_used_at: datetime) -> int:
+        count = super().flush_period(period, last_used_at)
+
+        # Other servers may have added credits, so reload from the database
+        # next time.
+        with self.values_lock:
+            self.values.pop(self.make_key(period, 'committed'), None)
+
+        return count
+
+    @override
+    def get_value(self, key: str) -> int | None:
+        with self.values_lock:
+            return self.values.get(key)
+
+    @override
+    def add_value(self, key: str, value: int, expires_at: datetime) -> None:
+        with self.values_lock:
+            self.values.setdefault(key, value)
+
+    @override
+    def increment(self, key: str, amount: int, expires_at: datetime) -> int:
+        with self.values_lock:
+            value = self.values.get(key, 0) + amount
+            self.values[key] = value
+            return value
+
+    @override
+    def increment_if_present(self, key: str, amount: int) -> bool:
+        with self.values_lock:
+            if key not in self.values:
+                return False
+
+            self.values[key] += amount
+            return True
+
+
+class CacheApiCreditAccountant(BufferedApiCreditAccountant):
+    """
+    Counts credits in a Django cache shared by all servers.
+    """
+
+    def __init__(self, flush_interval_seconds: int,
+            cache_alias: str = 'default') -> None:
+        super().__init__(flush_interval_seconds=flush_interval_seconds)
+        self.cache = caches[cache_alias]
+
+    @override
+    def get_value(self, key: str) -> int | None:
+        return self.cache.get(key)
+
+    @override
+    def add_value(self, key: str, value: int, expires_at: datetime) -> None:
+        self.cache.add(key, value, timeout=self.seconds_until(expires_at))
+
+    @override
+    def increment(self, key: str, amount: int, expires_at: datetime) -> int:
+        # incr() keeps the timeout set when the key was added
+        self.cache.add(key, 0, timeout=self.seconds_until(expires_at))
+        return self.cache.incr(key, amount)
+
+    @override
+    def increment_if_present(self, key: str, amount: int) -> bool:
+        try:
+            self.cache.incr(key, amount)
+            return True
+        except ValueError:
+            return False
+
+
+class RedisApiCreditAccountant(BufferedApiCreditAccountant):
+    """
+    Counts credits in Redis, shared by all servers. Requires the redis
+    package.
+    """
+
+    def __init__(self, flush_interval_seconds: int, redis_url: str) -> None:
+        super().__init__(flush_interval_seconds=flush_interval_seconds)
+
+        try:
+            import redis
+        except ImportError as ex:
+            raise ImproperlyConfigured(
+                    'The redis package is required to count API credits in Redis') from ex
+
+        self.redis: Any = redis.Redis.from_url(redis_url)
+
+    @override
+    def get_value(self, key: str) -> int | None:
+        value = self.redis.get(key)
+        return None if value is None else int(value)
+
+    @override
+    def add_value(self, key: str, value: int, expires_at: datetime) -> None:
+        with self.redis.pipeline() as pipe:
+            pipe.set(key, value, nx=True)
+            pipe.expireat(key, int(expires_at.timestamp()))
+            pipe.execute()
+
+    @override
+    def increment(self, key: str, amount: int, expires_at: datetime) -> int:
+        # Every write sets the same expiration time, so it is never extended
+        with self.redis.pipeline() as pipe:
+            pipe.incrby(key, amount)
+            pipe.expireat(key, int(expires_at.timestamp()))
+            value, _expired = pipe.execute()
+
+        return int(value)
+
+    @override
+    def increment_if_present(self, key: str, amount: int) -> bool:
+        with self.redis.pipeline() as pipe:
+            pipe.exists(key)
+            pipe.incrby(key, amount)
+            exists, _value = pipe.execute()
+
+        if not exists:
+            self.redis.delete(key)
+
+        return bool(exists)
+
+
+BACKEND_DATABASE: Final[str] = 'database'
+BACKEND_LOCAL: Final[str] = 'local'
+BACKEND_CACHE: Final[str] = 'cache'
+BACKEND_REDIS: Final[str] = 'redis'
+
+_accountant: ApiCreditAccountant | None = None
+_accountant_lock = threading.Lock()
+
+
+def make_api_credit_accountant(backend: str,
+        flush_interval_seconds: int = 30,
+        cache_alias: str = 'default',
+        redis_url: str | None = None) -> ApiCreditAccountant:
+    if backend == BACKEND_DATABASE:
+        return DatabaseApiCreditAccountant()
+
+    if backend == BACKEND_LOCAL:
+        return LocalApiCreditAccountant(
+                flush_interval_seconds=flush_interval_seconds)
+
+    if backend == BACKEND_CACHE:
+        return CacheApiCreditAccountant(
+                flush_interval_seconds=flush_interval_seconds,
+                cache_alias=cache_alias)
+
+    if backend == BACKEND_REDIS:
+        if not redis_url:
+            raise ImproperlyConfigured('A Redis URL is required to count API credits in Redis')
+
+        return RedisApiCreditAccountant(
+                flush_interval_seconds=flush_interval_seconds,
+                redis_url=redis_url)
+
+    raise ImproperlyConfigured(f"Unknown API credit backend '{backend}'")
+
+
+def get_api_credit_accountant() -> ApiCreditAccountant:
+    global _accountant
+
+    with _accountant_lock:
+        if _accountant is None:
+            api_credit_settings = settings.API_CREDIT_SETTINGS
+            _accountant = make_api_credit_accountant(
+                    backend=api_credit_settings['BACKEND'],
+                    flush_interval_seconds=api_credit_settings['FLUSH_INTERVAL_SECONDS'],
+                    cache_alias=api_credit_settings['CACHE_ALIAS'],
+                    redis_url=api_credit_settings['REDIS_URL'])
+
+            if isinstance(_accountant, BufferedApiCreditAccountant):
+                atexit.register(_accountant.flush)
+
+        return _accountant
@@ -4,10 +4,11 @@ from django.utils import timezone
 
 from rest_framework.throttling import UserRateThrottle
 
-from ..models.group_info import GroupInfo
 from ..models.saas_token import SaasToken
 from ..models.subscription import Subscription
 
+from .api_credit_accountant import get_api_credit_accountant
+
 class SubscriptionRateThrottle(UserRateThrottle):
     # Define a custom scope name to be referenced by DRF in settings.py
     scope = 'subscription'
@@ -34,49 +35,15 @@ class SubscriptionRateThrottle(UserRateThrottle):
             self.history = []
 
             token = cast(SaasToken, request.auth)
-            group = token.group
-            usage_limits = Subscription.compute_usage_limits(group)
-            max_api_credits_per_month = usage_limits.max_api_credits_per_month
-
-            group_info = GroupInfo.objects.filter(group=group).first()
-
-            if not group_info:
-                group_info = GroupInfo(group=group)
-
-            now = timezone.now()
-            api_last_used_at = group_info.api_last_used_at or now
-
-            current_month = now.month
-            current_year = now.year
-            last_used_month = api_last_used_at.month
-            last_used_year = api_last_used_at.year
-
-            api_credits = 0
+            usage_limits = Subscription.compute_usage_limits(token.group)
 
-            if (last_used_month != current_month) or (last_used_year != current_year):
-                if ((last_used_year == current_year) and
-                    (last_used_month == current_month - 1)) or (
-                    (last_used_year == current_year - 1) and
-                    ((last_used_month == 12) and (current_month == 1))):
-                    group_info.api_credits_used_previous_month = \
-                            group_info.api_credits_used_current_month
-            else:
-                api_credits = group_info.api_credits_used_current_month
+            if get_api_credit_accountant().consume_credit(
+                    group_id=token.group_id,
+                    max_api_credits_per_month=usage_limits.max_api_credits_per_month,
+                    utc_now=timezone.now()):
+                return True
 
-            throttled = False
-
-            if (max_api_credits_per_month is not None) and (api_credits >= max_api_credits_per_month):
-                throttled = True
-            else:
-                group_info.api_credits_used_current_month = api_credits + 1
-                group_info.api_last_used_at = now
-
-            group_info.save()
-
-            if throttled:
-                return self.throttle_failure()
-
-            return True
+            return self.throttle_failure()
 
         # For users of the website (using JWT), use the default throttle behavior
         return super().allow_request(request, view)
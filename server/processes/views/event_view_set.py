@@ -18,6 +18,7 @@ from rest_framework.request import Request
 from ..common.utils import model_class_to_type_string
 from ..models.event import Event
 from ..models.user_group_access_level import UserGroupAccessLevel
+from ..pagination import KeysetPagination
 from ..permissions import IsCreatedByGroup
 from ..serializers import EventSerializer
 
@@ -210,6 +211,8 @@ class EventViewSet(AtomicModelViewSet, BaseViewSet):
         'executable__name'
     )
     ordering = '-event_at'  # Default ordering by event timestamp, newest first
+    pagination_class = KeysetPagination
+    keyset_ordering_fields = ('event_at',)
 
     # Cache for type string to serializer mapping
     _type_string_to_serializer_cache = None
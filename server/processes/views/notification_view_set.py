@@ -3,6 +3,7 @@ from django_filters import rest_framework as filters
 from django_filters.filters import NumberFilter
 
 from ..models import Notification
+from ..pagination import KeysetPagination
 from ..serializers import NotificationSerializer
 
 from .base_view_set import BaseViewSet
@@ -28,3 +29,5 @@ class NotificationViewSet(AtomicModelViewSet, BaseViewSet):
     filterset_class = NotificationFilter
     search_fields = ('uuid', 'exception_type', 'exception_message',)
     ordering_fields = ('uuid', 'attempted_at', 'completed_at', 'send_status',)
+    pagination_class = KeysetPagination
+    keyset_ordering_fields = ('attempted_at',)
@@ -1,34 +1,47 @@
-from typing import cast, Any, override
+from typing import cast, Any, Final, override
 
+from collections import Counter
 import logging
+from uuid import UUID
 
 from django.db import transaction
 from django.db.models import F
 from django.db.models.query import QuerySet
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from django.views import View
 
 from django.contrib.auth.models import Group, User
 
 from rest_framework import permissions, serializers, status
-from rest_framework.exceptions import ErrorDetail
+from rest_framework.decorators import action
+from rest_framework.exceptions import APIException, ErrorDetail
 from rest_framework.request import Request
 from rest_framework.response import Response
 
 from django_filters import rest_framework as filters
 
+from ..pagination import KeysetPagination
 from ..permissions import IsCreatedByGroup
 
 from ..models import (
-    TaskExecution, Task, RunEnvironment, UserGroupAccessLevel, Execution
+    TaskExecution, TaskExecutionLogChunk, Task, RunEnvironment,
+    UserGroupAccessLevel, Execution
+)
+from ..serializers import (
+    TaskExecutionSerializer, TaskExecutionHeartbeatSerializer,
+    TaskExecutionLogsSerializer
 )
-from ..serializers import TaskExecutionSerializer
 
 from ..common.request_helpers import (
     ensure_group_access_level,
     extract_filtered_group
 )
 
-from .atomic_viewsets import AtomicCreateModelMixin, AtomicUpdateModelMixin, AtomicDestroyModelMixin
+from .atomic_viewsets import (
+    AtomicContextManager, AtomicCreateModelMixin, AtomicUpdateModelMixin,
+    AtomicDestroyModelMixin
+)
 from .base_view_set import BaseViewSet
 
 logger = logging.getLogger(__name__)
@@ -80,6 +93,8 @@ class TaskExecutionFilter(filters.FilterSet):
 
 class TaskExecutionViewSet(AtomicCreateModelMixin, AtomicUpdateModelMixin,
         AtomicDestroyModelMixin, BaseViewSet):
+    MAX_BULK_UPDATE_COUNT: Final[int] = 100
+
     model_class = TaskExecution
     serializer_class = TaskExecutionSerializer
     lookup_field = 'uuid'
@@ -102,6 +117,8 @@ class TaskExecutionViewSet(AtomicCreateModelMixin, AtomicUpdateModelMixin,
                        'api_base_url',
                        'created_at', 'updated_at',)
     ordering = 'started_at'
+    pagination_class = KeysetPagination
+    keyset_ordering_fields = ('started_at',)
 
     @override
     def get_queryset(self):
@@ -188,15 +205,213 @@ class TaskExecutionViewSet(AtomicCreateModelMixin, AtomicUpdateModelMixin,
         if response.status_code != status.HTTP_200_OK:
             return response
 
-        was_conflict = False
-        request_status_name = request.data.get('status')
-        if request_status_name and (request_status_name == Execution.Status.RUNNING.name):
-            actual_status_name = response.data['status']
-            if actual_status_name != request_status_name:
-                setattr(response, 'status_code', status.HTTP_409_CONFLICT)
-                was_conflict = True
+        was_conflict = self.is_status_conflict(
+                request_status_name=request.data.get('status'),
+                actual_status_name=response.data['status'])
+
+        if was_conflict:
+            setattr(response, 'status_code', status.HTTP_409_CONFLICT)
 
         if was_conflict or (request.query_params.get('content', '').lower() != 'false'):
             return response
 
         return Response(data=None, status=204)
+
+    def is_status_conflict(self, request_status_name: str | None,
+            actual_status_name: str | None) -> bool:
+        return bool(request_status_name) and \
+                (request_status_name == Execution.Status.RUNNING.name) and \
+                (actual_status_name != request_status_name)
+
+    @action(methods=['post'], detail=False,
+            url_path='bulk_update', url_name='bulk_update')
+    def bulk_update(self, request: Request, *args, **kwargs) -> Response:
+        """
+        Apply partial updates to many Task Executions in one transaction.
+        Each item must contain the uuid of the Task Execution to update,
+        and each Task Execution may only be updated by one item.
+        The response contains a result per item, in request order, with the
+        HTTP status code the item would have received from a PATCH.
+        """
+        items = request.data.get('task_executions') \
+                if isinstance(request.data, dict) else request.data
+
+        if not isinstance(items, list):
+            raise serializers.ValidationError({
+                'task_executions': [ErrorDetail('Must be a list', code='invalid')]
+            })
+
+        if len(items) > self.MAX_BULK_UPDATE_COUNT:
+            raise serializers.ValidationError({
+                'task_executions': [ErrorDetail(
+                    f'At most {self.MAX_BULK_UPDATE_COUNT} Task Executions may be updated at once',
+                    code='max_length')]
+            })
+
+        uuids = [self.canonical_uuid(item.get('uuid')) for item in items
+                if isinstance(item, dict)]
+
+        task_executions = {
+            str(te.uuid): te for te in self.get_queryset_for_all_groups() \
+                    .select_related('task__created_by_group',
+                    'task__run_environment').filter(
+                    uuid__in=[u for u in uuids if u is not None])
+        }
+
+        # Items updating the same Task Execution would share one instance,
+        # which keeps the changes of an item whose savepoint was rolled back
+        uuid_counts = Counter(u for u in uuids if u is not None)
+        duplicate_uuids = {u for u, count in uuid_counts.items() if count > 1}
+
+        include_content = (request.query_params.get('content', '').lower() != 'false')
+
+        with transaction.atomic():
+            results = [self.bulk_update_item(request=request, item=item,
+                    task_executions=task_executions,
+                    duplicate_uuids=duplicate_uuids,
+                    include_content=include_content) for item in items]
+
+        return Response(data={'results': results}, status=status.HTTP_200_OK)
+
+    @staticmethod
+    def canonical_uuid(value: Any) -> str | None:
+        """
+        Returns the hyphenated, lowercase form of a UUID sent by a client,
+        or None if it isn't a UUID.
+        """
+        try:
+            return str(UUID(str(value)))
+        except ValueError:
+            return None
+
+    def bulk_update_item(self, request: Request, item: Any,
+            task_executions: dict[str, TaskExecution],
+            duplicate_uuids: set[str],
+            include_content: bool) -> dict[str, Any]:
+        if not isinstance(item, dict):
+            return {
+                'uuid': None,
+                'status_code': status.HTTP_400_BAD_REQUEST,
+                'errors': {'detail': 'Each item must be an object'},
+            }
+
+        canonical_uuid = self.canonical_uuid(item.get('uuid'))
+        item_uuid = canonical_uuid or str(item.get('uuid'))
+
+        if item_uuid in duplicate_uuids:
+            return {
+                'uuid': item_uuid,
+                'status_code': status.HTTP_400_BAD_REQUEST,
+                'errors': {'uuid': [ErrorDetail(
+                    'Each Task Execution may only be updated once per request',
+                    code='duplicate')]},
+            }
+
+        task_execution = task_executions.get(item_uuid)
+
+        if task_execution is None:
+            return {
+                'uuid': item_uuid,
+                'status_code': status.HTTP_404_NOT_FOUND,
+                'errors': {'detail': 'Not found.'},
+            }
+
+        try:
+            # Use a savepoint so a failed item does not affect the others
+            with AtomicContextManager():
+                self.check_object_permissions(request, task_execution)
+                serializer = TaskExecutionSerializer(task_execution,
+                        data=dict(item), partial=True,
+                        context=self.get_serializer_context())
+                serializer.is_valid(raise_exception=True)
+                serializer.save()
+                data = serializer.data
+        except APIException as ex:
+            return {
+                'uuid': item_uuid,
+                'status_code': ex.status_code,
+                'errors': ex.detail,
+            }
+        except Exception:
+            # The savepoint was rolled back, so the other items can proceed
+            logger.exception(f"Failed to update Task Execution {item_uuid} in bulk")
+            return {
+                'uuid': item_uuid,
+                'status_code': status.HTTP_500_INTERNAL_SERVER_ERROR,
+                'errors': {'detail': 'Internal server error'},
+            }
+
+        status_code = status.HTTP_200_OK
+        if self.is_status_conflict(request_status_name=item.get('status'),
+                actual_status_name=data['status']):
+            status_code = status.HTTP_409_CONFLICT
+
+        result: dict[str, Any] = {
+            'uuid': item_uuid,
+            'status_code': status_code,
+        }
+
+        if include_content or (status_code == status.HTTP_409_CONFLICT):
+            result['task_execution'] = data
+
+        return result
+
+    @transaction.atomic
+    @action(methods=['post'], detail=True,
+            url_path='heartbeat', url_name='heartbeat',
+            serializer_class=TaskExecutionHeartbeatSerializer)
+    def heartbeat(self, request: Request, uuid=None) -> Response:
+        """
+        Record a heartbeat of a running Task Execution without going through
+        the full update path. Falls back to the equivalent of a PATCH
+        with a RUNNING status when the heartbeat changes the status or may
+        resolve a missing heartbeat event.
+        """
+        task_execution = get_object_or_404(
+                self.get_queryset_for_all_groups().select_related(
+                'task__created_by_group', 'task__run_environment'), uuid=uuid)
+
+        self.check_object_permissions(request, task_execution)
+
+        heartbeat_serializer = TaskExecutionHeartbeatSerializer(data=request.data)
+        heartbeat_serializer.is_valid(raise_exception=True)
+        attrs = dict(heartbeat_serializer.validated_data)
+
+        if task_execution.record_heartbeat(utc_now=timezone.now(), **attrs):
+            return Response(data=None, status=status.HTTP_204_NO_CONTENT)
+
+        logger.info(f"Task Execution {task_execution.uuid} heartbeat requires a full update")
+
+        serializer = TaskExecutionSerializer(task_execution,
+                data={**attrs, 'status': Execution.Status.RUNNING.name},
+                partial=True, context=self.get_serializer_context())
+        serializer.is_valid(raise_exception=True)
+        saved = serializer.save()
+
+        if saved.status != Execution.Status.RUNNING:
+            return Response(data=serializer.data,
+                    status=status.HTTP_409_CONFLICT)
+
+        return Response(data=None, status=status.HTTP_204_NO_CONTENT)
+
+    @action(methods=['get'], detail=True,
+            url_path='logs', url_name='logs',
+            serializer_class=TaskExecutionLogsSerializer)
+    def logs(self, request: Request, uuid=None) -> Response:
+        """
+        Return the debug and error log tails of a Task Execution.
+        """
+        task_execution = get_object_or_404(
+                self.get_queryset_for_all_groups().select_related(
+                'task__created_by_group', 'task__run_environment'), uuid=uuid)
+
+        self.check_object_permissions(request, task_execution)
+
+        serializer = TaskExecutionLogsSerializer({
+            'debug_log_tail': TaskExecutionLogChunk.read_tail(task_execution,
+                    TaskExecutionLogChunk.STREAM_DEBUG),
+            'error_log_tail': TaskExecutionLogChunk.read_tail(task_execution,
+                    TaskExecutionLogChunk.STREAM_ERROR),
+        })
+
+        return Response(data=serializer.data)
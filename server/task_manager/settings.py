@@ -273,6 +273,93 @@ REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
 }
 
+# How API credits used by API keys are counted: 'database' writes the
+# Group's GroupInfo row on every request, 'local', 'cache' and 'redis' count
+# in memory and add the counts to GroupInfo every FLUSH_INTERVAL_SECONDS.
+API_CREDIT_SETTINGS = {
+    'BACKEND': env.str('DJANGO_API_CREDIT_BACKEND', default='database'),
+    'FLUSH_INTERVAL_SECONDS': env.int('DJANGO_API_CREDIT_FLUSH_INTERVAL_SECONDS',
+            default=30),
+    'CACHE_ALIAS': env.str('DJANGO_API_CREDIT_CACHE_ALIAS', default='default'),
+    'REDIS_URL': env.str('DJANGO_API_CREDIT_REDIS_URL', default=None),
+}
+
+# Usage limits of Groups are cached per request, and per process for up to
+# TTL_SECONDS.
+USAGE_LIMITS_CACHE_SETTINGS = {
+    'TTL_SECONDS': env.int('DJANGO_USAGE_LIMITS_CACHE_TTL_SECONDS', default=60),
+    'MAX_ENTRIES': env.int('DJANGO_USAGE_LIMITS_CACHE_MAX_ENTRIES', default=10000),
+}
+
+# Histories are trimmed inline once they grow past their limits by
+# SLACK_FRACTION of the limit
+HISTORY_RETENTION_SETTINGS = {
+    'SLACK_FRACTION': env.float('DJANGO_HISTORY_RETENTION_SLACK_FRACTION', default=0.05),
+    'BATCH_SIZE': env.int('DJANGO_HISTORY_RETENTION_BATCH_SIZE', default=500),
+    'RESYNC_SECONDS': env.int('DJANGO_HISTORY_RETENTION_RESYNC_SECONDS', default=300),
+    'MAX_ENTRIES': env.int('DJANGO_HISTORY_RETENTION_MAX_ENTRIES', default=10000),
+}
+
+# Each of SHARD_COUNT task_schedule_checker processes must have a distinct
+# SHARD_INDEX
+CHECKER_SETTINGS = {
+    'SHARD_INDEX': env.int('DJANGO_CHECKER_SHARD_INDEX', default=0),
+    'SHARD_COUNT': env.int('DJANGO_CHECKER_SHARD_COUNT', default=1),
+    'MAX_WORKERS': env.int('DJANGO_CHECKER_MAX_WORKERS', default=1),
+}
+
+# If ASYNCHRONOUS is True, Notifications are written to an outbox and sent
+# by the notification_dispatcher command, instead of during the request or
+# check that created their Event.
+NOTIFICATION_DISPATCH_SETTINGS = {
+    'ASYNCHRONOUS': env.bool('DJANGO_NOTIFICATION_DISPATCH_ASYNCHRONOUS',
+            default=False),
+    'MAX_WORKERS': env.int('DJANGO_NOTIFICATION_DISPATCH_MAX_WORKERS', default=8),
+    'BATCH_SIZE': env.int('DJANGO_NOTIFICATION_DISPATCH_BATCH_SIZE', default=100),
+    'MAX_ATTEMPTS': env.int('DJANGO_NOTIFICATION_DISPATCH_MAX_ATTEMPTS', default=5),
+    'RETRY_BASE_DELAY_SECONDS': env.int('DJANGO_NOTIFICATION_DISPATCH_RETRY_BASE_DELAY_SECONDS',
+            default=30),
+    'MAX_RETRY_DELAY_SECONDS': env.int('DJANGO_NOTIFICATION_DISPATCH_MAX_RETRY_DELAY_SECONDS',
+            default=60 * 60),
+    'CLAIM_TIMEOUT_SECONDS': env.int('DJANGO_NOTIFICATION_DISPATCH_CLAIM_TIMEOUT_SECONDS',
+            default=5 * 60),
+}
+
+NOTIFICATION_TRANSPORT_SETTINGS = {
+    'MAX_IDLE_SETS': env.int('DJANGO_NOTIFICATION_TRANSPORT_MAX_IDLE_SETS', default=16),
+    'MAX_IDLE_SECONDS': env.float('DJANGO_NOTIFICATION_TRANSPORT_MAX_IDLE_SECONDS',
+            default=60.0),
+    'MAX_CLIENTS': env.int('DJANGO_NOTIFICATION_TRANSPORT_MAX_CLIENTS', default=100),
+}
+
+# Sessions with assumed role credentials are replaced this long before the
+# credentials expire
+AWS_SESSION_CACHE_SETTINGS = {
+    'REFRESH_MARGIN_SECONDS': env.int('DJANGO_AWS_SESSION_CACHE_REFRESH_MARGIN_SECONDS',
+            default=5 * 60),
+    'MAX_ENTRIES': env.int('DJANGO_AWS_SESSION_CACHE_MAX_ENTRIES', default=1000),
+}
+
+# The users, groups and access levels that API keys resolve to are cached
+# for up to TTL_SECONDS. Changes made in this process invalidate them
+# immediately.
+API_KEY_CACHE_SETTINGS = {
+    'TTL_SECONDS': env.float('DJANGO_API_KEY_CACHE_TTL_SECONDS', default=30.0),
+    'MAX_ENTRIES': env.int('DJANGO_API_KEY_CACHE_MAX_ENTRIES', default=10000),
+}
+
+# Up to MAX_START_WORKERS Task Executions of a Workflow Execution are started
+# concurrently when several Workflow Task Instances start at once. Heartbeats
+# of Task Executions update the last heartbeat time of their Workflow
+# Execution at most once per LIVENESS_UPDATE_INTERVAL_SECONDS per process.
+WORKFLOW_SETTINGS = {
+    'MAX_START_WORKERS': env.int('DJANGO_WORKFLOW_MAX_START_WORKERS', default=8),
+    'LIVENESS_UPDATE_INTERVAL_SECONDS': env.float(
+            'DJANGO_WORKFLOW_LIVENESS_UPDATE_INTERVAL_SECONDS', default=30.0),
+    'LIVENESS_MAX_ENTRIES': env.int('DJANGO_WORKFLOW_LIVENESS_MAX_ENTRIES',
+            default=10000),
+}
+
 IN_SCHEMA_GENERATION = env.bool('DJANGO_IN_SCHEMA_GENERATION',
     default=False)
 
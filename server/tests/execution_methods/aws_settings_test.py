@@ -0,0 +1,141 @@
+import os
+import threading
+
+from django.utils import timezone
+
+from botocore.client import BaseClient
+
+from processes.common.aws_session_cache import get_aws_session_cache
+from processes.execution_methods.aws_settings import AwsSettings
+
+from moto import mock_aws
+
+
+EVENTS_ROLE_ARN = 'arn:aws:iam::123456789012:role/cloudreactor-events-role'
+
+
+def record_assumed_roles(monkeypatch) -> list[str]:
+    """
+    Returns the list that the ARNs of roles assumed with STS are appended to.
+    """
+    assumed_role_arns: list[str] = []
+    make_api_call = BaseClient._make_api_call
+
+    def recording_make_api_call(self, operation_name, api_params):
+        if operation_name == 'AssumeRole':
+            assumed_role_arns.append(api_params['RoleArn'])
+
+        return make_api_call(self, operation_name, api_params)
+
+    monkeypatch.setattr(BaseClient, '_make_api_call', recording_make_api_call)
+    return assumed_role_arns
+
+
+def make_aws_settings() -> AwsSettings:
+    aws_settings = AwsSettings()
+    aws_settings.account_id = '123456789012'
+    aws_settings.region = 'us-west-1'
+    aws_settings.events_role_arn = EVENTS_ROLE_ARN
+    aws_settings.assumed_role_external_id = 'DEADBEEF'
+    return aws_settings
+
+
+def expire_sessions(role_arn: str) -> None:
+    for key, entry in get_aws_session_cache().entries.items():
+        if key[0] == role_arn:
+            entry.expires_at = timezone.now()
+
+
+@mock_aws
+def test_make_boto3_client_assumes_roles_once_per_expiry(monkeypatch):
+    assumed_role_arns = record_assumed_roles(monkeypatch)
+    invoker_role_arn = os.environ['CUSTOMER_INVOKER_ROLE_ARN']
+    aws_settings = make_aws_settings()
+
+    ecs_client = aws_settings.make_boto3_client('ecs')
+    assert ecs_client.list_clusters()['clusterArns'] == []
+
+    assert aws_settings.make_boto3_client('ecs') is ecs_client
+    assert make_aws_settings().make_boto3_client('ecs',
+            session_uuid='other') is ecs_client
+
+    # Other services use the same assumed credentials
+    events_client = aws_settings.make_events_client()
+    assert events_client is not ecs_client
+
+    assert assumed_role_arns == [invoker_role_arn, EVENTS_ROLE_ARN]
+
+    # Only the expired role is assumed again
+    expire_sessions(EVENTS_ROLE_ARN)
+    assert aws_settings.make_boto3_client('ecs') is not ecs_client
+    assert assumed_role_arns == [invoker_role_arn, EVENTS_ROLE_ARN, EVENTS_ROLE_ARN]
+
+    expire_sessions(EVENTS_ROLE_ARN)
+    expire_sessions(invoker_role_arn)
+    aws_settings.make_boto3_client('ecs')
+    assert assumed_role_arns == [invoker_role_arn, EVENTS_ROLE_ARN,
+            EVENTS_ROLE_ARN, invoker_role_arn, EVENTS_ROLE_ARN]
+
+
+@mock_aws
+def test_make_boto3_client_caches_by_role_and_region(monkeypatch):
+    assumed_role_arns = record_assumed_roles(monkeypatch)
+    aws_settings = make_aws_settings()
+    ecs_client = aws_settings.make_boto3_client('ecs')
+
+    other_region_settings = make_aws_settings()
+    other_region_settings.region = 'us-east-2'
+    assert other_region_settings.make_boto3_client('ecs') is not ecs_client
+
+    other_external_id_settings = make_aws_settings()
+    other_external_id_settings.assumed_role_external_id = 'FEEDFACE'
+    assert other_external_id_settings.make_boto3_client('ecs') is not ecs_client
+
+    # The customer invoker role is shared
+    assert len(assumed_role_arns) == 4
+    assert assumed_role_arns.count(EVENTS_ROLE_ARN) == 3
+
+
+@mock_aws
+def test_make_boto3_client_assumes_roles_once_concurrently(monkeypatch):
+    assumed_role_arns = record_assumed_roles(monkeypatch)
+    thread_count = 8
+    barrier = threading.Barrier(thread_count)
+    clients = []
+    errors: list[Exception] = []
+
+    def work() -> None:
+        try:
+            barrier.wait()
+            clients.append(make_aws_settings().make_boto3_client('ecs'))
+        except Exception as ex:
+            errors.append(ex)
+
+    threads = [threading.Thread(target=work) for _i in range(thread_count)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(clients) == thread_count
+    assert all(client is clients[0] for client in clients)
+    assert len(assumed_role_arns) == 2
+
+
+@mock_aws
+def test_make_boto3_client_with_access_key(monkeypatch):
+    assumed_role_arns = record_assumed_roles(monkeypatch)
+    aws_settings = make_aws_settings()
+    aws_settings.access_key = 'AKIAEXAMPLE'
+    aws_settings.secret_key = 'secret'
+
+    ecs_client = aws_settings.make_boto3_client('ecs')
+    assert aws_settings.make_boto3_client('ecs') is ecs_client
+
+    aws_settings.secret_key = 'rotated'
+    assert aws_settings.make_boto3_client('ecs') is not ecs_client
+
+    assert assumed_role_arns == []
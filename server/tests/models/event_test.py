@@ -1,10 +1,16 @@
 
 
 from datetime import timedelta
+
+from django.db import connection
+from django.db.models import ProtectedError
+from django.db.models.signals import pre_delete
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 from django.contrib.auth.models import Group
 
+from processes.common.history_retention import get_history_retention
 from processes.models import (
     Event,
     Subscription,
@@ -34,4 +40,90 @@ def test_save_event_exceeding_max_events(group: Group, subscription_plan_factory
             earliest_event = event
 
     assert Event.objects.filter(created_by_group=group).count() == 3
-    assert Event.objects.filter(uuid=earliest_event.uuid).exists() is False
\ No newline at end of file
+    assert Event.objects.filter(uuid=earliest_event.uuid).exists() is False
+
+@pytest.mark.django_db
+def test_save_event_trims_past_high_water_mark(group: Group,
+        subscription_plan_factory, basic_event_factory, monkeypatch):
+    utc_now = timezone.now()
+    monkeypatch.setattr(get_history_retention(), 'slack_fraction', 0.5)
+
+    subscription_plan = subscription_plan_factory(max_events=10)
+    subscription = Subscription(group=group,
+          subscription_plan=subscription_plan, active=True,
+          start_at=utc_now - timedelta(minutes=1))
+    subscription.save()
+
+    with CaptureQueriesContext(connection) as context:
+        for i in range(15):
+            basic_event_factory(created_by_group=group,
+                  event_at=utc_now - timedelta(minutes=(30 - i)))
+
+    # Events are only counted once, and not trimmed within the slack
+    assert count_event_count_queries(context) == 1
+    assert Event.objects.filter(created_by_group=group).count() == 15
+
+    basic_event_factory(created_by_group=group, event_at=utc_now)
+
+    events = list(Event.objects.filter(created_by_group=group).order_by('event_at'))
+    assert len(events) == 10
+    assert events[0].event_at == utc_now - timedelta(minutes=24)
+
+
+@pytest.mark.django_db
+def test_purge_event_history(group: Group, subscription_plan_factory,
+        basic_event_factory, monkeypatch):
+    utc_now = timezone.now()
+    monkeypatch.setattr(get_history_retention(), 'batch_size', 2)
+
+    for i in range(7):
+        basic_event_factory(created_by_group=group,
+              event_at=utc_now - timedelta(minutes=(30 - i)))
+
+    subscription_plan = subscription_plan_factory(max_events=2)
+    subscription = Subscription(group=group,
+          subscription_plan=subscription_plan, active=True,
+          start_at=utc_now - timedelta(minutes=1))
+    subscription.save()
+
+    assert Event.purge_history(group) == 5
+    assert Event.purge_history(group) == 0
+
+    assert [e.event_at for e in Event.objects.filter(created_by_group=group) \
+            .order_by('event_at')] == [utc_now - timedelta(minutes=25),
+            utc_now - timedelta(minutes=24)]
+
+
+@pytest.mark.django_db
+def test_purge_event_history_skips_rows_that_cannot_be_deleted(group: Group,
+        subscription_plan_factory, basic_event_factory, monkeypatch):
+    utc_now = timezone.now()
+    monkeypatch.setattr(get_history_retention(), 'batch_size', 2)
+
+    events = [basic_event_factory(created_by_group=group,
+            event_at=utc_now - timedelta(minutes=(30 - i))) for i in range(7)]
+
+    subscription_plan = subscription_plan_factory(max_events=2)
+    subscription = Subscription(group=group,
+          subscription_plan=subscription_plan, active=True,
+          start_at=utc_now - timedelta(minutes=1))
+    subscription.save()
+
+    def protect_earliest_event(sender, instance, **kwargs):
+        if instance.pk == events[0].pk:
+            raise ProtectedError('Simulated protected Event', {instance})
+
+    pre_delete.connect(protect_earliest_event, sender=Event)
+
+    try:
+        assert Event.purge_history(group) == 5
+    finally:
+        pre_delete.disconnect(protect_earliest_event, sender=Event)
+
+    assert [e.pk for e in Event.objects.filter(created_by_group=group) \
+            .order_by('event_at')] == [events[0].pk, events[6].pk]
+
+
+def count_event_count_queries(context: CaptureQueriesContext) -> int:
+    return len([q for q in context.captured_queries
+            if q['sql'].startswith('SELECT COUNT') and ('processes_event' in q['sql'])])
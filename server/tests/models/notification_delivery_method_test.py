@@ -0,0 +1,105 @@
+import threading
+
+from django.db import connections
+
+from processes.exception import NotificationRateLimitExceededException
+from processes.models import (
+    EmailNotificationDeliveryMethod, NotificationDeliveryMethod
+)
+
+import pytest
+
+
+MAX_REQUESTS = 10
+
+
+def make_rate_limited_method(email_notification_delivery_method_factory):
+    tier_settings = {}
+
+    for tier_index in range(NotificationDeliveryMethod.MAX_RATE_LIMIT_TIERS):
+        tier_settings[f'max_requests_per_period_{tier_index}'] = None
+        tier_settings[f'request_period_seconds_{tier_index}'] = None
+
+    tier_settings['max_requests_per_period_3'] = MAX_REQUESTS
+    tier_settings['request_period_seconds_3'] = 60 * 60
+
+    return email_notification_delivery_method_factory(**tier_settings)
+
+
+@pytest.mark.django_db
+def test_reserve_request_with_stale_instances(basic_event_factory,
+        email_notification_delivery_method_factory):
+    edm = make_rate_limited_method(email_notification_delivery_method_factory)
+    event = basic_event_factory()
+
+    stale_edms = [NotificationDeliveryMethod.objects.get(pk=edm.pk)
+            for _i in range(MAX_REQUESTS + 1)]
+
+    # Each instance was loaded before any request was counted
+    tier_indices = [stale_edm.reserve_request(event) for stale_edm in stale_edms]
+
+    assert tier_indices == ([None] * MAX_REQUESTS) + [3]
+
+    edm.refresh_from_db()
+    assert edm.request_count_in_period_3 == MAX_REQUESTS
+    assert edm.request_period_started_at_3 is not None
+
+
+@pytest.mark.django_db(transaction=True)
+def test_send_if_not_rate_limited_concurrently(basic_event_factory,
+        email_notification_delivery_method_factory, monkeypatch):
+    edm = make_rate_limited_method(email_notification_delivery_method_factory)
+    event = basic_event_factory()
+
+    thread_count = 8
+    sends_per_thread = 5
+    lock = threading.Lock()
+    sent_count = 0
+    rate_limited_count = 0
+    errors: list[Exception] = []
+
+    def counting_send(self, event):
+        nonlocal sent_count
+        with lock:
+            sent_count += 1
+        return {'success': True}
+
+    monkeypatch.setattr(EmailNotificationDeliveryMethod, 'send', counting_send,
+            raising=False)
+
+    barrier = threading.Barrier(thread_count)
+
+    def work() -> None:
+        nonlocal rate_limited_count
+
+        try:
+            thread_edm = NotificationDeliveryMethod.objects.get(pk=edm.pk)
+            barrier.wait()
+
+            for _i in range(sends_per_thread):
+                try:
+                    thread_edm.send_if_not_rate_limited(event)
+                except NotificationRateLimitExceededException:
+                    with lock:
+                        rate_limited_count += 1
+        except Exception as ex:
+            errors.append(ex)
+        finally:
+            connections.close_all()
+
+    threads = [threading.Thread(target=work) for _i in range(thread_count)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+
+    # No more than the limit were sent, and no increments were lost
+    assert sent_count == MAX_REQUESTS
+    assert rate_limited_count == (thread_count * sends_per_thread) - MAX_REQUESTS
+
+    edm.refresh_from_db()
+    assert edm.request_count_in_period_3 == MAX_REQUESTS
@@ -11,7 +11,8 @@ from processes.exception.notification_rate_limit_exceeded_exception import (
 import pytest
 
 @pytest.mark.django_db
-def test_send_success(basic_event, group, monkeypatch):
+def test_send_success(basic_event, group, monkeypatch,
+        django_capture_on_commit_callbacks):
 
     # Create a notification profile
     profile = NotificationProfile.objects.create(name="Test Profile", created_by_group=group)
@@ -29,8 +30,9 @@ def test_send_success(basic_event, group, monkeypatch):
     # Associate the NDM with the profile
     profile.notification_delivery_methods.add(ndm)
 
-    # Send a notification
-    profile.send(basic_event)
+    # Send a notification, which happens once the transaction commits
+    with django_capture_on_commit_callbacks(execute=True):
+        profile.send(basic_event)
 
     # Verify that a notification was created
     notifications = profile.notification_set.all()
@@ -45,7 +47,8 @@ def test_send_success(basic_event, group, monkeypatch):
 
 
 @pytest.mark.django_db
-def test_send_rate_limited(basic_event, group, monkeypatch):
+def test_send_rate_limited(basic_event, group, monkeypatch,
+        django_capture_on_commit_callbacks):
 
     # Create a notification profile
     profile = NotificationProfile.objects.create(name="Test Profile", created_by_group=group)
@@ -71,8 +74,9 @@ def test_send_rate_limited(basic_event, group, monkeypatch):
     # Associate the NDM with the profile
     profile.notification_delivery_methods.add(ndm)
 
-    # Send a notification
-    profile.send(basic_event)
+    # Send a notification, which happens once the transaction commits
+    with django_capture_on_commit_callbacks(execute=True):
+        profile.send(basic_event)
 
     # Verify that a notification was created
     notifications = profile.notification_set.all()
@@ -91,7 +95,8 @@ def test_send_rate_limited(basic_event, group, monkeypatch):
 
 
 @pytest.mark.django_db
-def test_send_failure(basic_event, group, monkeypatch):
+def test_send_failure(basic_event, group, monkeypatch,
+        django_capture_on_commit_callbacks):
 
     # Create a notification profile
     profile = NotificationProfile.objects.create(name="Test Profile", created_by_group=group)
@@ -111,8 +116,9 @@ def test_send_failure(basic_event, group, monkeypatch):
     # Associate the NDM with the profile
     profile.notification_delivery_methods.add(ndm)
 
-    # Send a notification
-    profile.send(basic_event)
+    # Send a notification, which happens once the transaction commits
+    with django_capture_on_commit_callbacks(execute=True):
+        profile.send(basic_event)
 
     # Verify that a notification was created
     notifications = profile.notification_set.all()
@@ -129,7 +135,8 @@ def test_send_failure(basic_event, group, monkeypatch):
 
 
 @pytest.mark.django_db
-def test_send_rate_limited(basic_event, group, monkeypatch):
+def test_send_rate_limited(basic_event, group, monkeypatch,
+        django_capture_on_commit_callbacks):
 
     # Create a notification profile
     profile = NotificationProfile.objects.create(name="Test Profile", created_by_group=group)
@@ -155,8 +162,9 @@ def test_send_rate_limited(basic_event, group, monkeypatch):
     # Associate the NDM with the profile
     profile.notification_delivery_methods.add(ndm)
 
-    # Send a notification
-    profile.send(basic_event)
+    # Send a notification, which happens once the transaction commits
+    with django_capture_on_commit_callbacks(execute=True):
+        profile.send(basic_event)
 
     # Verify that a notification was created
     notifications = profile.notification_set.all()
@@ -241,3 +249,48 @@ def test_send_while_disabled(basic_event, group, monkeypatch):
     notifications = profile.notification_set.all()
     assert notifications.count() == 0
 
+
+
+@pytest.mark.django_db
+def test_send_after_commit(basic_event, group, monkeypatch,
+        django_capture_on_commit_callbacks):
+    """
+    Notifications are sent after the transaction commits, so the rate limit
+    reservation doesn't lock the delivery method while sending.
+    """
+    profile = NotificationProfile.objects.create(name="Test Profile", created_by_group=group)
+
+    ndm = EmailNotificationDeliveryMethod.objects.create(name="Test NDM",
+          created_by_group=group,
+          email_to_addresses=["test@example.com"])
+
+    sent_events = []
+
+    def send(self, event):
+        sent_events.append(event)
+        return {'success': True}
+
+    monkeypatch.setattr(EmailNotificationDeliveryMethod, 'send', send,
+          raising=False)
+
+    profile.notification_delivery_methods.add(ndm)
+
+    with django_capture_on_commit_callbacks(execute=False) as callbacks:
+        profile.send(basic_event)
+
+    notification = profile.notification_set.get()
+    assert notification.send_status == NotificationSendStatus.SENDING
+    assert sent_events == []
+
+    ndm.refresh_from_db()
+    assert ndm.request_count_in_period_0 is None
+
+    for callback in callbacks:
+        callback()
+
+    notification.refresh_from_db()
+    assert notification.send_status == NotificationSendStatus.SUCCEEDED
+    assert sent_events == [basic_event]
+
+    ndm.refresh_from_db()
+    assert ndm.request_count_in_period_0 == 1
@@ -26,7 +26,7 @@ def test_send_task_execution_event(run_environment: RunEnvironment,
     event.severity = Event.Severity.ERROR
 
     # Mock pagerduty.EventsApiV2Client
-    with patch('processes.models.pagerduty_notification_delivery_method.pagerduty.EventsApiV2Client') as mock_session_class:
+    with patch('processes.common.notification_transports.pagerduty.EventsApiV2Client') as mock_session_class:
         mock_session = MagicMock()
         mock_session.__enter__.return_value = mock_session
         mock_session.trigger.return_value = 'test-dedup-key-123'
@@ -77,7 +77,7 @@ def test_send_workflow_execution_event(run_environment: RunEnvironment,
     event.severity = Event.Severity.WARNING
 
     # Mock pagerduty.EventsApiV2Client
-    with patch('processes.models.pagerduty_notification_delivery_method.pagerduty.EventsApiV2Client') as mock_session_class:
+    with patch('processes.common.notification_transports.pagerduty.EventsApiV2Client') as mock_session_class:
         mock_session = MagicMock()
         mock_session.__enter__.return_value = mock_session
         mock_session.trigger.return_value = 'workflow-dedup-key-456'
@@ -119,7 +119,7 @@ def test_send_resolution_event(run_environment: RunEnvironment,
     event.grouping_key = 'resolve-grouping-key'
 
     # Mock pagerduty.EventsApiV2Client
-    with patch('processes.models.pagerduty_notification_delivery_method.pagerduty.EventsApiV2Client') as mock_session_class:
+    with patch('processes.common.notification_transports.pagerduty.EventsApiV2Client') as mock_session_class:
         mock_session = MagicMock()
         mock_session.__enter__.return_value = mock_session
         mock_session.resolve.return_value = 'resolved-successfully'
@@ -0,0 +1,118 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from django.contrib.auth.models import Group
+
+from processes.common.usage_limits import UsageLimits
+from processes.common.usage_limits_cache import (
+    UsageLimitsCache, get_usage_limits_cache
+)
+from processes.models import Subscription
+
+import pytest
+
+
+@pytest.mark.django_db
+def test_compute_usage_limits_is_cached(group: Group,
+        subscription_plan_factory, subscription_factory):
+    subscription_plan = subscription_plan_factory(max_events=3)
+    subscription_factory(group=group, subscription_plan=subscription_plan)
+
+    assert Subscription.compute_usage_limits(group).max_events == 3
+
+    with CaptureQueriesContext(connection) as context:
+        for _i in range(5):
+            assert Subscription.compute_usage_limits(group).max_events == 3
+
+    assert len(context.captured_queries) == 0
+
+    stats = get_usage_limits_cache().stats()
+    assert stats['miss_count'] == 1
+    assert stats['process_hit_count'] == 5
+
+
+@pytest.mark.django_db
+def test_compute_usage_limits_invalidated_on_change(group: Group,
+        subscription_plan_factory, subscription_factory):
+    assert Subscription.compute_usage_limits(group).max_events == \
+            UsageLimits.default_limits().max_events
+
+    subscription_plan = subscription_plan_factory(max_events=3)
+    subscription = subscription_factory(group=group,
+            subscription_plan=subscription_plan)
+
+    assert Subscription.compute_usage_limits(group).max_events == 3
+
+    subscription_plan.max_events = 7
+    subscription_plan.save()
+
+    assert Subscription.compute_usage_limits(group).max_events == 7
+
+    subscription.delete()
+
+    assert Subscription.compute_usage_limits(group).max_events == \
+            UsageLimits.default_limits().max_events
+
+
+@pytest.mark.django_db
+def test_compute_usage_limits_invalidated_after_commit(group: Group,
+        subscription_plan_factory, subscription_factory,
+        django_capture_on_commit_callbacks):
+    """
+    Limits cached by another request before the change commits are
+    invalidated once it commits.
+    """
+    subscription_plan = subscription_plan_factory(max_events=3)
+    subscription_factory(group=group, subscription_plan=subscription_plan)
+
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        subscription_plan.max_events = 7
+        subscription_plan.save()
+
+        # Another request caches the limits of the uncommitted row
+        get_usage_limits_cache().get(group.pk,
+                lambda: (UsageLimits(max_events=3), None))
+
+    assert len(callbacks) > 0
+    assert Subscription.compute_usage_limits(group).max_events == 7
+
+
+@pytest.mark.django_db
+def test_compute_usage_limits_expires_when_subscription_ends(group: Group,
+        subscription_plan_factory, subscription_factory):
+    utc_now = timezone.now()
+    subscription_plan = subscription_plan_factory(max_events=3)
+    subscription_factory(group=group, subscription_plan=subscription_plan,
+            end_at=utc_now - timedelta(seconds=1))
+
+    # The ended Subscription is ignored
+    assert Subscription.compute_usage_limits(group).max_events == \
+            UsageLimits.default_limits().max_events
+
+    end_at = utc_now + timedelta(hours=1)
+    subscription_factory(group=group, subscription_plan=subscription_plan,
+            end_at=end_at)
+
+    usage_limits, valid_until = Subscription.load_usage_limits(group)
+    assert usage_limits.max_events == 3
+    assert valid_until == end_at
+
+
+def test_usage_limits_cache_evicts_least_recently_used():
+    cache = UsageLimitsCache(ttl_seconds=60, max_entries=2)
+
+    def loader(max_events: int):
+        return lambda: (UsageLimits(max_events=max_events), None)
+
+    cache.get(1, loader(1))
+    cache.get(2, loader(2))
+    cache.get(1, loader(100))
+    cache.get(3, loader(3))
+
+    # Group 2 was the least recently used, so it was evicted
+    assert cache.get(2, loader(200)).max_events == 200
+    assert cache.get(3, loader(300)).max_events == 3
+    assert cache.stats()['entry_count'] == 2
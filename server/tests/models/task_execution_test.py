@@ -1,15 +1,21 @@
+from datetime import timedelta
 from unittest.mock import patch
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 from moto import mock_aws
 import pytest
 
+from processes.common.liveness_throttle import get_workflow_liveness_throttle
 from processes.models import (
     Event,
     Execution,
     TaskExecution,
+    TaskExecutionLogChunk,
     TaskExecutionStatusChangeEvent,
+    WorkflowExecution,
 )
 
 
@@ -248,3 +254,151 @@ def test_post_save_timeout_event_postponed_when_configured(task_execution_factor
     assert event.postponed_until is not None
     assert event.triggered_at is None
     mock_notify.assert_not_called()
+
+
+@pytest.mark.django_db
+@mock_aws
+def test_post_save_throttles_workflow_execution_heartbeats(task_execution_factory,
+        workflow_execution_factory, workflow_task_instance_execution_factory):
+    """Heartbeats of a Task Execution in a Workflow update the Workflow Execution's last heartbeat with a throttled UPDATE instead of saving it."""
+    workflow_execution = workflow_execution_factory()
+    te = task_execution_factory(status=Execution.Status.RUNNING.value)
+    workflow_task_instance_execution_factory(
+            workflow_execution=workflow_execution, task_execution=te)
+
+    heartbeat_at = workflow_execution.started_at + timedelta(minutes=1)
+
+    with patch.object(WorkflowExecution, 'save') as mock_save, \
+            CaptureQueriesContext(connection) as context:
+        for i in range(5):
+            te.last_heartbeat_at = heartbeat_at + timedelta(seconds=i)
+            te.save()
+
+        # Status changes are always recorded
+        te.last_heartbeat_at = workflow_execution.started_at
+        te.status = Execution.Status.STOPPING
+        te.save()
+
+    mock_save.assert_not_called()
+
+    updates = [query for query in context.captured_queries
+            if query['sql'].startswith('UPDATE "processes_workflowexecution"')]
+    assert len(updates) == 2
+
+    # The last heartbeat never moves back in time
+    workflow_execution.refresh_from_db()
+    assert workflow_execution.last_heartbeat_at == heartbeat_at
+
+
+@pytest.mark.django_db
+@mock_aws
+def test_record_heartbeat_throttles_workflow_execution_updates(task_execution_factory,
+        workflow_execution_factory, workflow_task_instance_execution_factory):
+    """Heartbeats recorded without saving update the Workflow Execution through its liveness throttle."""
+    workflow_execution = workflow_execution_factory()
+    te = task_execution_factory(status=Execution.Status.RUNNING.value)
+    workflow_task_instance_execution_factory(
+            workflow_execution=workflow_execution, task_execution=te)
+
+    heartbeat_at = workflow_execution.started_at + timedelta(minutes=1)
+
+    with CaptureQueriesContext(connection) as context:
+        for i in range(5):
+            assert te.record_heartbeat(utc_now=heartbeat_at + timedelta(seconds=i))
+
+    updates = [query for query in context.captured_queries
+            if query['sql'].startswith('UPDATE "processes_workflowexecution"')]
+    assert len(updates) == 1
+
+    # Only Workflow Executions are tracked by their liveness throttle
+    assert get_workflow_liveness_throttle().written_at.items() == \
+            [(workflow_execution.pk, True)]
+
+    workflow_execution.refresh_from_db()
+    assert workflow_execution.last_heartbeat_at == heartbeat_at
+
+
+@pytest.mark.django_db
+@mock_aws
+def test_loaded_task_executions_only_track_compared_fields(task_execution_factory):
+    """Loaded TaskExecutions remember only the fields signal handlers compare, not copies of themselves."""
+    import tracemalloc
+
+    metadata_value = 'x' * 100000
+    task = task_execution_factory().task
+    for _i in range(20):
+        task_execution_factory(task=task, status=Execution.Status.RUNNING.value,
+                other_runtime_metadata={'a': metadata_value, 'b': metadata_value})
+
+    tracemalloc.start()
+    try:
+        before, _peak = tracemalloc.get_traced_memory()
+        tes = list(TaskExecution.objects.filter(task=task))
+        after, _peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    for te in tes:
+        assert set(te._loaded_values) == set(TaskExecution.CHANGE_TRACKED_FIELDS)
+
+    # Loading holds each row's metadata once, and nothing more per row
+    assert after - before < 2 * 2 * len(metadata_value) * len(tes)
+
+    # Changes are still detected after loading and saving
+    te = next(te for te in tes if te.status == Execution.Status.RUNNING)
+
+    with patch.object(TaskExecution, 'send_event_notifications', return_value=0):
+        te.status = Execution.Status.FAILED
+        te.save()
+
+        assert te._loaded_values['status'] == Execution.Status.FAILED
+
+        te.save()
+
+    assert TaskExecutionStatusChangeEvent.objects.filter(task_execution=te,
+            status=Execution.Status.FAILED).count() == 1
+
+
+@pytest.mark.django_db
+@mock_aws
+def test_log_chunk_appends_run_constant_queries(task_execution_factory):
+    te = task_execution_factory()
+    stream = TaskExecutionLogChunk.STREAM_DEBUG
+
+    def append(text: str) -> int:
+        with CaptureQueriesContext(connection) as context:
+            TaskExecutionLogChunk.append(te, stream, text)
+
+        return len(context.captured_queries)
+
+    with patch.object(TaskExecutionLogChunk, 'MAX_TAIL_LENGTH', 12):
+        query_counts = [append(f"line {i}\n") for i in range(6)]
+
+        # Appends don't read or add up the lengths of the other chunks
+        assert len(set(query_counts)) == 1
+
+        chunks = TaskExecutionLogChunk.objects.filter(task_execution=te,
+                stream=stream).order_by('end_offset')
+        assert [(chunk.length, chunk.end_offset) for chunk in chunks] == [
+            (7, 35), (7, 42),
+        ]
+        assert TaskExecutionLogChunk.read_tail(te, stream) == 'ne 4\nline 5\n'
+
+        TaskExecutionLogChunk.replace(te, stream, 'new\n')
+        assert list(TaskExecutionLogChunk.objects.filter(task_execution=te,
+                stream=stream).values_list('end_offset', flat=True)) == [4]
+
+
+@pytest.mark.django_db
+@mock_aws
+def test_log_chunk_first_append_locks_task_execution(task_execution_factory):
+    te = task_execution_factory()
+
+    # There is no chunk to lock yet, so the Task Execution is locked instead
+    with CaptureQueriesContext(connection) as context:
+        TaskExecutionLogChunk.append(te, TaskExecutionLogChunk.STREAM_ERROR,
+                'first\n')
+
+    assert [q for q in context.captured_queries
+            if ('FOR UPDATE' in q['sql']) and
+            q['sql'].startswith('SELECT "processes_taskexecution"')]
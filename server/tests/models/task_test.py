@@ -754,3 +754,38 @@ def test_sync_returns_false_when_nothing_updated(task_factory):
     result = _sync(task, mock_em)
 
     assert result is False
+
+
+@pytest.mark.django_db
+def test_auto_created_task_properties_digest_cleared_when_changed(task_factory,
+        task_execution_factory):
+    task = task_factory(auto_created_task_properties_digest='digest')
+
+    # Updates made by the server don't clear the digest
+    task_execution_factory(task=task, status=Execution.Status.RUNNING.value)
+    task = Task.objects.get(pk=task.pk)
+    assert task.latest_task_execution is not None
+    task.save()
+    task.refresh_from_db()
+    assert task.auto_created_task_properties_digest == 'digest'
+
+    # Neither does applying new auto-created properties
+    task = Task.objects.get(pk=task.pk)
+    task.description = 'auto-created'
+    task.auto_created_task_properties_digest = 'new_digest'
+    task.save()
+    task.refresh_from_db()
+    assert task.auto_created_task_properties_digest == 'new_digest'
+
+    task.description = 'edited'
+    task.save()
+    task.refresh_from_db()
+    assert task.auto_created_task_properties_digest == ''
+
+    Task.objects.filter(pk=task.pk).update(auto_created_task_properties_digest='digest')
+    task = Task.objects.get(pk=task.pk)
+    task.max_concurrency = 5
+    task.save(update_fields=['max_concurrency'])
+    task.refresh_from_db()
+    assert task.max_concurrency == 5
+    assert task.auto_created_task_properties_digest == ''
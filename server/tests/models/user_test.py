@@ -8,6 +8,7 @@ from djoser.views import UserViewSet as DjoserUserViewSet
 from processes.models import (
     SaasToken, UserGroupAccessLevel
 )
+from processes.common.api_key_cache import ApiKeyPrincipal, get_api_key_cache
 from processes.common.request_helpers import request_for_context
 
 def ensure_user_has_default_group_and_saas_token(user):
@@ -65,3 +66,27 @@ def test_conflicting_group_creation():
     assert user.groups.count() == 1
     group = user.groups.first()
     assert group.name == 'conflict 1'
+
+
+@pytest.mark.django_db
+def test_api_keys_invalidated_after_access_level_commits(user_factory,
+        django_capture_on_commit_callbacks):
+    """
+    API key principals cached by another request before an access level
+    change commits are invalidated once it commits.
+    """
+    user = user_factory()
+    group = user.groups.first()
+    ugal = UserGroupAccessLevel.objects.get(user=user, group=group)
+    principal = ApiKeyPrincipal(SaasToken(user=user, group=group),
+            user_access_level=ugal.access_level)
+
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        ugal.access_level = UserGroupAccessLevel.ACCESS_LEVEL_OBSERVER
+        ugal.save()
+
+        # Another request caches the principal before the change commits
+        get_api_key_cache().get('key', lambda: principal)
+
+    assert len(callbacks) > 0
+    assert 'key' not in get_api_key_cache().entries
@@ -1500,3 +1500,166 @@ def test_event_filter_by_workflow_execution_uuid(
     assert response.status_code == 200
     page = response.data
     assert page['count'] == 0
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("""
+  ordering
+""", [
+  (None),
+  ('event_at'),
+  ('-event_at'),
+])
+def test_event_list_cursor_pagination(
+        ordering: str | None,
+        user_factory, group_factory,
+        basic_event_factory,
+        api_client) -> None:
+    """
+    Test paging through events with cursors, in both directions, with
+    ties and NULL values in the ordering field.
+    """
+    from datetime import timedelta
+
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    user = user_factory()
+    group = user.groups.first()
+
+    set_group_access_level(user=user, group=group,
+            access_level=UserGroupAccessLevel.ACCESS_LEVEL_DEVELOPER)
+
+    now = timezone.now()
+    event_ats = [now, now, now - timedelta(minutes=1), now - timedelta(minutes=2),
+            now - timedelta(minutes=2), now - timedelta(minutes=2), None, None,
+            now - timedelta(minutes=3)]
+    events = [basic_event_factory(created_by_group=group, event_at=event_at)
+            for event_at in event_ats]
+
+    # Another group's events are excluded
+    basic_event_factory(created_by_group=group_factory())
+
+    client = make_api_client_from_options(api_client=api_client,
+            is_authenticated=True, user=user, group=group,
+            api_key_access_level=UserGroupAccessLevel.ACCESS_LEVEL_DEVELOPER,
+            api_key_run_environment=None)
+
+    # NULL values sort after all others, as in indexes
+    descending = ordering != 'event_at'
+    non_null_events = sorted([event for event in events if event.event_at],
+            key=lambda event: (event.event_at, event.pk), reverse=descending)
+    null_events = sorted([event for event in events if event.event_at is None],
+            key=lambda event: event.pk, reverse=descending)
+    expected_events = (null_events + non_null_events) if descending else \
+            (non_null_events + null_events)
+    expected_uuids = [str(event.uuid) for event in expected_events]
+
+    params: dict[str, Any] = {
+        'pagination': 'cursor',
+        'limit': 2,
+    }
+
+    if ordering:
+        params['ordering'] = ordering
+
+    url: str | None = '/api/v1/events/'
+    pages: list[list[str]] = []
+    query_counts: list[int] = []
+
+    while url:
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, params if not pages else None)
+
+        assert response.status_code == 200
+
+        page = response.data
+
+        # Counting is opt-in
+        assert page['count'] is None
+
+        if pages:
+            assert page['previous'] is not None
+        else:
+            assert page['previous'] is None
+
+        pages.append([r['uuid'] for r in page['results']])
+        query_counts.append(len(context.captured_queries))
+        url = page['next']
+
+    assert [uuid for page_uuids in pages for uuid in page_uuids] == expected_uuids
+    assert [len(page_uuids) for page_uuids in pages] == [2, 2, 2, 2, 1]
+
+    # Pages cost the same, except for one more query on pages that reach
+    # the rows with NULL values
+    assert max(query_counts) - min(query_counts) <= 1
+
+    # Page backwards from the last page
+    url = page['previous']
+    previous_pages: list[list[str]] = []
+
+    while url:
+        response = client.get(url)
+        assert response.status_code == 200
+        page = response.data
+        previous_pages.insert(0, [r['uuid'] for r in page['results']])
+        url = page['previous']
+
+    assert previous_pages == pages[:-1]
+
+    params['count'] = 'exact'
+    response = client.get('/api/v1/events/', params)
+    assert response.status_code == 200
+    assert response.data['count'] == len(events)
+
+    params['count'] = 'estimate'
+    response = client.get('/api/v1/events/', params)
+    assert response.status_code == 200
+    assert response.data['count'] is not None
+
+
+@pytest.mark.django_db
+def test_event_list_cursor_pagination_errors(
+        user_factory, basic_event_factory, api_client) -> None:
+    user = user_factory()
+    group = user.groups.first()
+
+    set_group_access_level(user=user, group=group,
+            access_level=UserGroupAccessLevel.ACCESS_LEVEL_DEVELOPER)
+
+    for _i in range(3):
+        basic_event_factory(created_by_group=group)
+
+    client = make_api_client_from_options(api_client=api_client,
+            is_authenticated=True, user=user, group=group,
+            api_key_access_level=UserGroupAccessLevel.ACCESS_LEVEL_DEVELOPER,
+            api_key_run_environment=None)
+
+    response = client.get('/api/v1/events/', {
+        'pagination': 'cursor',
+        'ordering': 'severity',
+    })
+    assert response.status_code == 400
+
+    response = client.get('/api/v1/events/', {
+        'cursor': 'not-a-cursor',
+    })
+    assert response.status_code == 404
+
+    # A cursor can't be reused with a different ordering
+    response = client.get('/api/v1/events/', {
+        'pagination': 'cursor',
+        'limit': 1,
+    })
+    assert response.status_code == 200
+    next_url = response.data['next']
+    assert next_url
+
+    response = client.get(next_url + '&ordering=event_at')
+    assert response.status_code == 404
+
+    # Offset pagination is still the default
+    response = client.get('/api/v1/events/', {'limit': 1, 'offset': 1})
+    assert response.status_code == 200
+    assert response.data['count'] == 3
+    assert len(response.data['results']) == 1
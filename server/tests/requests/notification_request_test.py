@@ -0,0 +1,66 @@
+from typing import Any
+
+from datetime import timedelta
+
+from django.utils import timezone
+
+from processes.models import UserGroupAccessLevel
+
+import pytest
+
+from conftest import *
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("""
+  ordering
+""", [
+  (None),
+  ('attempted_at'),
+  ('-attempted_at'),
+])
+def test_notification_list_cursor_pagination(
+        ordering: str | None,
+        user_factory, notification_factory,
+        api_client) -> None:
+    """
+    Test paging through Notifications with cursors, with ties and NULL
+    values of attempted_at, which sort after all other values.
+    """
+    user = user_factory()
+    group = user.groups.first()
+
+    set_group_access_level(user=user, group=group,
+            access_level=UserGroupAccessLevel.ACCESS_LEVEL_DEVELOPER)
+
+    now = timezone.now()
+    attempted_ats = [now, None, now - timedelta(minutes=1), now, None,
+            now - timedelta(minutes=2), None]
+    notifications = [notification_factory(created_by_group=group,
+            attempted_at=attempted_at) for attempted_at in attempted_ats]
+
+    client = make_api_client_from_options(api_client=api_client,
+            is_authenticated=True, user=user, group=group,
+            api_key_access_level=UserGroupAccessLevel.ACCESS_LEVEL_DEVELOPER,
+            api_key_run_environment=None)
+
+    params: dict[str, Any] = {
+        'pagination': 'cursor',
+        'limit': 2,
+    }
+
+    if ordering:
+        params['ordering'] = ordering
+
+    descending = ordering != 'attempted_at'
+    non_null = sorted([n for n in notifications if n.attempted_at],
+            key=lambda n: (n.attempted_at, n.pk), reverse=descending)
+    nulls = sorted([n for n in notifications if n.attempted_at is None],
+            key=lambda n: n.pk, reverse=descending)
+    expected = (nulls + non_null) if descending else (non_null + nulls)
+
+    pages = fetch_cursor_pages(client, '/api/v1/notifications/', params)
+
+    assert [len(page) for page in pages] == [2, 2, 2, 1]
+    assert [uuid for page in pages for uuid in page] == \
+            [str(n.uuid) for n in expected]
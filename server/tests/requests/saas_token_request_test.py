@@ -759,3 +759,70 @@ def test_saas_token_removal(
         assert not found_tokens.exists()
     else:
         assert found_tokens.exists()
+
+
+@pytest.mark.django_db
+def test_saas_token_authentication_is_cached(user_factory,
+        run_environment_factory):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework.exceptions import PermissionDenied
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    from processes.authentication import SaasTokenAuthentication
+    from processes.common.request_helpers import ensure_group_access_level
+
+    user = user_factory()
+    group = user.groups.first()
+    set_group_access_level(user=user, group=group,
+            access_level=UserGroupAccessLevel.ACCESS_LEVEL_DEVELOPER)
+    run_environment = run_environment_factory(created_by_group=group)
+
+    token = SaasToken.objects.create(user=user, group=group,
+            access_level=UserGroupAccessLevel.ACCESS_LEVEL_TASK,
+            run_environment=run_environment)
+
+    def authenticate_and_check() -> tuple[Request, int, int]:
+        request = Request(APIRequestFactory().get('/',
+                HTTP_AUTHORIZATION=f"Bearer {token.key}"),
+                authenticators=[SaasTokenAuthentication()])
+
+        with CaptureQueriesContext(connection) as context:
+            assert request.user.pk == user.pk
+            assert request.auth.run_environment.pk == run_environment.pk
+
+            for _i in range(3):
+                _user, _group, access_level = ensure_group_access_level(
+                        group=group,
+                        min_access_level=UserGroupAccessLevel.ACCESS_LEVEL_TASK,
+                        run_environment=run_environment, request=request)
+
+        return (request, access_level, len(context.captured_queries))
+
+    _request, access_level, query_count = authenticate_and_check()
+    assert access_level == UserGroupAccessLevel.ACCESS_LEVEL_TASK
+    assert query_count > 0
+
+    # Authenticating again, and checking access, runs no queries
+    _request, access_level, query_count = authenticate_and_check()
+    assert access_level == UserGroupAccessLevel.ACCESS_LEVEL_TASK
+    assert query_count == 0
+
+    # Lowering the user's access level in the Group invalidates the cache
+    set_group_access_level(user=user, group=group,
+            access_level=UserGroupAccessLevel.ACCESS_LEVEL_OBSERVER)
+
+    with pytest.raises(PermissionDenied):
+        authenticate_and_check()
+
+    set_group_access_level(user=user, group=group,
+            access_level=UserGroupAccessLevel.ACCESS_LEVEL_DEVELOPER)
+    authenticate_and_check()
+
+    # So does disabling the token
+    token.enabled = False
+    token.save()
+
+    with pytest.raises(PermissionDenied):
+        authenticate_and_check()
@@ -3,8 +3,11 @@ from typing import Any, List, Tuple, cast
 from datetime import timedelta
 import random
 import uuid
+from unittest.mock import patch
 from urllib.parse import quote
 
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 from django.contrib.auth.models import User
@@ -13,8 +16,9 @@ from processes.execution_methods.unknown_execution_method import UnknownExecutio
 
 from processes.models import (
     UserGroupAccessLevel, Subscription, RunEnvironment,
-    Task, TaskExecution, Execution
+    Task, TaskExecution, TaskExecutionLogChunk, Execution
 )
+from processes.serializers import TaskExecutionSerializer
 
 import pytest
 
@@ -821,6 +825,91 @@ def test_task_execution_with_unknown_method_auto_creation(
                 error_code)
 
 
+@pytest.mark.django_db
+@mock_aws
+def test_task_execution_skips_unchanged_auto_created_task_properties(
+        user_factory, group_factory, run_environment_factory,
+        unknown_execution_method_task_factory, task_execution_factory,
+        api_client, monkeypatch) -> None:
+    """
+    Auto-created Task properties are only applied to the Task when they
+    differ from the last ones applied.
+    """
+    from processes.serializers import TaskSerializer
+
+    user = user_factory()
+
+    _task_execution, _task, api_key_run_environment, client, url = common_setup(
+            is_authenticated=True,
+            group_access_level=UserGroupAccessLevel.ACCESS_LEVEL_DEVELOPER,
+            api_key_access_level=UserGroupAccessLevel.ACCESS_LEVEL_DEVELOPER,
+            api_key_scope_type=SCOPE_TYPE_CORRECT,
+            uuid_send_type=SEND_ID_NONE,
+            user=user,
+            group_factory=group_factory,
+            run_environment_factory=run_environment_factory,
+            task_factory=unknown_execution_method_task_factory,
+            task_execution_factory=task_execution_factory,
+            api_client=api_client)
+
+    assert api_key_run_environment is not None # for mypy
+
+    task_saves: list[dict[str, Any]] = []
+    create_or_update = TaskSerializer.create_or_update
+
+    def counting_create_or_update(self, instance, validated_data):
+        task_saves.append(validated_data)
+        return create_or_update(self, instance, validated_data)
+
+    monkeypatch.setattr(TaskSerializer, 'create_or_update',
+            counting_create_or_update)
+
+    def start(description: str) -> Task:
+        response = client.post(url, {
+            'status': Execution.Status.RUNNING.name,
+            'auto_created_task_properties': {
+                'name': 'Auto Task',
+                'description': description,
+                'run_environment': {
+                    'name': api_key_run_environment.name,
+                },
+                'execution_method_capability': {
+                    'type': 'Unknown',
+                },
+                'was_auto_created': True,
+                'passive': True,
+            }
+        })
+
+        assert response.status_code == 201
+        return Task.objects.get(uuid=response.data['task']['uuid'])
+
+    task = start('first')
+    assert len(task_saves) == 1
+    assert task.description == 'first'
+    assert task.auto_created_task_properties_digest
+
+    start('first')
+    assert len(task_saves) == 1
+
+    task = start('second')
+    assert len(task_saves) == 2
+    assert task.description == 'second'
+
+    # Changing the Task another way means the properties are applied again
+    response = client.patch(f"/api/v1/tasks/{task.uuid}/", {
+        'description': 'edited',
+    })
+    assert response.status_code == 200
+    task.refresh_from_db()
+    assert task.description == 'edited'
+    assert task.auto_created_task_properties_digest == ''
+
+    task = start('second')
+    assert len(task_saves) == 4
+    assert task.description == 'second'
+
+
 @pytest.mark.django_db
 @pytest.mark.parametrize("""
     status,
@@ -1250,6 +1339,552 @@ def test_task_execution_update_conflict(skip_response_body: bool,
     assert response_dict['status'] == Execution.Status.STOPPED.name
 
 
+@pytest.mark.django_db
+@pytest.mark.parametrize("""
+  initial_status, last_heartbeat_seconds_ago,
+  status_code, expected_status
+""", [
+  # Running with a recent heartbeat takes the single UPDATE path
+  (Execution.Status.RUNNING, 10,
+   204, Execution.Status.RUNNING),
+
+  # Running with a late heartbeat falls back to a full update
+  (Execution.Status.RUNNING, 3600,
+   204, Execution.Status.RUNNING),
+
+  # Manually started changes the status to RUNNING
+  (Execution.Status.MANUALLY_STARTED, None,
+   204, Execution.Status.RUNNING),
+
+  # Stopping is changed to STOPPED and yields 409
+  (Execution.Status.STOPPING, 10,
+   409, Execution.Status.STOPPED),
+
+  # Finished yields 409 and leaves the status alone
+  (Execution.Status.SUCCEEDED, 10,
+   409, Execution.Status.SUCCEEDED),
+])
+@mock_aws
+def test_task_execution_heartbeat(initial_status: Execution.Status,
+        last_heartbeat_seconds_ago: int | None,
+        status_code: int, expected_status: Execution.Status,
+        user_factory, group_factory, run_environment_factory,
+        task_factory, task_execution_factory,
+        api_client) -> None:
+    task_execution, _task, _api_key_run_environment, client, url = common_setup(
+            is_authenticated=True,
+            group_access_level=UserGroupAccessLevel.ACCESS_LEVEL_DEVELOPER,
+            api_key_access_level=UserGroupAccessLevel.ACCESS_LEVEL_TASK,
+            api_key_scope_type=SCOPE_TYPE_NONE,
+            uuid_send_type=SEND_ID_CORRECT,
+            user=user_factory(),
+            group_factory=group_factory,
+            run_environment_factory=run_environment_factory,
+            task_factory=task_factory,
+            task_execution_factory=task_execution_factory,
+            api_client=api_client)
+
+    assert task_execution is not None
+
+    utc_now = timezone.now()
+    old_last_heartbeat_at = None
+    if last_heartbeat_seconds_ago is not None:
+        old_last_heartbeat_at = utc_now - timedelta(
+                seconds=last_heartbeat_seconds_ago)
+
+    task_execution.status = initial_status
+    task_execution.last_heartbeat_at = old_last_heartbeat_at
+    if initial_status == Execution.Status.SUCCEEDED:
+        task_execution.finished_at = utc_now
+    task_execution.save()
+
+    response = client.post(url + 'heartbeat/', {
+      'success_count': 5,
+      'last_status_message': 'Still going',
+    })
+
+    assert response.status_code == status_code
+
+    task_execution.refresh_from_db()
+    assert task_execution.status == expected_status
+
+    if status_code == 204:
+        assert response.data is None
+        assert task_execution.success_count == 5
+        assert task_execution.last_status_message == 'Still going'
+        assert task_execution.last_heartbeat_at is not None
+        assert (old_last_heartbeat_at is None) or \
+                (task_execution.last_heartbeat_at > old_last_heartbeat_at)
+    elif expected_status == Execution.Status.STOPPED:
+        response_dict = cast(dict[str, Any], response.data)
+        assert response_dict['status'] == Execution.Status.STOPPED.name
+
+
+@pytest.mark.django_db
+@mock_aws
+def test_task_execution_heartbeat_query_count(
+        user_factory, group_factory, run_environment_factory,
+        task_factory, task_execution_factory,
+        api_client) -> None:
+    """
+    A heartbeat of a running Task Execution should cost fewer queries than
+    the equivalent PATCH.
+    """
+
+    task_execution, _task, _api_key_run_environment, client, url = common_setup(
+            is_authenticated=True,
+            group_access_level=UserGroupAccessLevel.ACCESS_LEVEL_DEVELOPER,
+            api_key_access_level=UserGroupAccessLevel.ACCESS_LEVEL_TASK,
+            api_key_scope_type=SCOPE_TYPE_NONE,
+            uuid_send_type=SEND_ID_CORRECT,
+            user=user_factory(),
+            group_factory=group_factory,
+            run_environment_factory=run_environment_factory,
+            task_factory=task_factory,
+            task_execution_factory=task_execution_factory,
+            api_client=api_client)
+
+    assert task_execution is not None
+
+    task_execution.last_heartbeat_at = timezone.now()
+    task_execution.save()
+
+    with CaptureQueriesContext(connection) as patch_context:
+        response = client.patch(url + '?content=false', {
+          'status': Execution.Status.RUNNING.name,
+          'success_count': 1,
+        })
+
+    assert response.status_code == 204
+
+    with CaptureQueriesContext(connection) as heartbeat_context:
+        response = client.post(url + 'heartbeat/', {
+          'success_count': 2,
+        })
+
+    assert response.status_code == 204
+    assert len(heartbeat_context.captured_queries) < \
+            len(patch_context.captured_queries)
+
+    task_execution.refresh_from_db()
+    assert task_execution.success_count == 2
+
+
+def find_duplicate_authorization_queries(
+        captured_queries: list[dict[str, Any]]) -> list[str]:
+    """
+    Returns the SQL of queries for access levels or group membership that
+    were run more than once.
+    """
+    seen: set[str] = set()
+    duplicates: list[str] = []
+
+    for query in captured_queries:
+        sql = query['sql']
+
+        if ('"processes_usergroupaccesslevel"' in sql) or \
+                sql.startswith('SELECT "auth_group"'):
+            if sql in seen:
+                duplicates.append(sql)
+            seen.add(sql)
+
+    return duplicates
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("""
+  endpoint, api_key_access_level
+""", [
+  ('create', None),
+  ('create', UserGroupAccessLevel.ACCESS_LEVEL_TASK),
+  ('fetch', None),
+  ('fetch', UserGroupAccessLevel.ACCESS_LEVEL_TASK),
+  ('update', None),
+  ('update', UserGroupAccessLevel.ACCESS_LEVEL_TASK),
+  ('heartbeat', UserGroupAccessLevel.ACCESS_LEVEL_TASK),
+  ('list', None),
+])
+@mock_aws
+def test_task_execution_authorization_query_count(
+        endpoint: str, api_key_access_level: int | None,
+        user_factory, group_factory, run_environment_factory,
+        task_factory, task_execution_factory,
+        api_client) -> None:
+    """
+    Access levels and group membership should be looked up at most once
+    per request, no matter how many views, permissions, serializers and
+    models check them.
+    """
+    user = user_factory()
+
+    _task_execution, task, _api_key_run_environment, client, url = common_setup(
+            is_authenticated=True,
+            group_access_level=UserGroupAccessLevel.ACCESS_LEVEL_DEVELOPER,
+            api_key_access_level=api_key_access_level,
+            api_key_scope_type=SCOPE_TYPE_NONE,
+            uuid_send_type=SEND_ID_NONE if endpoint in ['create', 'list'] else SEND_ID_CORRECT,
+            user=user,
+            group_factory=group_factory,
+            run_environment_factory=run_environment_factory,
+            task_factory=task_factory,
+            task_execution_factory=task_execution_factory,
+            api_client=api_client)
+
+    request_data: dict[str, Any] = {}
+
+    if endpoint == 'create':
+        request_data = make_aws_ecs_task_execution_request_body(
+                run_environment=task.run_environment,
+                group_factory=group_factory,
+                run_environment_factory=run_environment_factory,
+                task_factory=task_factory,
+                task_execution_factory=task_execution_factory,
+                user=user,
+                aws_ecs_setup=setup_aws_ecs(run_environment=task.run_environment),
+                task=task)
+
+    with CaptureQueriesContext(connection) as context:
+        if endpoint == 'create':
+            response = client.post(url, data=request_data)
+            assert response.status_code == 201
+        elif endpoint == 'fetch':
+            response = client.get(url)
+            assert response.status_code == 200
+        elif endpoint == 'update':
+            response = client.patch(url, {'success_count': 1})
+            assert response.status_code == 200
+        elif endpoint == 'heartbeat':
+            response = client.post(url + 'heartbeat/', {'success_count': 1})
+            assert response.status_code == 204
+        else:
+            response = client.get(url, {'task__uuid': str(task.uuid)})
+            assert response.status_code == 200
+
+    assert find_duplicate_authorization_queries(context.captured_queries) == []
+
+
+@pytest.mark.django_db
+@mock_aws
+def test_task_execution_log_tails(
+        user_factory, group_factory, run_environment_factory,
+        task_factory, task_execution_factory,
+        api_client) -> None:
+    """
+    Log tails are replaced by sending them, appended to in chunks, and only
+    returned by the logs endpoint.
+    """
+    user = user_factory()
+
+    task_execution, _task, _api_key_run_environment, client, url = common_setup(
+            is_authenticated=True,
+            group_access_level=UserGroupAccessLevel.ACCESS_LEVEL_TASK,
+            api_key_access_level=UserGroupAccessLevel.ACCESS_LEVEL_TASK,
+            api_key_scope_type=SCOPE_TYPE_NONE,
+            uuid_send_type=SEND_ID_CORRECT,
+            user=user,
+            group_factory=group_factory,
+            run_environment_factory=run_environment_factory,
+            task_factory=task_factory,
+            task_execution_factory=task_execution_factory,
+            api_client=api_client)
+
+    assert task_execution is not None
+
+    response = client.patch(url, {'debug_log_tail': 'old'})
+    assert response.status_code == 200
+    assert 'debug_log_tail' not in response.data
+
+    response = client.patch(url, {'debug_log_tail': 'started\n'})
+    assert response.status_code == 200
+
+    response = client.patch(url, {
+        'debug_log_append': 'working\n',
+        'error_log_append': 'oops\n',
+    })
+    assert response.status_code == 200
+
+    response = client.patch(url, {'debug_log_append': 'done\n'})
+    assert response.status_code == 200
+
+    assert TaskExecutionLogChunk.objects.filter(task_execution=task_execution,
+            stream=TaskExecutionLogChunk.STREAM_DEBUG).count() == 3
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert 'debug_log_tail' not in response.data
+    assert 'error_log_tail' not in response.data
+
+    response = client.get(url + 'logs/')
+    assert response.status_code == 200
+    assert response.data == {
+        'debug_log_tail': 'started\nworking\ndone\n',
+        'error_log_tail': 'oops\n',
+    }
+
+    # The oldest chunks are removed once they are no longer in the tail
+    with patch.object(TaskExecutionLogChunk, 'MAX_TAIL_LENGTH', 10):
+        response = client.patch(url, {'debug_log_append': 'finished\n'})
+        assert response.status_code == 200
+
+        response = client.get(url + 'logs/')
+        assert response.data['debug_log_tail'] == '\nfinished\n'
+
+    assert TaskExecutionLogChunk.objects.filter(task_execution=task_execution,
+            stream=TaskExecutionLogChunk.STREAM_DEBUG).count() == 2
+
+    # Sending an empty tail removes it
+    response = client.patch(url, {'error_log_tail': ''})
+    assert response.status_code == 200
+
+    response = client.get(url + 'logs/')
+    assert response.data['error_log_tail'] is None
+
+
+@pytest.mark.django_db
+@mock_aws
+def test_task_execution_bulk_update(
+        user_factory, group_factory, run_environment_factory,
+        task_factory, task_execution_factory,
+        api_client) -> None:
+    user = user_factory()
+
+    task_execution, task, _api_key_run_environment, client, _url = common_setup(
+            is_authenticated=True,
+            group_access_level=UserGroupAccessLevel.ACCESS_LEVEL_DEVELOPER,
+            api_key_access_level=UserGroupAccessLevel.ACCESS_LEVEL_TASK,
+            api_key_scope_type=SCOPE_TYPE_NONE,
+            uuid_send_type=SEND_ID_CORRECT,
+            user=user,
+            group_factory=group_factory,
+            run_environment_factory=run_environment_factory,
+            task_factory=task_factory,
+            task_execution_factory=task_execution_factory,
+            api_client=api_client)
+
+    assert task_execution is not None
+
+    stopping_task_execution = task_execution_factory(task=task,
+            status=Execution.Status.STOPPING)
+
+    another_group = group_factory()
+    task_execution_in_other_group = task_execution_factory(
+            task=task_factory(created_by_group=another_group))
+
+    missing_uuid = str(uuid.uuid4())
+
+    response = client.post('/api/v1/task_executions/bulk_update/', {
+      'task_executions': [
+        {
+          'uuid': str(task_execution.uuid),
+          'status': Execution.Status.SUCCEEDED.name,
+          'success_count': 3,
+        },
+        {
+          'uuid': str(stopping_task_execution.uuid),
+          'status': Execution.Status.RUNNING.name,
+        },
+        {
+          'uuid': str(task_execution_in_other_group.uuid),
+          'status': Execution.Status.FAILED.name,
+        },
+        {
+          'uuid': missing_uuid,
+          'status': Execution.Status.RUNNING.name,
+        },
+      ]
+    })
+
+    assert response.status_code == 200
+
+    results = cast(dict[str, Any], response.data)['results']
+    assert [r['uuid'] for r in results] == [
+      str(task_execution.uuid), str(stopping_task_execution.uuid),
+      str(task_execution_in_other_group.uuid), missing_uuid
+    ]
+    assert [r['status_code'] for r in results] == [200, 409, 404, 404]
+    assert results[0]['task_execution']['status'] == \
+            Execution.Status.SUCCEEDED.name
+    assert results[1]['task_execution']['status'] == \
+            Execution.Status.STOPPED.name
+
+    task_execution.refresh_from_db()
+    assert task_execution.status == Execution.Status.SUCCEEDED
+    assert task_execution.success_count == 3
+
+    stopping_task_execution.refresh_from_db()
+    assert stopping_task_execution.status == Execution.Status.STOPPED
+
+    task_execution_in_other_group.refresh_from_db()
+    assert task_execution_in_other_group.status == Execution.Status.RUNNING
+
+
+@pytest.mark.django_db
+@mock_aws
+def test_task_execution_bulk_update_item_failure_is_isolated(
+        user_factory, group_factory, run_environment_factory,
+        task_factory, task_execution_factory,
+        api_client) -> None:
+    task_execution, task, _api_key_run_environment, client, _url = common_setup(
+            is_authenticated=True,
+            group_access_level=UserGroupAccessLevel.ACCESS_LEVEL_DEVELOPER,
+            api_key_access_level=UserGroupAccessLevel.ACCESS_LEVEL_TASK,
+            api_key_scope_type=SCOPE_TYPE_NONE,
+            uuid_send_type=SEND_ID_CORRECT,
+            user=user_factory(),
+            group_factory=group_factory,
+            run_environment_factory=run_environment_factory,
+            task_factory=task_factory,
+            task_execution_factory=task_execution_factory,
+            api_client=api_client)
+
+    assert task_execution is not None
+
+    finished_task_execution = task_execution_factory(task=task,
+            status=Execution.Status.SUCCEEDED, finished_at=timezone.now())
+
+    response = client.post('/api/v1/task_executions/bulk_update/?content=false', {
+      'task_executions': [
+        {
+          'uuid': str(finished_task_execution.uuid),
+          'status': Execution.Status.RUNNING.name,
+        },
+        {
+          'uuid': str(task_execution.uuid),
+          'error_count': 7,
+        },
+      ]
+    })
+
+    assert response.status_code == 200
+
+    results = cast(dict[str, Any], response.data)['results']
+    assert [r['status_code'] for r in results] == [409, 200]
+    assert 'task_execution' not in results[1]
+
+    finished_task_execution.refresh_from_db()
+    assert finished_task_execution.status == Execution.Status.SUCCEEDED
+
+    task_execution.refresh_from_db()
+    assert task_execution.error_count == 7
+
+
+@pytest.mark.django_db
+@mock_aws
+def test_task_execution_bulk_update_unexpected_error_is_isolated(
+        user_factory, group_factory, run_environment_factory,
+        task_factory, task_execution_factory,
+        api_client) -> None:
+    task_execution, task, _api_key_run_environment, client, _url = common_setup(
+            is_authenticated=True,
+            group_access_level=UserGroupAccessLevel.ACCESS_LEVEL_DEVELOPER,
+            api_key_access_level=UserGroupAccessLevel.ACCESS_LEVEL_TASK,
+            api_key_scope_type=SCOPE_TYPE_NONE,
+            uuid_send_type=SEND_ID_CORRECT,
+            user=user_factory(),
+            group_factory=group_factory,
+            run_environment_factory=run_environment_factory,
+            task_factory=task_factory,
+            task_execution_factory=task_execution_factory,
+            api_client=api_client)
+
+    assert task_execution is not None
+
+    failing_task_execution = task_execution_factory(task=task,
+            status=Execution.Status.RUNNING)
+
+    original_save = TaskExecutionSerializer.save
+
+    def save(self, **kwargs):
+        if self.instance.uuid == failing_task_execution.uuid:
+            raise IntegrityError('Simulated failure')
+
+        return original_save(self, **kwargs)
+
+    with patch.object(TaskExecutionSerializer, 'save', save):
+        response = client.post('/api/v1/task_executions/bulk_update/?content=false', {
+          'task_executions': [
+            {
+              'uuid': str(failing_task_execution.uuid),
+              'success_count': 1,
+            },
+            {
+              # Not in canonical form
+              'uuid': task_execution.uuid.hex.upper(),
+              'success_count': 2,
+            },
+          ]
+        })
+
+    assert response.status_code == 200
+
+    results = cast(dict[str, Any], response.data)['results']
+    assert [r['uuid'] for r in results] == [
+      str(failing_task_execution.uuid), str(task_execution.uuid)
+    ]
+    assert [r['status_code'] for r in results] == [500, 200]
+
+    failing_task_execution.refresh_from_db()
+    assert failing_task_execution.success_count is None
+
+    task_execution.refresh_from_db()
+    assert task_execution.success_count == 2
+
+
+@pytest.mark.django_db
+@mock_aws
+def test_task_execution_bulk_update_rejects_duplicate_uuids(
+        user_factory, group_factory, run_environment_factory,
+        task_factory, task_execution_factory,
+        api_client) -> None:
+    task_execution, task, _api_key_run_environment, client, _url = common_setup(
+            is_authenticated=True,
+            group_access_level=UserGroupAccessLevel.ACCESS_LEVEL_DEVELOPER,
+            api_key_access_level=UserGroupAccessLevel.ACCESS_LEVEL_TASK,
+            api_key_scope_type=SCOPE_TYPE_NONE,
+            uuid_send_type=SEND_ID_CORRECT,
+            user=user_factory(),
+            group_factory=group_factory,
+            run_environment_factory=run_environment_factory,
+            task_factory=task_factory,
+            task_execution_factory=task_execution_factory,
+            api_client=api_client)
+
+    assert task_execution is not None
+
+    other_task_execution = task_execution_factory(task=task,
+            status=Execution.Status.RUNNING)
+
+    response = client.post('/api/v1/task_executions/bulk_update/?content=false', {
+      'task_executions': [
+        {
+          'uuid': str(task_execution.uuid),
+          'success_count': 1,
+        },
+        {
+          'uuid': str(other_task_execution.uuid),
+          'success_count': 2,
+        },
+        {
+          # The same Task Execution, not in canonical form
+          'uuid': task_execution.uuid.hex.upper(),
+          'success_count': 3,
+        },
+      ]
+    })
+
+    assert response.status_code == 200
+
+    results = cast(dict[str, Any], response.data)['results']
+    assert [r['status_code'] for r in results] == [400, 200, 400]
+    assert results[0]['errors']['uuid'][0].code == 'duplicate'
+
+    task_execution.refresh_from_db()
+    assert task_execution.success_count is None
+
+    other_task_execution.refresh_from_db()
+    assert other_task_execution.success_count == 2
+
+
 @pytest.mark.django_db
 @mock_aws
 def test_task_execution_update_unmodifiable_properties(
@@ -1429,3 +2064,55 @@ def test_task_execution_delete(
         assert not exists
     else:
         assert exists
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("""
+  ordering
+""", [
+  (None),
+  ('started_at'),
+  ('-started_at'),
+])
+@mock_aws
+def test_task_execution_list_cursor_pagination(
+        ordering: str | None,
+        user_factory, task_factory, task_execution_factory,
+        api_client) -> None:
+    """
+    Task Executions are in ascending order of started_at by default, so
+    cursors must seek forward through the index.
+    """
+    user = user_factory()
+    group = user.groups.first()
+
+    set_group_access_level(user=user, group=group,
+            access_level=UserGroupAccessLevel.ACCESS_LEVEL_DEVELOPER)
+
+    task = task_factory(created_by_group=group)
+    now = timezone.now()
+    started_ats = [now, now, now - timedelta(minutes=1), now - timedelta(minutes=2),
+            now - timedelta(minutes=2), now - timedelta(minutes=3)]
+    task_executions = [task_execution_factory(task=task, started_at=started_at)
+            for started_at in started_ats]
+
+    client = make_api_client_from_options(api_client=api_client,
+            is_authenticated=True, user=user, group=group,
+            api_key_access_level=UserGroupAccessLevel.ACCESS_LEVEL_DEVELOPER,
+            api_key_run_environment=None)
+
+    params: dict[str, Any] = {
+        'pagination': 'cursor',
+        'limit': 4,
+    }
+
+    if ordering:
+        params['ordering'] = ordering
+
+    expected_uuids = [str(te.uuid) for te in sorted(task_executions,
+            key=lambda te: (te.started_at, te.pk), reverse=(ordering == '-started_at'))]
+
+    pages = fetch_cursor_pages(client, '/api/v1/task_executions/', params)
+
+    assert [len(page) for page in pages] == [4, 2]
+    assert [uuid for page in pages for uuid in page] == expected_uuids
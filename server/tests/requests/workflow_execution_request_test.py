@@ -2,6 +2,7 @@ from typing import Any, List, Tuple
 
 from datetime import timedelta
 import random
+import threading
 import uuid
 from urllib.parse import quote
 
@@ -10,8 +11,8 @@ from django.utils import timezone
 from django.contrib.auth.models import User
 
 from processes.models import (
-  Subscription, UserGroupAccessLevel, RunEnvironment,
-  WorkflowExecution, Workflow,
+  Execution, Subscription, TaskExecution, UserGroupAccessLevel, RunEnvironment,
+  WorkflowExecution, WorkflowTaskInstanceExecution, Workflow,
 )
 
 import pytest
@@ -800,6 +801,62 @@ def test_workflow_execution_create_history_purging(
         else:
             assert not exists
 
+
+@pytest.mark.django_db(transaction=True)
+@mock_aws
+def test_workflow_execution_create_starts_roots_concurrently(
+        user_factory, group_factory, run_environment_factory,
+        workflow_factory, workflow_execution_factory,
+        workflow_task_instance_factory, api_client, monkeypatch) -> None:
+    user = user_factory()
+
+    workflow_execution, api_key_run_environment, client, url = common_setup(
+            user=user,
+            group_factory=group_factory,
+            run_environment_factory=run_environment_factory,
+            workflow_factory=workflow_factory,
+            workflow_execution_factory=workflow_execution_factory,
+            api_client=api_client,
+            group_access_level=UserGroupAccessLevel.ACCESS_LEVEL_DEVELOPER,
+            api_key_access_level=UserGroupAccessLevel.ACCESS_LEVEL_DEVELOPER)
+
+    workflow = workflow_execution.workflow
+    root_count = 3
+
+    for _i in range(root_count):
+        workflow_task_instance_factory(workflow=workflow)
+
+    # Every root must be starting at once to pass the barrier, which only
+    # happens if the starts run after the request's transaction commits
+    barrier = threading.Barrier(root_count, timeout=10)
+    start_threads = []
+
+    def manually_start(self):
+        barrier.wait()
+        start_threads.append(threading.current_thread())
+
+    monkeypatch.setattr(TaskExecution, 'manually_start', manually_start)
+
+    request_data = make_request_body(uuid_send_type=SEND_ID_NONE,
+            workflow_send_type=SEND_ID_CORRECT,
+            user=user,
+            group_factory=group_factory,
+            api_key_run_environment=api_key_run_environment,
+            workflow_execution=workflow_execution,
+            run_environment_factory=run_environment_factory,
+            workflow_factory=workflow_factory,
+            workflow_execution_factory=workflow_execution_factory)
+
+    response = client.post(url, data=request_data)
+
+    assert response.status_code == 201
+    assert len(start_threads) == root_count
+    assert threading.current_thread() not in start_threads
+
+    created_we = WorkflowExecution.objects.get(uuid=response.data['uuid'])
+    assert WorkflowTaskInstanceExecution.objects.filter(workflow_execution=created_we,
+            task_execution__status=Execution.Status.MANUALLY_STARTED).count() == root_count
+
 @pytest.mark.django_db
 @pytest.mark.parametrize("""
   is_authenticated, group_access_level,
@@ -0,0 +1,35 @@
+from processes.models import BasicEvent, Task
+from processes.services.checker_partition import CheckerPartition
+
+import pytest
+
+from moto import mock_aws
+
+
+@pytest.mark.django_db
+@mock_aws
+def test_checker_partition_filter_is_disjoint_and_complete(task_factory,
+        basic_event_factory):
+    tasks = [task_factory() for _i in range(10)]
+    events = [basic_event_factory(created_by_group=tasks[0].created_by_group)
+            for _i in range(10)]
+
+    shard_count = 3
+
+    for model, items in [(Task, tasks), (BasicEvent, events)]:
+        qs = model.objects.filter(pk__in=[item.pk for item in items])
+
+        shards = [set(CheckerPartition(shard_index=i, shard_count=shard_count)
+                .filter(qs).values_list('pk', flat=True))
+                for i in range(shard_count)]
+
+        assert sum(len(shard) for shard in shards) == len(items)
+        assert set().union(*shards) == {item.pk for item in items}
+
+
+def test_checker_partition_validates_shard():
+    with pytest.raises(ValueError):
+        CheckerPartition(shard_index=2, shard_count=2)
+
+    with pytest.raises(ValueError):
+        CheckerPartition(max_workers=0)
@@ -0,0 +1,131 @@
+from datetime import datetime, timedelta, timezone
+import logging
+import time
+
+from crontab import CronTab
+
+from processes.common.compiled_schedule import (
+    SCHEDULE_TYPE_CRON, SCHEDULE_TYPE_RATE,
+    compile_schedule
+)
+
+import pytest
+
+
+logger = logging.getLogger(__name__)
+
+
+UTC_NOW = datetime(2026, 10, 17, 12, 34, 56, 789000, tzinfo=timezone.utc)
+
+# A mix resembling the schedules of Tasks in a typical deployment: many
+# Tasks share a few schedules
+SCHEDULE_MIX = [
+    'cron(0 * * * ? *)',
+    'cron(*/5 * * * ? *)',
+    'cron(30 2 * * ? *)',
+    'cron(0 9 ? * MON-FRI *)',
+    'cron(15 0 1 * ? *)',
+    'rate(1 minute)',
+    'rate(15 minutes)',
+    'rate(1 hour)',
+    'rate(1 day)',
+    'rate(1 month)',
+]
+
+
+def test_compiled_schedule_is_cached():
+    compiled_schedule = compile_schedule('cron(0 * * * ? *)')
+
+    assert compiled_schedule.schedule_type == SCHEDULE_TYPE_CRON
+    assert compile_schedule('cron(0 * * * ? *)') is compiled_schedule
+    assert compile_schedule('rate(15 minutes)').schedule_type == SCHEDULE_TYPE_RATE
+    assert compile_schedule('hourly').schedule_type is None
+
+
+def test_compiled_cron_schedule_fire_times():
+    compiled_schedule = compile_schedule('cron(0 * * * ? *)')
+
+    assert compiled_schedule.previous(now=UTC_NOW) == \
+            datetime(2026, 10, 17, 12, 0, tzinfo=timezone.utc)
+    assert compiled_schedule.next(now=UTC_NOW) == \
+            datetime(2026, 10, 17, 13, 0, tzinfo=timezone.utc)
+
+    start = datetime(2026, 10, 17, 10, 0, tzinfo=timezone.utc)
+    end = datetime(2026, 10, 17, 13, 0, tzinfo=timezone.utc)
+
+    # The start is included, the end is not
+    assert compiled_schedule.fire_times(start, end) == [
+        start,
+        start + timedelta(hours=1),
+        start + timedelta(hours=2),
+    ]
+
+    assert len(compiled_schedule.fire_times(start, end, limit=2)) == 2
+
+
+def test_compiled_rate_schedule_fire_times():
+    compiled_schedule = compile_schedule('rate(15 minutes)')
+    anchor = datetime(2026, 10, 17, 12, 5, tzinfo=timezone.utc)
+
+    assert compiled_schedule.previous(now=UTC_NOW, anchor=anchor) == \
+            datetime(2026, 10, 17, 12, 35, tzinfo=timezone.utc) - timedelta(minutes=15)
+    assert compiled_schedule.next(now=UTC_NOW, anchor=anchor) == \
+            datetime(2026, 10, 17, 12, 35, tzinfo=timezone.utc)
+    assert compiled_schedule.previous(now=UTC_NOW) is None
+
+    assert compiled_schedule.fire_times(
+            datetime(2026, 10, 17, 12, 10, tzinfo=timezone.utc),
+            datetime(2026, 10, 17, 12, 50, tzinfo=timezone.utc),
+            anchor=anchor) == [
+        datetime(2026, 10, 17, 12, 20, tzinfo=timezone.utc),
+        datetime(2026, 10, 17, 12, 35, tzinfo=timezone.utc),
+    ]
+
+    compiled_schedule = compile_schedule('rate(1 month)')
+    anchor = datetime(2026, 1, 31, tzinfo=timezone.utc)
+
+    assert compiled_schedule.next(now=UTC_NOW, anchor=anchor) == \
+            datetime(2026, 10, 31, tzinfo=timezone.utc)
+
+
+def test_compiled_schedule_rejects_invalid_cron_expression():
+    with pytest.raises(Exception):
+        compile_schedule('cron(not a cron expression)')
+
+
+def test_compiled_schedule_benchmark():
+    """
+    Compare finding the previous fire time of each schedule in the mix with
+    a compiled schedule, to parsing the schedule each time as the schedule
+    checker used to. The timings are logged; the assertions only check
+    that the compiled schedules are reused and agree with parsing.
+    """
+    iteration_count = 200
+    schedules = SCHEDULE_MIX * 10
+    compile_schedule.cache_clear()
+
+    started_at = time.perf_counter()
+    for _i in range(iteration_count):
+        for schedule in schedules:
+            if schedule.startswith('cron'):
+                CronTab(schedule[5:-1]).previous(now=UTC_NOW)
+    parsing_seconds = time.perf_counter() - started_at
+
+    started_at = time.perf_counter()
+    for _i in range(iteration_count):
+        for schedule in schedules:
+            compile_schedule(schedule).previous(now=UTC_NOW, anchor=UTC_NOW)
+    compiled_seconds = time.perf_counter() - started_at
+
+    logger.info(f"{iteration_count * len(schedules)} lookups took {parsing_seconds:.3f}s parsing each time, {compiled_seconds:.3f}s compiled")
+
+    cache_info = compile_schedule.cache_info()
+    assert cache_info.misses == len(SCHEDULE_MIX)
+    assert cache_info.hits == (iteration_count * len(schedules)) - len(SCHEDULE_MIX)
+
+    for schedule in SCHEDULE_MIX:
+        if schedule.startswith('cron'):
+            expected_at = UTC_NOW + timedelta(
+                    seconds=CronTab(schedule[5:-1]).previous(now=UTC_NOW))
+            assert abs((compile_schedule(schedule).previous(now=UTC_NOW) -
+                    expected_at).total_seconds()) < 1
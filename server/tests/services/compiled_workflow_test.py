@@ -0,0 +1,189 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from processes.common.compiled_workflow import CompiledWorkflow
+from processes.models import *
+
+import pytest
+
+from moto import mock_aws
+
+
+def make_snapshot_transition(wt_uuid: str, from_uuid: str, to_uuid: str,
+        legacy: bool = False) -> dict:
+    prefix = 'workflow_process_type_instance' if legacy else 'workflow_task_instance'
+    return {
+        'uuid': wt_uuid,
+        f"from_{prefix}": {'uuid': from_uuid},
+        f"to_{prefix}": {'uuid': to_uuid},
+        'rule_type': WorkflowTransition.RULE_TYPE_ON_SUCCESS,
+        'exit_codes': None,
+    }
+
+
+def test_compiled_workflow_indexes_transitions():
+    snapshot = {
+        'workflow_task_instances': [{'uuid': wti_uuid} for wti_uuid in ['a', 'b', 'c', 'd', 'e']],
+        'workflow_transitions': [
+            make_snapshot_transition('ab', 'a', 'b'),
+            make_snapshot_transition('ac', 'a', 'c'),
+            make_snapshot_transition('bd', 'b', 'd'),
+            make_snapshot_transition('cd', 'c', 'd', legacy=True),
+        ],
+    }
+
+    compiled_workflow = CompiledWorkflow(snapshot,
+            task_instance_ids={'a': 1, 'b': 2, 'c': 3, 'd': 4},
+            transition_ids={'ab': 10, 'ac': 11, 'bd': 12})
+
+    assert [wt.uuid for wt in compiled_workflow.outbound_transitions('a')] == ['ab', 'ac']
+    assert [wt.uuid for wt in compiled_workflow.inbound_transitions('d')] == ['bd', 'cd']
+    assert compiled_workflow.inbound_counts == (0, 1, 1, 2, 0)
+    assert compiled_workflow.outbound_transitions('missing') == ()
+
+    # Rows deleted after the snapshot was taken have no IDs
+    assert compiled_workflow.transitions['cd'].id is None
+    assert compiled_workflow.task_instance_ids[4] is None
+
+    assert compiled_workflow.reachable_task_instance_uuids(['b']) == {'b', 'd'}
+    assert compiled_workflow.reachable_task_instance_uuids(['a', 'e']) == \
+            {'a', 'b', 'c', 'd', 'e'}
+
+
+def make_fan_in_workflow(workflow_factory, workflow_task_instance_factory,
+        workflow_transition_factory, workflow_execution_factory,
+        task_execution_factory, workflow_task_instance_execution_factory,
+        branch_count: int) -> tuple[WorkflowExecution, list[WorkflowTaskInstanceExecution], WorkflowTaskInstance]:
+    """
+    Returns a running Workflow Execution with branch_count succeeded
+    branches, which all transition to a Workflow Task Instance that starts
+    after all of them finish.
+    """
+    workflow = workflow_factory()
+    join_wti = workflow_task_instance_factory(workflow=workflow,
+            start_transition_condition=WorkflowTaskInstance.START_TRANSITION_CONDITION_ALL)
+    branch_wtis = [workflow_task_instance_factory(workflow=workflow)
+            for _i in range(branch_count)]
+
+    for branch_wti in branch_wtis:
+        workflow_transition_factory(from_workflow_task_instance=branch_wti,
+                to_workflow_task_instance=join_wti)
+
+    workflow_execution = workflow_execution_factory(workflow=workflow)
+
+    # Snapshot the Workflow
+    workflow_execution.compiled_workflow()
+
+    wties = [workflow_task_instance_execution_factory(
+            workflow_execution=workflow_execution,
+            workflow_task_instance=branch_wti,
+            task_execution=task_execution_factory(task=branch_wti.task,
+                    status=Execution.Status.SUCCEEDED.value))
+            for branch_wti in branch_wtis]
+
+    return (workflow_execution, wties, join_wti)
+
+
+@pytest.mark.django_db
+@mock_aws
+def test_fan_in_starts_after_all_branches_with_constant_queries(
+        workflow_factory, workflow_task_instance_factory,
+        workflow_transition_factory, workflow_execution_factory,
+        task_execution_factory, workflow_task_instance_execution_factory,
+        monkeypatch):
+    monkeypatch.setattr(TaskExecution, 'manually_start', lambda self: None)
+
+    query_counts: list[int] = []
+
+    for branch_count in [3, 12]:
+        workflow_execution, wties, join_wti = make_fan_in_workflow(
+                workflow_factory, workflow_task_instance_factory,
+                workflow_transition_factory, workflow_execution_factory,
+                task_execution_factory, workflow_task_instance_execution_factory,
+                branch_count)
+
+        for wtie in wties[:-1]:
+            workflow_execution.handle_workflow_task_instance_execution_finished(wtie)
+            assert not join_wti.find_latest_executions(workflow_execution).exists()
+
+        with CaptureQueriesContext(connection) as context:
+            workflow_execution.handle_workflow_task_instance_execution_finished(
+                    wties[-1])
+
+        query_counts.append(len(context.captured_queries))
+
+        assert workflow_execution.status == Execution.Status.RUNNING
+        assert join_wti.find_latest_executions(workflow_execution).count() == 1
+        assert WorkflowTransitionEvaluation.objects.filter(
+                workflow_execution=workflow_execution, result=True).count() == branch_count
+
+    # The queries don't depend on the number of inbound transitions
+    assert query_counts[1] <= query_counts[0]
+
+
+@pytest.mark.django_db
+@mock_aws
+def test_invalidate_reachable_task_instance_executions(
+        workflow_factory, workflow_task_instance_factory,
+        workflow_transition_factory, workflow_execution_factory,
+        task_execution_factory, workflow_task_instance_execution_factory):
+    workflow_execution, wties, join_wti = make_fan_in_workflow(
+            workflow_factory, workflow_task_instance_factory,
+            workflow_transition_factory, workflow_execution_factory,
+            task_execution_factory, workflow_task_instance_execution_factory, 2)
+
+    other_execution = workflow_execution_factory(workflow=workflow_execution.workflow)
+    other_wtie = workflow_task_instance_execution_factory(
+            workflow_execution=other_execution,
+            workflow_task_instance=wties[0].workflow_task_instance,
+            task_execution=task_execution_factory(
+                    task=wties[0].workflow_task_instance.task))
+
+    workflow_execution.invalidate_reachable_task_instance_executions(
+            [wties[0].workflow_task_instance.uuid])
+
+    wties[0].refresh_from_db()
+    wties[1].refresh_from_db()
+    other_wtie.refresh_from_db()
+
+    assert not wties[0].is_latest
+    assert wties[1].is_latest
+
+    # Other executions of the Workflow are unaffected
+    assert other_wtie.is_latest
+
+
+@pytest.mark.django_db
+@mock_aws
+def test_transitions_deleted_after_compiling_are_ignored(
+        workflow_factory, workflow_task_instance_factory,
+        workflow_transition_factory, workflow_execution_factory,
+        task_execution_factory, workflow_task_instance_execution_factory,
+        monkeypatch):
+    monkeypatch.setattr(TaskExecution, 'manually_start', lambda self: None)
+
+    workflow_execution, wties, join_wti = make_fan_in_workflow(
+            workflow_factory, workflow_task_instance_factory,
+            workflow_transition_factory, workflow_execution_factory,
+            task_execution_factory, workflow_task_instance_execution_factory, 3)
+
+    # The compiled Workflow is cached by the stored digest of the snapshot
+    assert workflow_execution.workflow_snapshot_digest is not None
+    compiled_workflow = workflow_execution.compiled_workflow()
+    assert WorkflowExecution.objects.get(pk=workflow_execution.pk) \
+            .compiled_workflow() is compiled_workflow
+
+    WorkflowTransition.objects.get(
+            from_workflow_task_instance=wties[2].workflow_task_instance).delete()
+
+    workflow_execution.handle_workflow_task_instance_execution_finished(wties[0])
+    assert not join_wti.find_latest_executions(workflow_execution).exists()
+
+    # The join starts once the branches that still transition to it finish
+    workflow_execution.handle_workflow_task_instance_execution_finished(wties[1])
+    assert join_wti.find_latest_executions(workflow_execution).count() == 1
+
+    # The deleted transition isn't evaluated
+    workflow_execution.handle_workflow_task_instance_execution_finished(wties[2])
+    assert WorkflowTransitionEvaluation.objects.filter(
+            workflow_execution=workflow_execution).count() == 2
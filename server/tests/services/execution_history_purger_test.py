@@ -0,0 +1,96 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from processes.models import (
+    Event,
+    Execution,
+    GroupInfo,
+    Notification,
+    Subscription,
+    TaskExecution,
+    WorkflowTaskInstanceExecution,
+)
+from processes.services.execution_history_purger import ExecutionHistoryPurger
+
+import pytest
+
+from moto import mock_aws
+
+
+@pytest.mark.django_db
+@mock_aws
+def test_execution_history_purger_purge_all(subscription_plan_factory,
+        task_factory, task_execution_factory,
+        task_execution_status_change_event_factory, notification_factory,
+        workflow_task_instance_execution_factory):
+    task = task_factory()
+    group = task.created_by_group
+    utc_now = timezone.now()
+
+    completed_task_executions: list[TaskExecution] = []
+    for i in range(4):
+        completed_task_executions.append(task_execution_factory(task=task,
+                status=Execution.Status.SUCCEEDED,
+                finished_at=utc_now - timedelta(minutes=10 - i)))
+
+    in_progress_task_executions = [
+        task_execution_factory(task=task, status=Execution.Status.RUNNING)
+        for _i in range(2)
+    ]
+
+    oldest_task_execution = completed_task_executions[0]
+    event = task_execution_status_change_event_factory(task=task,
+            task_execution=oldest_task_execution, created_by_group=group)
+    notification = notification_factory(event=event, created_by_group=group)
+    wtie = workflow_task_instance_execution_factory(
+            task_execution=completed_task_executions[1])
+
+    subscription_plan = subscription_plan_factory(
+            max_task_execution_history_items=3)
+    Subscription(group=group, subscription_plan=subscription_plan,
+            active=True, start_at=utc_now - timedelta(minutes=1)).save()
+
+    purger = ExecutionHistoryPurger(chunk_size=2)
+    assert purger.purge_all() == 3
+
+    # In-progress executions are kept first, then the latest finished
+    assert set(task.taskexecution_set.values_list('pk', flat=True)) == {
+        completed_task_executions[3].pk,
+        in_progress_task_executions[0].pk,
+        in_progress_task_executions[1].pk,
+    }
+
+    assert not Event.objects.filter(pk=event.pk).exists()
+    assert not Notification.objects.filter(pk=notification.pk).exists()
+    assert not WorkflowTaskInstanceExecution.objects.filter(pk=wtie.pk).exists()
+    assert GroupInfo.objects.get(group=group).execution_history_purged_at is not None
+
+    assert purger.purge_all() == 0
+
+
+@pytest.mark.django_db
+@mock_aws
+def test_execution_history_purger_time_budget(subscription_plan_factory,
+        task_factory, task_execution_factory):
+    task = task_factory()
+    group = task.created_by_group
+    utc_now = timezone.now()
+
+    for i in range(3):
+        task_execution_factory(task=task, status=Execution.Status.FAILED,
+                finished_at=utc_now - timedelta(minutes=i))
+
+    subscription_plan = subscription_plan_factory(
+            max_task_execution_history_items=1)
+    Subscription(group=group, subscription_plan=subscription_plan,
+            active=True, start_at=utc_now - timedelta(minutes=1)).save()
+
+    assert ExecutionHistoryPurger(time_budget_seconds=0).purge_all() == 0
+    assert task.taskexecution_set.count() == 3
+    assert not GroupInfo.objects.filter(group=group,
+            execution_history_purged_at__isnull=False).exists()
+
+    # The next run resumes where the last one left off
+    assert ExecutionHistoryPurger(time_budget_seconds=60).purge_all() == 2
+    assert task.taskexecution_set.count() == 1
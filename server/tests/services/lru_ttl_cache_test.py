@@ -0,0 +1,102 @@
+from unittest.mock import MagicMock, patch
+
+from processes.common.lru_ttl_cache import LruTtlCache, reset_all_caches
+
+import pytest
+
+
+def test_lru_ttl_cache_evicts_least_recently_used():
+    on_remove = MagicMock()
+    cache = LruTtlCache(2, on_remove=on_remove)
+
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+
+    cache.set('c', 3)
+
+    assert 'b' not in cache
+    assert cache.items() == [('a', 1), ('c', 3)]
+    on_remove.assert_called_once_with('b', 2)
+    assert cache.stats() == {'hit_count': 1, 'miss_count': 0, 'entry_count': 2}
+
+
+def test_lru_ttl_cache_expires_items():
+    on_remove = MagicMock()
+    cache = LruTtlCache(10, ttl_seconds=60, on_remove=on_remove)
+
+    with patch('processes.common.lru_ttl_cache.time.monotonic') as monotonic:
+        monotonic.return_value = 1000.0
+        cache.set('a', 1)
+        cache.set('b', 2, ttl_seconds=10)
+
+        # Adding an unexpired item keeps it
+        assert not cache.add('b', 3)
+
+        monotonic.return_value = 1011.0
+        assert cache.get('b') is None
+        on_remove.assert_called_once_with('b', 2)
+        assert cache.add('b', 3)
+
+        # Keeping the expiry doesn't postpone it
+        monotonic.return_value = 1050.0
+        cache.set('a', 4, keep_expiry=True)
+
+        monotonic.return_value = 1061.0
+        assert cache.get('a') is None
+        assert cache.get('b') == 3
+
+
+def test_lru_ttl_cache_sliding_expiry():
+    cache = LruTtlCache(10, ttl_seconds=60, sliding=True)
+
+    with patch('processes.common.lru_ttl_cache.time.monotonic') as monotonic:
+        monotonic.return_value = 1000.0
+        cache.set('a', 1)
+
+        monotonic.return_value = 1050.0
+        assert cache.get('a') == 1
+
+        monotonic.return_value = 1100.0
+        assert cache.get('a') == 1
+
+        monotonic.return_value = 1161.0
+        assert cache.get('a') is None
+
+
+def test_lru_ttl_cache_get_or_load():
+    cache = LruTtlCache(10)
+    loader = MagicMock(return_value=1)
+
+    assert cache.get_or_load('a', loader) == 1
+    assert cache.get_or_load('a', loader) == 1
+    loader.assert_called_once()
+
+    loader.side_effect = ValueError
+
+    with pytest.raises(ValueError):
+        cache.get_or_load('b', loader)
+
+    assert 'b' not in cache
+    assert cache.stats() == {'hit_count': 1, 'miss_count': 2, 'entry_count': 1}
+
+
+def test_lru_ttl_cache_remove_matching_and_reset():
+    on_remove = MagicMock()
+    cache = LruTtlCache(10, on_remove=on_remove)
+
+    for i in range(4):
+        cache.set(i, i * 10)
+
+    assert cache.remove_matching(lambda key, value: value >= 20) == 2
+    assert cache.items() == [(0, 0), (1, 10)]
+    assert cache.remove(1) == 10
+    assert cache.remove(1) is None
+    assert on_remove.call_count == 3
+
+    cache.get(0)
+    reset_all_caches()
+
+    assert len(cache) == 0
+    assert cache.stats() == {'hit_count': 0, 'miss_count': 0, 'entry_count': 0}
+    on_remove.assert_called_with(0, 0)
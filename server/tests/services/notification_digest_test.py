@@ -0,0 +1,348 @@
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+from django.db import IntegrityError, connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from processes.models import *
+from processes.services.notification_digest import NotificationDigest
+from processes.services.notification_dispatcher import NotificationDispatcher
+
+import pytest
+
+from moto import mock_aws
+
+
+def make_digest_profile(group, monkeypatch, sent_digests: list[NotificationDigest]) -> NotificationProfile:
+    profile = NotificationProfile.objects.create(name="Test Profile",
+            created_by_group=group)
+    ndm = EmailNotificationDeliveryMethod.objects.create(name="Test NDM",
+            created_by_group=group, email_to_addresses=["test@example.com"],
+            digest_window_seconds=300)
+    profile.notification_delivery_methods.add(ndm)
+
+    def send_digest(self, digest):
+        sent_digests.append(digest)
+        return {'success': True}
+
+    monkeypatch.setattr(EmailNotificationDeliveryMethod, 'send_digest',
+            send_digest, raising=False)
+
+    return profile
+
+
+def close_digest(notification: Notification) -> None:
+    closed_at = timezone.now() - timedelta(seconds=1)
+    Notification.objects.filter(pk=notification.pk).update(
+            digest_closes_at=closed_at, next_attempt_at=closed_at)
+
+
+@pytest.mark.django_db
+def test_events_in_window_are_sent_as_one_digest(basic_event_factory, group,
+        monkeypatch):
+    sent_digests: list[NotificationDigest] = []
+    profile = make_digest_profile(group, monkeypatch, sent_digests)
+
+    events = [basic_event_factory(severity=Event.Severity.ERROR if i % 2 else Event.Severity.WARNING)
+            for i in range(5)]
+
+    for event in events:
+        profile.send(event)
+
+    # One Notification buffers every Event, and nothing is sent yet
+    notification = profile.notification_set.get()
+    assert notification.is_digest
+    assert notification.event == events[0]
+    assert notification.next_attempt_at == notification.digest_closes_at
+    assert notification.digested_events.count() == 5
+    assert sent_digests == []
+
+    dispatcher = NotificationDispatcher(max_workers=1)
+    assert dispatcher.dispatch_all() == 0
+
+    close_digest(notification)
+    assert dispatcher.dispatch_all() == 1
+
+    notification.refresh_from_db()
+    assert notification.send_status == NotificationSendStatus.SUCCEEDED
+
+    assert len(sent_digests) == 1
+    digest = sent_digests[0]
+    assert digest.event_count == 5
+    assert digest.counts_by_severity == {'error': 2, 'warning': 3}
+    assert digest.severity == 'error'
+    assert digest.summary == '5 Events (2 error, 3 warning)'
+    assert digest.latest_events[0]['uuid'] == str(events[-1].uuid)
+
+    # A closed digest isn't reopened
+    profile.send(basic_event_factory())
+    assert profile.notification_set.count() == 2
+
+
+@pytest.mark.django_db
+def test_digest_counts_as_one_rate_limited_request(basic_event_factory, group,
+        monkeypatch):
+    sent_digests: list[NotificationDigest] = []
+    profile = make_digest_profile(group, monkeypatch, sent_digests)
+    ndm = profile.notification_delivery_methods.get()
+
+    for _i in range(20):
+        profile.send(basic_event_factory())
+
+    close_digest(profile.notification_set.get())
+    assert NotificationDispatcher(max_workers=1).dispatch_all() == 1
+
+    ndm.refresh_from_db()
+    assert ndm.request_count_in_period_0 == 1
+    assert sent_digests[0].event_count == 20
+
+
+@pytest.mark.django_db
+def test_resolutions_are_not_digested(basic_event_factory, group, monkeypatch,
+        django_capture_on_commit_callbacks):
+    profile = make_digest_profile(group, monkeypatch, [])
+    sent_event_uuids = []
+
+    def send(self, event):
+        sent_event_uuids.append(event.uuid)
+        return {'success': True}
+
+    monkeypatch.setattr(EmailNotificationDeliveryMethod, 'send', send,
+            raising=False)
+
+    event = basic_event_factory()
+    resolution = basic_event_factory(resolved_event=event)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        profile.send(resolution)
+
+    assert sent_event_uuids == [resolution.uuid]
+    assert not profile.notification_set.get().is_digest
+
+
+@pytest.mark.django_db
+def test_only_one_digest_is_open(basic_event_factory, group, monkeypatch):
+    """
+    The open digest isn't locked through its Notification Delivery Method,
+    so a unique constraint keeps concurrent requests from starting another.
+    """
+    profile = make_digest_profile(group, monkeypatch, [])
+    ndm = profile.notification_delivery_methods.get()
+
+    notification = Notification.add_to_digest(event=basic_event_factory(),
+            notification_profile=profile, notification_delivery_method=ndm)
+
+    with pytest.raises(IntegrityError):
+        with transaction.atomic():
+            Notification(event=basic_event_factory(),
+                    notification_profile=profile,
+                    notification_delivery_method=ndm,
+                    send_status=NotificationSendStatus.SENDING,
+                    digest_closes_at=notification.digest_closes_at,
+                    next_attempt_at=notification.digest_closes_at).save()
+
+    # Adding doesn't lock the Notification Delivery Method
+    with CaptureQueriesContext(connection) as context:
+        assert Notification.add_to_digest(event=basic_event_factory(),
+                notification_profile=profile,
+                notification_delivery_method=ndm) == notification
+
+    assert not [q for q in context.captured_queries
+            if ('FOR UPDATE' in q['sql']) and ('notificationdeliverymethod' in q['sql'])]
+    assert notification.digested_events.count() == 2
+
+
+@pytest.mark.django_db
+def test_events_are_not_added_to_closed_digest(basic_event_factory, group,
+        monkeypatch):
+    sent_digests: list[NotificationDigest] = []
+    profile = make_digest_profile(group, monkeypatch, sent_digests)
+
+    profile.send(basic_event_factory())
+    closed_digest = profile.notification_set.get()
+    close_digest(closed_digest)
+
+    # The closed digest hasn't been claimed yet, but a new one is started
+    profile.send(basic_event_factory())
+
+    assert profile.notification_set.count() == 2
+    open_digest = profile.notification_set.exclude(pk=closed_digest.pk).get()
+    assert open_digest.digested_events.count() == 1
+    assert open_digest.next_attempt_at == open_digest.digest_closes_at
+
+    closed_digest.refresh_from_db()
+    assert closed_digest.digested_events.count() == 1
+    assert closed_digest.next_attempt_at < closed_digest.digest_closes_at
+
+    assert NotificationDispatcher(max_workers=1).dispatch_all() == 1
+    assert [digest.event_count for digest in sent_digests] == [1]
+
+    closed_digest.refresh_from_db()
+    assert closed_digest.send_status == NotificationSendStatus.SUCCEEDED
+
+
+@pytest.mark.django_db
+def test_dispatch_digests_only(basic_event_factory, group, monkeypatch):
+    sent_digests: list[NotificationDigest] = []
+    profile = make_digest_profile(group, monkeypatch, sent_digests)
+
+    profile.send(basic_event_factory())
+    digest = profile.notification_set.get()
+    close_digest(digest)
+
+    other = Notification(event=basic_event_factory(),
+            notification_profile=profile,
+            notification_delivery_method=profile.notification_delivery_methods.get(),
+            send_status=NotificationSendStatus.SENDING,
+            next_attempt_at=timezone.now())
+    other.save()
+
+    assert NotificationDispatcher(max_workers=1).dispatch_all(
+            digests_only=True) == 1
+    assert len(sent_digests) == 1
+
+    other.refresh_from_db()
+    assert other.send_status == NotificationSendStatus.SENDING
+    assert other.attempt_count == 0
+
+
+@pytest.mark.django_db
+@mock_aws
+def test_email_digest(run_environment: RunEnvironment, task_factory,
+        task_execution_factory, email_notification_delivery_method_factory,
+        mailoutbox):
+    edm = email_notification_delivery_method_factory(
+            run_environment=run_environment,
+            email_to_addresses=['to@example.com'])
+
+    busy_task = task_factory(run_environment=run_environment, name='Busy Task')
+    other_task = task_factory(run_environment=run_environment, name='Other Task')
+
+    events: list[Event] = [TaskExecutionStatusChangeEvent(
+            task_execution=task_execution_factory(task=task,
+                    status=Execution.Status.FAILED.value))
+            for task in [busy_task, other_task, busy_task]]
+
+    result = edm.send_digest(NotificationDigest(events))
+
+    assert result == {'success_count': 1, 'event_count': 3}
+    assert len(mailoutbox) == 1
+
+    email = mailoutbox[0]
+    assert 'digest: 3 Events (3 error)' in email.subject
+
+    body = email.alternatives[0][0] if email.alternatives else email.body
+    assert 'Busy Task' in body
+    assert 'Other Task' in body
+    assert f"/events/{events[-1].uuid}" in body
+
+
+def make_pagerduty_digest_profile(group,
+        pager_duty_notification_delivery_method_factory) -> NotificationProfile:
+    profile = NotificationProfile.objects.create(name="Test Profile",
+            created_by_group=group)
+    pdm = pager_duty_notification_delivery_method_factory(created_by_group=group,
+            digest_window_seconds=300)
+    profile.notification_delivery_methods.add(pdm)
+    return profile
+
+
+@pytest.mark.django_db
+def test_pagerduty_digest_is_resolved_with_its_events(basic_event_factory,
+        group, pager_duty_notification_delivery_method_factory,
+        django_capture_on_commit_callbacks):
+    profile = make_pagerduty_digest_profile(group,
+            pager_duty_notification_delivery_method_factory)
+    events = [basic_event_factory() for _i in range(2)]
+
+    with patch('processes.common.notification_transports.pagerduty.EventsApiV2Client') as mock_session_class:
+        mock_session = MagicMock()
+        mock_session.trigger.side_effect = lambda **kwargs: kwargs['dedup_key']
+        mock_session_class.return_value = mock_session
+
+        for event in events:
+            profile.send(event)
+
+        # A resolution of an Event in the open digest joins the digest
+        with django_capture_on_commit_callbacks(execute=True):
+            profile.send(basic_event_factory(resolved_event=events[0]))
+
+        notification = profile.notification_set.get()
+        assert notification.digested_events.count() == 3
+
+        close_digest(notification)
+        assert NotificationDispatcher(max_workers=1).dispatch_all() == 1
+
+        # The incident is triggered with the digest's own dedup key, and
+        # resolutions aren't counted
+        mock_session.trigger.assert_called_once()
+        call_args = mock_session.trigger.call_args
+        assert call_args.kwargs['dedup_key'] == notification.digest_dedup_key
+        assert call_args.kwargs['custom_details']['event_count'] == 2
+        mock_session.resolve.assert_not_called()
+
+        notification.refresh_from_db()
+        assert notification.send_result['dedup_key'] == notification.digest_dedup_key
+
+        # Resolving the last Event resolves the incident
+        with django_capture_on_commit_callbacks(execute=True):
+            profile.send(basic_event_factory(resolved_event=events[1]))
+
+        mock_session.resolve.assert_called_once_with(
+                dedup_key=notification.digest_dedup_key)
+        assert profile.notification_set.count() == 1
+
+
+@pytest.mark.django_db
+def test_resolved_pagerduty_digest_is_not_triggered(basic_event_factory,
+        group, pager_duty_notification_delivery_method_factory,
+        django_capture_on_commit_callbacks):
+    profile = make_pagerduty_digest_profile(group,
+            pager_duty_notification_delivery_method_factory)
+    event = basic_event_factory()
+
+    with patch('processes.common.notification_transports.pagerduty.EventsApiV2Client') as mock_session_class:
+        mock_session = MagicMock()
+        mock_session_class.return_value = mock_session
+
+        profile.send(event)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            profile.send(basic_event_factory(resolved_event=event))
+
+        close_digest(profile.notification_set.get())
+        assert NotificationDispatcher(max_workers=1).dispatch_all() == 1
+
+        mock_session.trigger.assert_not_called()
+        mock_session.resolve.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_digest_outlives_its_first_event(basic_event_factory, group,
+        monkeypatch):
+    profile = make_digest_profile(group, monkeypatch, [])
+    ndm = profile.notification_delivery_methods.get()
+    events = [basic_event_factory() for _i in range(2)]
+
+    for event in events:
+        profile.send(event)
+
+    notification = profile.notification_set.get()
+    events[0].delete()
+
+    notification.refresh_from_db()
+    assert notification.event is None
+    assert list(notification.digested_events.values_list('pk', flat=True)) == \
+            [events[1].pk]
+
+    # Other Notifications are still deleted with their Event
+    event = basic_event_factory()
+    Notification(event=event, notification_profile=profile,
+            notification_delivery_method=ndm,
+            send_status=NotificationSendStatus.SUCCEEDED).save()
+    event.delete()
+
+    assert not Notification.objects.filter(event__isnull=True) \
+            .exclude(pk=notification.pk).exists()
+    assert profile.notification_set.count() == 1
@@ -0,0 +1,154 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from processes.models import *
+from processes.services.notification_dispatcher import NotificationDispatcher
+
+import pytest
+
+
+def make_profile(group, monkeypatch, send) -> NotificationProfile:
+    profile = NotificationProfile.objects.create(name="Test Profile",
+            created_by_group=group)
+    ndm = EmailNotificationDeliveryMethod.objects.create(name="Test NDM",
+            created_by_group=group, email_to_addresses=["test@example.com"])
+    profile.notification_delivery_methods.add(ndm)
+
+    monkeypatch.setattr(EmailNotificationDeliveryMethod, 'send', send,
+            raising=False)
+
+    return profile
+
+
+@pytest.fixture
+def asynchronous_dispatch(settings):
+    settings.NOTIFICATION_DISPATCH_SETTINGS = {
+        **settings.NOTIFICATION_DISPATCH_SETTINGS,
+        'ASYNCHRONOUS': True,
+    }
+
+
+@pytest.mark.django_db
+def test_notification_profile_send_queues_notifications(basic_event, group,
+        monkeypatch, asynchronous_dispatch):
+    sent_event_uuids = []
+
+    def send(self, event):
+        sent_event_uuids.append(event.uuid)
+        return {'success': True}
+
+    profile = make_profile(group, monkeypatch, send)
+    profile.send(basic_event)
+
+    # Nothing is sent until the dispatcher runs
+    notification = profile.notification_set.get()
+    assert notification.send_status == NotificationSendStatus.SENDING
+    assert notification.next_attempt_at is not None
+    assert sent_event_uuids == []
+
+    dispatcher = NotificationDispatcher(max_workers=1)
+    assert dispatcher.dispatch_all() == 1
+
+    notification.refresh_from_db()
+    assert notification.send_status == NotificationSendStatus.SUCCEEDED
+    assert notification.send_result == {'success': True}
+    assert notification.completed_at is not None
+    assert notification.next_attempt_at is None
+    assert notification.attempt_count == 1
+    assert sent_event_uuids == [basic_event.uuid]
+
+    assert dispatcher.dispatch_all() == 0
+    assert sent_event_uuids == [basic_event.uuid]
+
+
+@pytest.mark.django_db
+def test_notification_dispatcher_retries_with_backoff(basic_event, group,
+        monkeypatch, asynchronous_dispatch):
+    attempt_count = 0
+
+    def flaky_send(self, event):
+        nonlocal attempt_count
+        attempt_count += 1
+        if attempt_count < 3:
+            raise ConnectionError('Connection refused')
+        return {'success': True}
+
+    profile = make_profile(group, monkeypatch, flaky_send)
+    profile.send(basic_event)
+
+    dispatcher = NotificationDispatcher(max_workers=1, max_attempts=3,
+            retry_base_delay_seconds=30, max_retry_delay_seconds=45)
+    notification = profile.notification_set.get()
+
+    for expected_delay_seconds in [30, 45]:
+        dispatched_at = timezone.now()
+        assert dispatcher.dispatch_all() == 0
+
+        notification.refresh_from_db()
+        assert notification.send_status == NotificationSendStatus.SENDING
+        assert notification.exception_type == 'ConnectionError'
+
+        delay_seconds = (notification.next_attempt_at - dispatched_at).total_seconds()
+        assert expected_delay_seconds <= delay_seconds < expected_delay_seconds + 10
+
+        # Not due yet
+        assert dispatcher.claim_batch() == []
+
+        Notification.objects.filter(pk=notification.pk).update(
+                next_attempt_at=timezone.now() - timedelta(seconds=1))
+
+    assert dispatcher.dispatch_all() == 1
+
+    notification.refresh_from_db()
+    assert notification.send_status == NotificationSendStatus.SUCCEEDED
+    assert notification.attempt_count == 3
+
+
+@pytest.mark.django_db
+def test_notification_dispatcher_fails_after_max_attempts(basic_event, group,
+        monkeypatch, asynchronous_dispatch):
+    def failing_send(self, event):
+        raise ConnectionError('Connection refused')
+
+    profile = make_profile(group, monkeypatch, failing_send)
+    profile.send(basic_event)
+
+    assert NotificationDispatcher(max_workers=1, max_attempts=1).dispatch_all() == 0
+
+    notification = profile.notification_set.get()
+    assert notification.send_status == NotificationSendStatus.FAILED
+    assert notification.next_attempt_at is None
+    assert notification.attempt_count == 1
+
+
+@pytest.mark.django_db
+def test_notification_dispatcher_claims_are_leased(basic_event, group,
+        monkeypatch, asynchronous_dispatch):
+    profile = make_profile(group, monkeypatch,
+            lambda self, event: {'success': True})
+    profile.send(basic_event)
+
+    dispatcher = NotificationDispatcher(max_workers=1, claim_timeout_seconds=60)
+    notification = profile.notification_set.get()
+
+    assert dispatcher.claim_batch() == [notification.pk]
+
+    # Another dispatcher can't claim it until the lease expires
+    assert dispatcher.claim_batch() == []
+
+    notification.refresh_from_db()
+    assert notification.next_attempt_at > timezone.now() + timedelta(seconds=50)
+
+
+def test_notification_dispatcher_from_settings_overrides():
+    dispatcher = NotificationDispatcher.from_settings(max_workers=3,
+            batch_size=7)
+    assert dispatcher.pool.max_workers == 3
+    assert dispatcher.batch_size == 7
+
+    with pytest.raises(ValueError):
+        NotificationDispatcher.from_settings(max_workers=0)
+
+    with pytest.raises(ValueError):
+        NotificationDispatcher(batch_size=0)
@@ -0,0 +1,87 @@
+from processes.models import (
+    Execution, RunEnvironment, TaskExecutionStatusChangeEvent
+)
+from processes.services.notification_generator import (
+    NotificationContext, NotificationGenerator, TemplateCache
+)
+
+import pytest
+
+from moto import mock_aws
+
+
+def test_template_cache_reuses_and_evicts():
+    cache = TemplateCache(max_entries=2)
+
+    template = cache.get('Hello {{name}}')
+    assert cache.get('Hello {{name}}') is template
+    assert template.render(name='World') == 'Hello World'
+
+    cache.get('Goodbye {{name}}')
+    cache.get('Hello again {{name}}')
+
+    # The least recently used template was evicted
+    assert len(cache.templates) == 2
+    assert cache.get('Hello {{name}}') is not template
+
+
+def test_template_cache_is_sandboxed():
+    cache = TemplateCache()
+
+    with pytest.raises(Exception):
+        cache.get("{{ ''.__class__.__mro__[1].__subclasses__() }}").render()
+
+
+@pytest.mark.django_db
+@mock_aws
+def test_notification_context_renders_once_per_event(
+        run_environment: RunEnvironment, task_factory, task_execution_factory,
+        email_notification_delivery_method_factory, mailoutbox, monkeypatch):
+    make_template_params = NotificationGenerator.make_template_params
+    call_count = 0
+
+    def counting_make_template_params(self, **kwargs):
+        nonlocal call_count
+        call_count += 1
+        return make_template_params(self, **kwargs)
+
+    monkeypatch.setattr(NotificationGenerator, 'make_template_params',
+            counting_make_template_params)
+
+    edms = [email_notification_delivery_method_factory(
+            run_environment=run_environment,
+            email_to_addresses=[f'to{i}@example.com']) for i in range(3)]
+
+    task = task_factory(run_environment=run_environment)
+    te = task_execution_factory(task=task, status=Execution.Status.FAILED.value)
+    event = TaskExecutionStatusChangeEvent(task_execution=te)
+
+    # Rendering the Event summary computes the parameters for the Event
+    assert call_count == 1
+
+    for edm in edms:
+        edm.send(event=event)
+
+    assert len(mailoutbox) == 3
+    assert mailoutbox[0].subject == mailoutbox[2].subject
+    assert call_count == 1
+
+    # Another Event has its own context
+    TaskExecutionStatusChangeEvent(task_execution=te)
+    assert call_count == 2
+
+
+@pytest.mark.django_db
+@mock_aws
+def test_notification_context_returns_copies(task_execution_factory):
+    te = task_execution_factory()
+    context = NotificationContext()
+
+    template_params = context.make_template_params(task_execution=te,
+            severity='error')
+    template_params['extra'] = 'value'
+
+    assert 'extra' not in context.make_template_params(task_execution=te,
+            severity='error')
+    assert context.make_template_params(task_execution=te,
+            severity='info')['severity'] == 'info'
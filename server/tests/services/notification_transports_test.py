@@ -0,0 +1,254 @@
+from unittest.mock import MagicMock, patch
+import logging
+import socket
+import socketserver
+import threading
+import time
+
+from django.core.mail import EmailMessage
+
+from processes.common.notification_transports import NotificationTransportPool
+
+import pytest
+
+
+logger = logging.getLogger(__name__)
+
+
+class SmtpStubHandler(socketserver.StreamRequestHandler):
+    """
+    Accepts every message without delivering it.
+    """
+
+    def handle(self) -> None:
+        server: SmtpStubServer = self.server  # type: ignore
+        server.add_handler(self)
+        self.reply(b'220 localhost SMTP stub')
+        in_data = False
+
+        while line := self.rfile.readline():
+            if in_data:
+                if line == b'.\r\n':
+                    in_data = False
+                    server.count_message()
+                    self.reply(b'250 OK')
+                continue
+
+            command = line[:4].upper()
+
+            if command == b'DATA':
+                in_data = True
+                self.reply(b'354 End data with <CR><LF>.<CR><LF>')
+            elif command == b'QUIT':
+                self.reply(b'221 Bye')
+                break
+            else:
+                self.reply(b'250 OK')
+
+    def reply(self, message: bytes) -> None:
+        self.wfile.write(message + b'\r\n')
+
+
+class SmtpStubServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self) -> None:
+        super().__init__(('127.0.0.1', 0), SmtpStubHandler)
+        self.lock = threading.Lock()
+        self.handlers: list[SmtpStubHandler] = []
+        self.connection_count = 0
+        self.message_count = 0
+
+    def add_handler(self, handler: SmtpStubHandler) -> None:
+        with self.lock:
+            self.handlers.append(handler)
+            self.connection_count += 1
+
+    def count_message(self) -> None:
+        with self.lock:
+            self.message_count += 1
+
+    def drop_connections(self) -> None:
+        with self.lock:
+            handlers = self.handlers
+            self.handlers = []
+
+        for handler in handlers:
+            try:
+                handler.connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+@pytest.fixture
+def smtp_stub(settings):
+    server = SmtpStubServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    settings.EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+    settings.EMAIL_HOST = '127.0.0.1'
+    settings.EMAIL_PORT = server.server_address[1]
+    settings.EMAIL_HOST_USER = ''
+    settings.EMAIL_HOST_PASSWORD = ''
+    settings.EMAIL_USE_TLS = False
+    settings.EMAIL_USE_SSL = False
+
+    yield server
+
+    server.drop_connections()
+    server.shutdown()
+    server.server_close()
+
+
+def make_pool(**kwargs) -> NotificationTransportPool:
+    return NotificationTransportPool(**{
+        'max_idle_sets': 4,
+        'max_idle_seconds': 60,
+        'max_clients': 10,
+        **kwargs,
+    })
+
+
+def make_email(index: int) -> EmailMessage:
+    return EmailMessage(subject=f"Task {index} failed", body='Exit code 1',
+            from_email='from@example.com', to=['to@example.com'])
+
+
+def test_email_burst_benchmark(smtp_stub):
+    """
+    Compare sending a burst of emails with a connection each, as email
+    delivery used to, to sending them over a pooled connection. The
+    timings are logged; the assertions check the connections made.
+    """
+    message_count = 50
+    pool = make_pool()
+
+    started_at = time.perf_counter()
+    for i in range(message_count):
+        assert make_email(i).send() == 1
+    unpooled_seconds = time.perf_counter() - started_at
+
+    assert smtp_stub.connection_count == message_count
+
+    started_at = time.perf_counter()
+    for i in range(message_count):
+        with pool.checkout() as transports:
+            assert transports.send_email_messages([make_email(i)]) == 1
+    pooled_seconds = time.perf_counter() - started_at
+
+    logger.info(f"Sending {message_count} emails took {unpooled_seconds:.3f}s with a connection each, {pooled_seconds:.3f}s pooled")
+
+    assert smtp_stub.connection_count == message_count + 1
+
+    with pool.checkout() as transports:
+        assert transports.send_email_messages(
+                [make_email(i) for i in range(message_count)]) == message_count
+
+    assert smtp_stub.connection_count == message_count + 1
+    assert smtp_stub.message_count == 3 * message_count
+
+    pool.close_all()
+
+
+def test_email_connection_reconnects_after_failed_health_check(smtp_stub):
+    # Check the connection before every use
+    pool = make_pool(max_idle_seconds=-1)
+
+    with pool.checkout() as transports:
+        assert transports.send_email_messages([make_email(0)]) == 1
+        smtp_stub.drop_connections()
+        assert transports.send_email_messages([make_email(1)]) == 1
+        assert transports.email_connection_count == 2
+
+    assert smtp_stub.connection_count == 2
+    assert smtp_stub.message_count == 2
+
+    pool.close_all()
+
+
+def test_email_connection_reconnects_when_server_disconnects(smtp_stub):
+    pool = make_pool()
+
+    with pool.checkout() as transports:
+        assert transports.send_email_messages([make_email(0)]) == 1
+        smtp_stub.drop_connections()
+
+        # Not checked since it was just used, but resent on a new connection
+        assert transports.send_email_messages([make_email(1)]) == 1
+        assert transports.email_connection_count == 2
+
+    assert smtp_stub.message_count == 2
+
+    pool.close_all()
+
+
+def test_pagerduty_clients_are_reused_until_idle():
+    with patch('processes.common.notification_transports.pagerduty.EventsApiV2Client') as mock_client_class:
+        mock_client_class.side_effect = lambda *args, **kwargs: MagicMock()
+        pool = make_pool()
+
+        with pool.checkout() as transports:
+            client = transports.get_pagerduty_client('key_1')
+            assert transports.get_pagerduty_client('key_1') is client
+            assert transports.get_pagerduty_client('key_2') is not client
+
+        # The same transports are lent out again
+        with pool.checkout() as transports:
+            assert transports.get_pagerduty_client('key_1') is client
+
+            transports.discard_pagerduty_client('key_1')
+            client.close.assert_called_once()
+            assert transports.get_pagerduty_client('key_1') is not client
+
+        assert mock_client_class.call_count == 3
+
+        pool = make_pool(max_idle_seconds=-1)
+
+        with pool.checkout() as transports:
+            client = transports.get_pagerduty_client('key_1')
+            assert transports.get_pagerduty_client('key_1') is not client
+            client.close.assert_called_once()
+
+
+def test_apprise_objects_are_cached_by_url():
+    pool = make_pool(max_clients=1)
+    asset = MagicMock()
+
+    with pool.checkout() as transports:
+        with patch('processes.common.notification_transports.apprise.Apprise') as mock_apprise_class:
+            mock_apprise_class.side_effect = lambda *args, **kwargs: MagicMock()
+
+            apobj = transports.get_apprise_object('json://localhost/a', asset=asset)
+            assert transports.get_apprise_object('json://localhost/a', asset=asset) is apobj
+            apobj.add.assert_called_once_with('json://localhost/a')
+
+            # The least recently used object is evicted
+            transports.get_apprise_object('json://localhost/b', asset=asset)
+            assert transports.get_apprise_object('json://localhost/a', asset=asset) is not apobj
+            assert mock_apprise_class.call_count == 3
+
+            mock_apprise_class.side_effect = None
+            mock_apprise_class.return_value.add.return_value = False
+
+            with pytest.raises(ValueError, match="Invalid Apprise URL"):
+                transports.get_apprise_object('invalid', asset=asset)
+
+            assert 'invalid' not in transports.apprise_objects
+
+
+def test_pool_keeps_at_most_max_idle_sets():
+    pool = make_pool(max_idle_sets=1)
+
+    with pool.checkout() as transports_1:
+        with pool.checkout() as transports_2:
+            assert transports_1 is not transports_2
+
+    assert pool.idle_sets == [transports_2]
+
+    with pool.checkout() as transports:
+        assert transports is transports_2
+
+    pool.close_all()
+    assert pool.idle_sets == []
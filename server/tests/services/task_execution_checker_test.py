@@ -215,3 +215,57 @@ class TestTaskExecutionChecker:
 
         te.refresh_from_db()
         assert te.status == Execution.Status.RUNNING
+
+    def test_check_all_only_fetches_executions_past_deadline(self, checker,
+            task_factory, task_execution_factory):
+        utc_now = timezone.now()
+        task = task_factory(max_age_seconds=1000,
+                max_heartbeat_lateness_before_alert_seconds=30,
+                max_heartbeat_lateness_before_abandonment_seconds=600)
+
+        healthy_te = task_execution_factory(
+            task=task,
+            status=Execution.Status.RUNNING,
+            started_at=utc_now - timedelta(seconds=100),
+            heartbeat_interval_seconds=60,
+            last_heartbeat_at=utc_now - timedelta(seconds=10)
+        )
+
+        # The heartbeat alert is due first
+        assert healthy_te.check_deadline_at == \
+                healthy_te.last_heartbeat_at + timedelta(seconds=60 + 30)
+
+        late_te = task_execution_factory(
+            task=task,
+            status=Execution.Status.RUNNING,
+            started_at=utc_now - timedelta(seconds=200),
+            heartbeat_interval_seconds=60,
+            last_heartbeat_at=utc_now - timedelta(seconds=100)
+        )
+
+        checked_ids: list[int] = []
+        check_task_execution = checker.check_task_execution
+
+        def spy(te: TaskExecution) -> None:
+            checked_ids.append(te.pk)
+            check_task_execution(te)
+
+        checker.check_task_execution = spy
+        checker.check_all()
+
+        late_te.refresh_from_db()
+
+        assert checked_ids == [late_te.pk]
+        assert MissingHeartbeatDetectionEvent.objects.filter(task_execution=late_te).count() == 1
+
+        # The alert was sent, so wait until the execution is abandoned
+        assert late_te.check_deadline_at == \
+                late_te.last_heartbeat_at + timedelta(seconds=60 + 600)
+
+        # Changing the Task moves the deadlines
+        task.max_age_seconds = 150
+        task.save()
+
+        late_te.refresh_from_db()
+        assert late_te.check_deadline_at == \
+                late_te.started_at + timedelta(seconds=150)
@@ -207,4 +207,88 @@ def test_task_schedule_checker_missing_scheduled_executions(
         else:
             assert events.count() == 0
 
-        checker.check_all()
\ No newline at end of file
+        checker.check_all()
+
+@pytest.mark.django_db
+@mock_aws
+def test_task_schedule_checker_only_checks_due_tasks(task_factory,
+        task_execution_factory):
+    utc_now = timezone.now()
+    schedule_updated_at = utc_now - timedelta(days=2)
+
+    healthy_task = task_factory(schedule='rate(30 minutes)',
+            is_scheduling_managed=False,
+            schedule_updated_at=schedule_updated_at)
+    task_execution_factory(task=healthy_task,
+            started_at=utc_now - timedelta(minutes=5))
+
+    late_tasks = [task_factory(schedule='rate(30 minutes)',
+            is_scheduling_managed=False,
+            schedule_updated_at=schedule_updated_at) for _i in range(2)]
+
+    healthy_task.refresh_from_db()
+    assert healthy_task.next_schedule_check_at > utc_now
+
+    checker = TaskScheduleChecker()
+    checked_task_ids: list[int] = []
+    count_executions_call_count = 0
+
+    check_time_range = checker.check_time_range
+    count_executions = checker.count_executions
+
+    def check_time_range_spy(schedulable, **kwargs):
+        checked_task_ids.append(schedulable.pk)
+        return check_time_range(schedulable, **kwargs)
+
+    def count_executions_spy(time_ranges):
+        nonlocal count_executions_call_count
+        count_executions_call_count += 1
+        return count_executions(time_ranges)
+
+    checker.check_time_range = check_time_range_spy
+    checker.count_executions = count_executions_spy
+
+    checker.check_all()
+
+    # The executions of all due Tasks are counted in one query
+    assert sorted(checked_task_ids) == sorted(task.pk for task in late_tasks)
+    assert count_executions_call_count == 1
+
+    for task in late_tasks:
+        assert MissingScheduledTaskExecutionEvent.objects.filter(task=task).count() == 1
+
+        # Still missing executions, so keep checking
+        task.refresh_from_db()
+        assert task.next_schedule_check_at <= timezone.now()
+
+    # Starting an execution pushes back the next check
+    task_execution_factory(task=late_tasks[0], started_at=timezone.now())
+    late_tasks[0].refresh_from_db()
+    assert late_tasks[0].next_schedule_check_at > timezone.now()
+
+    checked_task_ids.clear()
+    checker.check_all()
+    assert checked_task_ids == [late_tasks[1].pk]
+
+
+@pytest.mark.django_db
+@mock_aws
+def test_task_schedule_checker_cron_advances_next_expected_execution(
+        task_factory, task_execution_factory):
+    utc_now = timezone.now().replace(second=0, microsecond=0)
+    expected_at = utc_now - timedelta(minutes=15)
+
+    task = task_factory(schedule=f'cron({expected_at.minute} {expected_at.hour} * * ? *)',
+            is_scheduling_managed=False,
+            schedule_updated_at=utc_now - timedelta(days=2))
+    task_execution_factory(task=task, started_at=expected_at)
+
+    task.refresh_from_db()
+    assert task.next_schedule_check_at < utc_now
+
+    TaskScheduleChecker().check_all()
+
+    task.refresh_from_db()
+    assert task.next_expected_execution_at == expected_at + timedelta(days=1)
+    assert task.next_schedule_check_at > task.next_expected_execution_at
+    assert not MissingScheduledTaskExecutionEvent.objects.filter(task=task).exists()
@@ -0,0 +1,41 @@
+import threading
+import time
+
+from processes.services.worker_pool import WorkerPool
+
+import pytest
+
+
+def test_worker_pool_run_is_bounded_and_concurrent():
+    max_workers = 4
+    lock = threading.Lock()
+    active_count = 0
+    max_active_count = 0
+
+    def check(item: int) -> bool:
+        nonlocal active_count, max_active_count
+
+        with lock:
+            active_count += 1
+            max_active_count = max(max_active_count, active_count)
+
+        time.sleep(0.02)
+
+        with lock:
+            active_count -= 1
+
+        if item == 3:
+            raise RuntimeError('Check failed')
+
+        return (item % 2) == 0
+
+    pool = WorkerPool(max_workers=max_workers)
+
+    # Items 0, 2, 4, ..., 18 are truthy
+    assert pool.run(iter(range(20)), check) == 10
+    assert 1 < max_active_count <= max_workers
+
+
+def test_worker_pool_validates_max_workers():
+    with pytest.raises(ValueError):
+        WorkerPool(max_workers=0)
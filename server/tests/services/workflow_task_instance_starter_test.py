@@ -0,0 +1,111 @@
+import threading
+
+from processes.models import *
+from processes.services.workflow_task_instance_starter import WorkflowTaskInstanceStarter
+
+import pytest
+
+from moto import mock_aws
+
+
+def make_workflow_task_instances(workflow_factory, workflow_task_instance_factory,
+        count: int) -> tuple[Workflow, list[WorkflowTaskInstance]]:
+    workflow = workflow_factory()
+    return (workflow, [workflow_task_instance_factory(workflow=workflow)
+            for _i in range(count)])
+
+
+@pytest.mark.django_db(transaction=True)
+@mock_aws
+def test_start_runs_branches_concurrently(workflow_factory,
+        workflow_task_instance_factory, workflow_execution_factory, monkeypatch):
+    branch_count = 4
+    workflow, wtis = make_workflow_task_instances(workflow_factory,
+            workflow_task_instance_factory, branch_count)
+    workflow_execution = workflow_execution_factory(workflow=workflow)
+    failing_task = wtis[1].task
+
+    # Every branch must be starting at once to pass the barrier
+    barrier = threading.Barrier(branch_count, timeout=10)
+    started_task_uuids = []
+    finished_wtie_uuids = []
+
+    def manually_start(self):
+        barrier.wait()
+
+        if self.task == failing_task:
+            raise RuntimeError('RunTask failed')
+
+        started_task_uuids.append(self.task.uuid)
+
+    def handle_workflow_task_instance_execution_finished(self, wptie, **kwargs):
+        finished_wtie_uuids.append(wptie.uuid)
+
+    monkeypatch.setattr(TaskExecution, 'manually_start', manually_start)
+    monkeypatch.setattr(WorkflowExecution,
+            'handle_workflow_task_instance_execution_finished',
+            handle_workflow_task_instance_execution_finished)
+
+    wties = WorkflowTaskInstanceStarter(max_workers=branch_count).start(wtis,
+            workflow_execution)
+
+    assert [wtie.workflow_task_instance for wtie in wties] == wtis
+    assert len(started_task_uuids) == branch_count - 1
+
+    # The failed branch is reported through its Task Execution
+    failed_wtie = wties[1]
+    failed_task_execution = TaskExecution.objects.get(
+            pk=failed_wtie.task_execution.pk)
+    assert failed_task_execution.status == Execution.Status.FAILED
+    assert failed_task_execution.stop_reason == TaskExecution.StopReason.FAILED_TO_START
+    assert failed_task_execution.error_details == {'exception': 'RunTask failed'}
+    assert finished_wtie_uuids == [failed_wtie.uuid]
+
+    for wtie in wties:
+        if wtie != failed_wtie:
+            assert TaskExecution.objects.get(pk=wtie.task_execution.pk).status == \
+                    Execution.Status.MANUALLY_STARTED
+
+
+@pytest.mark.django_db
+@mock_aws
+def test_start_writes_executions_for_each_task_instance(workflow_factory,
+        workflow_task_instance_factory, workflow_execution_factory, monkeypatch,
+        django_capture_on_commit_callbacks):
+    workflow, wtis = make_workflow_task_instances(workflow_factory,
+            workflow_task_instance_factory, 3)
+    workflow_execution = workflow_execution_factory(workflow=workflow)
+    start_threads = []
+
+    def manually_start(self):
+        start_threads.append(threading.current_thread())
+
+    monkeypatch.setattr(TaskExecution, 'manually_start', manually_start)
+
+    starter = WorkflowTaskInstanceStarter(max_workers=8)
+
+    # Inside a transaction, the Task Executions are started on commit
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        first_wties = starter.start(wtis[:1], workflow_execution)
+        assert start_threads == []
+
+        # Duplicates are started once
+        wties = starter.start(wtis + wtis[:1], workflow_execution)
+
+    assert len(callbacks) == 2
+
+    assert len(wties) == 3
+    assert WorkflowTaskInstanceExecution.objects.filter(
+            workflow_execution=workflow_execution).count() == 4
+    assert WorkflowTaskInstanceExecution.objects.filter(
+            workflow_execution=workflow_execution, is_latest=True).count() == 3
+    assert not WorkflowTaskInstanceExecution.objects.get(
+            pk=first_wties[0].pk).is_latest
+
+    for wtie, wti in zip(wties, wtis):
+        assert wtie.task_execution.task == wti.task
+        assert wtie.task_execution.status == Execution.Status.MANUALLY_STARTED
+
+    # The test transaction is never committed, so the rows aren't visible
+    # to other threads, and the Task Executions are started in this one
+    assert start_threads == [threading.current_thread()] * 4
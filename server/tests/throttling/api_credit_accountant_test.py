@@ -0,0 +1,183 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest.mock import patch
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from processes.models import GroupInfo
+from processes.throttling.api_credit_accountant import (
+    CacheApiCreditAccountant, DatabaseApiCreditAccountant,
+    LocalApiCreditAccountant
+)
+
+import pytest
+
+from conftest import *
+
+
+def count_group_info_updates(context: CaptureQueriesContext) -> int:
+    return len([q for q in context.captured_queries
+            if q['sql'].startswith('UPDATE') and ('groupinfo' in q['sql'])])
+
+
+@pytest.mark.django_db
+def test_group_info_add_api_credits_across_months(group_factory) -> None:
+    group_info = GroupInfo(group=group_factory(),
+            api_credits_used_current_month=10,
+            api_credits_used_previous_month=500,
+            api_last_used_at=datetime(2026, 1, 20, tzinfo=dt_timezone.utc))
+
+    # Counted in January, added in February
+    group_info.add_api_credits(5,
+            used_at=datetime(2026, 2, 1, tzinfo=dt_timezone.utc))
+    assert group_info.api_credits_used_current_month == 5
+    assert group_info.api_credits_used_previous_month == 10
+
+    # Counted before the rollover, added afterwards
+    group_info.add_api_credits(3,
+            used_at=datetime(2026, 1, 31, 23, 59, tzinfo=dt_timezone.utc))
+    assert group_info.api_credits_used_current_month == 5
+    assert group_info.api_credits_used_previous_month == 13
+
+    # Skipping a month clears the previous month
+    group_info.add_api_credits(1,
+            used_at=datetime(2026, 4, 2, tzinfo=dt_timezone.utc))
+    assert group_info.api_credits_used_current_month == 1
+    assert group_info.api_credits_used_previous_month == 0
+    assert group_info.api_last_used_at == \
+            datetime(2026, 4, 2, tzinfo=dt_timezone.utc)
+
+
+@pytest.mark.django_db
+def test_local_api_credit_accountant_limit_and_flush(group_factory) -> None:
+    group = group_factory()
+    utc_now = datetime(2026, 3, 15, tzinfo=dt_timezone.utc)
+    GroupInfo(group=group, api_credits_used_current_month=7,
+            api_last_used_at=utc_now).save()
+
+    accountant = LocalApiCreditAccountant(flush_interval_seconds=3600)
+
+    allowed = [accountant.consume_credit(group_id=group.pk,
+            max_api_credits_per_month=10, utc_now=utc_now) for _i in range(5)]
+
+    assert allowed == [True, True, True, False, False]
+    assert GroupInfo.objects.get(group=group).api_credits_used_current_month == 7
+
+    assert accountant.flush() == 3
+    assert GroupInfo.objects.get(group=group).api_credits_used_current_month == 10
+
+    assert not accountant.consume_credit(group_id=group.pk,
+            max_api_credits_per_month=10, utc_now=utc_now)
+    assert accountant.flush() == 0
+
+
+@pytest.mark.django_db
+def test_local_api_credit_accountant_month_rollover(group_factory) -> None:
+    group = group_factory()
+    accountant = LocalApiCreditAccountant(flush_interval_seconds=3600)
+
+    january = datetime(2026, 1, 31, 23, 59, tzinfo=dt_timezone.utc)
+    february = datetime(2026, 2, 1, 0, 1, tzinfo=dt_timezone.utc)
+
+    for _i in range(4):
+        assert accountant.consume_credit(group_id=group.pk,
+                max_api_credits_per_month=4, utc_now=january)
+
+    assert not accountant.consume_credit(group_id=group.pk,
+            max_api_credits_per_month=4, utc_now=january)
+
+    # The new month has its own limit
+    assert accountant.consume_credit(group_id=group.pk,
+            max_api_credits_per_month=4, utc_now=february)
+
+    assert accountant.flush() == 5
+
+    group_info = GroupInfo.objects.get(group=group)
+    assert group_info.api_credits_used_current_month == 1
+    assert group_info.api_credits_used_previous_month == 4
+    assert group_info.api_last_used_at == february
+
+
+@pytest.mark.django_db
+def test_local_api_credit_accountant_concurrency(group_factory) -> None:
+    """
+    Many threads using credits at once never exceed the limit, and do not
+    write the GroupInfo row until the counts are flushed, unlike the
+    database accountant which writes it once per credit.
+    """
+    group = group_factory()
+    utc_now = datetime(2026, 5, 10, tzinfo=dt_timezone.utc)
+    request_count = 400
+    max_api_credits_per_month = 250
+
+    GroupInfo(group=group, api_credits_used_current_month=0,
+            api_last_used_at=utc_now).save()
+
+    database_accountant = DatabaseApiCreditAccountant()
+
+    with CaptureQueriesContext(connection) as database_context:
+        for _i in range(20):
+            database_accountant.consume_credit(group_id=group.pk,
+                    max_api_credits_per_month=None, utc_now=utc_now)
+
+    assert count_group_info_updates(database_context) == 20
+
+    GroupInfo.objects.filter(group=group).update(
+            api_credits_used_current_month=0)
+
+    accountant = LocalApiCreditAccountant(flush_interval_seconds=3600)
+
+    with CaptureQueriesContext(connection) as local_context:
+        # Loads the committed count from the database
+        assert accountant.consume_credit(group_id=group.pk,
+                max_api_credits_per_month=max_api_credits_per_month,
+                utc_now=utc_now)
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            results = list(executor.map(
+                lambda _i: accountant.consume_credit(group_id=group.pk,
+                        max_api_credits_per_month=max_api_credits_per_month,
+                        utc_now=utc_now),
+                range(request_count - 1)))
+
+    assert 1 + results.count(True) == max_api_credits_per_month
+    assert count_group_info_updates(local_context) == 0
+
+    with CaptureQueriesContext(connection) as flush_context:
+        assert accountant.flush() == max_api_credits_per_month
+
+    assert count_group_info_updates(flush_context) == 1
+    assert GroupInfo.objects.get(group=group).api_credits_used_current_month == \
+            max_api_credits_per_month
+
+
+@pytest.mark.django_db
+def test_cache_api_credit_accountant_keys_expire_after_month(group_factory) -> None:
+    """
+    Shared stores expire the counts of a month shortly after it ends, so
+    keys don't accumulate forever.
+    """
+    group = group_factory()
+    accountant = CacheApiCreditAccountant(flush_interval_seconds=3600)
+
+    utc_now = datetime(2026, 12, 31, 12, tzinfo=dt_timezone.utc)
+    expires_at = datetime(2027, 1, 1, tzinfo=dt_timezone.utc) + \
+            CacheApiCreditAccountant.KEY_EXPIRATION_GRACE_PERIOD
+
+    assert accountant.period_expires_at((group.pk, 2026, 12)) == expires_at
+    assert accountant.period_expires_at((group.pk, 2026, 2)) == \
+            datetime(2026, 3, 1, tzinfo=dt_timezone.utc) + \
+            CacheApiCreditAccountant.KEY_EXPIRATION_GRACE_PERIOD
+
+    with patch('processes.throttling.api_credit_accountant.timezone.now',
+            return_value=utc_now), \
+            patch.object(accountant.cache, 'add',
+            wraps=accountant.cache.add) as mock_add:
+        assert accountant.consume_credit(group_id=group.pk,
+                max_api_credits_per_month=None, utc_now=utc_now)
+
+    timeouts = [call.kwargs['timeout'] for call in mock_add.call_args_list]
+
+    assert len(timeouts) == 2
+    assert timeouts == [int((expires_at - utc_now) / timedelta(seconds=1))] * 2